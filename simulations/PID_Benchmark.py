@@ -0,0 +1,115 @@
+"""
+Compare the cost per update of the PID controller against the implementation it replaced
+
+Run this file on a computer, the legacy controller below is a copy of the original src/PIDController.py update loop.
+The timings vary by a few percent between runs, so compare the ratios printed at the end over several runs rather
+than reading much into a single one.
+"""
+
+import os
+import sys
+import timeit
+
+src_dir = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+
+sys.path.append(src_dir)
+
+from PIDController import PIDController
+from Utilities import clamp
+
+SECONDS = "SECONDS"
+UPDATES = 200000
+
+
+class SteppingTimer:
+    # Advances 25ms every time it is read so neither controller skips an update
+    def __init__(self):
+        self.seconds = 0.0
+
+    def time(self, units):
+        self.seconds += 0.025
+        return self.seconds
+
+
+class LegacyPIDController:
+    def __init__(
+        self, timer, kp=1.0, ki=0.0, kd=0.0, t=0.05, integral_zone=(-1e9, 1e9)
+    ):
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.time_step = t
+        self.integral_zone = integral_zone
+        self.setpoint = 0.0
+        self._timer = timer
+        self._previous_time = timer.time(SECONDS)
+        self._error_integral = 0.0
+        self._last_error_derivative = 0.0
+        self._previous_error = 0.0
+        self._control_output = 0.0
+
+    def update(self, current_value):
+        current_time = self._timer.time(SECONDS)
+        delta_time = current_time - self._previous_time
+
+        if delta_time < self.time_step:
+            return self._control_output
+
+        self._previous_time = current_time
+
+        current_error = self.setpoint - current_value
+        self._error_integral += current_error * delta_time
+        if self.ki != 0:
+            self._error_integral = clamp(
+                self._error_integral, self.integral_zone[0], self.integral_zone[1]
+            )
+        self._last_error_derivative = (
+            current_error - self._previous_error
+        ) / delta_time
+        self._control_output = (
+            self.kp * current_error
+            + self.ki * self._error_integral
+            + self.kd * self._last_error_derivative
+        )
+        self._previous_error = current_error
+
+        return self._control_output
+
+
+def benchmark(name, function):
+    seconds = min(timeit.repeat(function, number=1, repeat=9))
+    print(name.ljust(36) + str(round(seconds / UPDATES * 1e9)) + " ns per update")
+    return seconds
+
+
+if __name__ == "__main__":
+    measurements = [i * 0.001 for i in range(UPDATES)]
+
+    legacy = LegacyPIDController(SteppingTimer(), 1, 0.1, 0.01, 0.02, (-2, 2))
+    measured = PIDController(SteppingTimer(), 1, 0.1, 0.01, 0.02, (-2, 2))
+    fixed = PIDController(None, 1, 0.1, 0.01, 0.02, (-2, 2), fixed_period=True)
+    batch = PIDController(None, 1, 0.1, 0.01, 0.02, (-2, 2), fixed_period=True)
+
+    def run(controller):
+        update = controller.update
+        for measurement in measurements:
+            update(measurement)
+
+    legacy_time = benchmark("Legacy update (measured dt)", lambda: run(legacy))
+    # Controllers that use the timer themselves, the measured path pays for a timer read on every update
+    measured_time = benchmark("PIDController.update (measured dt)", lambda: run(measured))
+    # MotorPIDs registered with a ControlScheduler and the PID inside ProfiledPIDController
+    fixed_time = benchmark("PIDController.update (fixed period)", lambda: run(fixed))
+    # Replaying logged data and tuning in simulation
+    batch_time = benchmark(
+        "PIDController.calculate_batch", lambda: batch.calculate_batch(measurements)
+    )
+    print("Relative to the legacy update, which has no derivative filter, output limits or continuous input:")
+    for name, seconds in (
+        ("update (measured dt)", measured_time),
+        ("update (fixed period)", fixed_time),
+        ("calculate_batch", batch_time),
+    ):
+        print("    " + name.ljust(24) + str(round(legacy_time / seconds, 2)) + "x")
@@ -0,0 +1,183 @@
+"""
+Search for PID gains on a simulated motor, spreading the candidates across every CPU core
+
+The plant is the MotorSimulation from PID_Test.py with a first order lag and a saturating input added, so that the
+derivative term matters and the integral can wind up like it does on the robot. A coarse grid of gains is simulated
+first, then random candidates are drawn around the best ones found so far for a number of refinement rounds. Each
+candidate's step response is ranked by settling time, then overshoot.
+
+Use the gains found here as a starting point, then confirm them on the robot with PIDAutotune.py or by hand.
+"""
+
+import os
+import random
+import sys
+from itertools import product
+from multiprocessing import Pool
+
+src_dir = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+
+sys.path.append(src_dir)
+
+from PIDController import PIDController
+from PID_Test import MotorSimulation
+
+TIME_STEP_S = 0.02
+SIMULATED_TIME_S = 10
+SETPOINT = 100
+# The response has settled once it stays within this fraction of the setpoint
+SETTLING_BAND = 0.02
+
+
+class LaggedMotorSimulation(MotorSimulation):
+    """
+    A MotorSimulation whose response to its input lags behind by a time constant, with the input clipped like a motor's
+    voltage
+    """
+
+    def __init__(self, time_constant_s=0.15, maximum_input=100.0):
+        super().__init__()
+        self.time_constant_s = time_constant_s
+        self.maximum_input = maximum_input
+        self._applied_input = 0.0
+
+    def set_input(self, control_output: float):
+        control_output = max(-self.maximum_input, min(self.maximum_input, control_output))
+        self._applied_input += (
+            (control_output - self._applied_input) * TIME_STEP_S / self.time_constant_s
+        )
+        super().set_input(self._applied_input)
+
+
+def step_response(gains):
+    """
+    Simulate a step to SETPOINT with the given gains
+
+    Args:
+        gains: A tuple of (kp, ki, kd)
+
+    Returns:
+        A list of measurements, one per time step
+    """
+    kp, ki, kd = gains
+    controller = PIDController(
+        kp=kp, ki=ki, kd=kd, t=TIME_STEP_S, integral_zone=(-20, 20), fixed_period=True
+    )
+    controller.setpoint = SETPOINT
+    motor = LaggedMotorSimulation()
+    measurements = []
+    for _ in range(round(SIMULATED_TIME_S / TIME_STEP_S)):
+        current_value = motor.get_measurement()
+        motor.set_input(controller.update(current_value))
+        measurements.append(current_value)
+    return measurements
+
+
+def evaluate(gains):
+    """
+    Score a set of gains by their step response
+
+    Returns:
+        A tuple of (settling_time_s, overshoot_percent, gains), the settling time is infinite if the response never
+        settles within the simulated time
+    """
+    measurements = step_response(gains)
+    overshoot_percent = max(0.0, (max(measurements) - SETPOINT) / SETPOINT * 100)
+
+    band = SETPOINT * SETTLING_BAND
+    settling_time_s = float("inf")
+    for i in range(len(measurements) - 1, -1, -1):
+        if abs(measurements[i] - SETPOINT) > band:
+            if i < len(measurements) - 1:
+                settling_time_s = (i + 1) * TIME_STEP_S
+            break
+    else:
+        settling_time_s = 0.0
+    return settling_time_s, overshoot_percent, gains
+
+
+def rank(results, maximum_overshoot_percent):
+    """
+    Sort results by settling time then overshoot, leaving out any that overshoot too far
+    """
+    return sorted(
+        (result for result in results if result[1] <= maximum_overshoot_percent),
+        key=lambda result: (result[0], result[1]),
+    )
+
+
+def refine(best_results, count, spread, rng):
+    """
+    Draw random candidates around the best gains found so far, each gain scaled by up to +-spread
+    """
+    candidates = []
+    for i in range(count):
+        kp, ki, kd = best_results[i % len(best_results)][2]
+        candidates.append(
+            tuple(
+                max(0.0, gain * (1 + rng.uniform(-spread, spread)))
+                for gain in (kp, ki, kd)
+            )
+        )
+    return candidates
+
+
+def sweep(
+    kp_values,
+    ki_values,
+    kd_values,
+    refinement_rounds=4,
+    candidates_per_round=200,
+    maximum_overshoot_percent=5.0,
+    processes=None,
+    seed=0,
+):
+    """
+    Grid search the gains, then refine around the best of them
+
+    Args:
+        kp_values: The Kp values to try in the grid
+        ki_values: The Ki values to try in the grid
+        kd_values: The Kd values to try in the grid
+        refinement_rounds: How many rounds of random refinement to run after the grid
+        candidates_per_round: How many candidates to simulate in each refinement round
+        maximum_overshoot_percent: Candidates that overshoot further than this are discarded
+        processes: How many worker processes to use, defaults to one per CPU core
+        seed: The random seed for the refinement rounds
+
+    Returns:
+        Every acceptable result as (settling_time_s, overshoot_percent, (kp, ki, kd)), best first
+    """
+    rng = random.Random(seed)
+    with Pool(processes) as pool:
+        results = rank(
+            pool.map(evaluate, product(kp_values, ki_values, kd_values), chunksize=16),
+            maximum_overshoot_percent,
+        )
+        spread = 0.5
+        for _ in range(refinement_rounds):
+            if not results:
+                break
+            candidates = refine(results[:10], candidates_per_round, spread, rng)
+            results = rank(
+                results + pool.map(evaluate, candidates, chunksize=16),
+                maximum_overshoot_percent,
+            )
+            spread /= 2
+    return results
+
+
+if __name__ == "__main__":
+    grid = [0.05, 0.1, 0.2, 0.3, 0.5, 0.8, 1.2, 2.0]
+    best = sweep(grid, [0, 0.01, 0.05, 0.1, 0.2, 0.5], [0, 0.005, 0.01, 0.02, 0.05])
+    print("Settling time (s)  Overshoot (%)  Kp      Ki      Kd")
+    for settling_time_s, overshoot_percent, (kp, ki, kd) in best[:10]:
+        print(
+            str(round(settling_time_s, 2)).ljust(19)
+            + str(round(overshoot_percent, 2)).ljust(15)
+            + str(round(kp, 4)).ljust(8)
+            + str(round(ki, 4)).ljust(8)
+            + str(round(kd, 4))
+        )
@@ -12,8 +12,9 @@ src_dir = os.path.join(
 
 sys.path.append(src_dir)
 
-from RANSAC import RANSAC
+from MultiLineRANSAC import MultiLineExtractor
 from LinearRegressor import LinearRegressor
+from RaycastTable import RaycastTable
 
 MAX_FPS = 20
 DISPLAY_SCALING_FACTOR = 4
@@ -42,6 +43,11 @@ optimal_model_position_error = -1
 pygame.init()
 
 field_map = pygame.image.load("Test_Obstacles.png")
+# Build with utils/raycast_table_builder.py (see its docstring) to look readings up instead of stepping through the map
+raycast_table = (
+    RaycastTable("Test_Obstacles.ray") if os.path.exists("Test_Obstacles.ray") else None
+)
+field_map_image_height = field_map.get_height()
 robot = pygame.image.load("Robot.png")
 font = pygame.font.Font("FreeSansBold.ttf", 10)
 pygame_logo = pygame.image.load("pygame_logo.png")
@@ -109,6 +115,22 @@ def cast_ray(start_pos, direction):
     max_distance = 200 * DISPLAY_SCALING_FACTOR
     step_size = 1
     x, y = start_pos
+
+    if raycast_table is not None:
+        # The table is in image pixels with y up the field, the display is scaled and y runs down the screen
+        distance = raycast_table.expected_range(
+            x / DISPLAY_SCALING_FACTOR,
+            field_map_image_height - y / DISPLAY_SCALING_FACTOR,
+            math.pi - direction,
+        )
+        if distance is None or distance * DISPLAY_SCALING_FACTOR >= max_distance:
+            return None
+        distance *= DISPLAY_SCALING_FACTOR
+        # The table can report ranges under a cell, too short for randrange's whole numbers
+        return distance + random.uniform(-distance, distance) * (
+            0.05 / DISPLAY_SCALING_FACTOR
+        )
+
     x_step = math.sin(direction)
     y_step = math.cos(direction)
 
@@ -199,9 +221,6 @@ def do_maneuver():
     models = []
     inliers = []
 
-    def sample(self, point_list, default_sample_points):
-        return random.sample(point_list, default_sample_points)
-
     def score_model(self, model, inliers):
         global horizontal_vertical_threshold
         if not (
@@ -271,37 +290,30 @@ def do_maneuver():
 
     start_time = time.perf_counter()
 
-    while True:
-        # `sample_points`: Minimum number of data points to estimate parameters
-        # `sample_count`: Maximum iterations allowed
-        # `score_threshold`: Threshold value to determine if points are fit well
-        # `inlier_count_threshold`: Number of close data points required to assert model fits well
-        line_detector = RANSAC(
-            500, 2, 10, 90, sample=sample, score_model=score_model, compare=compare
-        )
-
-        best_model, best_inliers = line_detector.fit(point_list)
-
-        if not best_model:
-            break
-
-        for point in best_inliers:
-            point_list.remove(point)
-
-        if not point_list:
-            break
-
-        if not (
+    def is_horizontal_or_vertical(model, _):
+        if (
             -1 / horizontal_vertical_threshold
-            <= best_model.slope
+            <= model.slope
             <= 1 / horizontal_vertical_threshold
-            or -horizontal_vertical_threshold >= best_model.slope
-            or best_model.slope >= horizontal_vertical_threshold
+            or -horizontal_vertical_threshold >= model.slope
+            or model.slope >= horizontal_vertical_threshold
         ):
-            # This line is not vertical or horizontal; try again
-            print("Discarding line")
-            continue
-
+            return True
+        # This line is not vertical or horizontal; its points are removed and the next line is tried
+        print("Discarding line")
+        return False
+
+    # Find every wall in one pass, each line's inliers are removed before looking for the next
+    line_extractor = MultiLineExtractor(
+        max_lines=4,
+        inlier_distance_threshold=10,
+        minimum_inliers=90,
+        sample_count=500,
+        accept=is_horizontal_or_vertical,
+        score_model=score_model,
+        compare=compare,
+    )
+    for best_model, best_inliers in line_extractor.extract(point_list):
         models.append(best_model)
         inliers.append(best_inliers)
 
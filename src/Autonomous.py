@@ -1,4 +1,17 @@
 from vex import *
+from Commands import (
+    Command,
+    InstantCommand,
+    WaitCommand,
+    SequentialCommandGroup,
+    ParallelCommandGroup,
+)
+from DrivetrainCommands import (
+    forward,
+    backwards,
+    strafe_left,
+    turn_to_heading_deg,
+)
 
 
 class AutonomousRoutine:
@@ -20,7 +33,7 @@ class NothingAutonomous(AutonomousRoutine):
 
         robot.drivetrain.current_position = (0, 0)
         robot.drivetrain._odometry.rotation_deg = 0
-        robot.drivetrain.rotation_PID.setpoint = robot.drivetrain.current_direction_rad
+        robot.drivetrain.hold_current_heading()
         robot.drivetrain.target_position = robot.drivetrain.current_position
 
     def run(self):
@@ -62,7 +75,7 @@ class WinPointAutonomous(AutonomousRoutine):
         robot.drivetrain.set_braking(False)
         robot.drivetrain.turn_to_face_heading_deg(25)
 
-        robot.drivetrain.rotation_PID.setpoint = robot.drivetrain.current_direction_rad
+        robot.drivetrain.hold_current_heading()
         robot.drivetrain.clear_direction_PID_output()
         robot.drivetrain.target_position = robot.drivetrain.current_position
 
@@ -77,7 +90,7 @@ class ScoringAutonomous4(AutonomousRoutine):
         self.robot = robot
 
         robot.drivetrain.current_position = (0, 0)
-        robot.drivetrain.rotation_PID.setpoint = robot.drivetrain.current_direction_rad
+        robot.drivetrain.hold_current_heading()
         robot.drivetrain.target_position = robot.drivetrain.current_position
 
     def run(self):
@@ -115,7 +128,7 @@ class ScoringAutonomous4(AutonomousRoutine):
         robot.intake.stop()
 
         self.log("Done")
-        robot.drivetrain.rotation_PID.setpoint = robot.drivetrain.current_direction_rad
+        robot.drivetrain.hold_current_heading()
         robot.drivetrain.clear_direction_PID_output()
         robot.drivetrain.target_position = robot.drivetrain.current_position
 
@@ -124,70 +137,110 @@ class ScoringAutonomous4(AutonomousRoutine):
         self.log_object.exit()
 
 
+class RaiseCatapult(Command):
+    """
+    Raise the catapult with the climber, finishing once the climber stalls against the top of its travel
+    """
+
+    def __init__(self, robot):
+        super().__init__((robot.climber,))
+        self.robot = robot
+        self._start_time = 0
+
+    def initialize(self):
+        self.robot.climber.set_velocity(50)
+        self.robot.climber.climber_motor.set_max_torque(20, PERCENT)
+        self._start_time = self.robot.brain.timer.time(SECONDS)
+
+    def is_finished(self):
+        # Give the climber time to get moving before checking whether it has stalled
+        return (
+            self.robot.brain.timer.time(SECONDS) - self._start_time >= 2
+            and abs(self.robot.climber.climber_motor.velocity()) <= 40
+        )
+
+    def end(self, interrupted):
+        self.robot.climber.climber_motor.set_max_torque(100, PERCENT)
+        self.robot.climber.set_velocity(0)
+
+
+class LowerCatapult(Command):
+    """
+    Lower the catapult with the climber
+    """
+
+    def __init__(self, robot):
+        super().__init__((robot.climber,))
+        self.robot = robot
+
+    def initialize(self):
+        self.robot.climber.set_velocity(-100)
+
+    def is_finished(self):
+        return self.robot.climber.climber_motor.position(DEGREES) <= 50
+
+    def end(self, interrupted):
+        self.robot.climber.set_velocity(0)
+
+
 class SkillsAutonomous(AutonomousRoutine):
     def __init__(self, robot, log_object):
         super().__init__(log_object)
         self.robot = robot
-        self.catapult_raised = False
 
         robot.drivetrain.current_position = (0, 0)
-        robot.drivetrain.rotation_PID.setpoint = robot.drivetrain.current_direction_rad
+        robot.drivetrain.hold_current_heading()
         robot.drivetrain.target_position = robot.drivetrain.current_position
 
-    def raise_catapult(self):
-        robot = self.robot
-        robot.climber.set_velocity(50)
-        robot.climber.climber_motor.set_max_torque(20, PERCENT)
-        wait(2000, MSEC)
-        while abs(robot.climber.climber_motor.velocity()) > 40:
-            pass
-        robot.climber.climber_motor.set_max_torque(100, PERCENT)
-        robot.climber.set_velocity(0)
-        self.catapult_raised = True
-
-    def lower_catapult(self):
-        robot = self.robot
-        robot.climber.set_velocity(-100)
-        while robot.climber.climber_motor.position(DEGREES) > 50:
-            pass
-        robot.climber.set_velocity(0)
+    def hold_position(self):
+        drivetrain = self.robot.drivetrain
+        drivetrain.clear_direction_PID_output()
+        drivetrain.target_position = drivetrain.current_position
+        drivetrain.stop()
 
     def first_segment(self):
         robot = self.robot
+        drivetrain = robot.drivetrain
         self.log("Starting skills autonomous")
-        robot.drivetrain.stop()
-
-        Thread(self.raise_catapult)
-
-        robot.drivetrain.strafe_left(40, 0.8)
-        robot.drivetrain.turn_to_face_heading_deg(-90 - 25)
-
-        robot.drivetrain.clear_direction_PID_output()
-        robot.drivetrain.target_position = robot.drivetrain.current_position
-        robot.drivetrain.stop()
-
-        while not self.catapult_raised:
-            pass
+        drivetrain.stop()
+
+        robot.command_scheduler.run_until_finished(
+            ParallelCommandGroup(
+                RaiseCatapult(robot),
+                SequentialCommandGroup(
+                    strafe_left(drivetrain, 40, 0.8),
+                    turn_to_heading_deg(drivetrain, -90 - 25),
+                    InstantCommand(self.hold_position),
+                ),
+            )
+        )
 
     def second_segment(self):
         robot = self.robot
-        robot.catapult.start_firing()
-        wait(40, SECONDS)
-        robot.catapult.stop_firing()
-
-        Thread(self.lower_catapult)
-
-        robot.drivetrain.turn_to_face_heading_deg(-90)
-
-        robot.drivetrain.forward(150, 0.8)
-        robot.drivetrain.turn_to_face_heading_deg(-90 - 45)
-        robot.drivetrain.forward(30, 1)
-        robot.wings.wings_out()
-        robot.drivetrain.forward(200, 1)
-        robot.drivetrain.backwards(50, 1)
-        robot.drivetrain.forward(70, 1)
-        robot.wings.wings_in()
-        robot.drivetrain.backwards(50, 1)
+        drivetrain = robot.drivetrain
+
+        robot.command_scheduler.run_until_finished(
+            SequentialCommandGroup(
+                InstantCommand(robot.catapult.start_firing),
+                WaitCommand(robot.brain.timer, 40),
+                InstantCommand(robot.catapult.stop_firing),
+                ParallelCommandGroup(
+                    LowerCatapult(robot),
+                    SequentialCommandGroup(
+                        turn_to_heading_deg(drivetrain, -90),
+                        forward(drivetrain, 150, 0.8),
+                        turn_to_heading_deg(drivetrain, -90 - 45),
+                        forward(drivetrain, 30, 1),
+                        InstantCommand(robot.wings.wings_out),
+                        forward(drivetrain, 200, 1),
+                        backwards(drivetrain, 50, 1),
+                        forward(drivetrain, 70, 1),
+                        InstantCommand(robot.wings.wings_in),
+                        backwards(drivetrain, 50, 1),
+                    ),
+                ),
+            )
+        )
 
     def run(self):
         robot = self.robot
@@ -196,7 +249,7 @@ class SkillsAutonomous(AutonomousRoutine):
         self.second_segment()
 
         self.log("Done")
-        robot.drivetrain.rotation_PID.setpoint = robot.drivetrain.current_direction_rad
+        robot.drivetrain.hold_current_heading()
         robot.drivetrain.clear_direction_PID_output()
         robot.drivetrain.target_position = robot.drivetrain.current_position
 
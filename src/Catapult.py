@@ -13,7 +13,6 @@ class Catapult:
         self.catapult_motor.spin(FORWARD)
         self.firing = False
         self.speed = 0
-        self.update_thread = Thread(self.update)
         self.fire_start_time = 0
 
     def start_firing(self):
@@ -31,10 +30,10 @@ class Catapult:
         self.stop_firing()
 
     def update(self):
-        while True:
-            if self.firing:
-                self.catapult_motor.set_velocity(
-                    Constants.catapult_motor_speed, PERCENT
-                )
-            else:
-                self.catapult_motor.set_velocity(0)
+        """
+        Send the catapult's state to its motor, the robot runs this from its Runtime
+        """
+        if self.firing:
+            self.catapult_motor.set_velocity(Constants.catapult_motor_speed, PERCENT)
+        else:
+            self.catapult_motor.set_velocity(0)
@@ -18,8 +18,6 @@ class Intake:
 
         self.wrist_motor.set_velocity(15, PERCENT)
 
-        self.update_thread = Thread(self.intake_loop)
-
     def wrist_up(self):
         self.wrist_state = Constants.WristState.up
 
@@ -44,15 +42,16 @@ class Intake:
         elif self.wrist_state == Constants.WristState.down:
             self.wrist_state = Constants.WristState.up
 
-    def intake_loop(self):
-        while True:
-            if self.wrist_state == Constants.WristState.up:
-                self.wrist_motor.spin_to_position(-130, DEGREES, False)
-            elif self.wrist_state == Constants.WristState.down:
-                self.wrist_motor.spin_to_position(0, DEGREES, False)
-
-            if self.claw_state == Constants.ClawState.open:
-                self.claw_pneumatic_solenoid.set(False)
-            elif self.claw_state == Constants.ClawState.closed:
-                self.claw_pneumatic_solenoid.set(True)
-            wait(100, MSEC)
+    def update(self):
+        """
+        Send the wrist and claw states to their hardware, add this to a Runtime to run it periodically
+        """
+        if self.wrist_state == Constants.WristState.up:
+            self.wrist_motor.spin_to_position(-130, DEGREES, False)
+        elif self.wrist_state == Constants.WristState.down:
+            self.wrist_motor.spin_to_position(0, DEGREES, False)
+
+        if self.claw_state == Constants.ClawState.open:
+            self.claw_pneumatic_solenoid.set(False)
+        elif self.claw_state == Constants.ClawState.closed:
+            self.claw_pneumatic_solenoid.set(True)
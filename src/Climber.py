@@ -1,7 +1,12 @@
 from vex import *
 from Utilities import sign
+from Logger import get_logger
 import Constants
 
+log = get_logger("Climber")
+# The climber updates every 100ms, debug output from it is only useful once a second
+log.set_rate_limit(1000)
+
 
 class Climber:
     def __init__(self):
@@ -17,7 +22,6 @@ class Climber:
         self.locking_mechanism = DigitalOut(Constants.climber_locking_port)
         self.locking_mechanism_state = Constants.PneumaticsState.out
         self.target_climber_velocity = 0
-        self.update_thread = Thread(self.climber_loop)
 
     # def calibrate(self):
     #     self.climber_motor.spin(REVERSE, 7, VOLT)
@@ -50,32 +54,37 @@ class Climber:
             if self.locking_mechanism_state == Constants.PneumaticsState.in_
             else Constants.PneumaticsState.in_
         )
-        print("Toggled lock state")
+        log.info("Toggled lock state")
 
-    def climber_loop(self):
-        while True:
-            if self.locking_mechanism_state == Constants.PneumaticsState.in_:
-                self.locking_mechanism.set(False)
+    def update(self):
+        """
+        Send the climber's lock state and velocity to its hardware, the robot runs this from its Runtime
+        """
+        if self.locking_mechanism_state == Constants.PneumaticsState.in_:
+            self.locking_mechanism.set(False)
 
-            if self.locking_mechanism_state == Constants.PneumaticsState.out:
-                self.locking_mechanism.set(True)
+        if self.locking_mechanism_state == Constants.PneumaticsState.out:
+            self.locking_mechanism.set(True)
 
-            if self._climber_inside_allowed_range() is not None:
-                # CLimber is hitting one of the constraints of motion
-                if sign(self.target_climber_velocity) == sign(
-                    self._climber_inside_allowed_range()
-                ):
-                    # The sign of the target velocity matches the sign of the allowed movement direction
-                    self.climber_motor.set_velocity(
-                        self.target_climber_velocity * 100, PERCENT
-                    )
-                else:
-                    # The sign of the target velocity does not match the sign of the allowed movement direction
-                    self.climber_motor.set_velocity(0, PERCENT)
-            else:
+        if self._climber_inside_allowed_range() is not None:
+            # CLimber is hitting one of the constraints of motion
+            if sign(self.target_climber_velocity) == sign(
+                self._climber_inside_allowed_range()
+            ):
+                # The sign of the target velocity matches the sign of the allowed movement direction
                 self.climber_motor.set_velocity(
                     self.target_climber_velocity * 100, PERCENT
                 )
-            print("Tick")
-
-            wait(100, MSEC)
+            else:
+                # The sign of the target velocity does not match the sign of the allowed movement direction
+                self.climber_motor.set_velocity(0, PERCENT)
+        else:
+            self.climber_motor.set_velocity(
+                self.target_climber_velocity * 100, PERCENT
+            )
+        if log.debug_enabled:
+            log.debug(
+                "Target velocity %s, position %s turns",
+                self.target_climber_velocity,
+                self.climber_motor.position(DEGREES) / 360,
+            )
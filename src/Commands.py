@@ -0,0 +1,363 @@
+"""
+A command-based framework for running robot actions without blocking
+
+Every action (a drivetrain move, raising an arm, waiting) is a Command with four stages:
+    initialize: Called once when the command is scheduled
+    execute: Called every tick of the scheduler while the command is running
+    is_finished: Checked every tick after execute, the command ends when it returns True
+    end: Called once when the command finishes or is interrupted
+
+Commands can be combined into sequential and parallel groups, and everything is ticked at a fixed rate from a single
+CommandScheduler thread rather than each action spawning its own thread or busy-waiting.
+"""
+
+from vex import *
+
+
+class Command:
+    """
+    The base class for all commands, subclass this and override the stages you need
+
+    Args:
+        requirements: The subsystems this command uses, scheduling a command interrupts any running command that
+            shares one of its requirements
+    """
+
+    def __init__(self, requirements=()):
+        self.requirements = set(requirements)
+
+    def initialize(self) -> None:
+        pass
+
+    def execute(self) -> None:
+        pass
+
+    def is_finished(self) -> bool:
+        return False
+
+    def end(self, interrupted: bool) -> None:
+        pass
+
+    def then(self, *commands):
+        """
+        Returns:
+            A SequentialCommandGroup that runs this command and then the given commands
+        """
+        return SequentialCommandGroup(self, *commands)
+
+    def alongside(self, *commands):
+        """
+        Returns:
+            A ParallelCommandGroup that runs this command at the same time as the given commands
+        """
+        return ParallelCommandGroup(self, *commands)
+
+
+class InstantCommand(Command):
+    """
+    Run a function once and finish immediately
+
+    Args:
+        function: The function to run
+        requirements: The subsystems this command uses
+    """
+
+    def __init__(self, function, requirements=()):
+        super().__init__(requirements)
+        self.function = function
+
+    def initialize(self):
+        self.function()
+
+    def is_finished(self):
+        return True
+
+
+class FunctionalCommand(Command):
+    """
+    Build a command from functions rather than subclassing
+
+    Args:
+        initialize: Called when the command starts, or None
+        execute: Called every tick, or None
+        is_finished: Returns True when the command is done, or None to run until interrupted
+        end: Called with the interrupted flag when the command ends, or None
+        requirements: The subsystems this command uses
+    """
+
+    def __init__(
+        self, initialize=None, execute=None, is_finished=None, end=None, requirements=()
+    ):
+        super().__init__(requirements)
+        self._initialize = initialize
+        self._execute = execute
+        self._is_finished = is_finished
+        self._end = end
+
+    def initialize(self):
+        if self._initialize:
+            self._initialize()
+
+    def execute(self):
+        if self._execute:
+            self._execute()
+
+    def is_finished(self):
+        return self._is_finished() if self._is_finished else False
+
+    def end(self, interrupted):
+        if self._end:
+            self._end(interrupted)
+
+
+class WaitCommand(Command):
+    """
+    Finish after a fixed amount of time, use this in place of wait() inside command groups
+
+    Args:
+        timer: A brain.timer object
+        seconds: How long to wait
+    """
+
+    def __init__(self, timer: Brain.timer, seconds: float):
+        super().__init__()
+        self.timer = timer
+        self.seconds = seconds
+        self._start_time = 0
+
+    def initialize(self):
+        self._start_time = self.timer.time(SECONDS)
+
+    def is_finished(self):
+        return self.timer.time(SECONDS) - self._start_time >= self.seconds
+
+
+class WaitUntilCommand(Command):
+    """
+    Finish once a condition becomes true
+
+    Args:
+        condition: A function returning True when the command should finish
+    """
+
+    def __init__(self, condition):
+        super().__init__()
+        self.condition = condition
+
+    def is_finished(self):
+        return self.condition()
+
+
+class SequentialCommandGroup(Command):
+    """
+    Run commands one after another, each command starts on the same tick the previous one finishes
+    """
+
+    def __init__(self, *commands):
+        super().__init__()
+        self.commands = list(commands)
+        for command in self.commands:
+            self.requirements |= command.requirements
+        self._index = 0
+
+    def initialize(self):
+        self._index = 0
+        if self.commands:
+            self.commands[0].initialize()
+
+    def execute(self):
+        while self._index < len(self.commands):
+            command = self.commands[self._index]
+            command.execute()
+            if not command.is_finished():
+                return
+            command.end(False)
+            self._index += 1
+            if self._index < len(self.commands):
+                self.commands[self._index].initialize()
+
+    def is_finished(self):
+        return self._index >= len(self.commands)
+
+    def end(self, interrupted):
+        if interrupted and self._index < len(self.commands):
+            self.commands[self._index].end(True)
+
+
+class ParallelCommandGroup(Command):
+    """
+    Run commands at the same time, finishing once all of them have finished
+    """
+
+    def __init__(self, *commands):
+        super().__init__()
+        self.commands = list(commands)
+        for command in self.commands:
+            self.requirements |= command.requirements
+        self._running = []
+
+    def initialize(self):
+        self._running = list(self.commands)
+        for command in self._running:
+            command.initialize()
+
+    def execute(self):
+        for command in list(self._running):
+            command.execute()
+            if command.is_finished():
+                command.end(False)
+                self._running.remove(command)
+
+    def is_finished(self):
+        return not self._running
+
+    def end(self, interrupted):
+        if interrupted:
+            for command in self._running:
+                command.end(True)
+        self._running = []
+
+
+class ParallelRaceGroup(ParallelCommandGroup):
+    """
+    Run commands at the same time, finishing as soon as any one of them finishes and interrupting the rest
+    """
+
+    def execute(self):
+        for command in list(self._running):
+            command.execute()
+            if command.is_finished():
+                command.end(False)
+                self._running.remove(command)
+                for other_command in self._running:
+                    other_command.end(True)
+                self._running = []
+                return
+
+    def is_finished(self):
+        return len(self._running) < len(self.commands)
+
+
+class CommandScheduler:
+    """
+    Run scheduled commands from a single thread at a fixed rate
+
+    Args:
+        timer: A brain.timer object
+        period_ms: The time between scheduler ticks
+    """
+
+    def __init__(self, timer: Brain.timer, period_ms: int = 10):
+        self.timer = timer
+        self.period_ms = period_ms
+        self._running = []
+        # Commands are scheduled and cancelled from other threads, so changes are queued and applied at the start of a tick
+        self._pending_schedule = []
+        self._pending_cancel = []
+        self._thread = None
+        self._enabled = False
+        # Counts the times the scheduler was started, so a loop left over from before a stop knows to exit
+        self._generation = 0
+        # Set by add_to_runtime, when a Runtime ticks the scheduler rather than its own thread
+        self._runtime_task = None
+
+    def schedule(self, *commands) -> None:
+        """
+        Schedule commands to start on the next tick
+        """
+        for command in commands:
+            self._pending_schedule.append(command)
+
+    def cancel(self, *commands) -> None:
+        """
+        Interrupt running commands on the next tick
+        """
+        for command in commands:
+            self._pending_cancel.append(command)
+
+    def cancel_all(self) -> None:
+        self.cancel(*self._running)
+
+    def is_scheduled(self, command) -> bool:
+        return command in self._running or command in self._pending_schedule
+
+    def _apply_pending(self):
+        while self._pending_cancel:
+            command = self._pending_cancel.pop(0)
+            if command in self._running:
+                self._running.remove(command)
+                command.end(True)
+        while self._pending_schedule:
+            command = self._pending_schedule.pop(0)
+            if command in self._running:
+                continue
+            for running_command in list(self._running):
+                if running_command.requirements & command.requirements:
+                    # Only one command may use a subsystem at a time
+                    self._running.remove(running_command)
+                    running_command.end(True)
+            self._running.append(command)
+            command.initialize()
+
+    def run(self) -> None:
+        """
+        Run a single tick of every scheduled command
+        """
+        self._apply_pending()
+        for command in list(self._running):
+            command.execute()
+            if command.is_finished():
+                self._running.remove(command)
+                command.end(False)
+
+    def _loop(self, generation):
+        next_tick_time = self.timer.time(MSEC)
+        while self._enabled and self._generation == generation:
+            self.run()
+            next_tick_time += self.period_ms
+            remaining_ms = next_tick_time - self.timer.time(MSEC)
+            if remaining_ms > 0:
+                wait(remaining_ms, MSEC)
+            else:
+                # We fell behind, don't try to catch up by running several ticks back to back
+                next_tick_time = self.timer.time(MSEC)
+
+    def start(self) -> None:
+        """
+        Start ticking the scheduler in its own thread
+        """
+        if self._thread is None:
+            self._enabled = True
+            self._generation += 1
+            self._thread = Thread(self._loop, (self._generation,))
+
+    def stop(self) -> None:
+        """
+        Stop the scheduler thread after its current tick, running commands are interrupted, the scheduler can be
+        started again straight away
+        """
+        self._enabled = False
+        self._thread = None
+        self.cancel_all()
+        self._apply_pending()
+
+    def add_to_runtime(self, runtime, name: str = "Command scheduler"):
+        """
+        Tick the scheduler from a Runtime (see Runtime.py) instead of its own thread
+
+        Returns:
+            The task's TaskStatistics
+        """
+        self._runtime_task = runtime.add_task(self.run, self.period_ms, name)
+        return self._runtime_task
+
+    def run_until_finished(self, command) -> None:
+        """
+        Schedule a command and block the calling thread until it finishes, yielding to other threads while waiting
+        """
+        self.schedule(command)
+        while self.is_scheduled(command):
+            if self._thread is None and self._runtime_task is None:
+                # Nothing else is ticking the scheduler, so tick it from here
+                self.run()
+            wait(self.period_ms, MSEC)
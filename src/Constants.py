@@ -60,6 +60,17 @@ class PneumaticsState:
     out = 2
 
 
+class LogLevel:
+    """A class for defining the severity of log messages, see Logger.py"""
+
+    debug = 10
+    info = 20
+    warning = 30
+    error = 40
+    critical = 50
+    off = 100
+
+
 """Sensors"""
 inertial_sensor_port = Ports.PORT5
 
@@ -108,7 +119,6 @@ front_right_motor_inverted = True
 rear_left_motor_inverted = False
 rear_right_motor_inverted = True
 encoder_ticks_per_rotation = 360  # Green: 360
-drivetrain_rotation_offset = -pi / 4
 drivetrain_slip_coefficients = {
     pi * 0: 1,
     # pi * -0.25: 1,
@@ -135,9 +145,14 @@ rear_left_wheel_rotation_rad = pi / 4 + pi / 2
 rear_right_wheel_rotation_rad = pi / 4
 
 # For tuning the rotation PID gains, please refer to the "Tuning a PID controller" section of Utilities.md
+# or measure them with PIDAutotune.autotune_heading
 drivetrain_turn_Kp = 2.1 * 0.4
 drivetrain_turn_Ki = 0
 drivetrain_turn_Kd = 0.017
+# Turns follow a jerk limited (S-curve) profile limited to these rates, see ProfiledPID.py and SCurveMovement.py
+drivetrain_turn_maximum_velocity_rad_per_s = pi
+drivetrain_turn_maximum_acceleration_rad_per_s2 = 2 * pi
+drivetrain_turn_maximum_jerk_rad_per_s3 = 8 * pi
 
 
 wheel_diameter_cm = wheel_radius_cm * 2
@@ -146,6 +161,72 @@ wheel_circumference_cm = wheel_diameter_cm * pi
 drivetrain_allowed_positional_error_cm = 3
 drivetrain_allowed_directional_error_rad = 0.025 * pi  # 4.5 degrees
 
+# How often the drivetrain's blocking movement loops update the motors
+drivetrain_control_period_ms = 10
+# The turn PID is calculated once per control loop, a longer period would skip some of them
+drivetrain_turn_PID_period_s = drivetrain_control_period_ms / 1000
+
+# How often the command scheduler ticks the running commands, see Commands.py
+command_scheduler_period_ms = 10
+
+# How often the control scheduler updates registered motor controllers, see ControlScheduler.py
+control_scheduler_period_ms = 10
+
+# How often the robot's Runtime runs each subsystem's update, see Runtime.py
+odometry_period_ms = 5
+catapult_period_ms = 20
+subsystem_period_ms = 100  # The climber, intake and wings
+display_period_ms = 100
+# Record how long each Runtime task and profiled section takes, see Profiler.py, leave off for matches
+profiling_enabled = False
+# How often to record the profile to the telemetry log, when both are enabled
+profile_telemetry_period_ms = 1000
+
+# Pure pursuit path following, see PurePursuit.py for a description of each value
+path_following_lookahead_cm = 25
+path_following_point_spacing_cm = 5
+path_following_curvature_speed_gain = 0.05
+path_following_maximum_deceleration = 0.01
+path_following_minimum_speed = 0.15
+
+# Trajectory generation limits, see TrajectoryGenerator.py
+trajectory_maximum_velocity_cm_per_s = 60
+trajectory_maximum_acceleration_cm_per_s2 = 120
+trajectory_maximum_centripetal_acceleration_cm_per_s2 = 80
+trajectory_time_step_s = 0.01
+# How strongly to correct for position error while following a trajectory (cm/s of correction per cm of error)
+trajectory_position_Kp = 2.0
+# How long to keep correcting towards the final point after a trajectory ends before giving up
+trajectory_settle_timeout_s = 1
+
+# The theoretical top speed of the drivetrain, 200 RPM * wheel circumference, used to convert velocities (cm/s)
+# into the 0-1 speeds accepted by Drivetrain.move
+drivetrain_maximum_velocity_cm_per_s = 200 / 60 * wheel_circumference_cm
+
+# Drive the wheels by voltage using a characterized feedforward instead of the motors' built-in velocity control,
+# run DrivetrainCharacterization.py on the robot to measure the constants below
+drivetrain_feedforward_control = False
+drivetrain_kS = 0.6  # Volts to overcome static friction
+drivetrain_kV = 0.16  # Volts per cm/s of wheel surface velocity
+drivetrain_kA = 0.02  # Volts per cm/s^2 of wheel surface acceleration
+# Per-wheel velocity feedback on top of the feedforward (volts per cm/s of error), set all three to 0 to disable
+drivetrain_wheel_velocity_Kp = 0.05
+drivetrain_wheel_velocity_Ki = 0
+drivetrain_wheel_velocity_Kd = 0
+
+# Particle filter localization, see ParticleFilter.py, rebuild the map with utils/distance_map_builder.py
+distance_map_cell_size_cm = 2
+distance_map_file = "field.dmap"  # In the deploy directory
+# Expected distance sensor ranges, see RaycastTable.py, rebuild the table with utils/raycast_table_builder.py
+raycast_table_cell_size_cm = 4
+raycast_table_angle_bins = 64
+raycast_table_file = "field.ray"  # In the deploy directory
+
+# Record the drivetrain's pose and wheel velocities every control tick to a binary log, see Telemetry.py, read it on a
+# computer with utils/telemetry_reader.py
+telemetry_enabled = False
+telemetry_file = "Drivetrain.tlm"  # In the log directory, later boots add _1, _2, ... to the name
+
 
 """
 A note on headless mode:
@@ -195,6 +276,9 @@ robot_start_rotation_deg = 90
 drivetrain_braking = False
 
 log_directory = "/logs/"
+# Messages less severe than this are skipped without being formatted, see Logger.py, set a module's own level with
+# get_logger(name).set_level
+log_level = LogLevel.info
 deploy_directory = "/deploy/"
 
 
@@ -0,0 +1,180 @@
+"""
+Tick many control loops from a single thread
+
+Every controller registered with a ControlScheduler has its update() method called once per tick, highest priority
+first, so eight motors cost one thread instead of eight threads each waiting on their own cadence. The time each
+controller takes is measured, and ticks that take longer than the scheduler's period are reported as overruns.
+"""
+
+from vex import *
+
+from Logger import get_logger
+from Profiler import ticks_diff, ticks_us
+
+log = get_logger("ControlScheduler")
+
+
+class ControllerStatistics:
+    """
+    The timing of one registered controller
+
+    Args:
+        name: The name to report the controller as
+        priority: Higher priority controllers are updated first each tick
+    """
+
+    def __init__(self, name: str, priority: int):
+        self.name = name
+        self.priority = priority
+        self.last_ms = 0.0
+        self.maximum_ms = 0.0
+        self.total_ms = 0.0
+        self.updates = 0
+
+    def record(self, elapsed_ms: float):
+        self.last_ms = elapsed_ms
+        self.total_ms += elapsed_ms
+        self.updates += 1
+        if elapsed_ms > self.maximum_ms:
+            self.maximum_ms = elapsed_ms
+
+    @property
+    def average_ms(self) -> float:
+        return self.total_ms / self.updates if self.updates else 0.0
+
+    def __str__(self):
+        return (
+            self.name
+            + ": last "
+            + str(round(self.last_ms, 3))
+            + "ms, average "
+            + str(round(self.average_ms, 3))
+            + "ms, max "
+            + str(round(self.maximum_ms, 3))
+            + "ms"
+        )
+
+
+class ControlScheduler:
+    """
+    Update every registered controller at a fixed rate from a single thread
+
+    Args:
+        timer: A brain.timer object
+        period_ms: The time between ticks
+        on_overrun: Called with (tick_ms, statistics) whenever a tick takes longer than period_ms, statistics is the
+            list of ControllerStatistics in the order they ran, defaults to logging a warning
+    """
+
+    def __init__(self, timer: Brain.timer, period_ms: int = 10, on_overrun=None):
+        self.timer = timer
+        self.period_ms = period_ms
+        self.on_overrun = on_overrun if on_overrun is not None else self._log_overrun
+        self.overruns = 0
+        self._controllers = []
+        self._statistics = {}
+        self._thread = None
+        self._enabled = False
+        # Counts the times the scheduler was started, so a loop left over from before a stop knows to exit
+        self._generation = 0
+
+    def register(self, controller, priority: int = 0, name: str = None):
+        """
+        Start updating a controller every tick
+
+        Args:
+            controller: Any object with an update() method, for example a MotorPID
+            priority: Higher priority controllers are updated first, controllers with equal priority run in the order
+                they were registered
+            name: The name to report the controller as, defaults to its class name
+
+        Returns:
+            The controller, so construction and registration can be combined
+        """
+        if controller in self._statistics:
+            raise ValueError("Controller is already registered")
+        if name is None:
+            name = type(controller).__name__ + " " + str(len(self._controllers))
+        self._statistics[controller] = ControllerStatistics(name, priority)
+        # Build a new sorted list rather than sorting in place so a tick running in the scheduler thread is unaffected
+        controllers = self._controllers + [controller]
+        controllers.sort(key=lambda registered: -self._statistics[registered].priority)
+        self._controllers = controllers
+        return controller
+
+    def unregister(self, controller) -> None:
+        if controller in self._statistics:
+            self._controllers = [
+                registered for registered in self._controllers if registered is not controller
+            ]
+            del self._statistics[controller]
+
+    def is_registered(self, controller) -> bool:
+        return controller in self._statistics
+
+    def statistics(self):
+        """
+        Returns:
+            The ControllerStatistics of every registered controller, in the order they are updated
+        """
+        return [self._statistics[controller] for controller in self._controllers]
+
+    def run(self) -> float:
+        """
+        Update every registered controller once, reporting an overrun if they took longer than the period together
+
+        Returns:
+            How long the tick took in milliseconds
+        """
+        controllers = self._controllers
+        statistics = self._statistics
+        # The brain's timer counts whole milliseconds, most controllers take a small fraction of one
+        tick_start_us = previous_us = ticks_us()
+        for controller in controllers:
+            controller.update()
+            current_us = ticks_us()
+            statistics[controller].record(ticks_diff(current_us, previous_us) / 1000)
+            previous_us = current_us
+
+        tick_ms = ticks_diff(previous_us, tick_start_us) / 1000
+        if tick_ms > self.period_ms:
+            self.overruns += 1
+            self.on_overrun(tick_ms, [statistics[controller] for controller in controllers])
+        return tick_ms
+
+    def _log_overrun(self, tick_ms, statistics):
+        slowest = max(statistics, key=lambda controller: controller.last_ms)
+        log.warning(
+            "Control tick overran: %sms of %sms, slowest was %s",
+            round(tick_ms, 3),
+            self.period_ms,
+            slowest,
+        )
+
+    def _loop(self, generation):
+        next_tick_time = self.timer.time(MSEC)
+        while self._enabled and self._generation == generation:
+            self.run()
+            next_tick_time += self.period_ms
+            remaining_ms = next_tick_time - self.timer.time(MSEC)
+            if remaining_ms > 0:
+                wait(remaining_ms, MSEC)
+            else:
+                # We fell behind, don't try to catch up by running several ticks back to back
+                next_tick_time = self.timer.time(MSEC)
+
+    def start(self) -> None:
+        """
+        Start ticking the controllers in their own thread
+        """
+        if self._thread is None:
+            self._enabled = True
+            self._generation += 1
+            self._thread = Thread(self._loop, (self._generation,))
+
+    def stop(self) -> None:
+        """
+        Stop the scheduler thread after its current tick, the scheduler can be started again straight away
+        """
+        self._enabled = False
+        self._thread = None
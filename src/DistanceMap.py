@@ -0,0 +1,123 @@
+"""
+A precomputed map of the distance from every point on the field to the nearest wall or obstacle, built on a computer by
+utils/distance_map_builder.py and loaded from the SD card by the robot
+
+File layout (little-endian):
+    Header: magic (4 bytes, b"VDMP"), format version (uint16), width in cells (uint16), height in cells (uint16),
+            cell size in centimeters (float32)
+    Cells: width * height uint8 distances, row by row starting at y = 0, each the distance to the nearest obstacle in
+           cells, capped at 255
+"""
+
+try:
+    import ustruct as struct
+except ImportError:
+    # Running on a computer rather than the brain
+    import struct
+
+DISTANCE_MAP_MAGIC = b"VDMP"
+DISTANCE_MAP_VERSION = 1
+HEADER_FORMAT = "<4sHHHf"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+MAXIMUM_DISTANCE = 255
+
+
+class DistanceMap:
+    """
+    The distance to the nearest obstacle for each cell of a grid laid over the field, the grid's origin is the field's
+    (0, 0) corner
+
+    Args:
+        width: The number of cells along x
+        height: The number of cells along y
+        cell_size_cm: The width of each (square) cell
+        distances: A bytes-like object of width * height distances in cells, row by row
+    """
+
+    def __init__(self, width, height, cell_size_cm, distances):
+        if len(distances) != width * height:
+            raise ValueError(
+                "Expected "
+                + str(width * height)
+                + " distances, got "
+                + str(len(distances))
+            )
+        self.width = width
+        self.height = height
+        self.cell_size_cm = cell_size_cm
+        self.distances = distances
+
+    def cell_distance(self, x_cm, y_cm):
+        """
+        Get the distance from a point to the nearest obstacle in cells, points off the map are as far from an obstacle
+        as the map can store
+
+        Args:
+            x_cm: The point's x position on the field
+            y_cm: The point's y position on the field
+
+        Returns:
+            The distance in cells, an integer from 0 to 255
+        """
+        cell_x = int(x_cm / self.cell_size_cm)
+        cell_y = int(y_cm / self.cell_size_cm)
+        if x_cm < 0 or y_cm < 0 or cell_x >= self.width or cell_y >= self.height:
+            return MAXIMUM_DISTANCE
+        return self.distances[cell_y * self.width + cell_x]
+
+    def distance_cm(self, x_cm, y_cm):
+        """
+        Get the distance from a point to the nearest obstacle in centimeters
+        """
+        return self.cell_distance(x_cm, y_cm) * self.cell_size_cm
+
+    def write(self, file_name: str):
+        """
+        Write the map to a distance map file
+
+        Args:
+            file_name: The path of the file to write
+        """
+        with open(file_name, "wb") as distance_map_file:
+            distance_map_file.write(
+                struct.pack(
+                    HEADER_FORMAT,
+                    DISTANCE_MAP_MAGIC,
+                    DISTANCE_MAP_VERSION,
+                    self.width,
+                    self.height,
+                    self.cell_size_cm,
+                )
+            )
+            distance_map_file.write(bytes(self.distances))
+
+    @classmethod
+    def load(cls, file_name: str):
+        """
+        Read a distance map file
+
+        Args:
+            file_name: The path of the file to read
+
+        Returns:
+            The DistanceMap
+
+        Raises:
+            ValueError: If the file is not a distance map or was written by an incompatible version
+        """
+        with open(file_name, "rb") as distance_map_file:
+            header = distance_map_file.read(HEADER_SIZE)
+            if len(header) != HEADER_SIZE:
+                raise ValueError("Distance map file is too short to contain a header")
+            magic, version, width, height, cell_size_cm = struct.unpack(
+                HEADER_FORMAT, header
+            )
+            if magic != DISTANCE_MAP_MAGIC:
+                raise ValueError("Not a distance map file")
+            if version != DISTANCE_MAP_VERSION:
+                raise ValueError("Unsupported distance map version " + str(version))
+            # Read straight into one buffer, a 2cm map of the field is 33KB
+            distances = bytearray(width * height)
+            if distance_map_file.readinto(distances) != len(distances):
+                raise ValueError("Distance map file is truncated")
+        return cls(width, height, cell_size_cm, distances)
@@ -0,0 +1,174 @@
+"""
+Measure the feedforward constants (kS, kV, kA) of the drivetrain
+
+Place the robot with plenty of room in front of and behind it and run characterize_drivetrain, each test drives the
+robot in a straight line by applying the same voltage to every wheel. Copy the printed constants into Constants.py and
+enable drivetrain_feedforward_control.
+
+Quasistatic test: the voltage is ramped up slowly enough that acceleration is negligible, so voltage = kS + kV * velocity
+Step test: a large voltage is applied at once, the voltage left over after kS and kV is what accelerates the robot (kA)
+"""
+
+from vex import *
+import Constants
+from Feedforward import fit_feedforward
+from Utilities import Logging
+
+
+def _wheel_motors():
+    return [
+        Motor(
+            Constants.front_left_motor_port,
+            Constants.front_left_motor_gear_ratio,
+            Constants.front_left_motor_inverted,
+        ),
+        Motor(
+            Constants.front_right_motor_port,
+            Constants.front_right_motor_gear_ratio,
+            Constants.front_right_motor_inverted,
+        ),
+        Motor(
+            Constants.rear_left_motor_port,
+            Constants.rear_left_motor_gear_ratio,
+            Constants.rear_left_motor_inverted,
+        ),
+        Motor(
+            Constants.rear_right_motor_port,
+            Constants.rear_right_motor_gear_ratio,
+            Constants.rear_right_motor_inverted,
+        ),
+    ]
+
+
+def _average_wheel_velocity(motors) -> float:
+    """
+    Get the average surface velocity of the wheels in cm/s
+    """
+    rpm = sum(motor.velocity(RPM) for motor in motors) / len(motors)
+    return rpm / 60 * Constants.wheel_circumference_cm
+
+
+def _apply_voltage(motors, voltage: float):
+    for motor in motors:
+        motor.spin(FORWARD, voltage, VOLT)
+
+
+def run_quasistatic_test(
+    motors,
+    timer: Brain.timer,
+    ramp_rate_volts_per_s: float = 0.25,
+    maximum_voltage: float = 7,
+    reverse: bool = False,
+    sample_period_ms: int = 20,
+):
+    """
+    Slowly ramp the voltage applied to the drivetrain and record the velocity it reaches
+
+    Args:
+        motors: The drivetrain's motors
+        timer: A brain.timer object
+        ramp_rate_volts_per_s: How quickly to increase the voltage, slow enough that the robot is never accelerating
+        maximum_voltage: The voltage to stop the test at
+        reverse: Whether to run the test driving backwards
+        sample_period_ms: The time between samples
+
+    Returns:
+        A list of (voltage, velocity) samples
+    """
+    direction = -1 if reverse else 1
+    samples = []
+    start_time = timer.time(SECONDS)
+    voltage = 0
+    while voltage < maximum_voltage:
+        voltage = (timer.time(SECONDS) - start_time) * ramp_rate_volts_per_s
+        _apply_voltage(motors, voltage * direction)
+        wait(sample_period_ms, MSEC)
+        samples.append((voltage * direction, _average_wheel_velocity(motors)))
+    _apply_voltage(motors, 0)
+    return samples
+
+
+def run_step_test(
+    motors,
+    timer: Brain.timer,
+    voltage: float = 6,
+    duration_s: float = 1.5,
+    reverse: bool = False,
+    sample_period_ms: int = 10,
+):
+    """
+    Apply a voltage to the drivetrain all at once and record how it accelerates
+
+    Args:
+        motors: The drivetrain's motors
+        timer: A brain.timer object
+        voltage: The voltage to apply
+        duration_s: How long to apply the voltage for
+        reverse: Whether to run the test driving backwards
+        sample_period_ms: The time between samples
+
+    Returns:
+        A list of (voltage, velocity, acceleration) samples
+    """
+    voltage *= -1 if reverse else 1
+    samples = []
+    start_time = previous_time = timer.time(SECONDS)
+    previous_velocity = _average_wheel_velocity(motors)
+    _apply_voltage(motors, voltage)
+    while timer.time(SECONDS) - start_time < duration_s:
+        wait(sample_period_ms, MSEC)
+        current_time = timer.time(SECONDS)
+        velocity = _average_wheel_velocity(motors)
+        if current_time > previous_time:
+            samples.append(
+                (voltage, velocity, (velocity - previous_velocity) / (current_time - previous_time))
+            )
+        previous_time, previous_velocity = current_time, velocity
+    _apply_voltage(motors, 0)
+    return samples
+
+
+def characterize_drivetrain(brain: Brain, rest_time_ms: int = 2000):
+    """
+    Run the quasistatic and step tests in both directions, fit the feedforward constants and report them
+
+    Args:
+        brain: The robot's brain
+        rest_time_ms: How long to let the robot come to a stop between tests
+
+    Returns:
+        A tuple of (kS, kV, kA)
+    """
+    motors = _wheel_motors()
+    log = Logging("drivetrain_characterization")
+    quasistatic_samples = []
+    step_samples = []
+    for reverse in (False, True):
+        quasistatic_samples += run_quasistatic_test(motors, brain.timer, reverse=reverse)
+        wait(rest_time_ms, MSEC)
+        step_samples += run_step_test(motors, brain.timer, reverse=reverse)
+        wait(rest_time_ms, MSEC)
+
+    for voltage, velocity in quasistatic_samples:
+        log.log("quasistatic," + str(voltage) + "," + str(velocity) + "\n")
+    for voltage, velocity, acceleration in step_samples:
+        log.log(
+            "step," + str(voltage) + "," + str(velocity) + "," + str(acceleration) + "\n"
+        )
+
+    ks, kv, ka = fit_feedforward(quasistatic_samples, step_samples)
+    log.log("kS=" + str(ks) + " kV=" + str(kv) + " kA=" + str(ka) + "\n")
+    log.exit()
+
+    brain.screen.clear_screen()
+    brain.screen.set_cursor(1, 1)
+    brain.screen.print("kS: " + str(ks))
+    brain.screen.next_row()
+    brain.screen.print("kV: " + str(kv))
+    brain.screen.next_row()
+    brain.screen.print("kA: " + str(ka))
+    return ks, kv, ka
+
+
+if __name__ == "__main__":
+    characterize_drivetrain(Brain())
@@ -0,0 +1,159 @@
+"""
+Commands that move the drivetrain, built on its non-blocking start_*/update_* methods
+"""
+
+import math
+from Commands import Command
+
+
+class _DrivetrainCommand(Command):
+    def __init__(self, drivetrain):
+        super().__init__((drivetrain,))
+        self.drivetrain = drivetrain
+        self._finished = False
+
+    def is_finished(self):
+        return self._finished
+
+    def end(self, interrupted):
+        self.drivetrain.stop()
+
+
+class MoveToPosition(_DrivetrainCommand):
+    """
+    Move to a position on the field
+
+    Args:
+        drivetrain: The drivetrain to move
+        target_position: The position to move to (x, y)
+        speed: The speed (0-1) for the move
+    """
+
+    def __init__(self, drivetrain, target_position, speed: float):
+        super().__init__(drivetrain)
+        self.target_position = target_position
+        self.speed = speed
+
+    def initialize(self):
+        self._finished = False
+        self.drivetrain.start_move_to_position(self.target_position)
+
+    def execute(self):
+        self._finished = self.drivetrain.update_move_to_position(self.speed)
+
+
+class MoveRelative(MoveToPosition):
+    """
+    Move a distance from wherever the drivetrain is targeting when the command starts
+
+    Args:
+        drivetrain: The drivetrain to move
+        direction: The direction to move in radians, relative to the robot's target heading unless field_relative
+        distance_cm: The distance to move
+        speed: The speed (0-1) for the move
+        field_relative: Whether direction is relative to the field rather than the robot
+    """
+
+    def __init__(
+        self, drivetrain, direction, distance_cm, speed: float, field_relative=False
+    ):
+        super().__init__(drivetrain, None, speed)
+        self.direction = direction
+        self.distance_cm = distance_cm
+        self.field_relative = field_relative
+
+    def initialize(self):
+        # The target can only be calculated once the previous command has set the drivetrain's target
+        self.target_position = self.drivetrain.relative_target_position(
+            self.direction, self.distance_cm, self.field_relative
+        )
+        super().initialize()
+
+
+def forward(drivetrain, distance_cm, speed=1, field_relative=False):
+    return MoveRelative(drivetrain, math.pi / 2, distance_cm, speed, field_relative)
+
+
+def backwards(drivetrain, distance_cm, speed=1, field_relative=False):
+    return MoveRelative(drivetrain, -math.pi / 2, distance_cm, speed, field_relative)
+
+
+def strafe_left(drivetrain, distance_cm, speed=1, field_relative=False):
+    return MoveRelative(drivetrain, math.pi, distance_cm, speed, field_relative)
+
+
+def strafe_right(drivetrain, distance_cm, speed=1, field_relative=False):
+    return MoveRelative(drivetrain, 0, distance_cm, speed, field_relative)
+
+
+class TurnToHeading(_DrivetrainCommand):
+    """
+    Turn in place to face a heading
+
+    Args:
+        drivetrain: The drivetrain to turn
+        heading_rad: The heading to face in radians
+    """
+
+    def __init__(self, drivetrain, heading_rad):
+        super().__init__(drivetrain)
+        self.heading_rad = heading_rad
+
+    def initialize(self):
+        self._finished = False
+        self.drivetrain.start_turn_to_face_heading_rad(self.heading_rad)
+
+    def execute(self):
+        self._finished = self.drivetrain.update_turn()
+
+
+def turn_to_heading_deg(drivetrain, heading_deg):
+    return TurnToHeading(drivetrain, math.radians(heading_deg))
+
+
+class FollowPath(_DrivetrainCommand):
+    """
+    Follow a path with the drivetrain's pure pursuit controller
+
+    Args:
+        drivetrain: The drivetrain to move
+        point_list: The points of the path to follow in centimeters (x, y)
+        maximum_speed: The maximum speed (0-1) for the move
+        face_path: Whether to turn the front of the robot along the path while following it
+    """
+
+    def __init__(self, drivetrain, point_list, maximum_speed, face_path=True):
+        super().__init__(drivetrain)
+        self.point_list = point_list
+        self.maximum_speed = maximum_speed
+        self.face_path = face_path
+
+    def initialize(self):
+        self._finished = False
+        self.drivetrain.start_follow_path(
+            self.point_list, self.maximum_speed, self.face_path
+        )
+
+    def execute(self):
+        self._finished = self.drivetrain.update_follow_path()
+
+
+class FollowTrajectory(_DrivetrainCommand):
+    """
+    Follow a time-parameterized trajectory
+
+    Args:
+        drivetrain: The drivetrain to move
+        trajectory: A Trajectory or TrajectoryPlayer
+    """
+
+    def __init__(self, drivetrain, trajectory):
+        super().__init__(drivetrain)
+        self.trajectory = trajectory
+
+    def initialize(self):
+        self._finished = False
+        self.drivetrain.start_follow_trajectory(self.trajectory)
+
+    def execute(self):
+        self._finished = self.drivetrain.update_follow_trajectory()
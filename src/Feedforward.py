@@ -0,0 +1,98 @@
+from LinearRegressor import LinearRegressor
+from Utilities import sign
+
+
+class MotorFeedforward:
+    """
+    A feedforward model for a motor driving a load, predicts the voltage needed to reach a velocity and acceleration
+
+    voltage = kS * sign(velocity) + kV * velocity + kA * acceleration
+
+    Args:
+        ks: The voltage needed to overcome static friction (volts)
+        kv: The voltage needed to hold a velocity (volts per unit of velocity)
+        ka: The voltage needed to accelerate (volts per unit of acceleration)
+    """
+
+    def __init__(self, ks: float, kv: float, ka: float = 0.0):
+        if kv <= 0:
+            raise ValueError("kV must be positive")
+        self.ks = ks
+        self.kv = kv
+        self.ka = ka
+
+    def calculate(self, velocity: float, acceleration: float = 0.0) -> float:
+        """
+        Calculate the voltage needed to reach a velocity and acceleration
+
+        Args:
+            velocity: The target velocity
+            acceleration: The target acceleration
+
+        Returns:
+            The feedforward voltage
+        """
+        return self.ks * sign(velocity) + self.kv * velocity + self.ka * acceleration
+
+    def maximum_achievable_velocity(
+        self, maximum_voltage: float, acceleration: float = 0.0
+    ) -> float:
+        """
+        Calculate the fastest velocity that can be reached with the voltage available
+
+        Args:
+            maximum_voltage: The highest voltage that can be supplied to the motor
+            acceleration: The acceleration that must be maintained at the same time
+
+        Returns:
+            The maximum achievable velocity
+        """
+        return (maximum_voltage - self.ks - self.ka * acceleration) / self.kv
+
+
+def fit_feedforward(quasistatic_samples, step_samples, minimum_velocity=1.0):
+    """
+    Fit feedforward constants to the results of a characterization routine
+
+    The quasistatic samples are taken while the voltage is ramped slowly enough that acceleration is negligible,
+    so a linear regression of voltage against velocity gives kV (slope) and kS (intercept). The voltage that is left
+    over during the step test once kS and kV have been accounted for is the voltage used to accelerate, a least squares
+    fit of that against acceleration gives kA.
+
+    Args:
+        quasistatic_samples: A list of (voltage, velocity) samples from slow voltage ramps
+        step_samples: A list of (voltage, velocity, acceleration) samples from sudden voltage steps
+        minimum_velocity: Samples slower than this are ignored, the mechanism hasn't broken free of static friction yet
+
+    Returns:
+        A tuple of (kS, kV, kA)
+
+    Raises:
+        ValueError: If there are not enough moving samples to fit the constants
+    """
+    # Fold reverse samples onto the forward direction, kS and kV are assumed to be symmetric
+    points = [
+        (abs(velocity), abs(voltage))
+        for voltage, velocity in quasistatic_samples
+        if abs(velocity) >= minimum_velocity
+    ]
+    regressor = LinearRegressor().fit(points)
+    ks, kv = regressor.y_intercept, regressor.slope
+    if kv is None or kv <= 0:
+        raise ValueError("Quasistatic samples do not show velocity increasing with voltage")
+
+    residual_acceleration_product = 0.0
+    acceleration_squared = 0.0
+    for voltage, velocity, acceleration in step_samples:
+        if abs(velocity) < minimum_velocity:
+            continue
+        acceleration_voltage = voltage - ks * sign(velocity) - kv * velocity
+        residual_acceleration_product += acceleration_voltage * acceleration
+        acceleration_squared += acceleration * acceleration
+
+    ka = (
+        residual_acceleration_product / acceleration_squared
+        if acceleration_squared > 0
+        else 0.0
+    )
+    return ks, kv, max(ka, 0.0)
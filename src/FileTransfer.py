@@ -0,0 +1,225 @@
+"""
+Receive files over a ReliableChannel (see SerialProtocol.py), writing them to the Micro-SD card as they arrive, so
+path and map files can be updated between matches without removing the card
+
+The file is sent in chunks, each with its offset in the file and its CRC-32, which the brain checks before copying the
+chunk into a buffer that is allocated once and written to the card whenever it fills. Until the whole file has
+arrived it is kept as its name followed by ".part", and once the CRC-32 of all of it matches the one it was announced
+with, that replaces the file. If the transfer stops part way through (the link drops, either end restarts), sending the
+same file again carries on from the end of the ".part" file rather than starting over.
+
+Message payloads (little-endian):
+    FILE_START_MESSAGE, computer to brain:
+        uint32  size of the file in bytes
+        uint32  CRC-32 of the whole file
+        bytes   UTF-8 name to save the file as
+    FILE_RESUME_MESSAGE, brain to computer, in reply to FILE_START_MESSAGE:
+        uint32  offset to send from, the number of bytes already received
+        uint32  CRC-32 of those bytes, if it doesn't match the file being sent, send from offset 0 instead
+    FILE_DATA_MESSAGE, computer to brain:
+        uint32  offset of this chunk in the file
+        uint32  CRC-32 of this chunk
+        bytes   the chunk
+    FILE_END_MESSAGE, computer to brain, after the last chunk, no payload
+    FILE_RESULT_MESSAGE, brain to computer, after FILE_END_MESSAGE or when a chunk is rejected:
+        uint8   status (TRANSFER_COMPLETE, or why the transfer can't go on)
+        uint32  offset to send from if the transfer should carry on
+"""
+
+from SerialProtocol import (
+    FILE_DATA_MESSAGE,
+    FILE_END_MESSAGE,
+    FILE_RESULT_MESSAGE,
+    FILE_RESUME_MESSAGE,
+    FILE_START_MESSAGE,
+    MAXIMUM_PAYLOAD_SIZE,
+)
+
+try:
+    import ustruct as struct
+except ImportError:
+    # Running on a computer rather than the brain
+    import struct
+
+try:
+    import uos as os
+except ImportError:
+    # Running on a computer rather than the brain
+    import os
+
+try:
+    from ubinascii import crc32
+except ImportError:
+    # Running on a computer rather than the brain
+    from binascii import crc32
+
+START_FORMAT = "<II"
+RESUME_FORMAT = "<II"
+DATA_HEADER_FORMAT = "<II"
+DATA_HEADER_SIZE = struct.calcsize(DATA_HEADER_FORMAT)
+RESULT_FORMAT = "<BI"
+
+# The most file bytes one FILE_DATA_MESSAGE can carry
+MAXIMUM_CHUNK_SIZE = MAXIMUM_PAYLOAD_SIZE - DATA_HEADER_SIZE
+
+PART_SUFFIX = ".part"
+
+TRANSFER_COMPLETE = 0
+# The chunk's CRC-32 didn't match, send again from the offset in the result
+CHUNK_CORRUPT = 1
+# The chunk wasn't the next one, send again from the offset in the result
+WRONG_OFFSET = 2
+# Every chunk arrived but the CRC-32 of the whole file didn't match, the file was discarded
+DIGEST_MISMATCH = 3
+# A chunk arrived while no transfer was started
+NOT_STARTED = 4
+
+
+def _file_size(path: str):
+    try:
+        return os.stat(path)[6]
+    except OSError:
+        return None
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class FileReceiver:
+    """
+    The brain's end of a file transfer, pass it every file message that arrives
+
+    Args:
+        channel: The ReliableChannel to reply on
+        buffer_size: How many bytes to collect before writing them to the card
+    """
+
+    def __init__(self, channel, buffer_size: int = 4096):
+        self.channel = channel
+        self._buffer = bytearray(buffer_size)
+        self._buffer_view = memoryview(self._buffer)
+        self._buffered = 0
+        self._file = None
+        self.file_name = None
+        self.size = 0
+        self.digest = 0
+        # Bytes received so far, whether written to the card yet or still in the buffer, and their CRC-32
+        self.offset = 0
+        self._crc = 0
+
+    def _part_path(self):
+        return self.file_name + PART_SUFFIX
+
+    def _reply(self, status: int):
+        self.channel.send(
+            FILE_RESULT_MESSAGE, struct.pack(RESULT_FORMAT, status, self.offset)
+        )
+
+    def _flush(self):
+        if self._buffered:
+            self._file.write(self._buffer_view[: self._buffered])
+            self._buffered = 0
+
+    def _close(self):
+        if self._file is not None:
+            self._flush()
+            self._file.close()
+            self._file = None
+
+    def _stored_crc(self, path: str) -> int:
+        """
+        The CRC-32 of a partly received file, read through the buffer so it isn't loaded all at once
+        """
+        crc = 0
+        with open(path, "rb") as file:
+            while True:
+                count = file.readinto(self._buffer)
+                if not count:
+                    return crc
+                crc = crc32(self._buffer_view[:count], crc)
+
+    def _restart(self):
+        self._close()
+        self._file = open(self._part_path(), "wb")
+        self.offset = 0
+        self._crc = 0
+
+    def handle(self, message_type: int, payload):
+        """
+        Handle one message, messages that aren't part of a file transfer are ignored
+
+        Returns:
+            The name of the file once one has been received and saved, otherwise None
+        """
+        if message_type == FILE_START_MESSAGE:
+            self._start(payload)
+        elif message_type == FILE_DATA_MESSAGE:
+            self._data(payload)
+        elif message_type == FILE_END_MESSAGE:
+            return self._end()
+        return None
+
+    def _start(self, payload):
+        self._close()
+        self.size, self.digest = struct.unpack_from(START_FORMAT, payload)
+        self.file_name = bytes(payload[struct.calcsize(START_FORMAT) :]).decode()
+
+        stored = _file_size(self._part_path())
+        if stored is None or stored > self.size:
+            self._restart()
+        else:
+            # Carry on from where an earlier transfer of this name stopped, the sender checks the CRC-32 to make sure
+            # it was the same file
+            self.offset = stored
+            self._crc = self._stored_crc(self._part_path())
+            self._file = open(self._part_path(), "ab")
+        self.channel.send(
+            FILE_RESUME_MESSAGE, struct.pack(RESUME_FORMAT, self.offset, self._crc)
+        )
+
+    def _data(self, payload):
+        if self._file is None:
+            self._reply(NOT_STARTED)
+            return
+        offset, chunk_crc = struct.unpack_from(DATA_HEADER_FORMAT, payload)
+        chunk = memoryview(payload)[DATA_HEADER_SIZE:]
+        if offset != self.offset:
+            if offset != 0:
+                self._reply(WRONG_OFFSET)
+                return
+            # The sender's file didn't match the partly received one, it is starting over
+            self._restart()
+        if crc32(chunk) != chunk_crc:
+            self._reply(CHUNK_CORRUPT)
+            return
+
+        self._crc = crc32(chunk, self._crc)
+        self.offset += len(chunk)
+        while len(chunk):
+            count = min(len(chunk), len(self._buffer) - self._buffered)
+            self._buffer_view[
+                self._buffered : self._buffered + count
+            ] = chunk[:count]
+            self._buffered += count
+            chunk = chunk[count:]
+            if self._buffered == len(self._buffer):
+                self._flush()
+
+    def _end(self):
+        if self._file is None:
+            self._reply(NOT_STARTED)
+            return None
+        self._close()
+        if self.offset != self.size or self._crc != self.digest:
+            _remove(self._part_path())
+            self.offset = 0
+            self._reply(DIGEST_MISMATCH)
+            return None
+        _remove(self.file_name)
+        os.rename(self._part_path(), self.file_name)
+        self._reply(TRANSFER_COMPLETE)
+        return self.file_name
@@ -2,7 +2,12 @@ from HolonomicOdometry import Odometry
 import Constants
 import math
 from Utilities import *
-from PIDController import PIDController
+from ProfiledPID import ProfiledPIDController
+from SCurveMovement import SCurveConstraints
+from MotorPIDController import MotorPID
+from Feedforward import MotorFeedforward
+from PurePursuit import PurePursuit
+from Kinematics import DrivetrainKinematics
 from vex import *
 
 x_axis = Constants.ControllerAxis.x_axis
@@ -50,19 +55,26 @@ class Drivetrain:
         )
         self._inertial = Inertial(Constants.inertial_sensor_port)
 
-        self._front_left_wheel_rotation_rad = Constants.front_left_wheel_rotation_rad
-        self._front_right_wheel_rotation_rad = Constants.front_right_wheel_rotation_rad
-        self._rear_left_wheel_rotation_rad = Constants.rear_left_wheel_rotation_rad
-        self._rear_right_wheel_rotation_rad = Constants.rear_right_wheel_rotation_rad
+        # Shared with the odometry so driving and tracking use the same model of the wheels
+        self._kinematics = DrivetrainKinematics.from_constants()
 
         self._movement_allowed_error = Constants.drivetrain_allowed_positional_error_cm
         self._wheel_circumference_cm = Constants.wheel_circumference_cm
-        self.rotation_PID = PIDController(
+        # The heading setpoint follows a jerk limited profile to the target heading instead of jumping to it,
+        # the target heading itself is the profile's goal
+        self.rotation_PID = ProfiledPIDController(
             self.timer,
             Constants.drivetrain_turn_Kp,
             Constants.drivetrain_turn_Ki,
             Constants.drivetrain_turn_Kd,
+            SCurveConstraints(
+                Constants.drivetrain_turn_maximum_velocity_rad_per_s,
+                Constants.drivetrain_turn_maximum_acceleration_rad_per_s2,
+                Constants.drivetrain_turn_maximum_jerk_rad_per_s3,
+            ),
+            Constants.drivetrain_turn_PID_period_s,
         )
+        self.rotation_PID.enable_continuous_input(-math.pi, math.pi)
 
         self._rotation_PID_output = 0
 
@@ -70,6 +82,12 @@ class Drivetrain:
         self._current_target_x_cm = 0
         self._current_target_y_cm = 0
 
+        # State of the non-blocking path and trajectory following moves
+        self._path_follower = None
+        self._face_path = True
+        self._trajectory = None
+        self._trajectory_start_time = 0
+
         self._front_left_motor.set_velocity(0, PERCENT)
         self._front_right_motor.set_velocity(0, PERCENT)
         self._rear_left_motor.set_velocity(0, PERCENT)
@@ -80,6 +98,33 @@ class Drivetrain:
         self._rear_left_motor.spin(FORWARD)
         self._rear_right_motor.spin(FORWARD)
 
+        self._wheel_controllers = None
+        if Constants.drivetrain_feedforward_control:
+            # Control the wheels' surface velocity (cm/s) by voltage, the motors report RPM
+            feedforward = MotorFeedforward(
+                Constants.drivetrain_kS, Constants.drivetrain_kV, Constants.drivetrain_kA
+            )
+            self._wheel_controllers = [
+                MotorPID(
+                    self.timer,
+                    motor,
+                    Constants.drivetrain_wheel_velocity_Kp,
+                    Constants.drivetrain_wheel_velocity_Ki,
+                    Constants.drivetrain_wheel_velocity_Kd,
+                    Constants.drivetrain_control_period_ms / 1000,
+                    feedforward=feedforward,
+                    velocity_scale=self._wheel_circumference_cm / 60,
+                )
+                for motor in (
+                    self._front_left_motor,
+                    self._front_right_motor,
+                    self._rear_left_motor,
+                    self._rear_right_motor,
+                )
+            ]
+        self._previous_wheel_velocities = (0, 0, 0, 0)
+        self._previous_wheel_update_time = self.timer.time(SECONDS)
+
         self._odometry = Odometry(
             self._front_left_motor,
             self._front_right_motor,
@@ -88,20 +133,27 @@ class Drivetrain:
             timer=self.timer,
             inertial=self._inertial,
             terminal=self.terminal,
+            kinematics=self._kinematics,
         )
 
+    def update_odometry(self):
+        """
+        Integrate the latest wheel positions into the robot's position, the robot runs this from its Runtime
+        """
+        self._odometry.update()
+
     def calibrate_inertial_sensor(self):
         self._inertial.calibrate()
         while self._inertial.is_calibrating():
             wait(5, MSEC)
 
-    def move_to_position(self, target_position, speed: float):
+    def start_move_to_position(self, target_position):
         """
-        Move to the specified position
+        Begin a non-blocking move to the specified position, call update_move_to_position every control tick until it
+        returns True
 
         Args:
-            target_position (tuple[float, float]): The position to mave to
-            speed (float): The speed (0-1) for the move
+            target_position (tuple[float, float]): The position to move to
         """
 
         # Ensure the drivetrain doesn't jerk when we start the move
@@ -111,137 +163,290 @@ class Drivetrain:
         # Set the target_x and target_y from the target position
         self._current_target_x_cm, self._current_target_y_cm = target_position
 
-        # While the distance between our current position and our target position is greater than tha allowed movement error
-        # continuously calculate the direction we need to travel to reach the target and the remaining distance
-        while (
-            hypotenuse(
-                target_position[0] - self._odometry.x,
-                target_position[1] - self._odometry.y,
-            )
-            > self._movement_allowed_error
-        ):
-            # Calculate the direction to move in the reach the target
-            direction_rad = math.atan2(
-                self._current_target_y_cm - self._odometry.y,
-                self._current_target_x_cm - self._odometry.x,
-            )
+    def update_move_to_position(self, speed: float) -> bool:
+        """
+        Run one control tick of the move started by start_move_to_position
+
+        Args:
+            speed (float): The speed (0-1) for the move
+
+        Returns:
+            True once the robot is within the allowed movement error of the target
+        """
+
+        # Calculate the remaining distance to move
+        distance_cm = hypotenuse(
+            self._current_target_x_cm - self._odometry.x,
+            self._current_target_y_cm - self._odometry.y,
+        )
+        if distance_cm <= self._movement_allowed_error:
+            return True
+
+        # Calculate the direction to move in the reach the target
+        direction_rad = math.atan2(
+            self._current_target_y_cm - self._odometry.y,
+            self._current_target_x_cm - self._odometry.x,
+        )
+
+        # Update the rotation PID to keep us facing the same direction throughout the move
+        self.update_direction_PID()
+        self.move_headless(direction_rad, speed, 0)
+        return False
+
+    def move_to_position(self, target_position, speed: float):
+        """
+        Move to the specified position
+
+        Args:
+            target_position (tuple[float, float]): The position to mave to
+            speed (float): The speed (0-1) for the move
+        """
 
-            # calculate the remaining distance to move
-            distance_cm = hypotenuse(
-                self._current_target_x_cm - self._odometry.x,
-                self._current_target_y_cm - self._odometry.y,
+        self.start_move_to_position(target_position)
+        while not self.update_move_to_position(speed):
+            wait(Constants.drivetrain_control_period_ms, MSEC)
+        self.stop()
+
+    def start_follow_path(self, point_list, maximum_speed, face_path=True):
+        """
+        Begin following a path without blocking, call update_follow_path every control tick until it returns True
+
+        Args:
+            point_list (list[tuple[float, float]]): The points of the path to follow in centimeters (x, y)
+            maximum_speed (float): The maximum speed (0-1) for the move
+            face_path (bool): Whether to turn the front of the robot along the path while following it
+        """
+        point_list = [tuple(point) for point in point_list]
+        if point_list and point_list[0] != self.current_position:
+            # Start the path from wherever we are now
+            point_list.insert(0, self.current_position)
+
+        self._path_follower = PurePursuit(
+            point_list,
+            maximum_speed,
+            Constants.path_following_lookahead_cm,
+            Constants.path_following_point_spacing_cm,
+            Constants.path_following_curvature_speed_gain,
+            Constants.path_following_maximum_deceleration,
+            Constants.path_following_minimum_speed,
+            self._movement_allowed_error,
+        )
+        self._face_path = face_path
+
+        self.clear_direction_PID_output()
+        self._current_target_x_cm, self._current_target_y_cm = (
+            self._path_follower.points[-1]
+        )
+
+    def update_follow_path(self) -> bool:
+        """
+        Run one control tick of the path started by start_follow_path
+
+        Returns:
+            True once the end of the path has been reached
+        """
+        direction_rad, speed, target_heading_rad = self._path_follower.update(
+            self.current_position
+        )
+        if self._path_follower.finished:
+            return True
+        if self._face_path:
+            # Shift the setpoint by the optimal turn so the robot never spins the long way around
+            self.target_heading_rad += self.calculate_optimal_turn(
+                target_heading_rad
             )
+        self.update_direction_PID()
+        self.move_headless(direction_rad, speed, 0)
+        return False
 
-            # Update the rotation PID to keep us facing the same direction throughout the move
-            self.update_direction_PID()
-            self.move_headless(direction_rad, speed, 0)
+    def follow_path(self, point_list, maximum_speed, face_path=True):
+        """
+        Follow a path without stopping at each point, using a pure pursuit controller that translates and rotates the
+        robot at the same time
+
+        Args:
+            point_list (list[tuple[float, float]]): The points of the path to follow in centimeters (x, y)
+            maximum_speed (float): The maximum speed (0-1) for the move, the robot will slow down for sharp turns and
+                at the end of the path
+            face_path (bool): Whether to turn the front of the robot along the path while following it, if False the
+                robot will hold its current target heading
+        """
+        self.start_follow_path(point_list, maximum_speed, face_path)
+        while not self.update_follow_path():
+            wait(Constants.drivetrain_control_period_ms, MSEC)
         self.stop()
 
-    def follow_path(self, point_list, maximum_speed):
-        for point in point_list:
-            self.turn_to_face_position(point)
-            self.move_to_position(point, maximum_speed)
+    def start_follow_trajectory(self, trajectory):
+        """
+        Begin following a trajectory without blocking, call update_follow_trajectory every control tick until it
+        returns True
+
+        Args:
+            trajectory: A Trajectory or TrajectoryPlayer, anything with a sample(t) method and a total_time
+        """
+        self.clear_direction_PID_output()
+        self._trajectory = trajectory
+        self._trajectory_start_time = self.timer.time(SECONDS)
+
+    def update_follow_trajectory(self) -> bool:
+        """
+        Run one control tick of the trajectory started by start_follow_trajectory
+
+        Returns:
+            True once the trajectory has ended and the robot has settled at its final point (or given up trying)
+        """
+        trajectory = self._trajectory
+        elapsed_time = self.timer.time(SECONDS) - self._trajectory_start_time
+        _, x, y, theta, vx, vy, _ = trajectory.sample(elapsed_time)
+        self._current_target_x_cm, self._current_target_y_cm = x, y
+
+        error_x = x - self._odometry.x
+        error_y = y - self._odometry.y
+        if elapsed_time >= trajectory.total_time and (
+            hypotenuse(error_x, error_y) <= self._movement_allowed_error
+            or elapsed_time
+            >= trajectory.total_time + Constants.trajectory_settle_timeout_s
+        ):
+            return True
+
+        # Feed forward the trajectory's velocity and feed back the position error
+        velocity_x = vx + error_x * Constants.trajectory_position_Kp
+        velocity_y = vy + error_y * Constants.trajectory_position_Kp
+
+        self.target_heading_rad += self.calculate_optimal_turn(theta)
+        self.update_direction_PID()
+        self.move_headless(
+            math.atan2(velocity_y, velocity_x),
+            hypotenuse(velocity_x, velocity_y)
+            / Constants.drivetrain_maximum_velocity_cm_per_s,
+            0,
+        )
+        return False
+
+    def follow_trajectory(self, trajectory):
+        """
+        Follow a time-parameterized trajectory, each control tick the trajectory is sampled at the time since the move
+        started and the robot drives at the sampled velocity plus a correction towards the sampled position
+
+        Args:
+            trajectory: A Trajectory or TrajectoryPlayer, anything with a sample(t) method and a total_time
+        """
+        self.start_follow_trajectory(trajectory)
+        while not self.update_follow_trajectory():
+            wait(Constants.drivetrain_control_period_ms, MSEC)
         self.stop()
 
-    def move_towards_direction_for_distance(self, direction, distance_cm, speed):
-        delta_x = math.cos(direction) * distance_cm
-        delta_y = math.sin(direction) * distance_cm
+    def relative_target_position(self, direction, distance_cm, field_relative=False):
+        """
+        Calculate the position a distance away from the current target position
+
+        Args:
+            direction: The direction to move in radians, relative to the robot's target heading unless field_relative
+            distance_cm: The distance to move
+            field_relative: Whether direction is relative to the field rather than the robot
 
+        Returns:
+            The new target position (x, y)
+        """
+        if not field_relative:
+            direction += self.target_heading_rad
+        return (
+            self._current_target_x_cm + math.cos(direction) * distance_cm,
+            self._current_target_y_cm + math.sin(direction) * distance_cm,
+        )
+
+    def move_towards_direction_for_distance(self, direction, distance_cm, speed):
         self.move_to_position(
-            (self._current_target_x_cm + delta_x, self._current_target_y_cm + delta_y),
+            self.relative_target_position(direction, distance_cm, True),
             speed,
-            # 2,
-            # 2,
         )
 
     def forward(self, distance_cm, speed=1, field_relative=False):
-        movement_direction = math.pi / 2
-        if not field_relative:
-            movement_direction += self.rotation_PID.setpoint
-
-        self.move_towards_direction_for_distance(movement_direction, distance_cm, speed)
+        self.move_to_position(
+            self.relative_target_position(math.pi / 2, distance_cm, field_relative),
+            speed,
+        )
 
     def backwards(self, distance_cm, speed=1, field_relative=False):
-        movement_direction = -math.pi / 2
-        if not field_relative:
-            movement_direction += self.rotation_PID.setpoint
-
-        self.move_towards_direction_for_distance(movement_direction, distance_cm, speed)
+        self.move_to_position(
+            self.relative_target_position(-math.pi / 2, distance_cm, field_relative),
+            speed,
+        )
 
     def strafe_left(self, distance_cm, speed=1, field_relative=False):
-        movement_direction = math.pi
-        if not field_relative:
-            movement_direction += self.rotation_PID.setpoint
-
-        self.move_towards_direction_for_distance(movement_direction, distance_cm, speed)
+        self.move_to_position(
+            self.relative_target_position(math.pi, distance_cm, field_relative),
+            speed,
+        )
 
     def strafe_right(self, distance_cm, speed=1, field_relative=False):
-        movement_direction = 0
-        if not field_relative:
-            movement_direction += self.rotation_PID.setpoint
-
-        self.move_towards_direction_for_distance(movement_direction, distance_cm, speed)
+        self.move_to_position(
+            self.relative_target_position(0, distance_cm, field_relative),
+            speed,
+        )
 
     @staticmethod
     def desaturate_wheel_speeds(front_left, front_right, back_left, back_right):
-        maximum_power = max(
-            front_left,
-            front_right,
-            back_left,
-            back_right,
+        # If any wheel speed is over the maximum (1) in either direction the motors would clip, losing some control of
+        # our turning while we are moving quickly, so scale every wheel down by the same amount instead
+        return tuple(
+            DrivetrainKinematics.desaturate(
+                (front_left, front_right, back_left, back_right)
+            )
         )
 
-        if maximum_power > 1:
-            # At least one of the motor velocities are over the maximum possible velocity
-            # This will result in clipping, meaning that the motor speeds will be "clipped" off to the maximum (1)
-            # We will lose some control of our turning while we are moving quickly
-            # To solve this issue we can detect if any motor velocities exceed the maximum possible velocity and
-            # Use the inverse of the maximum motor power as a scalar by dividing by it.
-            # This will always output all values in a range from 0-1
-            front_left /= maximum_power
-            front_right /= maximum_power
-            back_left /= maximum_power
-            back_right /= maximum_power
-        return front_left, front_right, back_left, back_right
-
     def move(self, direction, speed, spin):
         spin += self._rotation_PID_output
 
         speed = clamp(speed, 0, 1)  # This will ensure that speed is between 0 and 1
         spin = clamp(spin, -1, 1)  # This will ensure that spin is between -1 and 1
 
-        target_front_left_wheel_speed = calculate_wheel_power(
-            direction, speed, self._front_left_wheel_rotation_rad
-        ) + (spin if Constants.front_left_motor_inverted else -spin)
-        target_front_right_wheel_speed = calculate_wheel_power(
-            direction, speed, self._front_right_wheel_rotation_rad
-        ) + (spin if Constants.front_right_motor_inverted else -spin)
-        target_rear_left_wheel_speed = calculate_wheel_power(
-            direction, speed, self._rear_left_wheel_rotation_rad
-        ) + (spin if Constants.rear_left_motor_inverted else -spin)
-        target_rear_right_wheel_speed = calculate_wheel_power(
-            direction, speed, self._rear_right_wheel_rotation_rad
-        ) + (spin if Constants.rear_right_motor_inverted else -spin)
-
-        front_left, front_right, back_left, back_right = self.desaturate_wheel_speeds(
-            target_front_left_wheel_speed,
-            target_front_right_wheel_speed,
-            target_rear_left_wheel_speed,
-            target_rear_right_wheel_speed,
+        front_left, front_right, back_left, back_right = DrivetrainKinematics.desaturate(
+            self._kinematics.inverse(
+                math.cos(direction) * speed, math.sin(direction) * speed, spin
+            )
         )
 
-        self._front_left_motor.set_velocity(
-            front_left * 142.8, PERCENT
-        )
-        self._front_right_motor.set_velocity(
-            front_left * 142.8, PERCENT
-        )
-        self._rear_left_motor.set_velocity(
-            back_left * 142.8, PERCENT
-        )
-        self._rear_right_motor.set_velocity(
-            back_right * 142.8, PERCENT
+        self._set_wheel_speeds(front_left, front_right, back_left, back_right)
+
+    def _set_wheel_speeds(self, front_left, front_right, back_left, back_right):
+        """
+        Send desaturated wheel speeds to the motors, either as velocity targets for the motors' built-in controllers or,
+        in feedforward mode, as voltages predicted by the characterized feedforward plus per-wheel velocity feedback
+
+        Args:
+            front_left: The front left wheel speed (-1 to 1)
+            front_right: The front right wheel speed (-1 to 1)
+            back_left: The rear left wheel speed (-1 to 1)
+            back_right: The rear right wheel speed (-1 to 1)
+        """
+        if self._wheel_controllers is None:
+            self._front_left_motor.set_velocity(front_left * 142.8, PERCENT)
+            self._front_right_motor.set_velocity(front_right * 142.8, PERCENT)
+            self._rear_left_motor.set_velocity(back_left * 142.8, PERCENT)
+            self._rear_right_motor.set_velocity(back_right * 142.8, PERCENT)
+            return
+
+        current_time = self.timer.time(SECONDS)
+        delta_time = current_time - self._previous_wheel_update_time
+        self._previous_wheel_update_time = current_time
+
+        wheel_velocities = tuple(
+            speed * 1.428 * Constants.drivetrain_maximum_velocity_cm_per_s
+            for speed in (front_left, front_right, back_left, back_right)
         )
+        for controller, velocity, previous_velocity in zip(
+            self._wheel_controllers, wheel_velocities, self._previous_wheel_velocities
+        ):
+            # Estimate the acceleration we are asking for from the change in target, ignoring long gaps between moves
+            acceleration = (
+                (velocity - previous_velocity) / delta_time
+                if 0 < delta_time < 0.1
+                else 0
+            )
+            controller.set_velocity(velocity, acceleration)
+            controller.update()
+        self._previous_wheel_velocities = wheel_velocities
 
     def move_headless(self, direction, magnitude, spin):
         direction -= (
@@ -273,32 +478,57 @@ class Drivetrain:
         # in order to point the front of the robot towards the target
         self.turn_to_face_heading_rad(direction_to_point)
 
-    def turn_to_face_heading_rad(self, heading_rad, wait_=True):
+    def start_turn_to_face_heading_rad(self, heading_rad):
         # Calculate the optimal turn, this will return a number between -pi and pi
         # that the drivetrain should rotate in order to end facing the correct direction
         angular_difference = self.calculate_optimal_turn(heading_rad)
-        self.rotation_PID.setpoint += angular_difference
+        self.target_heading_rad += angular_difference
+
+    def update_turn(self) -> bool:
+        """
+        Run one control tick of the turn started by start_turn_to_face_heading_rad
+
+        Returns:
+            True once the robot is within the allowed directional error of its target heading
+        """
+        if (
+            abs(self._odometry.rotation_rad - self.target_heading_rad)
+            <= Constants.drivetrain_allowed_directional_error_rad
+        ):
+            return True
+        self.update_direction_PID()
+        self.stop()  # In order to not move but continue turning
+        return False
+
+    def turn_to_face_heading_rad(self, heading_rad, wait_=True):
+        self.start_turn_to_face_heading_rad(heading_rad)
         if wait_:
-            while (
-                abs(self._odometry.rotation_rad - self.rotation_PID.setpoint)
-                > Constants.drivetrain_allowed_directional_error_rad
-            ):
-                self.update_direction_PID()
-                self.stop()  # In order to not move but continue turning
+            while not self.update_turn():
                 wait(5, MSEC)
 
     def turn_to_face_heading_deg(self, heading_deg, wait_=True):
-        self.turn_to_face_heading_rad(math.radians(heading_deg))
+        self.turn_to_face_heading_rad(math.radians(heading_deg), wait_)
 
     def stop(self):
         self.move(0, 0, 0)
 
     def update_direction_PID(self):
-        self._rotation_PID_output = self.rotation_PID.update(self.current_direction_rad)
+        self._rotation_PID_output = self.rotation_PID.calculate(
+            self.current_direction_rad
+        )
 
     def clear_direction_PID_output(self):
         self._rotation_PID_output = 0
 
+    def hold_current_heading(self):
+        """
+        Make the heading the robot is at now the target, restarting the turn profile from it so the robot isn't driven
+        back towards the old target
+        """
+        heading_rad = self.current_direction_rad
+        self.rotation_PID.reset(heading_rad)
+        self.target_heading_rad = heading_rad
+
     def reset(self):
         """
         Reset all the drivetrain to its newly instantiated state
@@ -314,13 +544,13 @@ class Drivetrain:
         if self._inertial:
             self._inertial.set_heading(0, DEGREES)
         self._rotation_PID_output = 0
-        self.rotation_PID.setpoint = 0
         self._current_target_direction = 0
         self._current_target_x_cm = 0
         self._current_target_y_cm = 0
         self._odometry.reset()
         self.current_position = (0, 0)
-        self.rotation_PID.setpoint = self.current_direction_rad
+        self.rotation_PID.reset(self.current_direction_rad)
+        self.target_heading_rad = self.current_direction_rad
         self.target_position = self.current_position
 
     @property
@@ -361,6 +591,7 @@ class Drivetrain:
     @current_direction_rad.setter
     def current_direction_rad(self, rotation_rad):
         self._odometry.rotation_rad = rotation_rad
+        self.rotation_PID.reset(rotation_rad)
         self.target_heading_rad = rotation_rad
 
     @property
@@ -371,7 +602,7 @@ class Drivetrain:
         Returns:
             The current target heading of the robot in radians (use heading_deg for degrees)
         """
-        return self.rotation_PID.setpoint
+        return self.rotation_PID.get_goal().position
 
     @target_heading_rad.setter
     def target_heading_rad(self, heading):
@@ -381,7 +612,7 @@ class Drivetrain:
         Args:
              heading: New target heading in radians
         """
-        self.rotation_PID.setpoint = heading
+        self.rotation_PID.set_goal(heading)
 
     @property
     def target_heading_deg(self):
@@ -391,7 +622,7 @@ class Drivetrain:
         Returns:
             The current target heading of the robot in degrees (use heading_rad for radians)
         """
-        return math.degrees(self.rotation_PID.setpoint)
+        return math.degrees(self.target_heading_rad)
 
     @target_heading_deg.setter
     def target_heading_deg(self, heading):
@@ -401,7 +632,7 @@ class Drivetrain:
         Args:
             heading (float): New target heading in degrees
         """
-        self.rotation_PID.setpoint = math.radians(heading)
+        self.target_heading_rad = math.radians(heading)
 
     def set_braking(self, braking):
         if braking:
@@ -414,3 +645,17 @@ class Drivetrain:
             self._front_right_motor.set_stopping(COAST)
             self._rear_left_motor.set_stopping(COAST)
             self._rear_right_motor.set_stopping(COAST)
+
+    def wheel_velocities_rpm(self):
+        """
+        Get the velocity each wheel's motor reports
+
+        Returns:
+            The (front left, front right, rear left, rear right) velocities in RPM
+        """
+        return (
+            self._front_left_motor.velocity(RPM),
+            self._front_right_motor.velocity(RPM),
+            self._rear_left_motor.velocity(RPM),
+            self._rear_right_motor.velocity(RPM),
+        )
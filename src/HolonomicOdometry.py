@@ -6,6 +6,7 @@ from vex import *
 
 # Local or project-specific imports
 from Utilities import *
+from Kinematics import DrivetrainKinematics
 import Constants
 
 
@@ -19,6 +20,7 @@ class Odometry:
         timer: Brain.timer,
         inertial: Inertial,
         terminal: Terminal = None,
+        kinematics: DrivetrainKinematics = None,
     ):
         """
         A class for tracking the robot's position and rotation, this class integrates a stream of motor velocities into a position
@@ -30,6 +32,7 @@ class Odometry:
             rear_left_motor: The rear left motor object for the odometry
             rear_right_motor: The rear right motor object for the odometry
             terminal: An optional terminal to print debug output to
+            kinematics: The drivetrain's kinematics, built from Constants if not supplied
         """
         self.timer = timer
         self.terminal = terminal
@@ -43,6 +46,7 @@ class Odometry:
         # Define the drivetrain's physical properties
         self._wheel_circumference_cm = Constants.wheel_circumference_cm
         self._slip_coefficients = Constants.drivetrain_slip_coefficients
+        self._kinematics = kinematics or DrivetrainKinematics.from_constants()
 
         # Define the initial conditions of the robot
         self._x_position = self._y_position = self._current_rotation_rad = 0
@@ -65,10 +69,6 @@ class Odometry:
         self._previousTime = self.timer.time(SECONDS)
         self._auto_update = True
         self._inertial = inertial
-        if self._auto_update:
-            self._auto_update_thread = Thread(self._auto_update_velocities)
-        else:
-            self._auto_update_thread = None
         self.reset()
 
     def reset(self):
@@ -139,31 +139,21 @@ class Odometry:
         # Convert the angle value from the inertial sensor to radians with clockwise as negative
         self._current_rotation_rad = -math.radians(self._inertial.rotation(DEGREES))
 
-        theta = self._current_rotation_rad + Constants.drivetrain_rotation_offset
-        sin_theta = math.sin(theta)
-        cos_theta = math.cos(theta)
-
-        if not Constants.front_left_motor_inverted:
-            self._front_left_motor_distance_since_last_tick *= -1
-        if not Constants.front_right_motor_inverted:
-            self._front_right_motor_distance_since_last_tick *= -1
-        if not Constants.rear_left_motor_inverted:
-            self._rear_left_motor_distance_since_last_tick *= -1
-        if not Constants.rear_right_motor_inverted:
-            self._rear_right_motor_distance_since_last_tick *= -1
-
-        dx = (
-            self._front_left_motor_distance_since_last_tick
-            - self._rear_right_motor_distance_since_last_tick
-        ) / 2
-
-        dy = (
-            self._rear_left_motor_distance_since_last_tick
-            - self._front_right_motor_distance_since_last_tick
-        ) / 2
+        # How far the robot moved relative to itself, then rotated onto the field
+        dx, dy, _ = self._kinematics.forward(
+            (
+                self._front_left_motor_distance_since_last_tick,
+                self._front_right_motor_distance_since_last_tick,
+                self._rear_left_motor_distance_since_last_tick,
+                self._rear_right_motor_distance_since_last_tick,
+            )
+        )
+
+        sin_theta = math.sin(self._current_rotation_rad)
+        cos_theta = math.cos(self._current_rotation_rad)
 
-        delta_x = (dy * cos_theta) + (dx * sin_theta)
-        delta_y = (dy * sin_theta) - (dx * cos_theta)
+        delta_x = (dx * cos_theta) - (dy * sin_theta)
+        delta_y = (dx * sin_theta) + (dy * cos_theta)
 
         # direction = math.atan2(delta_y, delta_x)
         # slip_directions = sorted(list(self._slip_coefficients.keys()))
@@ -306,45 +296,38 @@ class Odometry:
         Set the odometry's auto-update state
         :param value: The new state
         """
+        if value and not self._auto_update:
+            # Set the last update time to now, avoids situations where delta_time is extremely high after pausing
+            # auto_update for long periods of time
+            self._previousTime = self.timer.time(SECONDS)
         self._auto_update = value
-        if self._auto_update:
-            if not self._auto_update_thread.isrunning():
-                self._previousTime = self.timer.time(
-                    SECONDS
-                )  # Set the last update time to now
-                # avoids situations where delta_time is extremely high
-                # after pausing auto_update_velocities for long periods of time
-                self._auto_update_thread = Thread(self._auto_update)
-        else:
-            self._auto_update_thread.stop()
 
-    def _auto_update_velocities(self):
+    def update(self):
         """
-        Used internally to constantly update the wheel states, do not call from outside this class
+        Read the wheel positions and integrate them into the robot's position, call this periodically (the robot adds
+        it to its Runtime), the wheels are only read while auto_update is on
         """
-        while True:
-            if self._auto_update:
-                self.update_states()
-                self.update_positions(
-                    self._front_left_motor.position(DEGREES)
-                    / Constants.encoder_ticks_per_rotation,
-                    self._front_right_motor.position(DEGREES)
-                    / Constants.encoder_ticks_per_rotation,
-                    self._rear_left_motor.position(DEGREES)
-                    / Constants.encoder_ticks_per_rotation,
-                    self._rear_right_motor.position(DEGREES)
-                    / Constants.encoder_ticks_per_rotation,
-                )
-            else:
-                self.update_positions(
-                    self._front_left_motor_last_position
-                    / Constants.encoder_ticks_per_rotation,
-                    self._front_right_motor_last_position
-                    / Constants.encoder_ticks_per_rotation,
-                    self._rear_left_motor_last_position
-                    / Constants.encoder_ticks_per_rotation,
-                    self._rear_right_motor_last_position
-                    / Constants.encoder_ticks_per_rotation,
-                )
-                self._previousTime = self.timer.time(SECONDS)
-            wait(5)
+        if self._auto_update:
+            self.update_states()
+            self.update_positions(
+                self._front_left_motor.position(DEGREES)
+                / Constants.encoder_ticks_per_rotation,
+                self._front_right_motor.position(DEGREES)
+                / Constants.encoder_ticks_per_rotation,
+                self._rear_left_motor.position(DEGREES)
+                / Constants.encoder_ticks_per_rotation,
+                self._rear_right_motor.position(DEGREES)
+                / Constants.encoder_ticks_per_rotation,
+            )
+        else:
+            self.update_positions(
+                self._front_left_motor_last_position
+                / Constants.encoder_ticks_per_rotation,
+                self._front_right_motor_last_position
+                / Constants.encoder_ticks_per_rotation,
+                self._rear_left_motor_last_position
+                / Constants.encoder_ticks_per_rotation,
+                self._rear_right_motor_last_position
+                / Constants.encoder_ticks_per_rotation,
+            )
+            self._previousTime = self.timer.time(SECONDS)
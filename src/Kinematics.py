@@ -0,0 +1,175 @@
+"""
+Drivetrain kinematics as a small precomputed matrix
+
+Each wheel i is described by one row of the kinematics matrix [cos(a_i), sin(a_i), s_i], where a_i is the direction the
+wheel pushes the robot when it spins forward and s_i is how much that wheel contributes to spinning the robot. Inverse
+kinematics (chassis speeds -> wheel speeds) is the product of this matrix with the chassis speeds, forward kinematics
+(wheel movements -> chassis movement) is the product of its precomputed pseudo-inverse with the wheel movements.
+
+Wheels are always ordered front left, front right, rear left, rear right.
+"""
+
+import math
+import Constants
+
+
+def _invert_matrix(matrix):
+    """
+    Invert a small square matrix with Gauss-Jordan elimination
+
+    Raises:
+        ValueError: If the matrix is singular
+    """
+    size = len(matrix)
+    augmented = [
+        list(row) + [1.0 if i == j else 0.0 for j in range(size)]
+        for i, row in enumerate(matrix)
+    ]
+    for column in range(size):
+        pivot_row = max(range(column, size), key=lambda row: abs(augmented[row][column]))
+        if abs(augmented[pivot_row][column]) < 1e-12:
+            raise ValueError("Matrix is singular")
+        augmented[column], augmented[pivot_row] = augmented[pivot_row], augmented[column]
+        pivot = augmented[column][column]
+        augmented[column] = [value / pivot for value in augmented[column]]
+        for row in range(size):
+            if row != column and augmented[row][column] != 0:
+                factor = augmented[row][column]
+                augmented[row] = [
+                    value - factor * pivot_value
+                    for value, pivot_value in zip(augmented[row], augmented[column])
+                ]
+    return [row[size:] for row in augmented]
+
+
+class DrivetrainKinematics:
+    """
+    Convert between chassis speeds and wheel speeds for a four wheel drivetrain
+
+    Args:
+        wheel_angles_rad: The direction each wheel pushes the robot when spinning forward, relative to the robot's right
+        spin_signs: How each wheel contributes to spinning the robot counterclockwise, +1 forward, -1 backwards
+    """
+
+    def __init__(self, wheel_angles_rad, spin_signs):
+        if len(wheel_angles_rad) != len(spin_signs):
+            raise ValueError("Every wheel needs both an angle and a spin sign")
+        self.matrix = tuple(
+            (math.cos(angle), math.sin(angle), float(spin_sign))
+            for angle, spin_sign in zip(wheel_angles_rad, spin_signs)
+        )
+        self.forward_matrix = self._pseudo_inverse(self.matrix)
+
+    @staticmethod
+    def _pseudo_inverse(matrix):
+        """
+        Calculate the least squares pseudo-inverse (M^T M)^-1 M^T of the kinematics matrix, any chassis axis that no
+        wheel can move along (strafing on a tank drive) is left out and always reads as zero
+        """
+        wheel_count = len(matrix)
+        active_axes = [
+            axis for axis in range(3) if any(abs(row[axis]) > 1e-9 for row in matrix)
+        ]
+        normal_matrix = [
+            [sum(row[i] * row[j] for row in matrix) for j in active_axes]
+            for i in active_axes
+        ]
+        inverse_normal_matrix = _invert_matrix(normal_matrix)
+
+        pseudo_inverse = [[0.0] * wheel_count for _ in range(3)]
+        for i, axis in enumerate(active_axes):
+            for wheel in range(wheel_count):
+                pseudo_inverse[axis][wheel] = sum(
+                    inverse_normal_matrix[i][j] * matrix[wheel][other_axis]
+                    for j, other_axis in enumerate(active_axes)
+                )
+        return tuple(tuple(row) for row in pseudo_inverse)
+
+    @classmethod
+    def from_constants(cls, drivetrain_type=None):
+        """
+        Build the kinematics of the robot's drivetrain from Constants
+
+        Args:
+            drivetrain_type: A Constants.DrivetrainType, defaults to Constants.drivetrain_type
+
+        Returns:
+            The drivetrain's kinematics
+        """
+        if drivetrain_type is None:
+            drivetrain_type = Constants.drivetrain_type
+
+        if drivetrain_type == Constants.DrivetrainType.Tank:
+            # Every wheel pushes straight forward
+            wheel_angles_rad = (math.pi / 2,) * 4
+        elif drivetrain_type in (
+            Constants.DrivetrainType.Mecanum,
+            Constants.DrivetrainType.XDrive,
+        ):
+            wheel_angles_rad = (
+                Constants.front_left_wheel_rotation_rad,
+                Constants.front_right_wheel_rotation_rad,
+                Constants.rear_left_wheel_rotation_rad,
+                Constants.rear_right_wheel_rotation_rad,
+            )
+        else:
+            raise ValueError("Unknown drivetrain type " + str(drivetrain_type))
+
+        # Inverted motors are on the right side of the robot, so spinning them forward turns the robot counterclockwise
+        spin_signs = tuple(
+            1 if inverted else -1
+            for inverted in (
+                Constants.front_left_motor_inverted,
+                Constants.front_right_motor_inverted,
+                Constants.rear_left_motor_inverted,
+                Constants.rear_right_motor_inverted,
+            )
+        )
+        return cls(wheel_angles_rad, spin_signs)
+
+    def inverse(self, vx: float, vy: float, omega: float):
+        """
+        Calculate the wheel speeds needed to move the robot at the given chassis speeds
+
+        Args:
+            vx: The speed to move towards the robot's right
+            vy: The speed to move towards the robot's front
+            omega: The speed to spin counterclockwise
+
+        Returns:
+            A list of wheel speeds
+        """
+        return [row[0] * vx + row[1] * vy + row[2] * omega for row in self.matrix]
+
+    def forward(self, wheel_movements):
+        """
+        Calculate how the robot moved from how its wheels moved, in the least squares sense when the wheels slip
+
+        Args:
+            wheel_movements: The distance (or speed) of each wheel
+
+        Returns:
+            A tuple of (dx, dy, dtheta) relative to the robot
+        """
+        return tuple(
+            sum(coefficient * movement for coefficient, movement in zip(row, wheel_movements))
+            for row in self.forward_matrix
+        )
+
+    @staticmethod
+    def desaturate(wheel_speeds, maximum: float = 1.0):
+        """
+        Scale wheel speeds down so none exceeds the maximum in either direction, preserving the ratios between them
+
+        Args:
+            wheel_speeds: The wheel speeds to desaturate
+            maximum: The highest speed a wheel can reach
+
+        Returns:
+            A list of desaturated wheel speeds
+        """
+        largest_speed = max(abs(speed) for speed in wheel_speeds)
+        if largest_speed <= maximum:
+            return list(wheel_speeds)
+        scale = maximum / largest_speed
+        return [speed * scale for speed in wheel_speeds]
@@ -0,0 +1,191 @@
+"""
+Leveled, per-module loggers that cost almost nothing when their level is disabled
+
+Loggers form a hierarchy by dotted name, get_logger("Drivetrain.Odometry") is a child of get_logger("Drivetrain"),
+which is a child of the root logger. A logger without a level of its own uses its parent's, and each logger caches
+its level and whether each level is enabled, so checking is a single attribute lookup:
+
+    log = get_logger("Climber")
+    log.debug("Velocity %s, position %s", velocity, position)  # Formatted only if debug messages are enabled
+
+    if log.debug_enabled:  # In hot loops, skip even building the arguments
+        log.debug("Velocity %s, position %s", motor.velocity(PERCENT), motor.position(DEGREES))
+
+Messages are formatted with % and their arguments only once they are going to be written. Each message is passed to
+the handlers of its logger and every ancestor, a handler is any object with an emit(level, name, message) method, for
+example a LogFileHandler. A logger can also be rate limited, debug and info messages closer together than its limit
+are skipped and counted, warnings and errors are never skipped.
+
+The default level for every logger is Constants.log_level, set it to LogLevel.off to ship with logging disabled.
+"""
+
+from vex import MSEC, Brain
+
+from Constants import LogLevel, log_level
+
+DEBUG = LogLevel.debug
+INFO = LogLevel.info
+WARNING = LogLevel.warning
+ERROR = LogLevel.error
+CRITICAL = LogLevel.critical
+OFF = LogLevel.off
+
+LEVEL_NAMES = {
+    DEBUG: "DEBUG",
+    INFO: "INFO",
+    WARNING: "WARNING",
+    ERROR: "ERROR",
+    CRITICAL: "CRITICAL",
+}
+
+_timer = Brain().timer
+
+
+class LogFileHandler:
+    """
+    Write log messages to a Logging file, in the "Name:LEVEL: message" format
+
+    Args:
+        log_object: The Logging instance to write to
+    """
+
+    def __init__(self, log_object):
+        self.log_object = log_object
+
+    def emit(self, level, name, message):
+        self.log_object.log(
+            name + ":" + LEVEL_NAMES.get(level, str(level)) + ": " + message + "\n"
+        )
+
+
+class Logger:
+    """
+    A named logger, get one with get_logger rather than creating it directly
+
+    Args:
+        name: The logger's dotted name, "" for the root logger
+        parent: The parent logger, None for the root logger
+    """
+
+    def __init__(self, name: str, parent=None):
+        self.name = name
+        self.parent = parent
+        self.children = []
+        self.handlers = []
+        self.rate_limit_ms = 0
+        self.suppressed_count = 0
+        self._own_level = None
+        self._last_message_ms = None
+        self._update_level()
+
+    def _update_level(self):
+        """
+        Recalculate the cached level of this logger and its descendants
+        """
+        if self._own_level is not None:
+            self.level = self._own_level
+        elif self.parent is not None:
+            self.level = self.parent.level
+        else:
+            self.level = log_level
+        self.debug_enabled = self.level <= DEBUG
+        self.info_enabled = self.level <= INFO
+        self.warning_enabled = self.level <= WARNING
+        for child in self.children:
+            child._update_level()
+
+    def set_level(self, level):
+        """
+        Set the least severe level this logger and its descendants without their own level write
+
+        Args:
+            level: A LogLevel, or None to use the parent's level again
+        """
+        self._own_level = level
+        self._update_level()
+
+    def set_rate_limit(self, interval_ms):
+        """
+        Skip debug and info messages sent within interval_ms of the last message this logger wrote, 0 to write them all
+        """
+        self.rate_limit_ms = interval_ms
+
+    def add_handler(self, handler):
+        self.handlers.append(handler)
+
+    def remove_handler(self, handler):
+        self.handlers.remove(handler)
+
+    def log(self, level, message, *args):
+        """
+        Write a message, if its level is enabled
+
+        Args:
+            level: The message's LogLevel
+            message: The message, or a % format string for args
+            args: Values to format into the message, only formatted if the message is written
+        """
+        if level < self.level:
+            return
+        if self.rate_limit_ms and level < WARNING:
+            now_ms = _timer.time(MSEC)
+            if (
+                self._last_message_ms is not None
+                and now_ms - self._last_message_ms < self.rate_limit_ms
+            ):
+                self.suppressed_count += 1
+                return
+            self._last_message_ms = now_ms
+
+        text = str(message) % args if args else str(message)
+        if self.suppressed_count:
+            text += " (" + str(self.suppressed_count) + " messages skipped)"
+            self.suppressed_count = 0
+        logger = self
+        while logger is not None:
+            for handler in logger.handlers:
+                handler.emit(level, self.name, text)
+            logger = logger.parent
+
+    def debug(self, message, *args):
+        if self.debug_enabled:
+            self.log(DEBUG, message, *args)
+
+    def info(self, message, *args):
+        if self.info_enabled:
+            self.log(INFO, message, *args)
+
+    def warning(self, message, *args):
+        if self.warning_enabled:
+            self.log(WARNING, message, *args)
+
+    def error(self, message, *args):
+        self.log(ERROR, message, *args)
+
+    def critical(self, message, *args):
+        self.log(CRITICAL, message, *args)
+
+
+_root = Logger("")
+_loggers = {"": _root}
+
+
+def get_logger(name: str = "") -> Logger:
+    """
+    Get the logger with a dotted name, creating it and its ancestors if they don't exist yet
+
+    Args:
+        name: The logger's name, usually the module or subsystem it belongs to, "" for the root logger
+
+    Returns:
+        The same Logger every time it is called with the same name
+    """
+    logger = _loggers.get(name)
+    if logger is not None:
+        return logger
+    dot = name.rfind(".")
+    parent = get_logger(name[:dot] if dot >= 0 else "")
+    logger = Logger(name, parent)
+    parent.children.append(logger)
+    _loggers[name] = logger
+    return logger
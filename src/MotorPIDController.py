@@ -1,11 +1,18 @@
 from vex import *
 from PIDController import PIDController
+from Utilities import clamp
 
 
 class MotorPID:
     """
     Wrap a motor definition in this class to use a custom PID to control its movements ie: my_motor = MotorPID(Motor(...), kp, kd, t)
     **Waring, this class disables all motor functionality except the following functions:[set_velocity, set_stopping, stop, spin, velocity]**
+
+    The PID corrects the velocity sent to the motor, the motor is sent its target velocity plus the PID's correction.
+    Register every MotorPID with one shared ControlScheduler rather than giving each motor its own thread
+
+    When a feedforward model is supplied the motor is driven by voltage instead: the feedforward predicts the voltage
+    needed to reach the target velocity and acceleration, and the PID only corrects for the error that remains
     """
 
     def __init__(
@@ -16,6 +23,10 @@ class MotorPID:
         ki: float = 0.01,
         kd: float = 0.05,
         t: float = 0.1,
+        feedforward=None,
+        velocity_scale: float = 1.0,
+        scheduler=None,
+        priority: int = 0,
     ):
         """
         Creates an instance of the MotorPID
@@ -25,39 +36,59 @@ class MotorPID:
             kp: Kp value for the PID: How quickly to modify the target value if it has not yet reached the desired value
             ki: Ki value for the PID: Integral gain to reduce steady-state error
             kd: Kd value for the PID: Higher values reduce the response time and limit overshoot
-            t: Time between PID updates
+            t: Minimum time between PID updates, updates made sooner keep the previous output, not used with a
+                scheduler, which updates the PID once every one of its periods
+            feedforward: An optional MotorFeedforward, when supplied velocities are in the feedforward's units and the
+                PID output is in volts
+            velocity_scale: Multiplied by the motor's velocity in RPM to convert it into the feedforward's units
+            scheduler: An optional ControlScheduler to update the PID every tick, otherwise call update() from your own
+                control loop
+            priority: The priority to register with the scheduler at, higher priority controllers are updated first
         """
         self.motor_object = motor_object
-        self.motor_PID = PIDController(timer, kp, ki, kd)
-        self.pid_thread = Thread(self._loop)
+        if scheduler is None:
+            self.motor_PID = PIDController(timer, kp, ki, kd, t)
+        else:
+            # The scheduler ticks at a fixed rate, so the PID can skip reading the timer on every update
+            self.motor_PID = PIDController(
+                None, kp, ki, kd, scheduler.period_ms / 1000, fixed_period=True
+            )
+        self.feedforward = feedforward
+        self.velocity_scale = velocity_scale
+        self.target_acceleration = 0.0
         self.t = t
+        if scheduler is not None:
+            scheduler.register(self, priority)
 
     def update(self) -> None:
         """
         Update the PID state with the most recent motor and target velocities and send the normalized value to the motor
         """
 
-        self.motor_object.set_velocity(self.motor_PID.update(self.velocity()), PERCENT)
-
-    def _loop(self) -> None:
-        """
-        Used to run the PID in a new thread: updates the values the PID uses and handles
-          applying the PID output to the motor
-        """
+        if self.feedforward is None:
+            self.motor_object.set_velocity(
+                self.motor_PID.setpoint + self.motor_PID.update(self.velocity()),
+                PERCENT,
+            )
+            return
 
-        while True:
-            self.update()
-            wait(self.t, SECONDS)
+        voltage = self.feedforward.calculate(
+            self.motor_PID.setpoint, self.target_acceleration
+        ) + self.motor_PID.update(self.velocity())
+        self.motor_object.spin(FORWARD, clamp(voltage, -12, 12), VOLT)
 
-    def set_velocity(self, velocity: float) -> None:
+    def set_velocity(self, velocity: float, acceleration: float = 0.0) -> None:
         """
-        Set the motor's target velocity using the PID, make sure you run PID_loop in a new thread or this
-        will have no effect
+        Set the motor's target velocity using the PID, make sure the MotorPID is registered with a ControlScheduler or
+        that update() is called regularly or this will have no effect
         :param velocity: The new target velocity of the motor
         :type velocity: float
+        :param acceleration: The acceleration the motor should currently have, only used with a feedforward
+        :type acceleration: float
         """
 
         self.motor_PID.setpoint = velocity
+        self.target_acceleration = acceleration
 
     def spin(self, direction):
         self.motor_object.spin(direction)
@@ -66,4 +97,6 @@ class MotorPID:
         self.motor_object.stop()
 
     def velocity(self):
-        return self.motor_object.velocity(PERCENT)
+        if self.feedforward is None:
+            return self.motor_object.velocity(PERCENT)
+        return self.motor_object.velocity(RPM) * self.velocity_scale
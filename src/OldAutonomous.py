@@ -20,7 +20,7 @@ class NothingAutonomous(AutonomousRoutine):
         self.robot = robot
 
         robot.drivetrain.current_position = (0, 0)
-        robot.drivetrain.rotation_PID.setpoint = robot.drivetrain.current_direction_rad
+        robot.drivetrain.hold_current_heading()
         robot.drivetrain.target_position = robot.drivetrain.current_position
 
     def run(self):
@@ -36,7 +36,7 @@ class TestAuto(AutonomousRoutine):
         self.robot = robot
 
         robot.drivetrain.current_position = (0, 0)
-        robot.drivetrain.rotation_PID.setpoint = robot.drivetrain.current_direction_rad
+        robot.drivetrain.hold_current_heading()
         robot.drivetrain.target_position = robot.drivetrain.current_position
 
     def run(self):
@@ -94,7 +94,7 @@ class ScoringAutonomous(AutonomousRoutine):
         self.robot = robot
 
         robot.drivetrain.current_position = (0, 0)
-        robot.drivetrain.rotation_PID.setpoint = robot.drivetrain.current_direction_rad
+        robot.drivetrain.hold_current_heading()
         robot.drivetrain.target_position = robot.drivetrain.current_position
 
     def run(self):
@@ -154,7 +154,7 @@ class ScoringAutonomous(AutonomousRoutine):
         robot.intake.stop()
 
         self.log("Done")
-        robot.drivetrain.rotation_PID.setpoint = robot.drivetrain.current_direction_rad
+        robot.drivetrain.hold_current_heading()
         robot.drivetrain.clear_direction_PID_output()
         robot.drivetrain.target_position = robot.drivetrain.current_position
 
@@ -169,7 +169,7 @@ class ScoringAutonomous4(AutonomousRoutine):
         self.robot = robot
 
         robot.drivetrain.current_position = (0, 0)
-        robot.drivetrain.rotation_PID.setpoint = robot.drivetrain.current_direction_rad
+        robot.drivetrain.hold_current_heading()
         robot.drivetrain.target_position = robot.drivetrain.current_position
 
     def run(self):
@@ -231,7 +231,7 @@ class ScoringAutonomous4(AutonomousRoutine):
         robot.drivetrain.forward(25, 1)
 
         self.log("Done")
-        robot.drivetrain.rotation_PID.setpoint = robot.drivetrain.current_direction_rad
+        robot.drivetrain.hold_current_heading()
         robot.drivetrain.clear_direction_PID_output()
         robot.drivetrain.target_position = robot.drivetrain.current_position
 
@@ -246,7 +246,7 @@ class SabotageAutonomous(AutonomousRoutine):
         self.robot = robot
 
         robot.drivetrain.current_position = (0, 0)
-        robot.drivetrain.rotation_PID.setpoint = robot.drivetrain.current_direction_rad
+        robot.drivetrain.hold_current_heading()
         robot.drivetrain.target_position = robot.drivetrain.current_position
 
     def run(self):
@@ -281,7 +281,7 @@ class SabotageAutonomous(AutonomousRoutine):
         robot.intake.stop()
 
         self.log("Done")
-        robot.drivetrain.rotation_PID.setpoint = robot.drivetrain.current_direction_rad
+        robot.drivetrain.hold_current_heading()
         robot.drivetrain.clear_direction_PID_output()
         robot.drivetrain.target_position = robot.drivetrain.current_position
 
@@ -296,7 +296,7 @@ class WinPointAutonomous(AutonomousRoutine):
         self.robot = robot
 
         robot.drivetrain.current_position = (0, 0)
-        robot.drivetrain.rotation_PID.setpoint = robot.drivetrain.current_direction_rad
+        robot.drivetrain.hold_current_heading()
         robot.drivetrain.target_position = robot.drivetrain.current_position
 
     def run(self):
@@ -327,7 +327,7 @@ class WinPointAutonomous(AutonomousRoutine):
         robot.wings.wings_out()
 
         self.log("Done")
-        robot.drivetrain.rotation_PID.setpoint = robot.drivetrain.current_direction_rad
+        robot.drivetrain.hold_current_heading()
         robot.drivetrain.clear_direction_PID_output()
         robot.drivetrain.target_position = robot.drivetrain.current_position
 
@@ -342,7 +342,7 @@ class SkillsAutonomous(AutonomousRoutine):
         self.robot = robot
 
         robot.drivetrain.current_position = (0, 0)
-        robot.drivetrain.rotation_PID.setpoint = robot.drivetrain.current_direction_rad
+        robot.drivetrain.hold_current_heading()
         robot.drivetrain.target_position = robot.drivetrain.current_position
 
     def run(self):
@@ -381,7 +381,7 @@ class SkillsAutonomous(AutonomousRoutine):
         robot.climber.set_velocity(0)
 
         robot.log("Done")
-        robot.drivetrain.rotation_PID.setpoint = robot.drivetrain.current_direction_rad
+        robot.drivetrain.hold_current_heading()
         robot.drivetrain.clear_direction_PID_output()
         robot.drivetrain.target_position = robot.drivetrain.current_position
 
@@ -0,0 +1,327 @@
+"""
+Estimate PID gains with the relay feedback (Astrom-Hagglund) test
+
+Instead of a PID, a relay drives the mechanism: the output is +d while the measurement is below the setpoint and -d
+while it is above it. Almost every mechanism settles into a steady oscillation under a relay, and from the amplitude (a)
+and period (Pu) of that oscillation the ultimate gain (the proportional gain that would make the loop oscillate on
+its own) is Ku = 4d / (pi * a). Ziegler-Nichols style rules then turn Ku and Pu into PID gains.
+
+Use autotune_heading for the drivetrain's rotation PID and autotune_motor for a MotorPID, or drive a RelayAutotuner
+from your own control loop for anything else.
+"""
+
+import math
+from vex import *
+from Utilities import Logging, input_modulus
+
+INFINITY = float("inf")
+
+# (Kp, Ti, Td) as multiples of (Ku, Pu, Pu), Ki = Kp / Ti and Kd = Kp * Td
+TUNING_RULES = {
+    "classic": (0.6, 0.5, 0.125),
+    "pessen": (0.7, 0.4, 0.15),
+    "some_overshoot": (0.33, 0.5, 0.33),
+    "no_overshoot": (0.2, 0.5, 0.33),
+    "pi": (0.45, 1 / 1.2, 0),
+    "p": (0.5, None, 0),
+}
+
+
+def ultimate_gain(
+    relay_amplitude: float, oscillation_amplitude: float, hysteresis: float = 0.0
+) -> float:
+    """
+    Calculate the ultimate gain from a relay test's describing function
+
+    Args:
+        relay_amplitude: How far the relay output swings either side of its bias (d)
+        oscillation_amplitude: Half the peak to peak swing of the measurement (a)
+        hysteresis: The relay's hysteresis, which would otherwise make the estimate too high
+
+    Returns:
+        The ultimate gain Ku = 4d / (pi * sqrt(a^2 - hysteresis^2))
+    """
+    if oscillation_amplitude <= hysteresis:
+        raise ValueError("The oscillation must be larger than the relay's hysteresis")
+    return 4 * relay_amplitude / (
+        math.pi * math.sqrt(oscillation_amplitude**2 - hysteresis**2)
+    )
+
+
+def tunings_from_ultimate(ku: float, pu: float, rule: str = "classic"):
+    """
+    Turn an ultimate gain and period into PID gains
+
+    Args:
+        ku: The ultimate gain
+        pu: The ultimate period in seconds
+        rule: One of TUNING_RULES, "classic" is Ziegler-Nichols, "some_overshoot" and "no_overshoot" are gentler
+
+    Returns:
+        A tuple of (kp, ki, kd)
+    """
+    if rule not in TUNING_RULES:
+        raise ValueError("Unknown tuning rule " + str(rule))
+    kp_ratio, ti_ratio, td_ratio = TUNING_RULES[rule]
+    kp = kp_ratio * ku
+    ki = 0.0 if ti_ratio is None else kp / (ti_ratio * pu)
+    kd = kp * td_ratio * pu
+    return kp, ki, kd
+
+
+class RelayAutotuner:
+    """
+    Run a relay feedback test one control tick at a time
+
+    Call update with each new measurement and apply the returned output to the mechanism until is_finished returns
+    True, then read the results with ultimate_gain, ultimate_period and tunings
+
+    Args:
+        timer: The timer object used to measure the oscillation's period
+        setpoint: The value to oscillate around
+        relay_amplitude: How far the output swings either side of the bias, big enough to move the mechanism well
+            clear of noise, small enough to be safe
+        bias: The output centred on, for example the output that holds the mechanism at the setpoint
+        hysteresis: How far past the setpoint the measurement must go before the relay switches, set this a little
+            above the measurement noise
+        cycles: How many full oscillations to average over, the first one is always discarded as it includes the
+            mechanism's initial response
+        timeout_s: The test is abandoned after this long
+    """
+
+    def __init__(
+        self,
+        timer: Brain.timer,
+        setpoint: float,
+        relay_amplitude: float,
+        bias: float = 0.0,
+        hysteresis: float = 0.0,
+        cycles: int = 4,
+        timeout_s: float = 20,
+    ):
+        if relay_amplitude <= 0:
+            raise ValueError("The relay amplitude must be positive")
+        if cycles < 1:
+            raise ValueError("At least one cycle must be measured")
+        self.timer = timer
+        self.setpoint = setpoint
+        self.relay_amplitude = relay_amplitude
+        self.bias = bias
+        self.hysteresis = hysteresis
+        self.cycles = cycles
+        self.timeout_s = timeout_s
+        self._continuous = False
+        self._error_bound = 0.0
+        self.reset()
+
+    def enable_continuous_input(self, minimum_input, maximum_input):
+        """
+        Treat the input range as a circle (for example -pi to pi for a heading), so the error is always measured the
+        shortest way around
+        """
+        self._continuous = True
+        self._error_bound = (maximum_input - minimum_input) / 2
+
+    def reset(self):
+        self._start_time = self.timer.time(SECONDS)
+        self._relay_high = True
+        self._switch_times = []
+        self._peaks = []
+        self._troughs = []
+        self._highest_error = -INFINITY
+        self._lowest_error = INFINITY
+        self._timed_out = False
+
+    def update(self, measurement: float) -> float:
+        """
+        Advance the test with the most recent measurement
+
+        Args:
+            measurement: The current measurement of the mechanism
+
+        Returns:
+            The output to apply to the mechanism, the bias once the test is finished
+        """
+        if self.is_finished():
+            return self.bias
+
+        current_time = self.timer.time(SECONDS)
+        if current_time - self._start_time > self.timeout_s:
+            self._timed_out = True
+            return self.bias
+
+        # Track the error rather than the measurement so a continuous input can wrap around
+        error = measurement - self.setpoint
+        if self._continuous:
+            error = input_modulus(error, -self._error_bound, self._error_bound)
+        self._highest_error = max(self._highest_error, error)
+        self._lowest_error = min(self._lowest_error, error)
+
+        if self._relay_high and error > self.hysteresis:
+            # Switching low ends the rising half of the cycle, the lowest error since the last switch is a trough
+            self._relay_high = False
+            self._troughs.append(self._lowest_error)
+            self._lowest_error = INFINITY
+        elif not self._relay_high and error < -self.hysteresis:
+            self._relay_high = True
+            self._peaks.append(self._highest_error)
+            self._highest_error = -INFINITY
+            self._switch_times.append(current_time)
+
+        if self._relay_high:
+            return self.bias + self.relay_amplitude
+        return self.bias - self.relay_amplitude
+
+    def is_finished(self) -> bool:
+        return self._timed_out or len(self._switch_times) > self.cycles + 1
+
+    def timed_out(self) -> bool:
+        return self._timed_out
+
+    def oscillation_amplitude(self) -> float:
+        """
+        Returns:
+            Half the average peak to peak swing of the measurement, ignoring the first cycle
+        """
+        peaks = self._peaks[1:]
+        troughs = self._troughs[1:]
+        if not peaks or not troughs:
+            raise ValueError("The relay test has not completed a full cycle")
+        return (sum(peaks) / len(peaks) - sum(troughs) / len(troughs)) / 2
+
+    def ultimate_period(self) -> float:
+        """
+        Returns:
+            The average time between rising relay switches in seconds, ignoring the first cycle
+        """
+        switch_times = self._switch_times[1:]
+        if len(switch_times) < 2:
+            raise ValueError("The relay test has not completed a full cycle")
+        return (switch_times[-1] - switch_times[0]) / (len(switch_times) - 1)
+
+    def ultimate_gain(self) -> float:
+        return ultimate_gain(
+            self.relay_amplitude, self.oscillation_amplitude(), self.hysteresis
+        )
+
+    def tunings(self, rule: str = "some_overshoot"):
+        """
+        Calculate PID gains from the test's results
+
+        Args:
+            rule: One of TUNING_RULES
+
+        Returns:
+            A tuple of (kp, ki, kd)
+        """
+        return tunings_from_ultimate(self.ultimate_gain(), self.ultimate_period(), rule)
+
+
+def _report(brain, log, name, tuner, rule):
+    brain.screen.clear_screen()
+    brain.screen.set_cursor(1, 1)
+    if tuner.timed_out():
+        log.log(name + " relay test timed out\n")
+        log.exit()
+        brain.screen.print(name + " autotune timed out")
+        return None
+
+    ku, pu = tuner.ultimate_gain(), tuner.ultimate_period()
+    kp, ki, kd = tuner.tunings(rule)
+    results = (("Ku", ku), ("Pu", pu), ("Kp", kp), ("Ki", ki), ("Kd", kd))
+    log.log(name + " " + " ".join(key + "=" + str(value) for key, value in results) + "\n")
+    log.exit()
+    for key, value in results:
+        brain.screen.print(key + ": " + str(value))
+        brain.screen.next_row()
+    return kp, ki, kd
+
+
+def autotune_heading(
+    brain: Brain,
+    drivetrain,
+    relay_amplitude: float = 0.3,
+    hysteresis: float = 0.02,
+    rule: str = "some_overshoot",
+    period_ms: int = 10,
+):
+    """
+    Relay tune the drivetrain's rotation PID by rocking the robot either side of its current heading, copy the printed
+    gains into Constants.drivetrain_turn_Kp/Ki/Kd
+
+    Args:
+        brain: The robot's brain
+        drivetrain: The robot's Drivetrain
+        relay_amplitude: The spin speed (0-1) applied either way
+        hysteresis: How far past the heading (in radians) the robot must turn before the spin reverses
+        rule: One of TUNING_RULES
+        period_ms: The time between control ticks
+
+    Returns:
+        A tuple of (kp, ki, kd), or None if the robot never settled into an oscillation
+    """
+    tuner = RelayAutotuner(
+        brain.timer,
+        drivetrain.current_direction_rad,
+        relay_amplitude,
+        hysteresis=hysteresis,
+    )
+    tuner.enable_continuous_input(-math.pi, math.pi)
+    drivetrain.clear_direction_PID_output()
+    while not tuner.is_finished():
+        drivetrain.move(0, 0, tuner.update(drivetrain.current_direction_rad))
+        wait(period_ms, MSEC)
+    drivetrain.stop()
+    # Hold the heading the robot ended up at rather than swinging back to the old target
+    drivetrain.hold_current_heading()
+    return _report(brain, Logging("heading_autotune"), "Heading", tuner, rule)
+
+
+def autotune_motor(
+    brain: Brain,
+    motor_pid,
+    target_velocity: float,
+    relay_amplitude: float,
+    bias: float = None,
+    hysteresis: float = 1.0,
+    rule: str = "some_overshoot",
+    period_ms: int = 10,
+):
+    """
+    Relay tune a MotorPID's velocity loop, copy the printed gains into the MotorPID's constructor
+
+    Args:
+        brain: The robot's brain
+        motor_pid: The MotorPID to tune, it must not be registered with a ControlScheduler during the test
+        target_velocity: The velocity to oscillate around, in the MotorPID's velocity units
+        relay_amplitude: How far the output swings either side of the bias, in percent or in volts when the MotorPID
+            has a feedforward
+        bias: The output centred on, defaults to the feedforward's prediction (or target_velocity without one)
+        hysteresis: How far past the target velocity the motor must get before the relay switches
+        rule: One of TUNING_RULES
+        period_ms: The time between control ticks
+
+    Returns:
+        A tuple of (kp, ki, kd), or None if the motor never settled into an oscillation
+    """
+    feedforward = motor_pid.feedforward
+    if bias is None:
+        bias = (
+            target_velocity
+            if feedforward is None
+            else feedforward.calculate(target_velocity)
+        )
+    tuner = RelayAutotuner(
+        brain.timer, target_velocity, relay_amplitude, bias, hysteresis
+    )
+    motor = motor_pid.motor_object
+    while not tuner.is_finished():
+        output = tuner.update(motor_pid.velocity())
+        if feedforward is None:
+            motor.set_velocity(output, PERCENT)
+            motor.spin(FORWARD)
+        else:
+            motor.spin(FORWARD, max(-12, min(12, output)), VOLT)
+        wait(period_ms, MSEC)
+    motor.stop()
+    return _report(brain, Logging("motor_autotune"), "Motor", tuner, rule)
@@ -1,47 +1,103 @@
 from vex import Brain, SECONDS
-from Utilities import clamp
+from Utilities import input_modulus
+
+INFINITY = float("inf")
 
 
 class PIDController:
     """
     A generalized PID controller implementation.
+
+    The controller runs in one of two timing modes:
+        Measured: Each update measures the time since the last one with the timer, calls made before the time step
+            has passed return the previous output
+        Fixed period: Each update is assumed to be exactly one time step after the last, for controllers ticked at a
+            fixed rate (or in simulation), no timer is needed
+
+    The derivative is taken on the measurement rather than the error, so changing the setpoint doesn't cause a spike in
+    the output, and can be smoothed with a first order low-pass filter.
     """
 
+    __slots__ = (
+        "kp",
+        "ki",
+        "kd",
+        "time_step",
+        "fixed_period",
+        "integral_zone",
+        "_output_limits",
+        "_limited",
+        "derivative_filter",
+        "position_tolerance",
+        "velocity_tolerance",
+        "setpoint",
+        "_timer",
+        "_previous_time",
+        "_current_value",
+        "_has_measurement",
+        "_error_integral",
+        "_last_error_derivative",
+        "_previous_error",
+        "_control_output",
+        "_continuous",
+        "_error_bound",
+    )
+
     def __init__(
         self,
-        timer: Brain.timer,
+        timer: Brain.timer = None,
         kp: float = 1.0,
         ki: float = 0.0,
         kd: float = 0.0,
         t: float = 0.05,
-        integral_zone=(-float("inf"), float("inf")),
+        integral_zone=(-INFINITY, INFINITY),
+        output_limits=(-INFINITY, INFINITY),
+        derivative_filter: float = 0.0,
+        fixed_period: bool = False,
     ):
         """
         Initializes a PIDController instance.
-        :param timer: The timer object used to measure time.
+        :param timer: The timer object used to measure time, only needed when fixed_period is False.
         :param kp: Kp value for the PID.
         :param ki: Ki value for the PID.
         :param kd: Kd value for the PID.
-        :param t: Minimum time between update calls.
+        :param t: Minimum time between update calls, or the time between them when fixed_period is True.
         All calls made before this amount of time has passed since the last calculation will be ignored.
         :param integral_zone: The lower and upper bounds for the integral term to prevent windup.
+        :param output_limits: The lower and upper bounds of the output, the integral stops growing while the output is
+        held at one of them.
+        :param derivative_filter: How much of the previous derivative to keep each update (0-1), 0 disables filtering.
+        :param fixed_period: Whether to assume every update is exactly t seconds after the last.
         """
 
+        if fixed_period and t <= 0:
+            raise ValueError("A fixed period controller needs a positive time step")
+        if not fixed_period and timer is None:
+            raise ValueError("A timer is needed to measure the time between updates")
+        if not 0 <= derivative_filter < 1:
+            raise ValueError("The derivative filter must be at least 0 and less than 1")
+
         self.kp = kp
         self.ki = ki
         self.kd = kd
         self.time_step = t
+        self.fixed_period = fixed_period
         self.integral_zone = integral_zone
+        self.output_limits = output_limits
+        self.derivative_filter = derivative_filter
         self.position_tolerance = 0
         self.velocity_tolerance = 0
         self.setpoint = 0.0
         self._timer = timer
-        self._previous_time = timer.time(SECONDS)
+        self._previous_time = 0.0 if fixed_period else timer.time(SECONDS)
         self._current_value = 0.0
+        self._has_measurement = False
         self._error_integral = 0.0
         self._last_error_derivative = 0.0
         self._previous_error = 0.0
         self._control_output = 0.0
+        self._continuous = False
+        self._error_bound = 0.0
 
     def set_tunings(self, kp, ki, kd):
         self.kp, self.ki, self.kd = kp, ki, kd
@@ -49,56 +105,215 @@ class PIDController:
     def set_integral_zone(self, integral_zone):
         self.integral_zone = integral_zone
 
+    def set_output_limits(self, output_limits):
+        self.output_limits = output_limits
+
+    @property
+    def output_limits(self):
+        return self._output_limits
+
+    @output_limits.setter
+    def output_limits(self, output_limits):
+        self._output_limits = output_limits
+        # Most controllers are unlimited, so update can skip clamping the output
+        self._limited = tuple(output_limits) != (-INFINITY, INFINITY)
+
+    def set_tolerance(self, position_tolerance, velocity_tolerance=INFINITY):
+        self.position_tolerance = position_tolerance
+        self.velocity_tolerance = velocity_tolerance
+
+    def enable_continuous_input(self, minimum_input, maximum_input):
+        """
+        Treat the input range as a circle (for example -pi to pi for a heading), so the error is always measured the
+        shortest way around
+        """
+        self._continuous = True
+        self._error_bound = (maximum_input - minimum_input) / 2
+
+    def disable_continuous_input(self):
+        self._continuous = False
+
+    def is_continuous_input_enabled(self):
+        return self._continuous
+
     def reset(self):
         self._error_integral = 0
         self._control_output = 0
+        self._last_error_derivative = 0
+        self._has_measurement = False
         self._previous_error = self.setpoint - self._current_value
 
-    def update(self, current_value: float) -> float:
+    def update(self, current_value: float, feedforward: float = 0.0) -> float:
         """
         Update the PID state with the most recent current value and calculate the control output.
 
         Args:
             current_value: The current measurement or feedback value
+            feedforward: A value added to the output, for example the output a model predicts the setpoint needs
 
         Returns:
             The calculated control output.
         """
 
-        current_time = self._timer.time(SECONDS)
-        delta_time = current_time - self._previous_time
-
-        if delta_time < self.time_step:
-            return self._control_output
-
-        self._previous_time = current_time
+        if self.fixed_period:
+            delta_time = self.time_step
+        else:
+            current_time = self._timer.time(SECONDS)
+            delta_time = current_time - self._previous_time
+            if delta_time < self.time_step or delta_time <= 0:
+                return self._control_output
+            self._previous_time = current_time
 
         current_error = self.setpoint - current_value
-        self._error_integral += current_error * delta_time
+        if self._continuous:
+            error_bound = self._error_bound
+            current_error = input_modulus(current_error, -error_bound, error_bound)
+
         # Apply integral windup prevention
         # PID integral windup is a phenomenon that occurs when the integral term of a PID
         # controller continues to accumulate error even when the controller's output is saturated.
         # This can lead to overshoot, instability, and poor performance in control systems.
         # if your Kp is reasonably low, and you are still experiencing overshoot/instability/oscillation,
         # then try decreasing the span of the integral zone
-        if self.ki != 0:
-            self._error_integral = clamp(
-                self._error_integral, self.integral_zone[0], self.integral_zone[1]
-            )
-        self._last_error_derivative = (
-            current_error - self._previous_error
-        ) / delta_time
-        self._control_output = (
+        previous_integral = self._error_integral
+        error_integral = previous_integral + current_error * delta_time
+        ki = self.ki
+        if ki:
+            lower_limit, upper_limit = self.integral_zone
+            if error_integral < lower_limit:
+                error_integral = lower_limit
+            elif error_integral > upper_limit:
+                error_integral = upper_limit
+
+        if self._has_measurement:
+            measurement_change = current_value - self._current_value
+            if self._continuous:
+                measurement_change = input_modulus(
+                    measurement_change, -self._error_bound, self._error_bound
+                )
+            error_derivative = -measurement_change / delta_time
+            derivative_filter = self.derivative_filter
+            if derivative_filter:
+                error_derivative = (
+                    derivative_filter * self._last_error_derivative
+                    + (1 - derivative_filter) * error_derivative
+                )
+        else:
+            error_derivative = 0.0
+            self._has_measurement = True
+
+        control_output = (
             self.kp * current_error
-            + self.ki * self._error_integral
-            + self.kd * self._last_error_derivative
+            + ki * error_integral
+            + self.kd * error_derivative
+            + feedforward
         )
+
+        if self._limited:
+            lower_limit, upper_limit = self._output_limits
+            if control_output > upper_limit:
+                control_output = upper_limit
+                if current_error > 0:
+                    # Integrating further would only push the output deeper into saturation
+                    error_integral = previous_integral
+            elif control_output < lower_limit:
+                control_output = lower_limit
+                if current_error < 0:
+                    error_integral = previous_integral
+
+        self._error_integral = error_integral
+        self._last_error_derivative = error_derivative
         self._previous_error = current_error
+        self._current_value = current_value
+        self._control_output = control_output
+        return control_output
+
+    def calculate_batch(self, measurements, setpoints=None):
+        """
+        Run the controller over a sequence of measurements spaced one time step apart, much faster than calling update
+        in a loop, for replaying logged data or tuning gains in simulation. Continuous input and output limits are
+        honoured, the controller's state is left as if update had been called for each measurement.
+
+        Args:
+            measurements: The measurements, one per time step
+            setpoints: An optional setpoint for each time step, otherwise the current setpoint is used throughout
+
+        Returns:
+            A list of control outputs, one per measurement
+        """
+        kp, ki, kd = self.kp, self.ki, self.kd
+        delta_time = self.time_step
+        integral_lower, integral_upper = self.integral_zone
+        output_lower, output_upper = self._output_limits
+        derivative_filter = self.derivative_filter
+        continuous = self._continuous
+        error_bound = self._error_bound
+        modulus = 2 * error_bound
+
+        setpoint = self.setpoint
+        error_integral = self._error_integral
+        error_derivative = self._last_error_derivative
+        previous_value = self._current_value
+        has_measurement = self._has_measurement
+        current_error = self._previous_error
+
+        outputs = []
+        append = outputs.append
+        for i, current_value in enumerate(measurements):
+            if setpoints is not None:
+                setpoint = setpoints[i]
+            current_error = setpoint - current_value
+            measurement_change = current_value - previous_value
+            if continuous:
+                current_error = (current_error + error_bound) % modulus - error_bound
+                measurement_change = (
+                    measurement_change + error_bound
+                ) % modulus - error_bound
+
+            previous_integral = error_integral
+            error_integral += current_error * delta_time
+            if ki != 0:
+                if error_integral < integral_lower:
+                    error_integral = integral_lower
+                elif error_integral > integral_upper:
+                    error_integral = integral_upper
+
+            if has_measurement:
+                error_derivative = (
+                    derivative_filter * error_derivative
+                    - (1 - derivative_filter) * measurement_change / delta_time
+                )
+            else:
+                error_derivative = 0.0
+                has_measurement = True
 
-        return self._control_output
+            control_output = (
+                kp * current_error + ki * error_integral + kd * error_derivative
+            )
+            if control_output > output_upper:
+                control_output = output_upper
+                if current_error > 0:
+                    error_integral = previous_integral
+            elif control_output < output_lower:
+                control_output = output_lower
+                if current_error < 0:
+                    error_integral = previous_integral
+
+            append(control_output)
+            previous_value = current_value
+
+        self.setpoint = setpoint
+        self._error_integral = error_integral
+        self._last_error_derivative = error_derivative
+        self._previous_error = current_error
+        self._current_value = previous_value
+        self._has_measurement = has_measurement
+        if outputs:
+            self._control_output = outputs[-1]
+        return outputs
 
     def at_setpoint(self):
         return (
-            self._previous_error <= self.position_tolerance
-            and self._last_error_derivative < self.velocity_tolerance
+            abs(self._previous_error) <= self.position_tolerance
+            and abs(self._last_error_derivative) <= self.velocity_tolerance
         )
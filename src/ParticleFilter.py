@@ -0,0 +1,377 @@
+"""
+Monte Carlo localization: correct odometry drift by checking distance sensor readings against a map of the field
+
+The filter keeps a cloud of particles, each a guess at the robot's pose (x, y, rotation). Every step:
+    - predict: each particle is moved by the change in the odometry's pose, plus noise in proportion to the move
+    - update: each sensor reading is projected from each particle with get_collision_point, a particle scores well when
+        the projected points land on walls, this is the likelihood field model and costs one DistanceMap lookup per
+        reading instead of casting a ray
+    - resample: particles are drawn again in proportion to their weight, KLD sampling draws only as many as the spread
+        of the cloud needs, few when the robot is well localized and up to max_particles when it is lost, which keeps
+        the time each step takes bounded
+
+Particles are stored in flat arrays of floats rather than as objects to save memory and allocation on the brain.
+"""
+
+import math
+
+try:
+    from uarray import array
+except ImportError:
+    # Running on a computer rather than the brain
+    from array import array
+
+try:
+    import urandom as random
+except ImportError:
+    # Running on a computer rather than the brain
+    import random
+
+from DistanceMap import MAXIMUM_DISTANCE
+from Utilities import get_collision_point
+
+TWO_PI = 2 * math.pi
+
+
+def gaussian(sigma):
+    """
+    Draw from a normal distribution with a mean of 0 by the Box-Muller transform, MicroPython's random has no gauss
+    """
+    if sigma <= 0:
+        return 0.0
+    return (
+        sigma
+        * math.sqrt(-2 * math.log(1 - random.random()))
+        * math.cos(TWO_PI * random.random())
+    )
+
+
+def kld_sample_count(occupied_bins, kld_error, kld_z):
+    """
+    Get how many particles are needed so the sampled distribution is within kld_error of the true one (by
+    Kullback-Leibler divergence), with the confidence given by the normal quantile kld_z
+
+    Args:
+        occupied_bins: The number of histogram bins with at least one particle in them
+
+    Returns:
+        The number of particles
+    """
+    if occupied_bins < 2:
+        return 1
+    degrees = occupied_bins - 1
+    a = 2 / (9 * degrees)
+    return int(math.ceil(degrees / (2 * kld_error) * (1 - a + math.sqrt(a) * kld_z) ** 3))
+
+
+class ParticleFilter:
+    """
+    Localize the robot on a known field from odometry and distance sensors
+
+    Poses are (x_cm, y_cm, rotation_rad) with the rotation measured as in get_collision_point, a rotation of 0 faces
+    along +y and positive rotations turn towards +x
+
+    Args:
+        distance_map: A DistanceMap of the field
+        sensors: A list of (sensor_rotation_rad, sensor_distance_from_center_cm) for each distance sensor, measured as
+            in get_collision_point
+        min_particles: The fewest particles to keep
+        max_particles: The most particles to keep, this bounds the time each update takes
+        hit_sigma_cm: The standard deviation of a sensor reading about the true distance
+        random_weight: The chance that a reading is noise rather than a wall, keeps one bad reading from zeroing a
+            particle
+        max_range_cm: Readings at or beyond this distance (or None) mean nothing was detected and are ignored
+        translation_noise: How much each particle's move is randomized, per centimeter moved
+        rotation_noise: How much each particle's turn is randomized, per radian turned
+        position_jitter_cm: Noise added to every particle's position each predict, even when the robot is still, so
+            the copies made by resampling spread out again
+        rotation_jitter_rad: Noise added to every particle's rotation each predict
+        kld_error: The largest acceptable KL divergence between the particles and the distribution they represent
+        kld_z: The normal quantile for the confidence of the kld_error bound, 2.33 is 99%
+        bin_size_cm: The width of the KLD histogram's position bins
+        bin_size_rad: The width of the KLD histogram's rotation bins
+    """
+
+    def __init__(
+        self,
+        distance_map,
+        sensors,
+        min_particles=100,
+        max_particles=1000,
+        hit_sigma_cm=4.0,
+        random_weight=0.05,
+        max_range_cm=200.0,
+        translation_noise=0.1,
+        rotation_noise=0.1,
+        position_jitter_cm=0.5,
+        rotation_jitter_rad=0.01,
+        kld_error=0.05,
+        kld_z=2.33,
+        bin_size_cm=10.0,
+        bin_size_rad=math.pi / 18,
+    ):
+        if not 0 < min_particles <= max_particles:
+            raise ValueError(
+                "Particle counts must satisfy 0 < min_particles <= max_particles"
+            )
+        self.distance_map = distance_map
+        self.sensors = sensors
+        self.min_particles = min_particles
+        self.max_particles = max_particles
+        self.max_range_cm = max_range_cm
+        self.translation_noise = translation_noise
+        self.rotation_noise = rotation_noise
+        self.position_jitter_cm = position_jitter_cm
+        self.rotation_jitter_rad = rotation_jitter_rad
+        self.kld_error = kld_error
+        self.kld_z = kld_z
+        self.bin_size_cm = bin_size_cm
+        self.bin_size_rad = bin_size_rad
+
+        # The likelihood of a reading for each distance the map can store, so updates never call exp
+        cell_size_cm = distance_map.cell_size_cm
+        self._likelihood = array(
+            "f",
+            [
+                (1 - random_weight)
+                * math.exp(-((distance * cell_size_cm) ** 2) / (2 * hit_sigma_cm**2))
+                + random_weight / max_range_cm
+                for distance in range(MAXIMUM_DISTANCE + 1)
+            ],
+        )
+
+        self.x = array("f")
+        self.y = array("f")
+        self.rotation = array("f")
+        self.weights = array("f")
+
+    def __len__(self):
+        return len(self.weights)
+
+    def _set_particles(self, x, y, rotation):
+        self.x, self.y, self.rotation = x, y, rotation
+        self.weights = array("f", [1 / len(x)] * len(x))
+
+    def initialize(
+        self,
+        x_cm,
+        y_cm,
+        rotation_rad,
+        position_sigma_cm=5.0,
+        rotation_sigma_rad=0.05,
+        count=None,
+    ):
+        """
+        Spread particles around a known starting pose
+
+        Args:
+            x_cm: The starting x position
+            y_cm: The starting y position
+            rotation_rad: The starting rotation
+            position_sigma_cm: The standard deviation of the particles' positions about the start
+            rotation_sigma_rad: The standard deviation of the particles' rotations about the start
+            count: How many particles to create, defaults to min_particles
+        """
+        count = count or self.min_particles
+        self._set_particles(
+            array("f", [x_cm + gaussian(position_sigma_cm) for _ in range(count)]),
+            array("f", [y_cm + gaussian(position_sigma_cm) for _ in range(count)]),
+            array(
+                "f", [rotation_rad + gaussian(rotation_sigma_rad) for _ in range(count)]
+            ),
+        )
+
+    def initialize_uniform(self, count=None):
+        """
+        Spread particles over the whole map, for when the robot's pose is unknown
+
+        Args:
+            count: How many particles to create, defaults to max_particles
+        """
+        count = count or self.max_particles
+        width_cm = self.distance_map.width * self.distance_map.cell_size_cm
+        height_cm = self.distance_map.height * self.distance_map.cell_size_cm
+        self._set_particles(
+            array("f", [random.random() * width_cm for _ in range(count)]),
+            array("f", [random.random() * height_cm for _ in range(count)]),
+            array("f", [random.random() * TWO_PI for _ in range(count)]),
+        )
+
+    def predict(self, previous_pose, current_pose):
+        """
+        Move every particle by the change in the odometry's pose
+
+        The move is taken relative to the robot, so a particle facing a different way than the odometry moves the way
+        that particle faces
+
+        Args:
+            previous_pose: The odometry's (x, y, rotation_rad) at the last predict
+            current_pose: The odometry's (x, y, rotation_rad) now
+        """
+        delta_x = current_pose[0] - previous_pose[0]
+        delta_y = current_pose[1] - previous_pose[1]
+        delta_rotation = current_pose[2] - previous_pose[2]
+        # Split the move into forward and sideways parts, forward is (sin, cos) of the rotation as in get_collision_point
+        sin_rotation = math.sin(previous_pose[2])
+        cos_rotation = math.cos(previous_pose[2])
+        forward = delta_x * sin_rotation + delta_y * cos_rotation
+        sideways = delta_x * cos_rotation - delta_y * sin_rotation
+
+        translation_sigma = self.position_jitter_cm + self.translation_noise * math.sqrt(
+            forward * forward + sideways * sideways
+        )
+        rotation_sigma = self.rotation_jitter_rad + self.rotation_noise * abs(
+            delta_rotation
+        )
+        x, y, rotation = self.x, self.y, self.rotation
+        for i in range(len(x)):
+            particle_forward = forward + gaussian(translation_sigma)
+            particle_sideways = sideways + gaussian(translation_sigma)
+            sin_rotation = math.sin(rotation[i])
+            cos_rotation = math.cos(rotation[i])
+            x[i] += particle_forward * sin_rotation + particle_sideways * cos_rotation
+            y[i] += particle_forward * cos_rotation - particle_sideways * sin_rotation
+            rotation[i] += delta_rotation + gaussian(rotation_sigma)
+
+    def update(self, readings):
+        """
+        Weight every particle by how well the sensor readings agree with the map from its pose
+
+        Args:
+            readings: The distance read by each sensor in centimeters, in the same order as sensors, None when a
+                sensor saw nothing
+
+        Returns:
+            False if every particle was impossible and the readings were ignored, True otherwise
+        """
+        beams = [
+            (sensor[0], sensor[1], reading)
+            for sensor, reading in zip(self.sensors, readings)
+            if reading is not None and 0 <= reading < self.max_range_cm
+        ]
+        if not beams:
+            return True
+
+        cell_distance = self.distance_map.cell_distance
+        likelihood = self._likelihood
+        x, y, rotation, weights = self.x, self.y, self.rotation, self.weights
+        total_weight = 0.0
+        new_weights = array("f", weights)
+        for i in range(len(weights)):
+            position = (x[i], y[i])
+            particle_rotation = rotation[i]
+            weight = weights[i]
+            for sensor_rotation, sensor_distance_from_center_cm, reading in beams:
+                hit_x, hit_y = get_collision_point(
+                    position,
+                    particle_rotation,
+                    sensor_rotation,
+                    reading,
+                    sensor_distance_from_center_cm,
+                )
+                weight *= likelihood[cell_distance(hit_x, hit_y)]
+            new_weights[i] = weight
+            total_weight += weight
+
+        if total_weight <= 0:
+            return False
+        for i in range(len(new_weights)):
+            new_weights[i] /= total_weight
+        self.weights = new_weights
+        return True
+
+    def effective_sample_size(self):
+        """
+        Get how many particles are effectively contributing, 1 when one particle holds all the weight and the particle
+        count when they are all equal
+        """
+        squared_total = 0.0
+        for weight in self.weights:
+            squared_total += weight * weight
+        return 1 / squared_total if squared_total > 0 else 0.0
+
+    def resample(self):
+        """
+        Draw a new set of particles in proportion to their weights, drawing only as many as KLD sampling says the cloud
+        needs
+        """
+        weights = self.weights
+        particle_count = len(weights)
+        cumulative = array("f", weights)
+        for i in range(1, particle_count):
+            cumulative[i] += cumulative[i - 1]
+        total_weight = cumulative[-1]
+
+        x, y, rotation = array("f"), array("f"), array("f")
+        occupied_bins = set()
+        required = self.min_particles
+        while len(x) < required:
+            # Binary search the cumulative weights for the particle this draw lands on
+            target = random.random() * total_weight
+            low, high = 0, particle_count - 1
+            while low < high:
+                middle = (low + high) // 2
+                if cumulative[middle] < target:
+                    low = middle + 1
+                else:
+                    high = middle
+            x.append(self.x[low])
+            y.append(self.y[low])
+            particle_rotation = self.rotation[low] % TWO_PI
+            rotation.append(particle_rotation)
+
+            particle_bin = (
+                int(self.x[low] // self.bin_size_cm),
+                int(self.y[low] // self.bin_size_cm),
+                int(particle_rotation // self.bin_size_rad),
+            )
+            if particle_bin not in occupied_bins:
+                occupied_bins.add(particle_bin)
+                required = min(
+                    self.max_particles,
+                    max(
+                        self.min_particles,
+                        kld_sample_count(len(occupied_bins), self.kld_error, self.kld_z),
+                    ),
+                )
+        self._set_particles(x, y, rotation)
+
+    def estimate(self):
+        """
+        Get the weighted mean pose of the particles
+
+        Returns:
+            A tuple of (x, y, rotation_rad)
+        """
+        total_x = total_y = total_sin = total_cos = total_weight = 0.0
+        x, y, rotation = self.x, self.y, self.rotation
+        for i, weight in enumerate(self.weights):
+            total_x += weight * x[i]
+            total_y += weight * y[i]
+            # Rotations wrap, so average them as unit vectors
+            total_sin += weight * math.sin(rotation[i])
+            total_cos += weight * math.cos(rotation[i])
+            total_weight += weight
+        return (
+            total_x / total_weight,
+            total_y / total_weight,
+            math.atan2(total_sin, total_cos),
+        )
+
+    def step(self, previous_pose, current_pose, readings):
+        """
+        Run one predict and update, resampling when too few particles carry the weight
+
+        Args:
+            previous_pose: The odometry's (x, y, rotation_rad) at the last step
+            current_pose: The odometry's (x, y, rotation_rad) now
+            readings: The distance read by each sensor, see update
+
+        Returns:
+            The estimated pose (x, y, rotation_rad)
+        """
+        self.predict(previous_pose, current_pose)
+        self.update(readings)
+        if self.effective_sample_size() < len(self) / 2:
+            self.resample()
+        return self.estimate()
@@ -8,8 +8,6 @@ class Wings:
 
         self.wings_state = Constants.PneumaticsState.in_
 
-        self.update_thread = Thread(self.wings_loop)
-
     def wings_out(self):
         self.wings_state = Constants.PneumaticsState.out
 
@@ -19,12 +17,12 @@ class Wings:
     def toggle_wings(self):
         self.wings_state = Constants.PneumaticsState.out if self.wings_state == Constants.PneumaticsState.in_ else Constants.PneumaticsState.in_
 
-    def wings_loop(self):
-        while True:
-            if self.wings_state == Constants.PneumaticsState.in_:
-                self.wings.set(False)
-
-            if self.wings_state == Constants.PneumaticsState.out:
-                self.wings.set(True)
+    def update(self):
+        """
+        Send the wings' state to the solenoid, the robot runs this from its Runtime
+        """
+        if self.wings_state == Constants.PneumaticsState.in_:
+            self.wings.set(False)
 
-            wait(100, MSEC)
+        if self.wings_state == Constants.PneumaticsState.out:
+            self.wings.set(True)
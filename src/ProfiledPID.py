@@ -1,35 +1,56 @@
 from PIDController import PIDController
+from SCurveMovement import SCurveConstraints, SCurveProfile
 from TrapezoidMovement import TrapezoidProfile, Constraints, State
-from src.vex import Brain
+from Utilities import input_modulus
+from vex import Brain, SECONDS, wait
 
 
-class ProfiledPID:
-    def __init__(self, pid_controller: PIDController, trapezoidal_movement_constraints: Constraints):
-        self.PID = pid_controller
-        self.trapezoidal_movement_constraints = trapezoidal_movement_constraints
-        self.trapezoidal_movement_profile = TrapezoidProfile(trapezoidal_movement_constraints)
-
-        self.initial_state = State(0.0, 0.0)
-        self.goal_state = State(0.0, 0.0)
+class ProfiledPIDController:
+    """
+    A PID controller whose setpoint follows a motion profile towards the goal rather than jumping to it, so the
+    mechanism never tries to move faster or accelerate harder than the profile's constraints allow
 
-    def set_target_state(self, target_state: State):
-        self.goal_state = target_state
+    The profile is a TrapezoidProfile for Constraints, or a jerk limited SCurveProfile for SCurveConstraints
 
+    Args:
+        timer: The timer object used to measure time
+        kp: Kp value for the PID
+        ki: Ki value for the PID
+        kd: Kd value for the PID
+        constraints: The maximum velocity and acceleration (and jerk, for SCurveConstraints) of the profile
+        period: Minimum time between calculations, calls made sooner return the previous output
+    """
 
-class ProfiledPIDController:
     instances = 0
 
-    def __init__(self, kp, ki, kd, constraints, period=0.02):
-        self.m_controller = PIDController(kp, ki, kd, period)
+    def __init__(
+        self, timer: Brain.timer, kp, ki, kd, constraints, period=0.02
+    ):
+        if period <= 0:
+            raise ValueError("Controller period must be a positive number")
+        # The profile handles the update rate, so the inner PID runs whenever it is asked to
+        # The time step is set from the time this controller measures before every update
+        self.m_controller = PIDController(None, kp, ki, kd, period, fixed_period=True)
+        self.m_timer = timer
+        self.m_period = period
+        self.m_continuous = False
         self.m_minimumInput = None
         self.m_maximumInput = None
         self.m_constraints = constraints
-        self.m_profile = TrapezoidProfile(self.m_constraints)
+        self.m_profile = self._make_profile(self.m_constraints)
         self.m_goal = State()
         self.m_setpoint = State()
+        self.m_previousTime = timer.time(SECONDS)
+        self.m_output = 0.0
 
         ProfiledPIDController.instances += 1
 
+    @staticmethod
+    def _make_profile(constraints):
+        if isinstance(constraints, SCurveConstraints):
+            return SCurveProfile(constraints)
+        return TrapezoidProfile(constraints)
+
     def set_tunings(self, kp, ki, kd):
         self.m_controller.set_tunings(kp, ki, kd)
 
@@ -40,7 +61,7 @@ class ProfiledPIDController:
         self.m_controller.ki = ki
 
     def set_kd(self, kd):
-        self.m_controller.d = kd
+        self.m_controller.kd = kd
 
     def set_integral_zone(self, integral_zone):
         self.m_controller.integral_zone = integral_zone
@@ -57,8 +78,8 @@ class ProfiledPIDController:
     def get_integral_zone(self):
         return self.m_controller.integral_zone
 
-    def get_time_step(self):
-        return self.m_controller.time_step
+    def get_period(self):
+        return self.m_period
 
     def get_position_tolerance(self):
         return self.m_controller.position_tolerance
@@ -66,19 +87,41 @@ class ProfiledPIDController:
     def get_velocity_tolerance(self):
         return self.m_controller.velocity_tolerance
 
+    def set_tolerance(self, position_tolerance, velocity_tolerance=float("inf")):
+        self.m_controller.position_tolerance = position_tolerance
+        self.m_controller.velocity_tolerance = velocity_tolerance
+
     def set_goal(self, goal):
+        """
+        Set the state the profile should end at
+
+        Args:
+            goal: A State, or a position to come to rest at
+        """
+        if not isinstance(goal, State):
+            goal = State(goal, 0.0)
         self.m_goal = goal
 
+    def get_goal(self):
+        return self.m_goal
+
     def set_constraints(self, constraints):
         self.m_constraints = constraints
-        self.m_profile = TrapezoidProfile(self.m_constraints)
+        self.m_profile = self._make_profile(self.m_constraints)
 
     def get_constraints(self):
         return self.m_constraints
 
     def get_setpoint(self):
+        """
+        Returns:
+            The current State of the profile, where the PID is currently trying to hold the mechanism
+        """
         return self.m_setpoint
 
+    def get_position_error(self):
+        return self.m_setpoint.position - self.m_controller._current_value
+
     def at_goal(self):
         return self.at_setpoint() and self.m_goal == self.m_setpoint
 
@@ -86,55 +129,85 @@ class ProfiledPIDController:
         return self.m_controller.at_setpoint()
 
     def enable_continuous_input(self, minimum_input, maximum_input):
-        self.m_controller.enable_continuous_input(minimum_input, maximum_input)
+        """
+        Treat the input range as a circle (for example -pi to pi for a heading), so the profile always takes the
+        shortest way around to the goal
+
+        Args:
+            minimum_input: The bottom of the input range
+            maximum_input: The top of the input range, equivalent to minimum_input
+        """
+        self.m_continuous = True
         self.m_minimumInput = minimum_input
         self.m_maximumInput = maximum_input
 
     def disable_continuous_input(self):
-        self.m_controller.disable_continuous_input()
-
-    def set_integrator_range(self, minimum_integral, maximum_integral):
-        self.m_controller.set_integrator_range(minimum_integral, maximum_integral)
-
-    def set_tolerance(self, position_tolerance, velocity_tolerance=float('inf')):
-        self.m_controller.set_tolerance(position_tolerance, velocity_tolerance)
-
-    def get_position_error(self):
-        return self.m_controller.get_position_error()
+        self.m_continuous = False
 
-    def get_velocity_error(self):
-        return self.m_controller.get_velocity_error()
+    def is_continuous_input_enabled(self):
+        return self.m_continuous
 
     def calculate(self, measurement, goal=None, constraints=None):
-        if goal:
+        """
+        Advance the profile and calculate the PID output towards its new setpoint
+
+        Args:
+            measurement: The current position of the mechanism
+            goal: An optional new goal, see set_goal
+            constraints: Optional new profile constraints
+
+        Returns:
+            The PID output
+        """
+        if goal is not None:
             self.set_goal(goal)
-        if constraints:
+        if constraints is not None:
             self.set_constraints(constraints)
 
-        if self.m_controller.is_continuous_input_enabled():
-            error_bound = (self.m_maximumInput - self.m_minimumInput) / 2.0
-            goal_min_distance = math_util.input_modulus(self.m_goal.position - measurement, -error_bound, error_bound)
-            setpoint_min_distance = math_util.input_modulus(self.m_setpoint.position - measurement, -error_bound, error_bound)
-
-            self.m_goal.position = goal_min_distance + measurement
-            self.m_setpoint.position = setpoint_min_distance + measurement
+        current_time = self.m_timer.time(SECONDS)
+        delta_time = current_time - self.m_previousTime
+        if delta_time < self.m_period:
+            return self.m_output
+        self.m_previousTime = current_time
 
-        self.m_setpoint = self.m_profile.calculate(self.get_period(), self.m_setpoint, self.m_goal)
-        return self.m_controller.calculate(measurement, self.m_setpoint.position)
+        if self.m_continuous:
+            # Move the goal and setpoint to whichever of their equivalent positions is closest to the measurement
+            error_bound = (self.m_maximumInput - self.m_minimumInput) / 2.0
+            self.m_goal = State(
+                input_modulus(self.m_goal.position - measurement, -error_bound, error_bound)
+                + measurement,
+                self.m_goal.velocity,
+            )
+            self.m_setpoint = State(
+                input_modulus(
+                    self.m_setpoint.position - measurement, -error_bound, error_bound
+                )
+                + measurement,
+                self.m_setpoint.velocity,
+            )
+
+        self.m_setpoint = self.m_profile.calculate(
+            delta_time, self.m_setpoint, self.m_goal
+        )
+        self.m_controller.setpoint = self.m_setpoint.position
+        self.m_controller.time_step = delta_time
+        self.m_output = self.m_controller.update(measurement)
+        return self.m_output
 
     def reset(self, measurement):
-        self.m_controller.reset()
+        """
+        Restart the profile from the given state, use this after the mechanism has been moved some other way
+
+        Args:
+            measurement: A State, or a position the mechanism is at rest at
+        """
+        if not isinstance(measurement, State):
+            measurement = State(measurement, 0.0)
         self.m_setpoint = measurement
-
-    def init_sendable(self, builder):
-        builder.set_smart_dashboard_type("ProfiledPIDController")
-        builder.add_double_property("p", self.get_p, self.set_p)
-        builder.add_double_property("i", self.get_i, self.set_i)
-        builder.add_double_property("d", self.get_d, self.set_d)
-        builder.add_double_property("izone", self.get_izone, self.set_integral_zone)
-        builder.add_double_property("goal", lambda: self.get_goal().position, self.set_goal)
-
-
+        self.m_controller.setpoint = measurement.position
+        self.m_controller.reset()
+        self.m_previousTime = self.m_timer.time(SECONDS)
+        self.m_output = 0.0
 
 
 if __name__ == "__main__":
@@ -145,8 +218,17 @@ if __name__ == "__main__":
     max_velocity = 1.0  # m/s
     max_acceleration = 0.2  # m/s^2
 
-    trapezoidal_movement_constraints = Constraints(max_velocity, max_acceleration)
-
-    PID_controller = PIDController(timer, 1, 0, 0, 0.05, 1)
-
-    profiledPID = ProfiledPID(PID_controller, trapezoidal_movement_constraints)
+    controller = ProfiledPIDController(
+        timer, 1, 0, 0, Constraints(max_velocity, max_acceleration), 0.02
+    )
+    controller.set_goal(1)
+
+    # Drive a simulated mechanism whose velocity is the controller's output
+    position = 0.0
+    previous_time = timer.time(SECONDS)
+    while abs(controller.get_goal().position - position) > 0.001:
+        current_time = timer.time(SECONDS)
+        position += controller.calculate(position) * (current_time - previous_time)
+        previous_time = current_time
+        print(round(controller.get_setpoint().position, 3), round(position, 3))
+        wait(controller.get_period(), SECONDS)
@@ -0,0 +1,304 @@
+"""
+Measure how long named sections of code take, to find out where the brain's time goes
+
+Each section keeps a call count, the minimum, mean and maximum time and a histogram of every time it has recorded, so
+percentiles (for example the 99th, the time that only 1 call in 100 takes longer than) can be read without storing the
+individual times. The histogram is allocated once, when the section is created, so recording never allocates.
+
+    @profile("PurePursuit.update")
+    def update(self):
+        ...
+
+    with section("Display"):
+        ...
+
+Tasks added to a Runtime are profiled under their own names automatically. Print the results with print_report, or
+record them to a telemetry log with ProfileTelemetry.
+
+Profiling is switched on by Constants.profiling_enabled. While it is off, profile returns the function it is given
+unchanged, so decorated functions cost nothing at all, and section returns a shared section that records nothing, so a
+with block costs two empty method calls.
+
+Histogram buckets are spaced like floating point numbers, 8 buckets for each power of two microseconds, so a bucket's
+width is at most 1/8 of the times it holds and percentiles are accurate to within 12.5%. Times past the last bucket
+(about a quarter of a second) go in the last bucket.
+"""
+
+try:
+    from uarray import array
+except ImportError:
+    # Running on a computer rather than the brain
+    from array import array
+
+try:
+    from time import ticks_diff, ticks_us
+except ImportError:
+    # Running on a computer rather than the brain
+    from time import perf_counter_ns
+
+    def ticks_us():
+        return perf_counter_ns() // 1000
+
+    def ticks_diff(end, start):
+        return end - start
+
+
+import Constants
+
+SUB_BUCKET_BITS = 3
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+BUCKET_COUNT = 128
+
+
+def bucket_index(time_us: int) -> int:
+    """
+    Get the histogram bucket that holds a time
+    """
+    if time_us < SUB_BUCKETS:
+        return max(0, time_us)
+    exponent = time_us.bit_length() - SUB_BUCKET_BITS - 1
+    index = SUB_BUCKETS * (exponent + 1) + (time_us >> exponent) - SUB_BUCKETS
+    return index if index < BUCKET_COUNT else BUCKET_COUNT - 1
+
+
+def bucket_upper_bound(index: int) -> int:
+    """
+    Get the longest time, in microseconds, that goes in a histogram bucket
+    """
+    if index < SUB_BUCKETS:
+        return index
+    exponent = index // SUB_BUCKETS - 1
+    mantissa = index % SUB_BUCKETS + SUB_BUCKETS
+    return ((mantissa + 1) << exponent) - 1
+
+
+class Section:
+    """
+    The recorded times of one named section of code, get one with Profiler.section
+
+    A section is also a context manager that times its with block, it holds a single start time so don't nest a
+    section inside itself or time it from two threads at once.
+
+    Args:
+        name: The name to report the section as
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.histogram = array("I", [0] * BUCKET_COUNT)
+        self._start_us = 0
+        self.reset()
+
+    def reset(self):
+        for index in range(BUCKET_COUNT):
+            self.histogram[index] = 0
+        self.count = 0
+        self.total_us = 0
+        self.minimum_us = 0
+        self.maximum_us = 0
+
+    def record(self, time_us: int):
+        """
+        Record one timed call
+
+        Args:
+            time_us: How long the call took in microseconds
+        """
+        time_us = int(time_us)
+        if not self.count or time_us < self.minimum_us:
+            self.minimum_us = time_us
+        if time_us > self.maximum_us:
+            self.maximum_us = time_us
+        self.count += 1
+        self.total_us += time_us
+        self.histogram[bucket_index(time_us)] += 1
+
+    def __enter__(self):
+        self._start_us = ticks_us()
+        return self
+
+    def __exit__(self, *args):
+        self.record(ticks_diff(ticks_us(), self._start_us))
+
+    @property
+    def mean_us(self) -> float:
+        return self.total_us / self.count if self.count else 0.0
+
+    def percentile_us(self, percentile: float) -> int:
+        """
+        Get a time that the given percentage of calls took no longer than, rounded up to the end of its histogram bucket
+
+        Args:
+            percentile: The percentage of calls, 0 to 100
+
+        Returns:
+            The time in microseconds, never more than the longest call recorded, 0 if nothing has been recorded
+        """
+        if not self.count:
+            return 0
+        # The rank of the call at this percentile, counting from 1
+        rank = max(1, self.count * percentile / 100)
+        seen = 0
+        for index in range(BUCKET_COUNT):
+            seen += self.histogram[index]
+            if seen >= rank:
+                return min(bucket_upper_bound(index), self.maximum_us)
+        return self.maximum_us
+
+    def __str__(self):
+        return (
+            self.name
+            + ": "
+            + str(self.count)
+            + " calls, min "
+            + str(self.minimum_us)
+            + "us, mean "
+            + str(round(self.mean_us))
+            + "us, p99 "
+            + str(self.percentile_us(99))
+            + "us, max "
+            + str(self.maximum_us)
+            + "us"
+        )
+
+
+class _DisabledSection:
+    """
+    Stands in for every section while profiling is off, recording nothing
+    """
+
+    name = ""
+    count = 0
+
+    def record(self, time_us):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+_DISABLED_SECTION = _DisabledSection()
+
+
+class Profiler:
+    """
+    A set of named sections
+
+    Args:
+        enabled: Whether to record anything, while False section returns a section that records nothing and profile
+            leaves functions unchanged
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._sections = {}
+
+    def section(self, name: str):
+        """
+        Get the section with a name, creating it the first time
+
+        Returns:
+            The Section, or a section that records nothing if profiling is off
+        """
+        if not self.enabled:
+            return _DISABLED_SECTION
+        found = self._sections.get(name)
+        if found is None:
+            found = self._sections[name] = Section(name)
+        return found
+
+    def profile(self, name: str = None):
+        """
+        A decorator that times every call to a function
+
+        Args:
+            name: The section to record to, defaults to the function's name
+        """
+
+        def decorator(function):
+            if not self.enabled:
+                return function
+            timed_section = self.section(
+                name if name is not None else function.__name__
+            )
+
+            def timed(*args, **kwargs):
+                start_us = ticks_us()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    timed_section.record(ticks_diff(ticks_us(), start_us))
+
+            return timed
+
+        return decorator
+
+    def sections(self):
+        """
+        Returns:
+            Every section, in the order they were created
+        """
+        return list(self._sections.values())
+
+    def reset(self):
+        for timed_section in self._sections.values():
+            timed_section.reset()
+
+    def print_report(self, print_function=print):
+        """
+        Print one line per section, for example to a Terminal's print or the brain screen's
+        """
+        for timed_section in self._sections.values():
+            print_function(str(timed_section))
+
+
+class ProfileTelemetry:
+    """
+    Record a summary of every section to a telemetry log (see Telemetry.py) each update, on a channel named
+    "profile." followed by the section's name, add it to a Runtime to record periodically
+
+    The channels of the sections that already exist are declared straight away, create it once the Runtime's tasks
+    have been added. Sections created later get their channel the first time they are recorded.
+
+    Args:
+        telemetry: The Telemetry to record to
+        profiler: The Profiler to summarize
+    """
+
+    FIELDS = ("count", "minimum_us", "mean_us", "p99_us", "maximum_us")
+    FORMAT = "IIfII"
+
+    def __init__(self, telemetry, profiler):
+        self.telemetry = telemetry
+        self.profiler = profiler
+        self._channels = {}
+        for timed_section in profiler.sections():
+            self._declare(timed_section)
+
+    def _declare(self, timed_section):
+        channel = self._channels[timed_section.name] = self.telemetry.channel(
+            "profile." + timed_section.name, self.FIELDS, self.FORMAT
+        )
+        return channel
+
+    def update(self):
+        for timed_section in self.profiler.sections():
+            channel = self._channels.get(timed_section.name)
+            if channel is None:
+                channel = self._declare(timed_section)
+            self.telemetry.record(
+                channel,
+                timed_section.count,
+                timed_section.minimum_us,
+                timed_section.mean_us,
+                timed_section.percentile_us(99),
+                timed_section.maximum_us,
+            )
+
+
+profiler = Profiler(Constants.profiling_enabled)
+section = profiler.section
+profile = profiler.profile
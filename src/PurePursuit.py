@@ -0,0 +1,270 @@
+import math
+
+from Utilities import hypotenuse
+
+
+class PurePursuit:
+    """
+    A holonomic pure pursuit path follower, instead of stopping and turning at every waypoint the robot continuously
+    steers towards a "lookahead" point that slides along the path ahead of it, translating and rotating at the same time
+
+    Args:
+        point_list: The path to follow as a list of (x, y) points in centimeters, this can be the output of the path
+            planner or of the path creator
+        maximum_speed: The fastest speed (0-1) that the robot is allowed to travel along the path
+        lookahead_distance_cm: How far ahead of the robot to place the point it steers towards
+        point_spacing_cm: The maximum distance between two points of the path, sparser paths are filled in with
+            points along the straight line between waypoints so that curvature and speeds are well-defined
+        curvature_speed_gain: The speed at each point is limited to (curvature_speed_gain / curvature),
+            so sharper turns are taken slower
+        maximum_deceleration: How quickly (speed per centimeter travelled) the robot may slow down approaching
+            sharp turns and the end of the path
+        minimum_speed: The slowest speed that the follower will command before the end of the path is reached
+        end_tolerance_cm: How close to the final point the robot must be for the path to be finished
+    """
+
+    def __init__(
+        self,
+        point_list,
+        maximum_speed: float,
+        lookahead_distance_cm: float,
+        point_spacing_cm: float = 5,
+        curvature_speed_gain: float = 0.05,
+        maximum_deceleration: float = 0.01,
+        minimum_speed: float = 0.15,
+        end_tolerance_cm: float = 3,
+    ):
+        self.lookahead_distance_cm = lookahead_distance_cm
+        self.minimum_speed = minimum_speed
+        self.end_tolerance_cm = end_tolerance_cm
+
+        self.points = self._fill_path(
+            [(float(x), float(y)) for x, y in point_list], point_spacing_cm
+        )
+        if len(self.points) < 2:
+            raise ValueError("A path must contain at least two unique points")
+
+        self.distances = self._calculate_distances(self.points)
+        self.speeds = self._calculate_speeds(
+            self.points,
+            self.distances,
+            maximum_speed,
+            curvature_speed_gain,
+            maximum_deceleration,
+        )
+
+        self._closest_index = 0
+        self._lookahead_progress = 0.0
+        self.finished = False
+
+    @staticmethod
+    def _fill_path(points, spacing_cm):
+        """
+        Insert evenly spaced points between waypoints that are further than spacing_cm apart, and drop duplicates
+        """
+        filled_points = [points[0]]
+        for x, y in points[1:]:
+            last_x, last_y = filled_points[-1]
+            segment_length = hypotenuse(x - last_x, y - last_y)
+            if segment_length == 0:
+                continue
+            steps = int(math.ceil(segment_length / spacing_cm))
+            for step in range(1, steps + 1):
+                fraction = step / steps
+                filled_points.append(
+                    (last_x + (x - last_x) * fraction, last_y + (y - last_y) * fraction)
+                )
+        return filled_points
+
+    @staticmethod
+    def _calculate_distances(points):
+        """
+        Calculate the distance along the path from the first point to each point
+        """
+        distances = [0.0]
+        for i in range(1, len(points)):
+            distances.append(
+                distances[-1]
+                + hypotenuse(
+                    points[i][0] - points[i - 1][0], points[i][1] - points[i - 1][1]
+                )
+            )
+        return distances
+
+    @staticmethod
+    def curvature(previous_point, point, next_point) -> float:
+        """
+        Calculate the curvature (1 / radius) of the circle passing through three points
+
+        Args:
+            previous_point: The point before the point to calculate the curvature at
+            point: The point to calculate the curvature at
+            next_point: The point after the point to calculate the curvature at
+
+        Returns:
+            The curvature at point, 0 for a straight line
+        """
+        side_a = hypotenuse(point[0] - previous_point[0], point[1] - previous_point[1])
+        side_b = hypotenuse(next_point[0] - point[0], next_point[1] - point[1])
+        side_c = hypotenuse(
+            next_point[0] - previous_point[0], next_point[1] - previous_point[1]
+        )
+        if side_a * side_b * side_c == 0:
+            return 0.0
+        # Twice the signed area of the triangle formed by the three points
+        cross_product = (point[0] - previous_point[0]) * (next_point[1] - point[1]) - (
+            point[1] - previous_point[1]
+        ) * (next_point[0] - point[0])
+        return 2 * abs(cross_product) / (side_a * side_b * side_c)
+
+    def _calculate_speeds(
+        self, points, distances, maximum_speed, curvature_speed_gain, deceleration
+    ):
+        """
+        Calculate the target speed at each point of the path, limited by the curvature at that point and by how
+        quickly the robot is able to slow down for the sharper turns (and the stop) ahead of it
+        """
+        speeds = [maximum_speed] * len(points)
+        for i in range(1, len(points) - 1):
+            point_curvature = self.curvature(points[i - 1], points[i], points[i + 1])
+            if point_curvature > 0:
+                speeds[i] = min(maximum_speed, curvature_speed_gain / point_curvature)
+        speeds[-1] = 0.0
+
+        # Backward pass, make sure that we can slow down in time for every point ahead of us (v² = v₀² + 2ad)
+        for i in range(len(points) - 2, -1, -1):
+            speeds[i] = min(
+                speeds[i],
+                math.sqrt(
+                    speeds[i + 1] ** 2 + 2 * deceleration * (distances[i + 1] - distances[i])
+                ),
+            )
+        return speeds
+
+    def _update_closest_index(self, position):
+        """
+        Advance the closest point index, the search only ever moves forward so the robot can't skip back to an
+        earlier part of the path that happens to cross near its current position
+        """
+        search_end = len(self.points)
+        closest_distance = math.inf
+        for i in range(self._closest_index, search_end):
+            distance = hypotenuse(
+                self.points[i][0] - position[0], self.points[i][1] - position[1]
+            )
+            if distance < closest_distance:
+                closest_distance = distance
+                self._closest_index = i
+            elif distance > closest_distance + self.lookahead_distance_cm:
+                # We are well past the closest point, no need to keep searching
+                break
+
+    def _find_lookahead_point(self, position):
+        """
+        Find the furthest intersection of the lookahead circle around the robot with the path ahead of the closest point
+        """
+        x, y = position
+        lookahead_point = None
+
+        for i in range(self._closest_index, len(self.points) - 1):
+            if (
+                self.distances[i] - self.distances[self._closest_index]
+                > 2 * self.lookahead_distance_cm
+            ):
+                # No segment this far along the path can intersect the lookahead circle
+                break
+
+            start_x, start_y = self.points[i]
+            end_x, end_y = self.points[i + 1]
+
+            segment_x = end_x - start_x
+            segment_y = end_y - start_y
+            offset_x = start_x - x
+            offset_y = start_y - y
+
+            # Solve |start + t * segment - position| = lookahead for t
+            a = segment_x * segment_x + segment_y * segment_y
+            b = 2 * (offset_x * segment_x + offset_y * segment_y)
+            c = (
+                offset_x * offset_x
+                + offset_y * offset_y
+                - self.lookahead_distance_cm * self.lookahead_distance_cm
+            )
+            discriminant = b * b - 4 * a * c
+            if discriminant < 0:
+                continue
+
+            discriminant = math.sqrt(discriminant)
+            for t in ((-b + discriminant) / (2 * a), (-b - discriminant) / (2 * a)):
+                if 0 <= t <= 1 and i + t >= self._lookahead_progress:
+                    self._lookahead_progress = i + t
+                    lookahead_point = (start_x + t * segment_x, start_y + t * segment_y)
+                    break
+
+        if lookahead_point is None:
+            # The path is entirely inside of (or outside of) the lookahead circle,
+            # steer towards the last lookahead point we found, or the closest point if there isn't one yet
+            progress = max(self._lookahead_progress, self._closest_index)
+            index = min(int(progress), len(self.points) - 2)
+            t = min(progress - index, 1)
+            start_x, start_y = self.points[index]
+            end_x, end_y = self.points[index + 1]
+            lookahead_point = (
+                start_x + (end_x - start_x) * t,
+                start_y + (end_y - start_y) * t,
+            )
+        return lookahead_point
+
+    def update(self, position):
+        """
+        Calculate the movement needed to follow the path from the robot's current position
+
+        Args:
+            position (tuple[float, float]): The robot's current position in centimeters (x, y)
+
+        Returns:
+            A tuple of (direction_rad, speed, target_heading_rad), direction_rad is the field-relative direction to
+            drive in, speed is the speed (0-1) to drive at and target_heading_rad is the heading that points the front
+            of the robot along the path
+        """
+        self._update_closest_index(position)
+
+        end_x, end_y = self.points[-1]
+        distance_to_end = hypotenuse(end_x - position[0], end_y - position[1])
+
+        if distance_to_end <= self.lookahead_distance_cm and (
+            self.distances[-1] - self.distances[self._closest_index]
+            <= self.lookahead_distance_cm
+        ):
+            # We are on the last stretch of the path, aim directly for the final point
+            target_x, target_y = end_x, end_y
+        else:
+            target_x, target_y = self._find_lookahead_point(position)
+
+        if (
+            distance_to_end <= self.end_tolerance_cm
+            and self._closest_index >= len(self.points) - 2
+        ):
+            self.finished = True
+            return 0.0, 0.0, self.target_heading_rad
+
+        direction_rad = math.atan2(target_y - position[1], target_x - position[0])
+        # Never command less than the minimum speed before we arrive or the robot will stall short of the end
+        speed = max(self.speeds[self._closest_index], self.minimum_speed)
+
+        return direction_rad, speed, self.target_heading_rad
+
+    @property
+    def target_heading_rad(self) -> float:
+        """
+        Get the heading that points the front of the robot along the path at the robot's current position
+
+        Returns:
+            The heading in radians
+        """
+        index = min(self._closest_index, len(self.points) - 2)
+        start_x, start_y = self.points[index]
+        end_x, end_y = self.points[index + 1]
+        # On the drivetrain a heading of 0 rad faces up the y axis (direction pi / 2), so shift the direction
+        # of the path by pi / 2 in order to point the front of the robot in the direction that it is travelling
+        return math.atan2(end_y - start_y, end_x - start_x) - math.pi / 2
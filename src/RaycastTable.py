@@ -0,0 +1,185 @@
+"""
+A precomputed table of the distance a distance sensor would read from every position and direction on the field, built
+on a computer by utils/raycast_table_builder.py so neither the simulation nor the robot has to cast rays
+
+File layout (little-endian):
+    Header: magic (4 bytes, b"VRAY"), format version (uint16), width in cells (uint16), height in cells (uint16),
+            angle bins (uint16), cell size (float32), range resolution (float32)
+    Ranges: width * height * angle bins uint8 ranges, ordered by row (y = 0 first), then cell, then angle, so every
+            direction from one cell is a single contiguous read. Each range is in multiples of the range resolution,
+            NO_HIT (255) means nothing is within range
+
+Angles are measured as in get_collision_point, an angle of 0 points along +y and positive angles turn towards +x.
+
+On a computer the file is memory mapped, on the brain (which has no mmap) each query seeks and reads from the file, either
+way only the ranges asked for are read and a query takes the same time however large the table is.
+"""
+
+import math
+
+try:
+    import ustruct as struct
+except ImportError:
+    # Running on a computer rather than the brain
+    import struct
+
+try:
+    import mmap
+except ImportError:
+    # Running on the brain, queries read from the file instead
+    mmap = None
+
+RAYCAST_TABLE_MAGIC = b"VRAY"
+RAYCAST_TABLE_VERSION = 1
+HEADER_FORMAT = "<4sHHHHff"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+NO_HIT = 255
+
+
+def write_raycast_table(
+    file_name: str,
+    width,
+    height,
+    angle_bins,
+    cell_size,
+    range_resolution,
+    rows,
+):
+    """
+    Write a raycast table file
+
+    Args:
+        file_name: The path of the file to write
+        width: The number of cells along x
+        height: The number of cells along y
+        angle_bins: The number of directions per cell
+        cell_size: The width of each cell
+        range_resolution: The distance each step of a stored range stands for
+        rows: An iterable of height bytes-like rows, each width * angle_bins ranges
+    """
+    with open(file_name, "wb") as raycast_table_file:
+        raycast_table_file.write(
+            struct.pack(
+                HEADER_FORMAT,
+                RAYCAST_TABLE_MAGIC,
+                RAYCAST_TABLE_VERSION,
+                width,
+                height,
+                angle_bins,
+                cell_size,
+                range_resolution,
+            )
+        )
+        for row in rows:
+            if len(row) != width * angle_bins:
+                raise ValueError("Every row must hold width * angle_bins ranges")
+            raycast_table_file.write(bytes(row))
+
+
+class RaycastTable:
+    """
+    Look up the expected range of a distance sensor from a raycast table file, use as a context manager or call close
+
+    Args:
+        file_name: The path of the table to open
+
+    Raises:
+        ValueError: If the file is not a raycast table or was written by an incompatible version
+    """
+
+    def __init__(self, file_name: str):
+        self._file = open(file_name, "rb")
+        header = self._file.read(HEADER_SIZE)
+        if len(header) != HEADER_SIZE:
+            self._file.close()
+            raise ValueError("Raycast table file is too short to contain a header")
+        (
+            magic,
+            version,
+            self.width,
+            self.height,
+            self.angle_bins,
+            self.cell_size,
+            self.range_resolution,
+        ) = struct.unpack(HEADER_FORMAT, header)
+        if magic != RAYCAST_TABLE_MAGIC:
+            self._file.close()
+            raise ValueError("Not a raycast table file")
+        if version != RAYCAST_TABLE_VERSION:
+            self._file.close()
+            raise ValueError("Unsupported raycast table version " + str(version))
+        self._angle_bin_size = 2 * math.pi / self.angle_bins
+        self._map = None
+        if mmap is not None:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def _offset(self, x, y):
+        """
+        Get the file offset of the first range of the cell containing a point, or None if the point is off the table
+        """
+        if x < 0 or y < 0:
+            return None
+        cell_x = int(x / self.cell_size)
+        cell_y = int(y / self.cell_size)
+        if cell_x >= self.width or cell_y >= self.height:
+            return None
+        return HEADER_SIZE + (cell_y * self.width + cell_x) * self.angle_bins
+
+    def _read(self, offset, count):
+        if self._map is not None:
+            return self._map[offset : offset + count]
+        self._file.seek(offset)
+        return self._file.read(count)
+
+    def _to_range(self, stored):
+        return None if stored == NO_HIT else stored * self.range_resolution
+
+    def angle_bin(self, angle_rad):
+        """
+        Get the index of the angle bin nearest an angle
+        """
+        return int(round(angle_rad / self._angle_bin_size)) % self.angle_bins
+
+    def expected_range(self, x, y, angle_rad):
+        """
+        Get the distance to the nearest obstacle from a point in a direction
+
+        Args:
+            x: The point's x position
+            y: The point's y position
+            angle_rad: The direction to look in
+
+        Returns:
+            The distance, or None if nothing is in range or the point is off the table
+        """
+        offset = self._offset(x, y)
+        if offset is None:
+            return None
+        return self._to_range(self._read(offset + self.angle_bin(angle_rad), 1)[0])
+
+    def expected_ranges(self, x, y):
+        """
+        Get the distance to the nearest obstacle from a point in every direction, with one read
+
+        Returns:
+            A list with the range (or None) for each angle bin, bin i points at angle i * 2pi / angle_bins, or None if
+            the point is off the table
+        """
+        offset = self._offset(x, y)
+        if offset is None:
+            return None
+        return [
+            self._to_range(stored) for stored in self._read(offset, self.angle_bins)
+        ]
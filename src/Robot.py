@@ -39,14 +39,37 @@ from Autonomous import (
 )
 from Catapult import Catapult
 from Climber import Climber
+from Commands import CommandScheduler
+from ControlScheduler import ControlScheduler
 from HolonomicDrivetrain import Drivetrain
 from PneumaticWings import Wings
 from RollerIntake import Intake
+from Profiler import ProfileTelemetry, profiler
+from Runtime import Runtime
 from SetupUI import SetupUI
+from Telemetry import DrivetrainTelemetry, Telemetry
 import Constants
 from Utilities import *
 
 
+def field_coordinates_to_screen_coordinates(position):
+    """
+    Convert x,y coordinates from the field (0,0 at bottom left) to the right half of the screen (0,0 at top left)
+
+    Args:
+        position: The position to convert
+
+    Returns:
+        The converted position
+    """
+    x, y = position
+    x *= (Constants.screen_size_x / 2) / Constants.field_x_size
+    y *= Constants.screen_size_y / Constants.field_y_size
+
+    y = Constants.screen_size_y - y  # Flip Y axis
+    return x, y
+
+
 class Robot:
     """
     Represents a robot
@@ -70,6 +93,59 @@ class Robot:
         self.catapult = Catapult()
         self.drivetrain = Drivetrain(timer=self.brain.timer, terminal=self.terminal)
 
+        # Runs every command (autonomous moves and subsystem actions) at a fixed rate
+        self.command_scheduler = CommandScheduler(
+            self.brain.timer, Constants.command_scheduler_period_ms
+        )
+
+        # Updates every MotorPID registered with it at a fixed rate
+        self.control_scheduler = ControlScheduler(
+            self.brain.timer, Constants.control_scheduler_period_ms
+        )
+
+        # Runs every subsystem's periodic update, and both schedulers, from one thread, earliest deadline first
+        self.runtime = Runtime(self.brain.timer)
+        self.runtime.add_task(
+            self.drivetrain.update_odometry, Constants.odometry_period_ms, "Odometry"
+        )
+        self.runtime.add_task(
+            self.control_scheduler.run,
+            Constants.control_scheduler_period_ms,
+            "Control scheduler",
+        )
+        self.command_scheduler.add_to_runtime(self.runtime)
+        self.runtime.add_task(
+            self.catapult.update, Constants.catapult_period_ms, "Catapult"
+        )
+        self.runtime.add_task(
+            self.climber.update, Constants.subsystem_period_ms, "Climber"
+        )
+        self.runtime.add_task(
+            self.intake.update, Constants.subsystem_period_ms, "Intake"
+        )
+        self.runtime.add_task(self.wings.update, Constants.subsystem_period_ms, "Wings")
+        self.display_task = None
+        self.display_started = False
+        self.runtime.start()
+
+        # Records the drivetrain every control tick, after the motor controllers have run
+        self.telemetry = None
+        if Constants.telemetry_enabled:
+            self.telemetry = Telemetry(
+                Constants.log_directory + Constants.telemetry_file, self.brain.timer
+            )
+            self.control_scheduler.register(
+                DrivetrainTelemetry(self.telemetry, self.drivetrain),
+                priority=-1,
+                name="Telemetry",
+            )
+            if profiler.enabled:
+                self.runtime.add_task(
+                    ProfileTelemetry(self.telemetry, profiler).update,
+                    Constants.profile_telemetry_period_ms,
+                    "Profile telemetry",
+                )
+
         # Threads and Flags
         self.driver_control_threads = []
         self.autonomous_threads = []
@@ -207,56 +283,40 @@ class Robot:
                     while self.primary_controller.buttonRight.pressing():
                         pass
 
-    def display_thread(self):
-        # Runs as a background thread during driver control to display information about the robot on the screen
-        def field_coordinates_to_screen_coordinates(position):
-            """
-            Convert x,y coordinates from the field (0,0 at bottom left) to the screen (0,0 at top left)
-
-            Args:
-                position: The position to convert
-
-            Returns:
-                The converted position
-            """
-            x, y = position
-            x *= (Constants.screen_size_x / 2) / Constants.field_x_size
-            y *= Constants.screen_size_y / Constants.field_y_size
-
-            y = Constants.screen_size_y - y  # Flip Y axis
-            return x, y
-
-        while not self.setup_complete:
-            wait(10, MSEC)
-        self.brain.screen.clear_screen()
-        self.brain.screen.set_fill_color(Color.WHITE)
-        while True:
-            self.brain.screen.draw_image_from_file(
-                Constants.deploy_directory + "Field.png", 240, 0
-            )
-
-            current_x, current_y = field_coordinates_to_screen_coordinates(
-                self.drivetrain.current_position
-            )
-            target_x, target_y = field_coordinates_to_screen_coordinates(
-                self.drivetrain.target_position
-            )
+    def update_display(self):
+        """
+        Runs from the runtime during driver control to display information about the robot on the screen
+        """
+        if not self.setup_complete:
+            return
+        if not self.display_started:
+            self.brain.screen.clear_screen()
+            self.brain.screen.set_fill_color(Color.WHITE)
+            self.display_started = True
+        self.brain.screen.draw_image_from_file(
+            Constants.deploy_directory + "Field.png", 240, 0
+        )
 
-            self.brain.screen.set_pen_color(Color.CYAN)
-            self.brain.screen.set_fill_color(Color.CYAN)
+        current_x, current_y = field_coordinates_to_screen_coordinates(
+            self.drivetrain.current_position
+        )
+        target_x, target_y = field_coordinates_to_screen_coordinates(
+            self.drivetrain.target_position
+        )
 
-            self.brain.screen.draw_circle(
-                current_x + Constants.screen_size_x / 2, current_y, 3
-            )
+        self.brain.screen.set_pen_color(Color.CYAN)
+        self.brain.screen.set_fill_color(Color.CYAN)
 
-            self.brain.screen.set_pen_color(Color.RED)
-            self.brain.screen.set_fill_color(Color.RED)
+        self.brain.screen.draw_circle(
+            current_x + Constants.screen_size_x / 2, current_y, 3
+        )
 
-            self.brain.screen.draw_circle(
-                target_x + Constants.screen_size_x / 2, target_y, 3
-            )
+        self.brain.screen.set_pen_color(Color.RED)
+        self.brain.screen.set_fill_color(Color.RED)
 
-            wait(100, MSEC)
+        self.brain.screen.draw_circle(
+            target_x + Constants.screen_size_x / 2, target_y, 3
+        )
 
     def autonomous_handler(self):
         """
@@ -269,7 +329,7 @@ class Robot:
         ):
             wait(5, MSEC)
 
-        self.drivetrain.rotation_PID.setpoint = self.drivetrain.current_direction_rad
+        self.drivetrain.hold_current_heading()
         self.drivetrain.clear_direction_PID_output()
         self.drivetrain.target_position = self.drivetrain.current_position
 
@@ -294,24 +354,26 @@ class Robot:
         ):
             wait(5, MSEC)
 
-        self.drivetrain.rotation_PID.setpoint = self.drivetrain.current_direction_rad
+        self.drivetrain.hold_current_heading()
         self.drivetrain.clear_direction_PID_output()
         self.drivetrain.target_position = self.drivetrain.current_position
 
         self.drivetrain.stop()
         self.clear()
 
-        for _function in (
-            self.on_driver_control,
-            self.display_thread,
-        ):
+        for _function in (self.on_driver_control,):
             self.driver_control_threads.append(Thread(_function))
+        self.display_started = False
+        self.display_task = self.runtime.add_task(
+            self.update_display, Constants.display_period_ms, "Display"
+        )
 
         self.print("Started all driver control tasks")
         while self.competition.is_driver_control() and self.competition.is_enabled():
             wait(10, MSEC)
         for thread in self.driver_control_threads:
             thread.stop()
+        self.runtime.remove_task(self.display_task)
         self.print("Stopped all driver control tasks")
 
     def main(self):
@@ -25,8 +25,6 @@ class Intake:
         self.manual_control = False
         self.state = Constants.IntakeState.off
 
-        self.update_thread = Thread(self.intake_loop)
-
     def pull_in(self):
         self.manual_control = False
         self.state = Constants.IntakeState.pull_in
@@ -47,13 +45,14 @@ class Intake:
         self.manual_control = True
         self._set_velocity(velocity)
 
-    def intake_loop(self):
-        while True:
-            if not self.manual_control:
-                if self.state == Constants.IntakeState.pull_in:
-                    self._set_velocity(100)
-                elif self.state == Constants.IntakeState.push_out:
-                    self._set_velocity(-100)
-                elif self.state == Constants.IntakeState.off:
-                    self._set_velocity(0)
-            wait(100, MSEC)
+    def update(self):
+        """
+        Send the intake's state to its motors, the robot runs this from its Runtime
+        """
+        if not self.manual_control:
+            if self.state == Constants.IntakeState.pull_in:
+                self._set_velocity(100)
+            elif self.state == Constants.IntakeState.push_out:
+                self._set_velocity(-100)
+            elif self.state == Constants.IntakeState.off:
+                self._set_velocity(0)
@@ -0,0 +1,263 @@
+"""
+Run every subsystem's periodic work from one asyncio event loop (uasyncio on the brain), instead of a thread per
+subsystem each waiting on its own cadence
+
+Each task is a plain function doing one step of work, added with the period it should run at and optionally a deadline
+shorter than its period. Whenever more than one task is due, the one whose deadline is soonest runs first (earliest
+deadline first), and when none are due the loop waits until the next one is, so no time is spent spinning and the
+brain's other threads get to run. Tasks run to completion one at a time, so they never interrupt each other part way
+through. Coroutines (for example a sequence of autonomous moves) can run alongside the periodic tasks with spawn.
+
+The time each task takes, how late it started and how many deadlines it missed are recorded in its TaskStatistics, and
+the runtime keeps track of how much of the time it spent busy. While profiling is on (see Profiler.py) each task's
+times also go into a profiler section named after the task, for percentiles. A task that raises an exception is counted and logged,
+and keeps being run.
+"""
+
+from vex import MSEC, Thread, wait
+
+from Logger import get_logger
+from Profiler import profiler, ticks_diff, ticks_us
+
+try:
+    import uasyncio as asyncio
+except ImportError:
+    # Running on a computer rather than the brain
+    import asyncio
+
+log = get_logger("Runtime")
+
+
+async def sleep_ms(duration_ms):
+    if hasattr(asyncio, "sleep_ms"):
+        await asyncio.sleep_ms(int(duration_ms))
+    else:
+        await asyncio.sleep(duration_ms / 1000)
+
+
+class TaskStatistics:
+    """
+    A periodic task and its timing, created by Runtime.add_task
+
+    Args:
+        function: Called with no arguments to do one step of the task's work
+        name: The name to report the task as
+        period_ms: The time between the starts of consecutive runs
+        deadline_ms: How long after it is due each run must finish by
+        release_ms: When the task is first due
+    """
+
+    def __init__(self, function, name: str, period_ms, deadline_ms, release_ms):
+        self.function = function
+        self.name = name
+        self.section = profiler.section(name) if profiler.enabled else None
+        self.period_ms = period_ms
+        self.deadline_ms = deadline_ms
+        self.release_ms = release_ms
+        self.absolute_deadline_ms = release_ms + deadline_ms
+
+        self.runs = 0
+        self.last_ms = 0.0
+        self.maximum_ms = 0.0
+        self.total_ms = 0.0
+        self.maximum_lateness_ms = 0.0
+        self.missed_deadlines = 0
+        self.errors = 0
+        # Runs that never happened because the task fell more than a whole period behind
+        self.skipped = 0
+
+    def record(self, start_ms, end_ms):
+        """
+        Record one run, and work out when the task is next due
+        """
+        elapsed_ms = end_ms - start_ms
+        self.runs += 1
+        self.last_ms = elapsed_ms
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.maximum_ms:
+            self.maximum_ms = elapsed_ms
+        lateness_ms = start_ms - self.release_ms
+        if lateness_ms > self.maximum_lateness_ms:
+            self.maximum_lateness_ms = lateness_ms
+        if end_ms > self.absolute_deadline_ms:
+            self.missed_deadlines += 1
+
+        self.release_ms += self.period_ms
+        if self.release_ms < end_ms:
+            # Don't try to catch up by running several times back to back
+            skipped = int((end_ms - self.release_ms) // self.period_ms)
+            self.skipped += skipped
+            self.release_ms += skipped * self.period_ms
+        self.absolute_deadline_ms = self.release_ms + self.deadline_ms
+
+    @property
+    def average_ms(self) -> float:
+        return self.total_ms / self.runs if self.runs else 0.0
+
+    def __str__(self):
+        return (
+            self.name
+            + ": every "
+            + str(self.period_ms)
+            + "ms, average "
+            + str(round(self.average_ms, 3))
+            + "ms, max "
+            + str(round(self.maximum_ms, 3))
+            + "ms, max late "
+            + str(round(self.maximum_lateness_ms, 3))
+            + "ms, "
+            + str(self.missed_deadlines)
+            + " missed deadlines"
+        )
+
+
+class Runtime:
+    """
+    Run periodic tasks, earliest deadline first, from one event loop
+
+    Args:
+        timer: A brain.timer object
+    """
+
+    def __init__(self, timer):
+        self.timer = timer
+        self._tasks = []
+        self._running = False
+        self._thread = None
+        # Counts the times the runtime was started, so a loop left over from before a stop knows to exit
+        self._generation = 0
+        self._started_ms = None
+        self.busy_ms = 0.0
+
+    def add_task(self, function, period_ms, name: str = None, deadline_ms=None):
+        """
+        Start running a function periodically, its first run is due straight away
+
+        Args:
+            function: Called with no arguments to do one step of work, it should return rather than loop or wait
+            period_ms: The time between the starts of consecutive runs
+            name: The name to report the task as, defaults to the function's name
+            deadline_ms: How long after it is due each run must finish by, defaults to the period
+
+        Returns:
+            The task's TaskStatistics, pass it to remove_task to stop it
+        """
+        task = TaskStatistics(
+            function,
+            name if name is not None else getattr(function, "__name__", "task"),
+            period_ms,
+            deadline_ms if deadline_ms is not None else period_ms,
+            self.timer.time(MSEC),
+        )
+        # Build a new list rather than appending so a step running in the runtime's thread is unaffected
+        self._tasks = self._tasks + [task]
+        return task
+
+    def remove_task(self, task: TaskStatistics) -> None:
+        self._tasks = [other for other in self._tasks if other is not task]
+
+    def statistics(self):
+        """
+        Returns:
+            The TaskStatistics of every task, in the order they were added
+        """
+        return list(self._tasks)
+
+    @property
+    def utilization(self) -> float:
+        """
+        The fraction of the time since the runtime started that was spent running tasks
+        """
+        if self._started_ms is None:
+            return 0.0
+        elapsed_ms = self.timer.time(MSEC) - self._started_ms
+        return self.busy_ms / elapsed_ms if elapsed_ms > 0 else 0.0
+
+    def step(self):
+        """
+        Run the due task with the earliest deadline, if any task is due
+
+        Returns:
+            0 if a task ran, otherwise how long until the next task is due in milliseconds, or None if there are no tasks
+        """
+        now_ms = self.timer.time(MSEC)
+        chosen = None
+        next_release_ms = None
+        # There are only a handful of tasks, so a scan is cheaper than keeping a heap ordered
+        for task in self._tasks:
+            if task.release_ms <= now_ms:
+                if chosen is None or task.absolute_deadline_ms < chosen.absolute_deadline_ms:
+                    chosen = task
+            elif next_release_ms is None or task.release_ms < next_release_ms:
+                next_release_ms = task.release_ms
+        if chosen is None:
+            return None if next_release_ms is None else next_release_ms - now_ms
+
+        # The brain's timer counts whole milliseconds, too coarse for the profiler's histograms
+        start_us = ticks_us() if chosen.section is not None else 0
+        try:
+            chosen.function()
+        except Exception as error:
+            # One failing subsystem mustn't stop the others, including the drivetrain
+            chosen.errors += 1
+            log.error("%s raised %s", chosen.name, repr(error))
+        if chosen.section is not None:
+            chosen.section.record(ticks_diff(ticks_us(), start_us))
+        end_ms = self.timer.time(MSEC)
+        chosen.record(now_ms, end_ms)
+        self.busy_ms += end_ms - now_ms
+        return 0
+
+    async def _dispatch(self, generation, duration_ms=None):
+        self._started_ms = self.timer.time(MSEC)
+        while self._running and self._generation == generation:
+            if (
+                duration_ms is not None
+                and self.timer.time(MSEC) - self._started_ms >= duration_ms
+            ):
+                break
+            delay_ms = self.step()
+            if delay_ms is None:
+                delay_ms = 10
+            if delay_ms > 0:
+                # The brain only switches threads in wait, an asyncio sleep would keep every other thread waiting
+                # until the next task is due. Spawned coroutines that become due meanwhile run just after.
+                wait(delay_ms, MSEC)
+            # Give spawned coroutines a turn
+            await sleep_ms(0)
+        if self._generation == generation:
+            self._running = False
+            self._thread = None
+
+    def spawn(self, coroutine):
+        """
+        Run a coroutine alongside the periodic tasks, only call this while the runtime is running
+        """
+        return asyncio.create_task(coroutine)
+
+    def run(self, duration_ms=None):
+        """
+        Run the tasks in this thread until stop is called, or for duration_ms if it is given
+        """
+        self._running = True
+        self._generation += 1
+        self._run(self._generation, duration_ms)
+
+    def _run(self, generation, duration_ms=None):
+        asyncio.run(self._dispatch(generation, duration_ms))
+
+    def start(self) -> None:
+        """
+        Run the tasks in their own thread
+        """
+        if self._thread is None:
+            self._running = True
+            self._generation += 1
+            self._thread = Thread(self._run, (self._generation,))
+
+    def stop(self) -> None:
+        """
+        Stop running tasks once the current one finishes, the runtime can be started again straight away
+        """
+        self._running = False
+        self._thread = None
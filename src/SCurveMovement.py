@@ -0,0 +1,324 @@
+from math import sqrt
+from TrapezoidMovement import State
+
+
+class SCurveConstraints:
+    """
+    The limits of a jerk limited (S-curve) profile
+
+    Args:
+        max_velocity: The highest speed the profile may reach
+        max_acceleration: The highest acceleration the profile may reach
+        max_jerk: How quickly the acceleration may change
+    """
+
+    def __init__(self, max_velocity, max_acceleration, max_jerk):
+        if max_velocity <= 0 or max_acceleration <= 0 or max_jerk <= 0:
+            raise ValueError("S-curve constraints must be positive")
+        self.maxVelocity = max_velocity
+        self.maxAcceleration = max_acceleration
+        self.maxJerk = max_jerk
+
+
+def _ramp_times(peak_velocity, max_acceleration, max_jerk):
+    """
+    Find the jerk time and constant acceleration time needed to ramp from rest to a velocity
+
+    Returns:
+        A tuple of (jerk_time, constant_acceleration_time)
+    """
+    if peak_velocity * max_jerk >= max_acceleration * max_acceleration:
+        jerk_time = max_acceleration / max_jerk
+        return jerk_time, peak_velocity / max_acceleration - jerk_time
+    # The velocity is reached before the acceleration limit is
+    return sqrt(peak_velocity / max_jerk), 0.0
+
+
+def solve_s_curve(constraints, distance):
+    """
+    Find the phase durations of a rest to rest S-curve covering a distance
+
+    Args:
+        constraints: An SCurveConstraints
+        distance: The (positive) distance to cover
+
+    Returns:
+        A tuple of (jerk_time, constant_acceleration_time, cruise_time), the profile is made of: jerk up, constant
+        acceleration, jerk down, cruise, jerk down, constant deceleration, jerk up
+    """
+    max_velocity = constraints.maxVelocity
+    max_acceleration = constraints.maxAcceleration
+    max_jerk = constraints.maxJerk
+
+    jerk_time, constant_time = _ramp_times(max_velocity, max_acceleration, max_jerk)
+    # Ramping up and down is symmetrical, together they cover the peak velocity times one ramp's duration
+    ramp_distance = max_velocity * (2 * jerk_time + constant_time)
+    if ramp_distance <= distance:
+        return jerk_time, constant_time, (distance - ramp_distance) / max_velocity
+
+    # The maximum velocity can't be reached, find the highest velocity that leaves room to stop
+    peak_velocity = (distance * sqrt(max_jerk) / 2) ** (2 / 3)
+    if peak_velocity * max_jerk > max_acceleration * max_acceleration:
+        jerk_time = max_acceleration / max_jerk
+        peak_velocity = (
+            (-jerk_time + sqrt(jerk_time * jerk_time + 4 * distance / max_acceleration))
+            * max_acceleration
+            / 2
+        )
+    jerk_time, constant_time = _ramp_times(peak_velocity, max_acceleration, max_jerk)
+    return jerk_time, constant_time, 0.0
+
+
+def _ramp_segments(from_velocity, to_velocity, max_acceleration, max_jerk):
+    """
+    Find the segments of an S-curve that changes velocity, without limiting the velocity reached
+
+    Returns:
+        A tuple of (segments, distance), segments are (duration, jerk) pairs and distance is how far the ramp goes
+    """
+    change = to_velocity - from_velocity
+    if change == 0:
+        return [], 0.0
+    jerk_time, constant_time = _ramp_times(abs(change), max_acceleration, max_jerk)
+    jerk = max_jerk if change > 0 else -max_jerk
+    duration = 2 * jerk_time + constant_time
+    # The velocity changes symmetrically about the middle of the ramp, so its average is halfway between the ends
+    return (
+        [(jerk_time, jerk), (constant_time, 0.0), (jerk_time, -jerk)],
+        (from_velocity + to_velocity) / 2 * duration,
+    )
+
+
+def _rest_to_rest_segments(constraints, distance):
+    jerk_time, constant_time, cruise_time = solve_s_curve(constraints, distance)
+    jerk = constraints.maxJerk
+    return [
+        (jerk_time, jerk),
+        (constant_time, 0.0),
+        (jerk_time, -jerk),
+        (cruise_time, 0.0),
+        (jerk_time, -jerk),
+        (constant_time, 0.0),
+        (jerk_time, jerk),
+    ]
+
+
+def _moving_segments(constraints, velocity, distance):
+    """
+    Find the segments of a profile that starts at a velocity towards the goal (with no acceleration), speeds up to the
+    highest velocity that still leaves room to stop, and comes to rest at the goal
+
+    Returns:
+        The (duration, jerk) segments, or None if the profile can't stop in time from this velocity
+    """
+    max_velocity = constraints.maxVelocity
+    max_acceleration = constraints.maxAcceleration
+    max_jerk = constraints.maxJerk
+
+    def segments_through(peak_velocity):
+        speed_up, speed_up_distance = _ramp_segments(
+            velocity, peak_velocity, max_acceleration, max_jerk
+        )
+        slow_down, slow_down_distance = _ramp_segments(
+            peak_velocity, 0.0, max_acceleration, max_jerk
+        )
+        return speed_up, slow_down, speed_up_distance + slow_down_distance
+
+    speed_up, slow_down, ramp_distance = segments_through(max_velocity)
+    if ramp_distance <= distance:
+        cruise_time = (distance - ramp_distance) / max_velocity
+        return speed_up + [(cruise_time, 0.0)] + slow_down
+    if velocity >= max_velocity or segments_through(velocity)[2] > distance:
+        return None
+
+    # The distance covered grows with the peak velocity, bisect for the peak that covers exactly the distance
+    lower, upper = velocity, max_velocity
+    for _ in range(40):
+        middle = (lower + upper) / 2
+        if segments_through(middle)[2] > distance:
+            upper = middle
+        else:
+            lower = middle
+    speed_up, slow_down, _ = segments_through(lower)
+    return speed_up + slow_down
+
+
+class SCurveProfile:
+    """
+    A 7 segment jerk limited motion profile, the acceleration ramps up and down rather than jumping like it does in a
+    TrapezoidProfile, so the wheels don't slip at the start and end of each phase
+
+    The profile runs from the current position and velocity to rest at the goal (the goal's velocity is not used). It
+    is solved once per start and goal, and each calculate after that is a short branch and a polynomial. Like
+    TrapezoidProfile it can be advanced a tick at a time by passing the state it last returned as the current state,
+    the profile then carries on along the same solution rather than being solved again, so the acceleration stays
+    continuous.
+
+    Args:
+        constraints: An SCurveConstraints
+    """
+
+    # How close a state must be to the last one returned to carry on along the same solution
+    TOLERANCE = 1e-9
+
+    def __init__(self, constraints):
+        self.constraints = constraints
+        self.direction = 1
+        self.current = State()
+        self.goal = State()
+        self._solved_for = None
+        # Time each segment ends at, and the position, velocity, acceleration and jerk it starts with
+        self._end_times = ()
+        self._segment_states = ()
+        # The state calculate last returned and its time into the profile
+        self._last_state = None
+        self._last_time = 0.0
+
+    def _solve(self, current, goal):
+        key = (current.position, current.velocity, goal.position)
+        if key == self._solved_for:
+            return
+        self._solved_for = key
+        self.current = State(current.position, current.velocity)
+        self.goal = State(goal.position, 0.0)
+        self._last_state = None
+
+        distance = goal.position - current.position
+        if distance:
+            self.direction = 1 if distance > 0 else -1
+        else:
+            # Already at the goal, any velocity has to be stopped and undone
+            self.direction = -1 if current.velocity > 0 else 1
+        distance = abs(distance)
+        # Work in the direction of the goal, so velocities towards it are positive
+        velocity = current.velocity * self.direction
+
+        segments = None
+        if velocity == 0:
+            segments = _rest_to_rest_segments(self.constraints, distance)
+        elif velocity > 0:
+            segments = _moving_segments(self.constraints, velocity, distance)
+        if segments is None:
+            # Moving away from the goal, or too fast to stop in time, come to rest and then go back
+            segments, stopping_distance = _ramp_segments(
+                velocity,
+                0.0,
+                self.constraints.maxAcceleration,
+                self.constraints.maxJerk,
+            )
+            remaining = distance - stopping_distance
+            back = 1 if remaining >= 0 else -1
+            segments += [
+                (duration, jerk * back)
+                for duration, jerk in _rest_to_rest_segments(
+                    self.constraints, abs(remaining)
+                )
+            ]
+
+        end_times = []
+        segment_states = []
+        time = 0.0
+        position, velocity, acceleration = current.position, current.velocity, 0.0
+        for duration, segment_jerk in segments:
+            if duration <= 0:
+                continue
+            segment_jerk *= self.direction
+            segment_states.append((position, velocity, acceleration, segment_jerk))
+            position += duration * (
+                velocity + duration * (acceleration / 2 + duration * segment_jerk / 6)
+            )
+            velocity += duration * (acceleration + duration * segment_jerk / 2)
+            acceleration += duration * segment_jerk
+            time += duration
+            end_times.append(time)
+        self._end_times = tuple(end_times)
+        self._segment_states = tuple(segment_states)
+
+    def sample(self, t):
+        """
+        Get the position, velocity and acceleration t seconds into the profile solved by the last calculate
+
+        Returns:
+            A tuple of (position, velocity, acceleration)
+        """
+        end_times = self._end_times
+        if not end_times or t >= end_times[-1]:
+            return self.goal.position, 0.0, 0.0
+        if t < 0:
+            t = 0.0
+
+        segment_start_time = 0.0
+        for i, end_time in enumerate(end_times):
+            if t < end_time:
+                break
+            segment_start_time = end_time
+
+        position, velocity, acceleration, jerk = self._segment_states[i]
+        dt = t - segment_start_time
+        return (
+            position + dt * (velocity + dt * (acceleration / 2 + dt * jerk / 6)),
+            velocity + dt * (acceleration + dt * jerk / 2),
+            acceleration + dt * jerk,
+        )
+
+    def calculate(self, t, current, goal):
+        """
+        Get the state of the profile t seconds after the current state
+
+        Args:
+            t: The time since the current state in seconds
+            current: The State to start from, either where the profile starts or the State it last returned
+            goal: The State the profile ends at
+
+        Returns:
+            The State of the profile at time t
+        """
+        last = self._last_state
+        if (
+            last is not None
+            and abs(current.position - last.position) <= self.TOLERANCE
+            and abs(current.velocity - last.velocity) <= self.TOLERANCE
+            and abs(goal.position - self.goal.position) <= self.TOLERANCE
+        ):
+            # Advancing a tick at a time, carry on from the last state returned
+            t += self._last_time
+        else:
+            self._solve(current, goal)
+        position, velocity, _ = self.sample(t)
+        self._last_state = State(position, velocity)
+        self._last_time = t
+        return self._last_state
+
+    def time_left_until(self, target):
+        """
+        Get the time from the start of the profile until it reaches a position, for profiles that start at rest or
+        moving towards the goal
+
+        Args:
+            target: A position between the start and the goal of the profile
+
+        Returns:
+            The time in seconds, or the profile's total time if the target is never reached
+        """
+        distance_to_target = (target - self.current.position) * self.direction
+        if distance_to_target <= 0:
+            return 0.0
+        if distance_to_target >= abs(self.goal.position - self.current.position):
+            return self.total_time()
+
+        # The profile never moves backwards when it starts at rest, so bisect on its position
+        lower, upper = 0.0, self.total_time()
+        for _ in range(50):
+            middle = (lower + upper) / 2
+            distance = (self.sample(middle)[0] - self.current.position) * self.direction
+            if distance < distance_to_target:
+                lower = middle
+            else:
+                upper = middle
+        return (lower + upper) / 2
+
+    def total_time(self):
+        return self._end_times[-1] if self._end_times else 0.0
+
+    def is_finished(self, t):
+        return t >= self.total_time()
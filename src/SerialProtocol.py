@@ -0,0 +1,434 @@
+"""
+A framed binary protocol for talking to a computer over the brain's serial port, with acknowledgements and
+retransmission so that no message is lost, duplicated or reordered
+
+Every message is sent in one frame:
+
+Frame layout, before COBS encoding:
+    uint8   frame type (DATA_FRAME or ACK_FRAME)
+    uint8   message type, chosen by the application (for example TEXT_MESSAGE), 0 in acknowledgements
+    uint8   sequence number, counting up from 0 and wrapping at 256
+    bytes   payload, empty in acknowledgements
+    uint16  CRC-16/XMODEM of everything above, big-endian
+
+The frame is then COBS (consistent overhead byte stuffing) encoded, which removes every 0 byte at the cost of one extra
+byte per 254, and a 0 byte is sent after it. A receiver that starts listening part way through a frame, or that loses
+or corrupts some bytes, finds the start of the next frame at the next 0 byte, and a frame whose CRC doesn't match is
+dropped. Payloads may hold any bytes.
+
+Each data frame is acknowledged by an ACK_FRAME with the same sequence number, and resent if its acknowledgement hasn't
+arrived within the retransmit timeout. Up to window_size frames can be waiting for acknowledgement at once, so the link
+keeps sending while acknowledgements are on their way back rather than stopping after every frame. The receiver
+acknowledges duplicates again (the first acknowledgement may have been the frame that was lost), holds frames that
+arrive early and delivers messages in the order they were sent.
+
+A ReliableChannel only encodes and decodes, it is given the bytes that arrive and a function to write bytes with. On
+the brain, a StreamConnection feeds it from stdin in a thread that sleeps until bytes arrive. On a computer, see
+utils/serial_peer.py.
+"""
+
+from vex import MSEC, wait
+
+from Synchronization import Empty, Lock, Queue
+
+try:
+    import uselect as select
+except ImportError:
+    # Running on a computer rather than the brain
+    import select
+
+DATA_FRAME = 1
+ACK_FRAME = 2
+
+# Message types used by main_wireless and FileTransfer.py, other programs may use any others from 1 to 255
+TEXT_MESSAGE = 1
+FILE_START_MESSAGE = 2
+FILE_DATA_MESSAGE = 3
+FILE_END_MESSAGE = 4
+FILE_RESUME_MESSAGE = 5
+FILE_RESULT_MESSAGE = 6
+
+HEADER_SIZE = 3
+CRC_SIZE = 2
+SEQUENCE_MODULUS = 256
+
+# The largest payload a frame may carry, longer frames are assumed to be corrupt and dropped
+MAXIMUM_PAYLOAD_SIZE = 1024
+
+
+def _crc16_xmodem_table():
+    table = []
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021 if crc & 0x8000 else crc << 1) & 0xFFFF
+        table.append(crc)
+    return table
+
+
+_CRC16_TABLE = _crc16_xmodem_table()
+
+
+def crc16_xmodem(data, crc: int = 0) -> int:
+    """
+    Calculate the CRC-16/XMODEM (polynomial 0x1021, starting from 0) of some bytes, the same CRC as binascii.crc_hqx,
+    which the brain's ubinascii doesn't have
+
+    Args:
+        data: The bytes
+        crc: The CRC of the bytes before these, to calculate a CRC in pieces
+
+    Returns:
+        The CRC
+    """
+    table = _CRC16_TABLE
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFF) ^ table[(crc >> 8) ^ byte]
+    return crc
+
+
+def cobs_encode(data) -> bytes:
+    """
+    COBS encode some bytes, the result holds no 0 bytes and is at most len(data) // 254 + 1 bytes longer
+    """
+    output = bytearray(len(data) + len(data) // 254 + 1)
+    # Where the current block's length byte goes, it is filled in once the block ends
+    code_index = 0
+    write_index = 1
+    code = 1
+    for byte in data:
+        # A 0 byte ends the block and is implied by its length byte, a block also ends after 254 non-zero bytes
+        if byte:
+            output[write_index] = byte
+            write_index += 1
+            code += 1
+            if code < 0xFF:
+                continue
+        output[code_index] = code
+        code_index = write_index
+        write_index += 1
+        code = 1
+    output[code_index] = code
+    return bytes(output[:write_index])
+
+
+def cobs_decode(data) -> bytes:
+    """
+    Decode COBS encoded bytes, without the 0 byte that follows them
+
+    Raises:
+        ValueError: If the bytes aren't valid COBS
+    """
+    output = bytearray()
+    index = 0
+    length = len(data)
+    while index < length:
+        code = data[index]
+        if code == 0:
+            raise ValueError("COBS data can't contain a 0 byte")
+        end = index + code
+        if end > length:
+            raise ValueError("COBS block runs past the end of the data")
+        output += data[index + 1 : end]
+        index = end
+        if code < 0xFF and index < length:
+            output.append(0)
+    return bytes(output)
+
+
+def encode_frame(
+    frame_type: int, message_type: int, sequence: int, payload=b""
+) -> bytes:
+    """
+    Build a frame, ready to write, including the 0 byte that ends it
+    """
+    frame = bytearray(HEADER_SIZE + len(payload) + CRC_SIZE)
+    frame[0] = frame_type
+    frame[1] = message_type
+    frame[2] = sequence
+    frame[HEADER_SIZE : HEADER_SIZE + len(payload)] = payload
+    crc = crc16_xmodem(memoryview(frame)[: HEADER_SIZE + len(payload)])
+    frame[-2] = crc >> 8
+    frame[-1] = crc & 0xFF
+    return cobs_encode(frame) + b"\x00"
+
+
+def decode_frame(encoded):
+    """
+    Check and unpack a frame
+
+    Args:
+        encoded: The COBS encoded frame, without the 0 byte that ends it
+
+    Returns:
+        (frame type, message type, sequence number, payload)
+
+    Raises:
+        ValueError: If the frame is malformed or its CRC doesn't match
+    """
+    frame = cobs_decode(encoded)
+    if len(frame) < HEADER_SIZE + CRC_SIZE:
+        raise ValueError("Frame is too short")
+    crc = (frame[-2] << 8) | frame[-1]
+    if crc16_xmodem(memoryview(frame)[:-CRC_SIZE]) != crc:
+        raise ValueError("Frame CRC doesn't match")
+    return frame[0], frame[1], frame[2], frame[HEADER_SIZE:-CRC_SIZE]
+
+
+class _SentFrame:
+    def __init__(self, encoded: bytes, sent_ms):
+        self.encoded = encoded
+        self.sent_ms = sent_ms
+        self.attempts = 1
+
+
+class ReliableChannel:
+    """
+    Send and receive messages over a serial link, see the top of this file for the protocol
+
+    Sending is thread safe, and so is receiving from one thread while another feeds in arrived bytes.
+
+    Args:
+        write: Called with the bytes of each frame to send, it should write them all
+        timer: A brain.timer object, or anything else with time(MSEC)
+        window_size: How many data frames may be waiting for acknowledgement at once, at most 128, both ends must use
+            the same window size
+        retransmit_timeout_ms: How long to wait for an acknowledgement before sending a frame again
+    """
+
+    def __init__(
+        self, write, timer, window_size: int = 8, retransmit_timeout_ms=200
+    ):
+        if not 0 < window_size <= SEQUENCE_MODULUS // 2:
+            raise ValueError("window_size must be from 1 to 128")
+        self.write = write
+        self.timer = timer
+        self.window_size = window_size
+        self.retransmit_timeout_ms = retransmit_timeout_ms
+
+        self._lock = Lock()
+        # Sending: frames waiting for acknowledgement by sequence number, and messages waiting for room in the window
+        self._unacknowledged = {}
+        self._waiting = []
+        self._next_sequence = 0
+        # The oldest unacknowledged sequence number, frames are only sent up to window_size past it so the receiver
+        # can tell new frames from resent ones
+        self._oldest_sequence = 0
+        # Receiving: the next sequence number to deliver, and frames that arrived before it
+        self._expected_sequence = 0
+        self._early = {}
+        self._received = Queue()
+        # Bytes of a frame whose 0 byte hasn't arrived yet
+        self._partial = bytearray()
+        self._discarding = False
+
+        self.frames_sent = 0
+        self.retransmissions = 0
+        self.frames_received = 0
+        self.duplicates = 0
+        self.corrupt_frames = 0
+
+    def send(self, message_type: int, payload=b"") -> None:
+        """
+        Send a message, straight away if there is room in the window, otherwise once there is
+
+        Args:
+            message_type: 1 to 255, passed to the receiver alongside the payload
+            payload: bytes (or a str, which is UTF-8 encoded) of at most MAXIMUM_PAYLOAD_SIZE
+        """
+        if isinstance(payload, str):
+            payload = payload.encode()
+        if len(payload) > MAXIMUM_PAYLOAD_SIZE:
+            raise ValueError("Payload is longer than MAXIMUM_PAYLOAD_SIZE")
+        with self._lock:
+            if self._waiting or not self._window_open():
+                self._waiting.append((message_type, bytes(payload)))
+            else:
+                self._transmit(message_type, payload)
+
+    def _window_open(self):
+        return (
+            self._next_sequence - self._oldest_sequence
+        ) % SEQUENCE_MODULUS < self.window_size
+
+    def _transmit(self, message_type, payload):
+        sequence = self._next_sequence
+        self._next_sequence = (sequence + 1) % SEQUENCE_MODULUS
+        encoded = encode_frame(DATA_FRAME, message_type, sequence, payload)
+        self._unacknowledged[sequence] = _SentFrame(encoded, self.timer.time(MSEC))
+        self.frames_sent += 1
+        self.write(encoded)
+
+    def pending(self) -> int:
+        """
+        Returns:
+            How many sent messages haven't been acknowledged yet
+        """
+        return len(self._unacknowledged) + len(self._waiting)
+
+    def receive_bytes(self, data) -> None:
+        """
+        Handle bytes read from the link, any number at a time, frames may be split between calls
+        """
+        start = 0
+        length = len(data)
+        while start < length:
+            end = data.find(b"\x00", start)
+            if end < 0:
+                self._append_partial(data[start:])
+                return
+            self._append_partial(data[start:end])
+            if self._partial and not self._discarding:
+                self._handle_frame(bytes(self._partial))
+            self._partial = bytearray()
+            self._discarding = False
+            start = end + 1
+
+    def _append_partial(self, data):
+        if self._discarding:
+            return
+        if len(self._partial) + len(data) > (
+            MAXIMUM_PAYLOAD_SIZE + HEADER_SIZE + CRC_SIZE + 8
+        ):
+            # Too long to be a frame, its 0 byte must have been lost, skip to the next one
+            self.corrupt_frames += 1
+            self._partial = bytearray()
+            self._discarding = True
+            return
+        self._partial += data
+
+    def _handle_frame(self, encoded):
+        try:
+            frame_type, message_type, sequence, payload = decode_frame(encoded)
+        except ValueError:
+            # The sender will resend it once its acknowledgement doesn't arrive
+            self.corrupt_frames += 1
+            return
+        if frame_type == ACK_FRAME:
+            with self._lock:
+                self._unacknowledged.pop(sequence, None)
+                while (
+                    self._oldest_sequence != self._next_sequence
+                    and self._oldest_sequence not in self._unacknowledged
+                ):
+                    self._oldest_sequence = (
+                        self._oldest_sequence + 1
+                    ) % SEQUENCE_MODULUS
+                while self._waiting and self._window_open():
+                    self._transmit(*self._waiting.pop(0))
+            return
+        if frame_type != DATA_FRAME:
+            self.corrupt_frames += 1
+            return
+
+        with self._lock:
+            self.write(encode_frame(ACK_FRAME, 0, sequence))
+        self.frames_received += 1
+        # How far ahead of the next expected frame this one is, frames behind it come out as large numbers
+        ahead = (sequence - self._expected_sequence) % SEQUENCE_MODULUS
+        if ahead >= self.window_size or sequence in self._early:
+            # Already delivered (or already waiting to be), its acknowledgement must have been lost
+            self.duplicates += 1
+            return
+        self._early[sequence] = (message_type, payload)
+        while self._expected_sequence in self._early:
+            self._received.put(self._early.pop(self._expected_sequence))
+            self._expected_sequence = (self._expected_sequence + 1) % SEQUENCE_MODULUS
+
+    def poll(self):
+        """
+        Resend frames whose acknowledgements are overdue
+
+        Returns:
+            How long until the next frame is due to be resent in milliseconds, or None if nothing is waiting
+        """
+        now_ms = self.timer.time(MSEC)
+        next_due_ms = None
+        with self._lock:
+            for sent in self._unacknowledged.values():
+                due_ms = sent.sent_ms + self.retransmit_timeout_ms - now_ms
+                if due_ms <= 0:
+                    sent.sent_ms = now_ms
+                    sent.attempts += 1
+                    self.retransmissions += 1
+                    self.write(sent.encoded)
+                    due_ms = self.retransmit_timeout_ms
+                if next_due_ms is None or due_ms < next_due_ms:
+                    next_due_ms = due_ms
+        return next_due_ms
+
+    def has_messages(self) -> bool:
+        return bool(self._received)
+
+    def receive(self, block: bool = False, timeout_ms=None):
+        """
+        Get the next message received
+
+        Args:
+            block: Whether to wait for a message if there isn't one yet
+            timeout_ms: The longest to wait, None waits forever
+
+        Returns:
+            (message type, payload bytes), or None if there is no message
+        """
+        try:
+            return self._received.get(block, timeout_ms)
+        except Empty:
+            return None
+
+
+class StreamConnection:
+    """
+    Feed a ReliableChannel from a stream (stdin on the brain), checking for bytes without blocking and waiting in
+    between, so the brain's other threads run while nothing has arrived
+
+    Args:
+        channel: The ReliableChannel to feed
+        stream: The stream to read from, it must work with select.poll and have read(1)
+        read_size: The most bytes to read before handing them to the channel
+        idle_wait_ms: How long to wait between checks while nothing has arrived, the most a byte waits to be read
+    """
+
+    def __init__(
+        self, channel: ReliableChannel, stream, read_size: int = 256, idle_wait_ms=5
+    ):
+        self.channel = channel
+        self.stream = stream
+        self.read_size = read_size
+        self.idle_wait_ms = idle_wait_ms
+        self.running = False
+        self._poller = select.poll()
+        self._poller.register(stream, select.POLLIN)
+
+    def read_available(self) -> bytes:
+        """
+        Read the bytes that have already arrived, up to read_size, without waiting for more
+        """
+        data = bytearray()
+        while len(data) < self.read_size and self._poller.poll(0):
+            byte = self.stream.read(1)
+            if not byte:
+                break
+            data += byte
+        return bytes(data)
+
+    def run(self):
+        """
+        Keep feeding the channel until stop is called, call this in its own Thread
+        """
+        self.running = True
+        while self.running:
+            next_due_ms = self.channel.poll()
+            data = self.read_available()
+            # Blocking in poll would keep every other thread on the brain waiting, they only run during wait, so wait
+            # even while bytes keep arriving, only briefly since more are likely on the way
+            wait_ms = self.idle_wait_ms
+            if data:
+                self.channel.receive_bytes(data)
+                wait_ms = 1
+            elif next_due_ms is not None:
+                wait_ms = max(1, min(wait_ms, next_due_ms))
+            wait(wait_ms, MSEC)
+
+    def stop(self):
+        self.running = False
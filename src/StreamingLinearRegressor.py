@@ -0,0 +1,275 @@
+"""
+StreamingLinearRegressor
+
+Fit a line to points that arrive (and leave) one at a time. Rather than keeping the points and summing them again on
+every fit, the regressor keeps running sufficient statistics: the total weight, the weighted means of x and y and the
+centered second moments (Sxx, Syy, Sxy). These are updated with Welford's method, which stays accurate when the points
+are far from the origin where the raw sums (sum of x squared and so on) would lose precision to cancellation. The raw
+sums are still available as properties.
+
+Two fits are offered:
+    - fit: Ordinary least squares, y as a function of x, the same line as LinearRegressor.fit
+    - fit_total_least_squares: The line minimising the perpendicular distance to the points, which treats x and y
+        alike and so handles vertical lines without swapping the axes like LinearRegressor.smart_fit does
+
+Examples:
+    >>> regressor = StreamingLinearRegressor().add_points([(1, 5), (2, 10), (3, 15)])
+    >>> print(regressor.fit().slope, regressor.y_intercept)
+    5.0 0.0
+    >>> regressor = StreamingLinearRegressor().add_points([(2, 0), (2, 1), (2, 3)])
+    >>> print(regressor.fit_total_least_squares().slope, regressor.x_intercept)
+    inf 2.0
+"""
+
+import math
+
+
+class StreamingLinearRegressor:
+    """
+    A linear regressor with O(1) point insertion and removal
+
+    Args:
+        window_size: When set only the most recent window_size points are fitted, older points are removed as new ones
+            are added
+    """
+
+    def __init__(self, window_size=None):
+        if window_size is not None and window_size < 2:
+            raise ValueError("The window must hold at least 2 points")
+        self.window_size = window_size
+
+        self.slope = None
+        self.y_intercept = None
+        self.x_intercept = None
+        self.angle_rad = None
+        self._direction = (1.0, 0.0)
+        # The centroid when the line was last fitted, points keep moving the running means
+        self._origin = (0.0, 0.0)
+        self.clear()
+
+    def clear(self):
+        """
+        Remove every point
+        """
+        self.count = 0
+        self.total_weight = 0.0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.sxx = 0.0
+        self.syy = 0.0
+        self.sxy = 0.0
+        # The window is a ring buffer of (x, y, weight), _window_start is the oldest point
+        self._window = []
+        self._window_start = 0
+
+    def add_point(self, x, y, weight=1.0):
+        """
+        Add a point to the fit, when the window is full the oldest point is removed
+
+        Args:
+            x: The point's x value
+            y: The point's y value
+            weight: How much the point counts towards the fit relative to the others
+
+        Returns:
+            StreamingLinearRegressor: Self for method chaining.
+        """
+        if weight <= 0:
+            raise ValueError("Point weights must be positive")
+        if self.window_size is not None:
+            if len(self._window) < self.window_size:
+                self._window.append((x, y, weight))
+            else:
+                self._remove(*self._window[self._window_start])
+                self._window[self._window_start] = (x, y, weight)
+                self._window_start = (self._window_start + 1) % self.window_size
+
+        self.count += 1
+        self.total_weight += weight
+        delta_x = x - self.mean_x
+        delta_y = y - self.mean_y
+        self.mean_x += delta_x * weight / self.total_weight
+        self.mean_y += delta_y * weight / self.total_weight
+        self.sxx += weight * delta_x * (x - self.mean_x)
+        self.syy += weight * delta_y * (y - self.mean_y)
+        self.sxy += weight * delta_x * (y - self.mean_y)
+        return self
+
+    def add_points(self, points):
+        """
+        Add an iterable of (x, y) or (x, y, weight) points
+
+        Returns:
+            StreamingLinearRegressor: Self for method chaining.
+        """
+        for point in points:
+            self.add_point(*point)
+        return self
+
+    def remove_point(self, x, y, weight=1.0):
+        """
+        Remove a point that was previously added, the point must be removed with the weight it was added with
+
+        Args:
+            x: The point's x value
+            y: The point's y value
+            weight: The weight the point was added with
+
+        Returns:
+            StreamingLinearRegressor: Self for method chaining.
+        """
+        if self.window_size is not None:
+            raise ValueError("Points leave a windowed regressor automatically")
+        if self.count == 0:
+            raise ValueError("There are no points to remove")
+        self._remove(x, y, weight)
+        return self
+
+    def _remove(self, x, y, weight):
+        remaining_weight = self.total_weight - weight
+        self.count -= 1
+        if self.count == 0 or remaining_weight <= 0:
+            self.count = 0
+            self.total_weight = 0.0
+            self.mean_x = self.mean_y = 0.0
+            self.sxx = self.syy = self.sxy = 0.0
+            return
+        # Undo add_point: the means are wound back first, then the moments using both the old and new means
+        new_mean_x = (self.total_weight * self.mean_x - weight * x) / remaining_weight
+        new_mean_y = (self.total_weight * self.mean_y - weight * y) / remaining_weight
+        self.sxx -= weight * (x - new_mean_x) * (x - self.mean_x)
+        self.syy -= weight * (y - new_mean_y) * (y - self.mean_y)
+        self.sxy -= weight * (x - new_mean_x) * (y - self.mean_y)
+        self.mean_x, self.mean_y = new_mean_x, new_mean_y
+        self.total_weight = remaining_weight
+
+    @property
+    def sum_x(self):
+        return self.total_weight * self.mean_x
+
+    @property
+    def sum_y(self):
+        return self.total_weight * self.mean_y
+
+    @property
+    def sum_xy(self):
+        return self.sxy + self.total_weight * self.mean_x * self.mean_y
+
+    @property
+    def sum_x_squared(self):
+        return self.sxx + self.total_weight * self.mean_x * self.mean_x
+
+    @property
+    def sum_y_squared(self):
+        return self.syy + self.total_weight * self.mean_y * self.mean_y
+
+    @property
+    def centroid(self):
+        return self.mean_x, self.mean_y
+
+    def _check_fit(self):
+        if self.count < 2 or self.sxx + self.syy <= 0:
+            raise ValueError(
+                "Invalid data points. The number of unique data points must be greater than 1."
+            )
+
+    def _set_line(self, direction_x, direction_y):
+        """
+        Set the line's parameters from its direction, the line always passes through the centroid
+        """
+        length = math.sqrt(direction_x * direction_x + direction_y * direction_y)
+        self._direction = (direction_x / length, direction_y / length)
+        self._origin = (self.mean_x, self.mean_y)
+        self.angle_rad = math.atan2(direction_y, direction_x)
+        if abs(direction_x) <= 1e-12 * length:
+            self.slope = math.inf
+            self.y_intercept = None
+            self.x_intercept = self.mean_x
+        else:
+            self.slope = direction_y / direction_x
+            self.y_intercept = self.mean_y - self.slope * self.mean_x
+            self.x_intercept = (
+                -self.y_intercept / self.slope if self.slope != 0 else None
+            )
+        # Fix silly signed zeros
+        self.slope = 0.0 if self.slope == -0.0 else self.slope
+        if self.y_intercept == -0.0:
+            self.y_intercept = 0.0
+        if self.x_intercept == -0.0:
+            self.x_intercept = 0.0
+
+    def fit(self):
+        """
+        Fit y as a function of x by ordinary least squares
+
+        Returns:
+            StreamingLinearRegressor: Self for method chaining.
+
+        Raises:
+            ValueError: If every point has the same x value (use fit_total_least_squares) or there are too few points
+        """
+        self._check_fit()
+        if self.sxx <= 0:
+            raise ValueError("Every point has the same x value, the line is vertical")
+        self._set_line(self.sxx, self.sxy)
+        return self
+
+    def fit_total_least_squares(self):
+        """
+        Fit the line that minimises the perpendicular distance to the points, the principal axis of their scatter
+
+        Returns:
+            StreamingLinearRegressor: Self for method chaining.
+        """
+        self._check_fit()
+        # The line runs along the eigenvector of the scatter matrix [[Sxx, Sxy], [Sxy, Syy]] with the larger eigenvalue
+        largest_eigenvalue = (
+            self.sxx
+            + self.syy
+            + math.sqrt((self.sxx - self.syy) ** 2 + 4 * self.sxy * self.sxy)
+        ) / 2
+        # Of the two equivalent forms of the eigenvector use the longer one, the other can vanish
+        if largest_eigenvalue - self.syy >= largest_eigenvalue - self.sxx:
+            self._set_line(largest_eigenvalue - self.syy, self.sxy)
+        else:
+            self._set_line(self.sxy, largest_eigenvalue - self.sxx)
+        return self
+
+    def distance_to_point(self, x, y):
+        """
+        Get the perpendicular distance from the most recently fitted line to a point
+        """
+        origin_x, origin_y = self._origin
+        return abs(
+            (x - origin_x) * self._direction[1] - (y - origin_y) * self._direction[0]
+        )
+
+    def predict_y(self, x_values):
+        """
+        Predict y values for given x values using the fitted line
+
+        Args:
+            x_values (iterable or float): List of x values or a single x value
+
+        Returns:
+            list or float: The predicted y value(s)
+        """
+        if isinstance(x_values, (list, tuple)):
+            return [(self.slope * x) + self.y_intercept for x in x_values]
+        return (self.slope * x_values) + self.y_intercept
+
+    def predict_x(self, y_values):
+        """
+        Predict x values for given y values using the fitted line, vertical lines are supported
+
+        Args:
+            y_values (iterable or float): List of y values or a single y value
+
+        Returns:
+            list or float: The predicted x value(s)
+        """
+        if isinstance(y_values, (list, tuple)):
+            return [self.predict_x(y) for y in y_values]
+        if math.isinf(self.slope):
+            return self.x_intercept
+        return (y_values - self.y_intercept) / self.slope
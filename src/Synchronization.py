@@ -0,0 +1,430 @@
+"""
+Locks, conditions, events and queues for sharing data between threads
+
+On a computer (and any MicroPython port with _thread) these are built on _thread's locks, so a waiting thread sleeps
+until it is woken. The brain has no _thread, but its threads only switch when one of them calls wait, so a lock can
+be a flag that nothing else can change part way through being checked, and a thread waiting for one calls wait to let
+the others run rather than spinning.
+
+Timeouts are in milliseconds, None (or a negative timeout for acquire) waits forever.
+"""
+
+from vex import MSEC, Brain, wait
+
+try:
+    import _thread
+except ImportError:
+    # Running on the brain, threads only switch at a wait
+    _thread = None
+
+# How long a waiting thread on the brain lets the others run before checking again
+YIELD_MS = 1
+
+_timer = Brain().timer
+
+
+class Empty(Exception):
+    """
+    Raised by Queue.get when there is nothing to get
+    """
+
+
+class Full(Exception):
+    """
+    Raised by Queue.put when there is no room for another item
+    """
+
+
+class _RingBuffer:
+    """
+    An unlocked double ended queue kept in a ring buffer, so both ends are O(1) (MicroPython's own deque can only
+    remove from the left and allocates its whole maximum length up front)
+
+    Args:
+        maximum_length: The most items it holds, adding to a full buffer drops an item from the other end, 0 for no
+            limit
+        initial_capacity: How many items to make room for up front when there is no limit, the room doubles whenever
+            it runs out
+    """
+
+    def __init__(self, maximum_length: int = 0, initial_capacity: int = 8):
+        self.maximum_length = maximum_length
+        self._items = [None] * (maximum_length or initial_capacity)
+        self._start = 0
+        self._length = 0
+
+    def __len__(self):
+        return self._length
+
+    def __bool__(self):
+        return self._length > 0
+
+    def _make_room(self, drop_left: bool):
+        """
+        Make room for one more item, by dropping one from an end if at the maximum length, or by growing
+        """
+        if self._length < len(self._items):
+            return
+        if self.maximum_length:
+            if drop_left:
+                self.popleft()
+            else:
+                self.pop()
+            return
+        capacity = len(self._items)
+        self._items = [
+            self._items[(self._start + i) % capacity] for i in range(capacity)
+        ] + [None] * capacity
+        self._start = 0
+
+    def append(self, item):
+        self._make_room(drop_left=True)
+        self._items[(self._start + self._length) % len(self._items)] = item
+        self._length += 1
+
+    def appendleft(self, item):
+        self._make_room(drop_left=False)
+        self._start = (self._start - 1) % len(self._items)
+        self._items[self._start] = item
+        self._length += 1
+
+    def popleft(self):
+        if not self._length:
+            raise IndexError("pop from an empty deque")
+        item = self._items[self._start]
+        self._items[self._start] = None
+        self._start = (self._start + 1) % len(self._items)
+        self._length -= 1
+        return item
+
+    def pop(self):
+        if not self._length:
+            raise IndexError("pop from an empty deque")
+        index = (self._start + self._length - 1) % len(self._items)
+        item = self._items[index]
+        self._items[index] = None
+        self._length -= 1
+        return item
+
+    def remove(self, item):
+        """
+        Remove the first occurrence of an item, compared by identity
+        """
+        found = False
+        for _ in range(self._length):
+            other = self.popleft()
+            if other is item and not found:
+                found = True
+            else:
+                self.append(other)
+
+    def clear(self):
+        while self._length:
+            self.popleft()
+
+
+class Lock:
+    """
+    A lock that one thread at a time can hold, use it as a context manager to hold it for a block of code
+    """
+
+    def __init__(self):
+        self._lock = _thread.allocate_lock() if _thread is not None else None
+        self._locked = False
+
+    def acquire(self, blocking: bool = True, timeout_ms=-1) -> bool:
+        """
+        Take the lock, waiting for another thread to release it if it is held
+
+        Args:
+            blocking: False to return straight away if the lock is held
+            timeout_ms: The longest to wait for the lock, negative or None to wait forever
+
+        Returns:
+            Whether the lock was taken
+        """
+        if timeout_ms is None:
+            timeout_ms = -1
+        if self._lock is not None:
+            if not blocking:
+                return self._lock.acquire(False)
+            return self._lock.acquire(
+                True, timeout_ms / 1000 if timeout_ms >= 0 else -1
+            )
+
+        if self._locked:
+            if not blocking or timeout_ms == 0:
+                return False
+            start_ms = _timer.time(MSEC)
+            while self._locked:
+                if 0 <= timeout_ms <= _timer.time(MSEC) - start_ms:
+                    return False
+                wait(YIELD_MS, MSEC)
+        self._locked = True
+        return True
+
+    def release(self):
+        """
+        Release the lock, letting a waiting thread take it
+
+        Raises:
+            RuntimeError: If the lock is not held
+        """
+        if self._lock is not None:
+            self._lock.release()
+            return
+        if not self._locked:
+            raise RuntimeError("Released a lock that was not held")
+        self._locked = False
+
+    def locked(self) -> bool:
+        if self._lock is not None:
+            return self._lock.locked()
+        return self._locked
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *args):
+        self.release()
+
+
+class Condition:
+    """
+    Let threads wait, while holding a lock, for another thread to tell them something has changed
+
+    Args:
+        lock: The Lock to hold while checking and changing the shared state, defaults to a new one
+    """
+
+    def __init__(self, lock: Lock = None):
+        self.lock = lock if lock is not None else Lock()
+        # One held lock per waiting thread, notify releases them in the order the threads started waiting
+        self._waiters = _RingBuffer()
+
+    def acquire(self, blocking: bool = True, timeout_ms=-1) -> bool:
+        return self.lock.acquire(blocking, timeout_ms)
+
+    def release(self):
+        self.lock.release()
+
+    def __enter__(self):
+        self.lock.acquire()
+        return self
+
+    def __exit__(self, *args):
+        self.lock.release()
+
+    def wait(self, timeout_ms=None) -> bool:
+        """
+        Release the lock until notified or the timeout passes, then take it again, the lock must be held
+
+        Returns:
+            False if the timeout passed without being notified
+        """
+        waiter = Lock()
+        waiter.acquire()
+        self._waiters.append(waiter)
+        self.lock.release()
+        try:
+            notified = waiter.acquire(True, timeout_ms)
+        finally:
+            self.lock.acquire()
+        if not notified:
+            # Timed out, so no notify released this waiter
+            self._waiters.remove(waiter)
+        return notified
+
+    def wait_for(self, predicate, timeout_ms=None):
+        """
+        Wait until predicate() returns something true, the lock must be held
+
+        Returns:
+            The last value returned by predicate, which is false if the timeout passed first
+        """
+        start_ms = _timer.time(MSEC)
+        result = predicate()
+        while not result:
+            remaining_ms = None
+            if timeout_ms is not None:
+                remaining_ms = timeout_ms - (_timer.time(MSEC) - start_ms)
+                if remaining_ms <= 0:
+                    break
+            self.wait(remaining_ms)
+            result = predicate()
+        return result
+
+    def notify(self, count: int = 1):
+        """
+        Wake up to count threads waiting on this condition, the lock must be held
+        """
+        while count > 0 and self._waiters:
+            self._waiters.popleft().release()
+            count -= 1
+
+    def notify_all(self):
+        self.notify(len(self._waiters))
+
+
+class Event:
+    """
+    A flag that threads can wait to be set
+    """
+
+    def __init__(self):
+        self._condition = Condition()
+        self._set = False
+
+    def is_set(self) -> bool:
+        return self._set
+
+    def set(self):
+        with self._condition:
+            self._set = True
+            self._condition.notify_all()
+
+    def clear(self):
+        with self._condition:
+            self._set = False
+
+    def wait(self, timeout_ms=None) -> bool:
+        """
+        Wait until the flag is set
+
+        Returns:
+            Whether the flag is set, False if the timeout passed first
+        """
+        with self._condition:
+            return self._condition.wait_for(self.is_set, timeout_ms)
+
+
+class Queue:
+    """
+    A first in, first out queue for passing items between threads
+
+    Args:
+        maximum_size: The most items the queue holds, put waits for room once it is full, 0 for no limit
+    """
+
+    def __init__(self, maximum_size: int = 0):
+        self.maximum_size = maximum_size
+        self._items = _RingBuffer()
+        self._lock = Lock()
+        self._not_empty = Condition(self._lock)
+        self._not_full = Condition(self._lock)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __bool__(self):
+        return bool(self._items)
+
+    def _full(self):
+        return 0 < self.maximum_size <= len(self._items)
+
+    def put(self, item, block: bool = True, timeout_ms=None):
+        """
+        Add an item to the back of the queue
+
+        Args:
+            item: The item to add
+            block: False to raise Full straight away if the queue is full rather than waiting for room
+            timeout_ms: The longest to wait for room
+
+        Raises:
+            Full: If there is no room
+        """
+        with self._lock:
+            if self._full():
+                if not block or not self._not_full.wait_for(
+                    lambda: not self._full(), timeout_ms
+                ):
+                    raise Full()
+            self._items.append(item)
+            self._not_empty.notify()
+
+    def get(self, block: bool = True, timeout_ms=None):
+        """
+        Remove and return the item at the front of the queue
+
+        Args:
+            block: False to raise Empty straight away if the queue is empty rather than waiting for an item
+            timeout_ms: The longest to wait for an item
+
+        Raises:
+            Empty: If there is no item
+        """
+        with self._lock:
+            if not self._items:
+                if not block or not self._not_empty.wait_for(
+                    lambda: self._items, timeout_ms
+                ):
+                    raise Empty()
+            item = self._items.popleft()
+            self._not_full.notify()
+            return item
+
+    def put_nowait(self, item):
+        self.put(item, False)
+
+    def get_nowait(self):
+        return self.get(False)
+
+
+class SafeDeque:
+    """
+    A double ended queue that any thread can add to or remove from either end of
+
+    Args:
+        maximum_length: The most items the deque holds, adding to a full deque drops an item from the other end, 0 for
+            no limit
+    """
+
+    def __init__(self, maximum_length: int = 0):
+        self._items = _RingBuffer(maximum_length)
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __bool__(self):
+        return bool(self._items)
+
+    def append(self, item):
+        """
+        Add an item to the right end
+        """
+        with self._lock:
+            self._items.append(item)
+
+    def appendleft(self, item):
+        """
+        Add an item to the left end
+        """
+        with self._lock:
+            self._items.appendleft(item)
+
+    def popleft(self):
+        """
+        Remove and return the item at the left end
+
+        Raises:
+            IndexError: If the deque is empty
+        """
+        with self._lock:
+            return self._items.popleft()
+
+    def pop(self):
+        """
+        Remove and return the item at the right end
+
+        Raises:
+            IndexError: If the deque is empty
+        """
+        with self._lock:
+            return self._items.pop()
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
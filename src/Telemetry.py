@@ -0,0 +1,281 @@
+"""
+A compact binary log of fixed-width records, for logging pose and motor data every control tick without the cost of
+formatting text, read it on a computer with utils/telemetry_reader.py
+
+Each channel is declared once with a name, a struct format and the names of its fields, then every record on that
+channel is packed into a preallocated block buffer. Each channel has two buffers, a full block is handed to a writer
+thread while the next one fills, so recording never waits for the SD card or allocates.
+
+File layout (little-endian):
+    Header: magic (4 bytes, b"VTLM"), format version (uint16)
+    Then any number of blocks, each starting with a block type (uint8):
+        Schema block (type 0): channel id (uint8), then the channel's name, struct format and comma separated field
+            names, each as a length (uint8) followed by that many bytes of text
+        Data block (type 1): channel id (uint8), record count (uint16), block start time in ms (uint32), then each
+            record as its offset from the block start in ms (uint16) followed by the fields packed with the channel's
+            struct format
+
+A channel's schema block is always written before its first data block. Blocks are closed early rather than let a
+record's offset overflow, so records may be any distance apart.
+
+The brain's timer starts from 0 every boot, so each boot writes its own file rather than replacing or adding to the
+last one, see unused_file_name.
+"""
+
+from vex import MSEC, SECONDS, Thread, wait
+
+try:
+    import ustruct as struct
+except ImportError:
+    # Running on a computer rather than the brain
+    import struct
+
+try:
+    import uos as os
+except ImportError:
+    # Running on a computer rather than the brain
+    import os
+
+TELEMETRY_MAGIC = b"VTLM"
+TELEMETRY_VERSION = 1
+HEADER_FORMAT = "<4sH"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+SCHEMA_BLOCK = 0
+DATA_BLOCK = 1
+BLOCK_HEADER_FORMAT = "<BBHI"
+BLOCK_HEADER_SIZE = struct.calcsize(BLOCK_HEADER_FORMAT)
+MAXIMUM_OFFSET_MS = 0xFFFF
+
+
+def _exists(path: str) -> bool:
+    try:
+        os.stat(path)
+        return True
+    except OSError:
+        return False
+
+
+def unused_file_name(file_name: str) -> str:
+    """
+    Get a name to write a new file as without replacing one written before
+
+    Returns:
+        file_name if no file has that name, otherwise the first of file_name with _1, _2, ... added before its
+        extension that is free
+    """
+    if not _exists(file_name):
+        return file_name
+    dot = file_name.rfind(".")
+    if dot <= max(file_name.rfind("/"), file_name.rfind("\\")):
+        dot = len(file_name)
+    number = 1
+    while True:
+        candidate = file_name[:dot] + "_" + str(number) + file_name[dot:]
+        if not _exists(candidate):
+            return candidate
+        number += 1
+
+
+class TelemetryChannel:
+    """
+    The buffers and state of one channel, created by Telemetry.channel
+
+    Args:
+        channel_id: The channel's id in the file
+        name: The channel's name
+        fields: The names of the channel's fields
+        format: The struct format of one record's fields, without a byte order
+        block_records: The number of records in a full block
+    """
+
+    def __init__(self, channel_id: int, name: str, fields, format: str, block_records: int):
+        self.channel_id = channel_id
+        self.name = name
+        self.fields = tuple(fields)
+        self.format = format
+        self.record_format = "<H" + format
+        self.record_size = struct.calcsize(self.record_format)
+        self.block_records = block_records
+
+        block_size = BLOCK_HEADER_SIZE + block_records * self.record_size
+        self.buffers = (bytearray(block_size), bytearray(block_size))
+        self.views = (memoryview(self.buffers[0]), memoryview(self.buffers[1]))
+        # The size of each finished block waiting to be written, 0 while a buffer is free
+        self.pending = [0, 0]
+        self.active = 0
+        self.count = 0
+        self.start_ms = 0
+
+
+class Telemetry:
+    """
+    Record fixed-width telemetry to a binary file, written by a background thread
+
+    VEX threads only switch at wait calls, so recording and the writer can't interrupt each other part way through and
+    no lock is needed. If the writer falls a whole block behind on a channel, new records on that channel are dropped
+    and counted in dropped_count rather than waiting.
+
+    Args:
+        file_name: The path of the file to write, if it exists a number is added to the name (see unused_file_name) so
+            the logs of earlier boots are kept, file_name is set to the path actually written
+        timer: A brain.timer object, used to timestamp the records
+        block_records: How many records of a channel are gathered before they are written together
+        flush_interval: How often (in seconds) the writer thread writes the finished blocks, None to only write them
+            when flush is called
+    """
+
+    def __init__(self, file_name: str, timer, block_records: int = 64, flush_interval=0.1):
+        self.file_name = unused_file_name(file_name)
+        self.timer = timer
+        self.block_records = block_records
+        self.dropped_count = 0
+        self._channels = []
+        # Schema blocks of channels declared since the last flush, written by the writer ahead of any data blocks
+        self._pending_schemas = []
+
+        self.file_object = open(self.file_name, "wb")
+        self.file_object.write(
+            struct.pack(HEADER_FORMAT, TELEMETRY_MAGIC, TELEMETRY_VERSION)
+        )
+
+        self._running = flush_interval is not None
+        if self._running:
+            Thread(self.auto_flush, [flush_interval])
+
+    def channel(self, name: str, fields, format: str) -> int:
+        """
+        Declare a channel, this allocates the channel's buffers so declare every channel before recording starts
+        where possible, its schema is written by the writer along with the first blocks
+
+        Args:
+            name: The channel's name
+            fields: The names of the channel's fields, in the order they are recorded
+            format: The struct format of the fields, for example "fff" for three floats, without a byte order
+
+        Returns:
+            The channel's id, pass it to record
+        """
+        if len(fields) != len(struct.unpack("<" + format, bytes(struct.calcsize("<" + format)))):
+            raise ValueError("The format must have one value for each field")
+        channel_id = len(self._channels)
+        if channel_id > 0xFF:
+            raise ValueError("A telemetry file holds at most 256 channels")
+        channel = TelemetryChannel(channel_id, name, fields, format, self.block_records)
+        self._channels.append(channel)
+
+        schema = bytearray(struct.pack("<BB", SCHEMA_BLOCK, channel_id))
+        for text in (name, format, ",".join(fields)):
+            encoded = text.encode()
+            schema.append(len(encoded))
+            schema.extend(encoded)
+        self._pending_schemas.append(schema)
+        return channel_id
+
+    def record(self, channel_id: int, *values):
+        """
+        Record one sample on a channel, timestamped now
+
+        Args:
+            channel_id: The id returned by channel
+            values: The value of each field
+        """
+        channel = self._channels[channel_id]
+        now_ms = int(self.timer.time(MSEC))
+        if channel.count and now_ms - channel.start_ms > MAXIMUM_OFFSET_MS:
+            self._finish_block(channel)
+        if not channel.count:
+            if channel.pending[channel.active]:
+                # Both buffers are waiting for the writer
+                self.dropped_count += 1
+                return
+            channel.start_ms = now_ms
+        struct.pack_into(
+            channel.record_format,
+            channel.buffers[channel.active],
+            BLOCK_HEADER_SIZE + channel.count * channel.record_size,
+            now_ms - channel.start_ms,
+            *values
+        )
+        channel.count += 1
+        if channel.count == channel.block_records:
+            self._finish_block(channel)
+
+    def _finish_block(self, channel: TelemetryChannel):
+        """
+        Hand the block being filled to the writer and start filling the other buffer
+        """
+        struct.pack_into(
+            BLOCK_HEADER_FORMAT,
+            channel.buffers[channel.active],
+            0,
+            DATA_BLOCK,
+            channel.channel_id,
+            channel.count,
+            channel.start_ms,
+        )
+        channel.pending[channel.active] = (
+            BLOCK_HEADER_SIZE + channel.count * channel.record_size
+        )
+        channel.active ^= 1
+        channel.count = 0
+
+    def flush(self):
+        """
+        Write every finished block to the file
+        """
+        schemas, self._pending_schemas = self._pending_schemas, []
+        for schema in schemas:
+            self.file_object.write(schema)
+        for channel in self._channels:
+            # If both buffers are waiting the active one was finished first
+            for index in (channel.active, channel.active ^ 1):
+                size = channel.pending[index]
+                if size:
+                    self.file_object.write(channel.views[index][:size])
+                    channel.pending[index] = 0
+        self.file_object.flush()
+
+    def close(self):
+        """
+        Write every record, including partly filled blocks, and close the file
+        """
+        self._running = False
+        for channel in self._channels:
+            if channel.count:
+                self._finish_block(channel)
+        self.flush()
+        self.file_object.close()
+
+    def auto_flush(self, interval_sec):
+        while self._running:
+            wait(interval_sec, SECONDS)
+            if self._running:
+                self.flush()
+
+
+class DrivetrainTelemetry:
+    """
+    Record the drivetrain's pose and wheel velocities every update, register it with a ControlScheduler to record every
+    tick
+
+    Args:
+        telemetry: The Telemetry to record to
+        drivetrain: The drivetrain to record
+    """
+
+    def __init__(self, telemetry: Telemetry, drivetrain):
+        self.telemetry = telemetry
+        self.drivetrain = drivetrain
+        self.pose_channel = telemetry.channel("pose", ("x", "y", "rotation"), "fff")
+        self.wheel_channel = telemetry.channel(
+            "wheel_velocity",
+            ("front_left", "front_right", "rear_left", "rear_right"),
+            "ffff",
+        )
+
+    def update(self):
+        x, y = self.drivetrain.current_position
+        self.telemetry.record(
+            self.pose_channel, x, y, self.drivetrain.current_direction_rad
+        )
+        self.telemetry.record(self.wheel_channel, *self.drivetrain.wheel_velocities_rpm())
@@ -0,0 +1,184 @@
+"""
+A compact binary file format for precomputed trajectories, and a player that streams them from the SD card
+
+File layout (little-endian):
+    Header: magic (4 bytes, b"VTRJ"), format version (uint16), fields per record (uint16),
+            record count (uint32), time step in seconds (float32)
+    Records: record count records of (t, x, y, theta, vx, vy, omega) as float32
+"""
+
+try:
+    import ustruct as struct
+except ImportError:
+    # Running on a computer rather than the brain
+    import struct
+
+from TrajectoryGenerator import Trajectory
+
+TRAJECTORY_FILE_MAGIC = b"VTRJ"
+TRAJECTORY_FILE_VERSION = 1
+HEADER_FORMAT = "<4sHHIf"
+RECORD_FORMAT = "<7f"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+FIELDS_PER_RECORD = 7
+
+
+def write_trajectory(file_name: str, trajectory: Trajectory):
+    """
+    Write a trajectory to a binary trajectory file
+
+    Args:
+        file_name: The path of the file to write
+        trajectory: The trajectory to write
+    """
+    with open(file_name, "wb") as trajectory_file:
+        trajectory_file.write(
+            struct.pack(
+                HEADER_FORMAT,
+                TRAJECTORY_FILE_MAGIC,
+                TRAJECTORY_FILE_VERSION,
+                FIELDS_PER_RECORD,
+                len(trajectory),
+                trajectory.time_step,
+            )
+        )
+        for i in range(len(trajectory)):
+            trajectory_file.write(struct.pack(RECORD_FORMAT, *trajectory.record(i)))
+
+
+def _read_header(trajectory_file):
+    """
+    Read and validate the header of a trajectory file
+
+    Returns:
+        A tuple of (record_count, time_step)
+
+    Raises:
+        ValueError: If the file is not a trajectory file or was written by an incompatible version
+    """
+    header = trajectory_file.read(HEADER_SIZE)
+    if len(header) != HEADER_SIZE:
+        raise ValueError("Trajectory file is too short to contain a header")
+    magic, version, fields, record_count, time_step = struct.unpack(
+        HEADER_FORMAT, header
+    )
+    if magic != TRAJECTORY_FILE_MAGIC:
+        raise ValueError("Not a trajectory file")
+    if version != TRAJECTORY_FILE_VERSION or fields != FIELDS_PER_RECORD:
+        raise ValueError(
+            "Unsupported trajectory file version " + str(version)
+        )
+    return record_count, time_step
+
+
+def read_trajectory(file_name: str) -> Trajectory:
+    """
+    Read an entire trajectory file into memory, use a TrajectoryPlayer instead on the robot
+
+    Args:
+        file_name: The path of the file to read
+
+    Returns:
+        The trajectory stored in the file
+    """
+    with open(file_name, "rb") as trajectory_file:
+        record_count, time_step = _read_header(trajectory_file)
+        trajectory = Trajectory(time_step)
+        for _ in range(record_count):
+            trajectory.append(
+                *struct.unpack(RECORD_FORMAT, trajectory_file.read(RECORD_SIZE))
+            )
+    return trajectory
+
+
+class TrajectoryPlayer:
+    """
+    Stream the records of a trajectory file from the SD card rather than loading the whole file into memory,
+    records are read ahead in small blocks so the SD card is only touched every few control ticks
+
+    Args:
+        file_name: The path of the trajectory file to play
+        buffer_records: How many records to read from the SD card at a time
+    """
+
+    def __init__(self, file_name: str, buffer_records: int = 16):
+        if buffer_records < 2:
+            raise ValueError("The read-ahead buffer must hold at least two records")
+        self._file = open(file_name, "rb")
+        self.record_count, self.time_step = _read_header(self._file)
+        if self.record_count == 0:
+            self._file.close()
+            raise ValueError("Trajectory file contains no records")
+
+        self._buffer = bytearray(buffer_records * RECORD_SIZE)
+        self._buffer_start = 0
+        self._buffered_count = 0
+        self._fill_buffer(0)
+
+        self.total_time = self.record(self.record_count - 1)[0]
+
+    def _fill_buffer(self, index: int):
+        """
+        Read the block of records starting at index into the read-ahead buffer
+        """
+        self._file.seek(HEADER_SIZE + index * RECORD_SIZE)
+        bytes_read = self._file.readinto(self._buffer)
+        self._buffer_start = index
+        self._buffered_count = (bytes_read or 0) // RECORD_SIZE
+
+    def record(self, index: int):
+        """
+        Get a single record of the trajectory
+
+        Args:
+            index: The index of the record, clamped to the bounds of the file
+
+        Returns:
+            A tuple of (t, x, y, theta, vx, vy, omega)
+        """
+        index = min(max(index, 0), self.record_count - 1)
+        if not (self._buffer_start <= index < self._buffer_start + self._buffered_count):
+            self._fill_buffer(index)
+        return struct.unpack_from(
+            RECORD_FORMAT, self._buffer, (index - self._buffer_start) * RECORD_SIZE
+        )
+
+    def sample(self, t: float):
+        """
+        Get the state of the trajectory at any time, linearly interpolating between the two closest records
+
+        Args:
+            t: The time since the start of the trajectory in seconds
+
+        Returns:
+            A tuple of (t, x, y, theta, vx, vy, omega), times past the end of the trajectory return the last record
+        """
+        index = int(t / self.time_step)
+        if t <= 0 or index >= self.record_count - 1:
+            return self.record(index)
+        if not (
+            self._buffer_start <= index
+            and index + 1 < self._buffer_start + self._buffered_count
+        ):
+            # Make sure both records are read in the same block, so we don't alternate between two blocks
+            self._fill_buffer(index)
+        current_record = self.record(index)
+        next_record = self.record(index + 1)
+        fraction = (t - current_record[0]) / (next_record[0] - current_record[0])
+        return (t,) + tuple(
+            current_record[i] + (next_record[i] - current_record[i]) * fraction
+            for i in range(1, FIELDS_PER_RECORD)
+        )
+
+    def close(self):
+        """
+        Close the trajectory file
+        """
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
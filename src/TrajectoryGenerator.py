@@ -0,0 +1,433 @@
+import math
+
+try:
+    from uarray import array
+except ImportError:
+    # Running on a computer rather than the brain
+    from array import array
+
+from PurePursuit import PurePursuit
+from Utilities import hypotenuse
+
+
+class TrajectoryConstraints:
+    """
+    The physical limits to respect while generating a trajectory
+
+    Args:
+        maximum_velocity: The fastest the robot may travel in cm/s
+        maximum_acceleration: The fastest the robot may speed up or slow down in cm/s²
+        maximum_centripetal_acceleration: The largest sideways acceleration allowed in turns in cm/s²,
+            this is what limits the speed through curves (v² = a * r)
+    """
+
+    def __init__(
+        self,
+        maximum_velocity: float,
+        maximum_acceleration: float,
+        maximum_centripetal_acceleration: float,
+    ):
+        if maximum_velocity <= 0 or maximum_acceleration <= 0:
+            raise ValueError("Velocity and acceleration limits must be positive")
+        if maximum_centripetal_acceleration <= 0:
+            raise ValueError("The centripetal acceleration limit must be positive")
+        self.maximum_velocity = maximum_velocity
+        self.maximum_acceleration = maximum_acceleration
+        self.maximum_centripetal_acceleration = maximum_centripetal_acceleration
+
+
+class Trajectory:
+    """
+    A time-parameterized trajectory sampled at a fixed time step, each field is stored in its own compact float32
+    array so that long trajectories fit in the brain's memory
+
+    Args:
+        time_step: The time between samples in seconds
+    """
+
+    FIELDS = ("t", "x", "y", "theta", "vx", "vy", "omega")
+
+    def __init__(self, time_step: float):
+        self.time_step = time_step
+        self.t = array("f")
+        self.x = array("f")
+        self.y = array("f")
+        self.theta = array("f")
+        self.vx = array("f")
+        self.vy = array("f")
+        self.omega = array("f")
+
+    def append(self, t, x, y, theta, vx, vy, omega):
+        """
+        Append a sample to the end of the trajectory
+
+        Args:
+            t: The time of the sample in seconds
+            x: The x position in centimeters
+            y: The y position in centimeters
+            theta: The heading of the robot in radians
+            vx: The field-relative x velocity in cm/s
+            vy: The field-relative y velocity in cm/s
+            omega: The angular velocity in rad/s
+        """
+        self.t.append(t)
+        self.x.append(x)
+        self.y.append(y)
+        self.theta.append(theta)
+        self.vx.append(vx)
+        self.vy.append(vy)
+        self.omega.append(omega)
+
+    def __len__(self):
+        return len(self.t)
+
+    def record(self, index: int):
+        """
+        Get a single sample of the trajectory
+
+        Args:
+            index: The index of the sample
+
+        Returns:
+            A tuple of (t, x, y, theta, vx, vy, omega)
+        """
+        return (
+            self.t[index],
+            self.x[index],
+            self.y[index],
+            self.theta[index],
+            self.vx[index],
+            self.vy[index],
+            self.omega[index],
+        )
+
+    def sample(self, t: float):
+        """
+        Get the state of the trajectory at any time, linearly interpolating between the two closest samples
+
+        Args:
+            t: The time since the start of the trajectory in seconds
+
+        Returns:
+            A tuple of (t, x, y, theta, vx, vy, omega), times past the end of the trajectory return the last sample
+        """
+        if t <= 0:
+            return self.record(0)
+        index = int(t / self.time_step)
+        if index >= len(self) - 1:
+            return self.record(len(self) - 1)
+        fraction = (t - self.t[index]) / (self.t[index + 1] - self.t[index])
+        return (t,) + tuple(
+            column[index] + (column[index + 1] - column[index]) * fraction
+            for column in (self.x, self.y, self.theta, self.vx, self.vy, self.omega)
+        )
+
+    @property
+    def total_time(self) -> float:
+        """
+        Get the duration of the trajectory
+
+        Returns:
+            The time of the last sample in seconds
+        """
+        return self.t[-1] if len(self) else 0.0
+
+
+def catmull_rom_spline(waypoints, samples_per_segment: int = 20):
+    """
+    Create a smooth curve that passes through every waypoint using a centripetal Catmull-Rom spline
+
+    Args:
+        waypoints: The points for the spline to pass through (x, y)
+        samples_per_segment: How many points to generate between each pair of waypoints
+
+    Returns:
+        A list of points (x, y) along the spline
+    """
+    waypoints = [(float(x), float(y)) for x, y in waypoints]
+    if len(waypoints) < 3:
+        return waypoints
+
+    # Mirror the end points so that the spline reaches the first and last waypoints
+    control_points = (
+        [
+            (
+                2 * waypoints[0][0] - waypoints[1][0],
+                2 * waypoints[0][1] - waypoints[1][1],
+            )
+        ]
+        + waypoints
+        + [
+            (
+                2 * waypoints[-1][0] - waypoints[-2][0],
+                2 * waypoints[-1][1] - waypoints[-2][1],
+            )
+        ]
+    )
+
+    points = [waypoints[0]]
+    for i in range(1, len(control_points) - 2):
+        p0, p1, p2, p3 = control_points[i - 1 : i + 3]
+
+        # Centripetal parameterization (alpha = 0.5) avoids cusps and self-intersections
+        t0 = 0.0
+        t1 = t0 + math.sqrt(max(hypotenuse(p1[0] - p0[0], p1[1] - p0[1]), 1e-6))
+        t2 = t1 + math.sqrt(max(hypotenuse(p2[0] - p1[0], p2[1] - p1[1]), 1e-6))
+        t3 = t2 + math.sqrt(max(hypotenuse(p3[0] - p2[0], p3[1] - p2[1]), 1e-6))
+
+        for step in range(1, samples_per_segment + 1):
+            t = t1 + (t2 - t1) * step / samples_per_segment
+            point = []
+            for axis in (0, 1):
+                a1 = ((t1 - t) * p0[axis] + (t - t0) * p1[axis]) / (t1 - t0)
+                a2 = ((t2 - t) * p1[axis] + (t - t1) * p2[axis]) / (t2 - t1)
+                a3 = ((t3 - t) * p2[axis] + (t - t2) * p3[axis]) / (t3 - t2)
+                b1 = ((t2 - t) * a1 + (t - t0) * a2) / (t2 - t0)
+                b2 = ((t3 - t) * a2 + (t - t1) * a3) / (t3 - t1)
+                point.append(((t2 - t) * b1 + (t - t1) * b2) / (t2 - t1))
+            points.append((point[0], point[1]))
+    return points
+
+
+def resample_path(points, spacing_cm: float):
+    """
+    Resample a polyline into points that are evenly spaced along its length
+
+    Args:
+        points: The polyline to resample (x, y)
+        spacing_cm: The distance between consecutive output points
+
+    Returns:
+        A list of points (x, y), the first and last points of the polyline are always included
+    """
+    points = [(float(x), float(y)) for x, y in points]
+    resampled_points = [points[0]]
+    distance_to_next_point = spacing_cm
+    for i in range(1, len(points)):
+        start_x, start_y = points[i - 1]
+        end_x, end_y = points[i]
+        segment_length = hypotenuse(end_x - start_x, end_y - start_y)
+        travelled = 0.0
+        while segment_length - travelled >= distance_to_next_point:
+            travelled += distance_to_next_point
+            fraction = travelled / segment_length
+            resampled_points.append(
+                (
+                    start_x + (end_x - start_x) * fraction,
+                    start_y + (end_y - start_y) * fraction,
+                )
+            )
+            distance_to_next_point = spacing_cm
+        distance_to_next_point -= segment_length - travelled
+    if resampled_points[-1] != points[-1]:
+        if hypotenuse(
+            points[-1][0] - resampled_points[-1][0],
+            points[-1][1] - resampled_points[-1][1],
+        ) < spacing_cm / 2 and len(resampled_points) > 1:
+            # Avoid a tiny final segment, which would give an unrealistic curvature
+            resampled_points[-1] = points[-1]
+        else:
+            resampled_points.append(points[-1])
+    return resampled_points
+
+
+def _shortest_angular_difference(start, end):
+    return (end - start + math.pi) % (2 * math.pi) - math.pi
+
+
+def calculate_velocity_profile(points, constraints: TrajectoryConstraints):
+    """
+    Calculate the fastest velocity at each point of a path that stays within the constraints
+
+    Args:
+        points: The path (x, y), ideally evenly spaced
+        constraints: The limits for the profile
+
+    Returns:
+        A tuple of (distances, velocities), the distance along the path and the velocity in cm/s at each point
+    """
+    point_count = len(points)
+    distances = [0.0] * point_count
+    for i in range(1, point_count):
+        distances[i] = distances[i - 1] + hypotenuse(
+            points[i][0] - points[i - 1][0], points[i][1] - points[i - 1][1]
+        )
+
+    # Curvature limit: never exceed the centripetal acceleration limit (a = v² * curvature)
+    velocities = [constraints.maximum_velocity] * point_count
+    for i in range(1, point_count - 1):
+        curvature = PurePursuit.curvature(points[i - 1], points[i], points[i + 1])
+        if curvature > 0:
+            velocities[i] = min(
+                velocities[i],
+                math.sqrt(constraints.maximum_centripetal_acceleration / curvature),
+            )
+    velocities[0] = velocities[-1] = 0.0
+
+    # Forward pass: we can only speed up so quickly (v² = v₀² + 2ad)
+    for i in range(1, point_count):
+        velocities[i] = min(
+            velocities[i],
+            math.sqrt(
+                velocities[i - 1] ** 2
+                + 2 * constraints.maximum_acceleration * (distances[i] - distances[i - 1])
+            ),
+        )
+
+    # Backward pass: we also have to be able to slow down in time for every point ahead
+    for i in range(point_count - 2, -1, -1):
+        velocities[i] = min(
+            velocities[i],
+            math.sqrt(
+                velocities[i + 1] ** 2
+                + 2 * constraints.maximum_acceleration * (distances[i + 1] - distances[i])
+            ),
+        )
+    return distances, velocities
+
+
+def generate_trajectory(
+    path,
+    constraints: TrajectoryConstraints,
+    time_step: float = 0.01,
+    spline: bool = False,
+    spacing_cm: float = 1.0,
+    start_heading_rad: float = None,
+    end_heading_rad: float = None,
+) -> Trajectory:
+    """
+    Generate a time-parameterized trajectory along a path
+
+    Args:
+        path: The waypoints to drive through (x, y) in centimeters
+        constraints: The velocity and acceleration limits of the trajectory
+        time_step: The time between samples of the trajectory in seconds
+        spline: Whether to drive a smooth spline through the waypoints rather than straight lines between them
+        spacing_cm: The distance between points used while calculating the velocity profile,
+            smaller values are more accurate but slower to generate
+        start_heading_rad: The heading of the robot at the start of the trajectory, if either this or
+            end_heading_rad is None then the front of the robot will face along the path instead
+        end_heading_rad: The heading of the robot at the end of the trajectory, the heading is interpolated
+            between the start and end headings by distance travelled, taking the shortest way around
+
+    Returns:
+        A Trajectory sampled every time_step seconds
+    """
+    points = catmull_rom_spline(path) if spline else path
+    points = resample_path(points, spacing_cm)
+    if len(points) < 2:
+        raise ValueError("A path must contain at least two unique points")
+    if len(points) == 2:
+        # The robot has to speed up and slow down again on even the shortest path, which needs a point in between
+        points.insert(
+            1,
+            ((points[0][0] + points[1][0]) / 2, (points[0][1] + points[1][1]) / 2),
+        )
+
+    distances, velocities = calculate_velocity_profile(points, constraints)
+    total_distance = distances[-1]
+    face_path = start_heading_rad is None or end_heading_rad is None
+    if not face_path:
+        heading_change = _shortest_angular_difference(start_heading_rad, end_heading_rad)
+
+    # Accumulate the time at which the robot reaches each point, assuming constant acceleration between points
+    times = [0.0] * len(points)
+    for i in range(1, len(points)):
+        average_velocity = (velocities[i - 1] + velocities[i]) / 2
+        times[i] = times[i - 1] + (distances[i] - distances[i - 1]) / average_velocity
+
+    trajectory = Trajectory(time_step)
+    sample_count = int(math.ceil(times[-1] / time_step)) + 1
+    segment = 1
+    previous_theta = previous_unwrapped_theta = None
+
+    for sample in range(sample_count):
+        t = min(sample * time_step, times[-1])
+        while segment < len(points) - 1 and times[segment] < t:
+            segment += 1
+
+        # Position and velocity within the current segment, from constant acceleration kinematics
+        segment_time = t - times[segment - 1]
+        segment_length = distances[segment] - distances[segment - 1]
+        start_velocity = velocities[segment - 1]
+        acceleration = (velocities[segment] ** 2 - start_velocity**2) / (
+            2 * segment_length
+        )
+        travelled = min(
+            start_velocity * segment_time + acceleration * segment_time**2 / 2,
+            segment_length,
+        )
+        velocity = start_velocity + acceleration * segment_time
+
+        start_x, start_y = points[segment - 1]
+        end_x, end_y = points[segment]
+        fraction = travelled / segment_length
+        x = start_x + (end_x - start_x) * fraction
+        y = start_y + (end_y - start_y) * fraction
+        direction = math.atan2(end_y - start_y, end_x - start_x)
+
+        if face_path:
+            # A heading of 0 rad faces up the y axis (direction pi / 2)
+            theta = direction - math.pi / 2
+        else:
+            theta = (
+                start_heading_rad
+                + heading_change * (distances[segment - 1] + travelled) / total_distance
+            )
+
+        # Keep theta continuous so that omega doesn't jump by 2 pi when the heading wraps around
+        if previous_theta is None:
+            unwrapped_theta = theta
+            omega = 0.0
+        else:
+            unwrapped_theta = previous_unwrapped_theta + _shortest_angular_difference(
+                previous_theta, theta
+            )
+            omega = (unwrapped_theta - previous_unwrapped_theta) / time_step
+        previous_theta = theta
+        previous_unwrapped_theta = unwrapped_theta
+
+        trajectory.append(
+            t,
+            x,
+            y,
+            unwrapped_theta,
+            velocity * math.cos(direction),
+            velocity * math.sin(direction),
+            omega,
+        )
+
+    return trajectory
+
+
+if __name__ == "__main__":
+    import ast
+    import os
+    import time
+
+    import Constants
+
+    # Precompute the trajectory for the path created by the path creator and report how long it takes to drive
+    deploy_directory = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deploy"
+    )
+    with open(os.path.join(deploy_directory, "path.pth")) as path_file:
+        waypoints = ast.literal_eval(path_file.read())
+
+    example_constraints = TrajectoryConstraints(
+        Constants.trajectory_maximum_velocity_cm_per_s,
+        Constants.trajectory_maximum_acceleration_cm_per_s2,
+        Constants.trajectory_maximum_centripetal_acceleration_cm_per_s2,
+    )
+
+    start_time = time.perf_counter()
+    example_trajectory = generate_trajectory(
+        waypoints,
+        example_constraints,
+        Constants.trajectory_time_step_s,
+        spline=True,
+    )
+    print(
+        f"Generated {len(example_trajectory)} samples in {round((time.perf_counter() - start_time) * 1000)} ms, "
+        f"driving the path takes {example_trajectory.total_time:.2f} seconds"
+    )
@@ -18,6 +18,16 @@ class State:
         self.position = position
         self.velocity = velocity
 
+    def __eq__(self, other):
+        return (
+            isinstance(other, State)
+            and self.position == other.position
+            and self.velocity == other.velocity
+        )
+
+    def __hash__(self):
+        return hash((self.position, self.velocity))
+
 
 class TrapezoidProfile:
     def __init__(self, constraints):
@@ -166,35 +176,24 @@ class TrapezoidProfile:
 
 
 if __name__ == "__main__":
-    # import matplotlib.pyplot as plt
-    # import numpy as np
+    import matplotlib.pyplot as plt
+    import numpy as np
+    from VectorizedProfiles import VectorizedTrapezoidProfile
 
     # Constants
     max_velocity = 1.0  # m/s
     max_acceleration = 0.2  # m/s^2
 
-    # Create TrapezoidProfile
+    # Solve the profile once, then sample it at every time step in one go
     constraints = Constraints(max_velocity, max_acceleration)
     initial_state = State(0.0, 0.0)
     goal_state = State(10, 0)
-    profile = TrapezoidProfile(constraints)
-
-    profile.calculate(0, initial_state, goal_state)
-
-    # Calculate total time for the profile
-    total_time = profile.total_time()
+    profile = VectorizedTrapezoidProfile(constraints, initial_state, goal_state)
 
     # Simulate the profile
     dt = 0.01
-    simulation_time = np.arange(0.0, total_time, dt)
-
-    positions = []
-    velocities = []
-
-    for t in simulation_time:
-        state = profile.calculate(t, initial_state, goal_state)
-        positions.append(state.position)
-        velocities.append(state.velocity)
+    simulation_time = np.arange(0.0, profile.total_time(), dt)
+    positions, velocities, accelerations = profile.sample(simulation_time)
 
     # Plotting
     plt.figure(figsize=(10, 6))
@@ -213,4 +212,3 @@ if __name__ == "__main__":
 
     plt.tight_layout()
     plt.show()
-
@@ -1,18 +1,27 @@
 # Standard library imports
-import gc
 from math import cos, isinf, sin, sqrt
 
+try:
+    from uarray import array
+except ImportError:
+    # Running on a computer rather than the brain
+    from array import array
+
 # Third-party imports
 from vex import SECONDS, Thread, wait
 
 # Local or project-specific imports
 from Constants import font_size, log_directory
+from Logger import INFO, LogFileHandler, get_logger
 
 
 class Terminal:
     def __init__(self, brain):
         self.brain = brain
         self.log = Logging("Terminal")
+        # Everything printed, and every message from a module's logger, goes to the terminal's log file
+        self.logger = get_logger("Terminal")
+        get_logger().add_handler(LogFileHandler(self.log))
         self.brain.screen.set_font(font_size)
 
     def clear(self):
@@ -21,21 +30,28 @@ class Terminal:
         """
 
         self.brain.screen.set_font(font_size)
-        self.log.log("{Clearing terminal}\n")
+        self.logger.debug("Clearing terminal")
         self.brain.screen.clear_screen()
         self.brain.screen.set_cursor(1, 1)
 
-    def print(self, text: str, end: str = "\n"):
+    def print(self, text: str, end: str = "\n", level: int = INFO):
         """
         Prints a string to a console
 
         Args:
             text: the text to print to the screen
             end: The string to print at the end (defaults to new line)
+            level: The message's LogLevel, the text is only logged if the terminal's logger has it enabled, it is
+                always printed to the screen
         """
 
+        if level >= self.logger.level:
+            message = str(text) + str(end)
+            # The log file handler ends every message with a newline of its own
+            if message.endswith("\n"):
+                message = message[:-1]
+            self.logger.log(level, message)
         self.brain.screen.set_font(font_size)
-        self.log.log(str(text) + str(end))
 
         # Deal with the vex brain class' inability to parse "\n" as a newline (^ look, Logging.log can do it ^)
         text_split = str(text).split("\n")
@@ -56,32 +72,6 @@ class Terminal:
             i += 1
 
 
-class BinarySemaphore:
-    """
-    Represents a binary semaphore (thread lock) with two states, locked and unlocked and methods to acquire and release the lock
-
-    See Also:
-        https://en.m.wikipedia.org/wiki/Semaphore_(programming)
-    """
-
-    def __init__(self):
-        self.locked = False
-        self.attempting_acquisition = False
-
-    def is_locked(self):
-        return self.locked or self.attempting_acquisition
-
-    def acquire(self):
-        self.attempting_acquisition = True
-        while self.locked:
-            pass
-        self.locked = True
-        self.attempting_acquisition = False
-
-    def release(self):
-        self.locked = False
-
-
 def apply_deadzone(value: float, deadzone: float, maximum: float) -> float:
     """
     Apply a dead_zone to the passed value
@@ -106,64 +96,187 @@ def apply_deadzone(value: float, deadzone: float, maximum: float) -> float:
 
 class Logging:
     """
-    A log that can buffer it's output and when a Micro-SD card is present, can store the buffer in the Mico-SD card
+    A log that buffers its messages in memory and writes them to a file on the Micro-SD card in the background
+
+    Messages are copied into a ring buffer of fixed-size records that is allocated once, so logging from a control loop
+    never waits for the SD card or grows the heap. A writer thread gathers every waiting record into one buffer and
+    writes it with a single write call each flush, through a file handle that stays open. VEX threads only switch at
+    wait calls, so log and the writer can't interrupt each other part way through and no lock is needed.
+
+    When the buffer is full the drop policy decides what happens to a new message:
+        DROP_NEWEST: The new message is discarded, the default, logging never waits
+        DROP_OLDEST: The oldest waiting message is overwritten
+        BLOCK: The message waits while the buffer is written out, only use this away from time critical code
+
+    Messages longer than record_size bytes are truncated, keeping the newline at the end of a line. Dropped, overwritten and truncated messages are counted, and
+    the writer notes any drops in the log.
     """
 
-    def __init__(self, log_name, flush_interval=3):
+    DROP_NEWEST = 1
+    DROP_OLDEST = 2
+    BLOCK = 3
+
+    def __init__(
+        self,
+        log_name,
+        flush_interval=3,
+        capacity=128,
+        record_size=128,
+        drop_policy=DROP_NEWEST,
+        directory=log_directory,
+    ):
         """
         Logging initializer
 
         Args:
             log_name: The name to use for the log, logs will be placed in the "logs" directory on the Micro-SD card, make sure to create this directory or logs will be unable to save
-            flush_interval: How often (in seconds) to flush the log buffer to the Micro-SD card
+            flush_interval: How often (in seconds) to flush the log buffer to the Micro-SD card, None to only flush when flush_file_contents is called
+            capacity: How many messages the buffer holds
+            record_size: The longest message in bytes, longer messages are truncated
+            drop_policy: What to do with a message when the buffer is full, one of DROP_NEWEST, DROP_OLDEST or BLOCK
+            directory: The directory to place the log in
         """
 
-        self.file_name = log_directory + str(log_name) + ".log"
-        self.file_object = open(
-            self.file_name,
-            "w",
-        )
-        self.write_queue = []
+        self.file_name = directory + str(log_name) + ".log"
+        self.capacity = capacity
+        self.record_size = record_size
+        self.drop_policy = drop_policy
+
+        self._records = bytearray(capacity * record_size)
+        self._record_lengths = array("H", [0] * capacity)
+        # Everything waiting gathered up for one write, with room for a note about dropped messages
+        self._output = bytearray(capacity * record_size + 64)
+        self._records_view = memoryview(self._records)
+        self._output_view = memoryview(self._output)
+        # Only log moves the head and only the writer moves the tail (except when DROP_OLDEST overwrites), they count
+        # to twice the capacity so a full buffer can be told apart from an empty one
+        self._head = 0
+        self._tail = 0
+
+        self.dropped_count = 0
+        self.overwritten_count = 0
+        self.truncated_count = 0
+        self._reported_drops = 0
+
+        # Append rather than truncate, so the logs from earlier runs survive a reboot
+        self.file_object = None
+        self._open_file()
         self.log("Starting log at " + self.file_name + "\n")
 
-        Thread(self.auto_flush_logs, [flush_interval])
+        self._running = flush_interval is not None
+        if self._running:
+            Thread(self.auto_flush_logs, [flush_interval])
+
+    def _open_file(self):
+        try:
+            self.file_object = open(self.file_name, "ab")
+        except OSError:
+            # The SD card is not present, try again at the next flush
+            self.file_object = None
 
-    def log(self, string: str):
+    def __len__(self):
+        """
+        Get the number of messages waiting to be written
+        """
+        return (self._head - self._tail) % (2 * self.capacity)
+
+    def log(self, string):
         """
         Send a string to the file, using the log format
-        :param string:
+
+        Args:
+            string: The message, bytes are stored as they are and anything else is converted to a string
         """
 
-        try:
-            self.write_queue.append(str(string))
-        except MemoryError:
-            self.write_queue.clear()
-            gc.collect()  # Free up the unused memory previously occupied by write_queue
-            self.log(
-                "WARNING:Ran out of memory while appending to write_queue, some log messages will be omitted\n"
-            )
+        if isinstance(string, (bytes, bytearray)):
+            data = string
+        else:
+            data = str(string).encode()
+
+        if len(self) >= self.capacity:
+            if self.drop_policy == Logging.DROP_OLDEST:
+                self._tail = (self._tail + 1) % (2 * self.capacity)
+                self.overwritten_count += 1
+            elif self.drop_policy == Logging.BLOCK:
+                self.flush_file_contents()
+                if len(self) >= self.capacity:
+                    # There is nowhere to write to
+                    self.dropped_count += 1
+                    return
+            else:
+                self.dropped_count += 1
+                return
+
+        length = len(data)
+        ends_line = False
+        if length > self.record_size:
+            # Keep the newline a truncated line ended with, so the next message still starts on a line of its own
+            ends_line = data[-1] == 10
+            length = self.record_size - 1 if ends_line else self.record_size
+            self.truncated_count += 1
+        slot = self._head % self.capacity
+        start = slot * self.record_size
+        self._records_view[start : start + length] = memoryview(data)[:length]
+        if ends_line:
+            self._records[start + length] = 10
+            length += 1
+        self._record_lengths[slot] = length
+        self._head = (self._head + 1) % (2 * self.capacity)
 
     def exit(self):
         """
         Close the log object
         """
 
-        self.log("Ending log at " + self.file_name)
+        self.log("Ending log at " + self.file_name + "\n")
+        self._running = False
         self.flush_file_contents()
-        self.file_object.close()
+        if self.file_object is not None:
+            self.file_object.close()
+            self.file_object = None
 
     def flush_file_contents(self):
+        """
+        Write every waiting message to the file in one write
+        """
+        if self.file_object is None:
+            self._open_file()
+
+        position = 0
+        tail = self._tail
+        for _ in range(len(self)):
+            slot = tail % self.capacity
+            length = self._record_lengths[slot]
+            start = slot * self.record_size
+            self._output_view[position : position + length] = self._records_view[
+                start : start + length
+            ]
+            position += length
+            tail = (tail + 1) % (2 * self.capacity)
+        self._tail = tail
+
+        drops = self.dropped_count + self.overwritten_count
+        if drops != self._reported_drops:
+            note = (
+                "WARNING:The log buffer was full, "
+                + str(drops - self._reported_drops)
+                + " messages were dropped\n"
+            ).encode()
+            self._output_view[position : position + len(note)] = note
+            position += len(note)
+            self._reported_drops = drops
+
+        if not position or self.file_object is None:
+            return
         try:
-            with open(self.file_name, "a") as self.file_object:
-                for _ in range(len(self.write_queue)):
-                    self.file_object.write(self.write_queue.pop(0))
-                self.file_object.flush()
+            self.file_object.write(self._output_view[:position])
+            self.file_object.flush()
         except OSError:
-            # The SD card is not present
-            pass
+            # The SD card was removed, the messages are lost but the log keeps running
+            self.file_object = None
 
     def auto_flush_logs(self, interval_sec):
-        while True:
+        while self._running:
             wait(interval_sec, SECONDS)
             self.flush_file_contents()
 
@@ -210,6 +323,22 @@ def clamp(value: float, lower_limit: float = None, upper_limit: float = None) ->
     return value
 
 
+def input_modulus(value: float, minimum_input: float, maximum_input: float) -> float:
+    """
+    Wrap a value into a continuous range, for example an angle into -pi to pi
+
+    Args:
+        value: The value to wrap
+        minimum_input: The bottom of the range
+        maximum_input: The top of the range, equivalent to minimum_input
+
+    Returns:
+        The equivalent value inside the range
+    """
+    modulus = maximum_input - minimum_input
+    return (value - minimum_input) % modulus + minimum_input
+
+
 def get_collision_point(
     robot_position,
     robot_rotation_rad,
@@ -0,0 +1,207 @@
+"""
+Motion profiles that are solved once and then sampled at many times at once with NumPy
+
+TrapezoidProfile.calculate works out every phase boundary again on each call and returns a new State, which is what the
+robot needs when it asks for one setpoint per control tick. Planning and plotting on a computer asks for thousands of
+points at a time instead, so these profiles solve their phases when they are created and sample(ts) evaluates a whole
+array of times in a handful of array operations.
+
+Both profiles are made of segments of constant jerk, a trapezoid profile is the special case where every jerk is zero.
+
+Only for use on a computer, NumPy is not available on the brain
+"""
+
+import numpy as np
+
+from SCurveMovement import SCurveConstraints, solve_s_curve
+from TrapezoidMovement import TrapezoidProfile, State
+
+
+class PiecewiseProfile:
+    """
+    A profile made of consecutive segments of constant jerk
+
+    Args:
+        start_position: The position the profile starts at
+        start_velocity: The velocity the profile starts at
+        start_acceleration: The acceleration the profile starts at
+        segments: A list of (duration, acceleration, jerk) for each segment, the acceleration is only used when the
+            jerk is zero and the segment's acceleration jumps to it
+    """
+
+    def __init__(self, start_position, start_velocity, start_acceleration, segments):
+        start_times = []
+        positions = []
+        velocities = []
+        accelerations = []
+        jerks = []
+
+        time = 0.0
+        position, velocity, acceleration = start_position, start_velocity, start_acceleration
+        for duration, segment_acceleration, jerk in segments:
+            if duration <= 0:
+                continue
+            if jerk == 0:
+                acceleration = segment_acceleration
+            start_times.append(time)
+            positions.append(position)
+            velocities.append(velocity)
+            accelerations.append(acceleration)
+            jerks.append(jerk)
+
+            position += (
+                velocity * duration
+                + acceleration * duration**2 / 2
+                + jerk * duration**3 / 6
+            )
+            velocity += acceleration * duration + jerk * duration**2 / 2
+            acceleration += jerk * duration
+            time += duration
+
+        self._start_times = np.array(start_times)
+        self._positions = np.array(positions)
+        self._velocities = np.array(velocities)
+        self._accelerations = np.array(accelerations)
+        self._jerks = np.array(jerks)
+        self._total_time = time
+        self.end_state = State(position, velocity)
+
+    def total_time(self):
+        return self._total_time
+
+    def is_finished(self, t):
+        return t >= self._total_time
+
+    def sample(self, ts):
+        """
+        Evaluate the profile at many times at once, times after the end of the profile hold its final state
+
+        Args:
+            ts: An array of times in seconds since the start of the profile
+
+        Returns:
+            A tuple of (positions, velocities, accelerations) arrays, one value per time
+        """
+        ts = np.asarray(ts, dtype=float)
+        if not len(self._start_times):
+            # The profile is already at its goal
+            return (
+                np.full(ts.shape, self.end_state.position),
+                np.full(ts.shape, self.end_state.velocity),
+                np.zeros(ts.shape),
+            )
+
+        clipped_ts = np.clip(ts, 0.0, self._total_time)
+        segment = np.searchsorted(self._start_times, clipped_ts, side="right") - 1
+        np.clip(segment, 0, len(self._start_times) - 1, out=segment)
+        dt = clipped_ts - self._start_times[segment]
+
+        velocity = self._velocities[segment]
+        acceleration = self._accelerations[segment]
+        jerk = self._jerks[segment]
+        positions = self._positions[segment] + dt * (
+            velocity + dt * (acceleration / 2 + dt * jerk / 6)
+        )
+        velocities = velocity + dt * (acceleration + dt * jerk / 2)
+        accelerations = acceleration + dt * jerk
+
+        finished = ts >= self._total_time
+        positions[finished] = self.end_state.position
+        velocities[finished] = self.end_state.velocity
+        accelerations[finished] = 0.0
+        return positions, velocities, accelerations
+
+
+class VectorizedTrapezoidProfile(PiecewiseProfile):
+    """
+    A trapezoid profile with the same shape as TrapezoidProfile, solved once for sampling many times
+
+    Args:
+        constraints: The maximum velocity and acceleration of the profile
+        current: The State to start from
+        goal: The State to end at
+    """
+
+    def __init__(self, constraints, current, goal):
+        # Reuse TrapezoidProfile's solution for the phase boundaries, it is the profile we must match
+        profile = TrapezoidProfile(constraints)
+        profile.calculate(0, current, goal)
+        direction = profile.direction
+        maximum_acceleration = constraints.maxAcceleration * direction
+
+        end_accel = max(profile.end_accel, 0.0)
+        end_full_speed = max(profile.end_full_speed, end_accel)
+        end_deccel = max(profile.end_deccel, end_full_speed)
+        super().__init__(
+            current.position,
+            profile.current.velocity * direction,
+            0.0,
+            [
+                (end_accel, maximum_acceleration, 0),
+                (end_full_speed - end_accel, 0.0, 0),
+                (end_deccel - end_full_speed, -maximum_acceleration, 0),
+            ],
+        )
+        self.end_state = State(goal.position, goal.velocity)
+
+
+class VectorizedSCurveProfile(PiecewiseProfile):
+    """
+    A jerk limited profile from rest to rest, the acceleration ramps up and down rather than jumping so the mechanism
+    is not jolted at the start and end of each phase
+
+    Args:
+        constraints: An SCurveConstraints
+        start_position: The position to start at
+        goal_position: The position to come to rest at
+    """
+
+    def __init__(self, constraints, start_position, goal_position):
+        direction = -1 if goal_position < start_position else 1
+        # Share the S-curve solution used on the robot
+        jerk_time, constant_time, cruise_time = solve_s_curve(
+            constraints, abs(goal_position - start_position)
+        )
+
+        jerk = constraints.maxJerk * direction
+        super().__init__(
+            start_position,
+            0.0,
+            0.0,
+            [
+                (jerk_time, 0.0, jerk),
+                (constant_time, jerk * jerk_time, 0),
+                (jerk_time, 0.0, -jerk),
+                (cruise_time, 0.0, 0),
+                (jerk_time, 0.0, -jerk),
+                (constant_time, -jerk * jerk_time, 0),
+                (jerk_time, 0.0, jerk),
+            ],
+        )
+        # Finish exactly on the goal rather than wherever rounding left the integrated segments
+        self.end_state = State(goal_position, 0.0)
+
+
+if __name__ == "__main__":
+    import timeit
+    from TrapezoidMovement import Constraints
+
+    # Compare sampling a 10,000 point profile with calling TrapezoidProfile.calculate once per point
+    constraints = Constraints(1.0, 0.2)
+    initial_state, goal_state = State(0.0, 0.0), State(10.0, 0.0)
+    vectorized_profile = VectorizedTrapezoidProfile(constraints, initial_state, goal_state)
+    scalar_profile = TrapezoidProfile(constraints)
+    times = np.linspace(0, vectorized_profile.total_time(), 10000)
+
+    scalar_seconds = min(
+        timeit.repeat(
+            lambda: [scalar_profile.calculate(t, initial_state, goal_state) for t in times],
+            number=1,
+            repeat=5,
+        )
+    )
+    vectorized_seconds = min(
+        timeit.repeat(lambda: vectorized_profile.sample(times), number=100, repeat=5)
+    ) / 100
+    print("TrapezoidProfile.calculate loop: " + str(round(scalar_seconds * 1e6)) + "us")
+    print("VectorizedTrapezoidProfile.sample: " + str(round(vectorized_seconds * 1e6)) + "us")
@@ -0,0 +1,307 @@
+"""
+A NumPy version of RANSAC line fitting
+
+RANSAC.fit builds a LinearRegressor for every hypothesis and measures each point's distance to it one at a time in
+Python. VectorizedRANSAC draws hypotheses in batches and scores every point against every hypothesis in the batch with a
+single array operation. Instead of always running sample_count iterations it stops as soon as the standard bound
+
+    k = log(1 - confidence) / log(1 - w^s)
+
+says that, with the inlier ratio w seen so far and s points per sample, an all-inlier sample would have been drawn with
+the requested confidence.
+
+Scoring:
+    "ransac": A hypothesis scores the number of points within the inlier distance (the same as RANSAC)
+    "msac": Each point costs its squared distance, capped at the squared inlier distance, and the cheapest line wins,
+        which prefers lines that fit their inliers closely rather than just having many of them. The refined lines are
+        compared by the same cost, unless a custom compare function is given
+
+Sampling:
+    Passing a quality for each point to fit (for example the sensor's confidence in it) turns on PROSAC style sampling,
+    early hypotheses are drawn only from the best points and the pool grows to include the rest as iterations go by
+
+The constructor and fit keep the RANSAC API, including custom sample, score_model and compare functions.
+
+Only for use on a computer, NumPy is not available on the brain
+"""
+
+import math
+
+import numpy as np
+
+from LinearRegressor import LinearRegressor
+from RANSAC import RANSAC
+
+
+class VectorizedRANSAC(RANSAC):
+    """
+    RANSAC line fitting with batched hypothesis scoring and an adaptive iteration count
+
+    Args:
+        sample_count: The maximum number of hypotheses to try
+        default_sample_size: How many points each hypothesis is fitted to
+        inlier_distance_threshold: The furthest a point can be from a line and still be an inlier
+        score_threshold: The fewest inliers a hypothesis needs to be considered
+        sample: An optional custom sample function, see RANSAC
+        score_model: An optional custom score function, see RANSAC
+        compare: An optional custom compare function, see RANSAC
+        confidence: How sure to be that an all-inlier sample was drawn before stopping early
+        scoring: "ransac" or "msac"
+        batch_size: How many hypotheses to score at once
+        random_seed: An optional seed to make the fit repeatable
+    """
+
+    def __init__(
+        self,
+        sample_count=500,
+        default_sample_size=2,
+        inlier_distance_threshold=40,
+        score_threshold=1,
+        sample: callable = None,
+        score_model: callable = None,
+        compare: callable = None,
+        confidence=0.99,
+        scoring="ransac",
+        batch_size=64,
+        random_seed=None,
+    ):
+        super().__init__(
+            sample_count,
+            default_sample_size,
+            inlier_distance_threshold,
+            score_threshold,
+            sample,
+            score_model,
+            compare,
+        )
+        if scoring not in ("ransac", "msac"):
+            raise ValueError("Unknown scoring " + str(scoring))
+        if not 0 < confidence < 1:
+            raise ValueError("The confidence must be between 0 and 1")
+        self._custom_sample = sample is not None
+        self._custom_score_model = score_model is not None
+        self._custom_compare = compare is not None
+        self.confidence = confidence
+        self.scoring = scoring
+        self.batch_size = batch_size
+        self.random = np.random.default_rng(random_seed)
+        self.iterations = 0
+        # The MSAC cost of the best model, compared against instead of its error when scoring is "msac"
+        self.best_cost = math.inf
+
+    def required_iterations(self, inlier_ratio):
+        """
+        Get how many hypotheses must be tried to draw a sample made only of inliers with the requested confidence
+
+        Args:
+            inlier_ratio: The fraction of the points that are inliers
+
+        Returns:
+            The number of iterations, never more than sample_count
+        """
+        if inlier_ratio <= 0:
+            return self.sample_count
+        all_inlier_probability = inlier_ratio**self.default_sample_size
+        if all_inlier_probability >= 1:
+            return 0
+        return min(
+            self.sample_count,
+            math.ceil(math.log(1 - self.confidence) / math.log(1 - all_inlier_probability)),
+        )
+
+    def _sample_indices(self, hypothesis_count, pool_size):
+        """
+        Draw the indices of the points making up each hypothesis, from the first pool_size points (a number, or an
+        array with a pool size for each hypothesis)
+        """
+        sample_size = self.default_sample_size
+        indices = np.empty((hypothesis_count, sample_size), dtype=np.intp)
+        indices[:, 0] = self.random.integers(0, pool_size, hypothesis_count)
+        # Draw the rest from the pool without the points already drawn so every sample has distinct points
+        for column in range(1, sample_size):
+            drawn = self.random.integers(0, pool_size - column, hypothesis_count)
+            for previous in np.sort(indices[:, :column], axis=1).T:
+                drawn += drawn >= previous
+            indices[:, column] = drawn
+        return indices
+
+    @staticmethod
+    def _fit_hypotheses(samples):
+        """
+        Fit a line to each sample at once by total least squares
+
+        Args:
+            samples: An array of shape (hypotheses, sample size, 2)
+
+        Returns:
+            The unit normal (hypotheses, 2) and offset (hypotheses,) of each line, where normal . point = offset for
+            points on the line, and a mask of the samples that were not degenerate
+        """
+        centroids = samples.mean(axis=1)
+        centered = samples - centroids[:, None, :]
+        sxx = (centered[:, :, 0] ** 2).sum(axis=1)
+        syy = (centered[:, :, 1] ** 2).sum(axis=1)
+        sxy = (centered[:, :, 0] * centered[:, :, 1]).sum(axis=1)
+        angles = 0.5 * np.arctan2(2 * sxy, sxx - syy)
+        normals = np.stack((-np.sin(angles), np.cos(angles)), axis=1)
+        offsets = (normals * centroids).sum(axis=1)
+        return normals, offsets, sxx + syy > 0
+
+    def _refine(self, points, point_list, inlier_mask):
+        """
+        Refit the line to a hypothesis' inliers and find the inliers of the refined line
+
+        Returns:
+            The refined LinearRegressor, its inliers and its MSAC cost, or (None, None, None) if the inliers are
+            degenerate
+        """
+        inliers = {(point_list[i][0], point_list[i][1]) for i in np.flatnonzero(inlier_mask)}
+        try:
+            model = LinearRegressor().smart_fit(list(inliers))
+        except (ValueError, ZeroDivisionError, TypeError):
+            return None, None, None
+
+        if math.isinf(model.slope):
+            distances = np.abs(points[:, 0] - model.x_intercept)
+        else:
+            distances = np.abs(
+                model.slope * points[:, 0] - points[:, 1] + model.y_intercept
+            ) / math.sqrt(model.slope**2 + 1)
+        threshold = self.inlier_distance_threshold
+        for i in np.flatnonzero(distances < threshold):
+            inliers.add((point_list[i][0], point_list[i][1]))
+        cost = float(np.minimum(distances * distances, threshold * threshold).sum())
+        return model, inliers, cost
+
+    def fit(self, point_list, quality=None):
+        """
+        Find the line with the most support among the points
+
+        Args:
+            point_list: A list of (x, y) points
+            quality: An optional quality for each point, higher is better, turns on PROSAC sampling
+
+        Returns:
+            A tuple of (best_model, best_inliers) as in RANSAC.fit, best_model is None if no line was found
+        """
+        self.point_list = point_list
+        self.iterations = 0
+        point_count = len(point_list)
+        sample_size = self.default_sample_size
+        if point_count < sample_size:
+            return self.best_model, self.best_inliers
+
+        points = np.array([point[:2] for point in point_list], dtype=float)
+        order = None
+        if quality is not None:
+            # PROSAC: sort the points best first and sample from a pool of the best that grows as we go
+            order = np.argsort(-np.asarray(quality, dtype=float), kind="stable")
+            sorted_points = points[order]
+        threshold = self.inlier_distance_threshold
+        squared_threshold = threshold * threshold
+
+        best_inlier_count = 0
+        maximum_iterations = self.sample_count
+        while self.iterations < maximum_iterations:
+            hypothesis_count = min(self.batch_size, maximum_iterations - self.iterations)
+
+            if self._custom_sample:
+                samples = np.array(
+                    [
+                        [point[:2] for point in self.sample(self, point_list, sample_size)]
+                        for _ in range(hypothesis_count)
+                    ],
+                    dtype=float,
+                )
+            elif order is not None:
+                # The pool grows by one point per hypothesis until it holds every point
+                pool_sizes = np.minimum(
+                    point_count,
+                    sample_size + self.iterations + np.arange(hypothesis_count),
+                )
+                samples = sorted_points[self._sample_indices(hypothesis_count, pool_sizes)]
+            else:
+                samples = points[self._sample_indices(hypothesis_count, point_count)]
+            self.iterations += hypothesis_count
+
+            normals, offsets, valid = self._fit_hypotheses(samples)
+            # Every point's distance to every hypothesis, shape (points, hypotheses)
+            distances = np.abs(points @ normals.T - offsets)
+            inlier_masks = distances < threshold
+            inlier_counts = inlier_masks.sum(axis=0)
+            if self.scoring == "msac":
+                scores = -np.minimum(distances * distances, squared_threshold).sum(axis=0)
+            else:
+                scores = inlier_counts.astype(float)
+            scores[~valid | (inlier_counts < self.score_threshold)] = -np.inf
+
+            for hypothesis in np.argsort(-scores, kind="stable"):
+                if scores[hypothesis] == -np.inf:
+                    break
+                model, inliers, cost = self._refine(
+                    points, point_list, inlier_masks[:, hypothesis]
+                )
+                if model is None:
+                    continue
+                # Custom scores need a model to inspect, so they are only checked for the most promising hypotheses
+                if (
+                    self._custom_score_model
+                    and self.score_model(self, model, inliers) < self.score_threshold
+                ):
+                    continue
+                self._consider(model, inliers, cost)
+                break
+
+            if self.best_inliers and len(self.best_inliers) > best_inlier_count:
+                best_inlier_count = len(self.best_inliers)
+                maximum_iterations = self.required_iterations(
+                    min(1.0, best_inlier_count / point_count)
+                )
+
+        return self.best_model, self.best_inliers
+
+    def _consider(self, model, inliers, cost):
+        """
+        Keep a refined hypothesis if it compares favourably with the best so far
+        """
+        model_error = self._model_error(self, model, inliers)
+        if self.scoring == "msac" and not self._custom_compare:
+            better = cost < self.best_cost
+        else:
+            better = self.compare(
+                self,
+                model,
+                model_error,
+                inliers,
+                self.best_model,
+                self.best_error,
+                self.best_inliers,
+            )
+        if better:
+            self.best_error = model_error
+            self.best_cost = cost
+            self.best_model = model
+            self.best_inliers = inliers
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    # A noisy vertical wall with a third of the points scattered randomly
+    generator = random.Random(1)
+    example_points = [(756 + generator.gauss(0, 3), y * 3.0) for y in range(200)]
+    example_points += [
+        (generator.uniform(0, 1400), generator.uniform(0, 1400)) for _ in range(100)
+    ]
+
+    for detector in (RANSAC(500, 2, 12, 20), VectorizedRANSAC(500, 2, 12, 20)):
+        start_time = time.perf_counter()
+        best_model, best_inliers = detector.fit(list(example_points))
+        print(
+            type(detector).__name__
+            + ": "
+            + str(len(best_inliers))
+            + " inliers in "
+            + str(round((time.perf_counter() - start_time) * 1000, 1))
+            + "ms"
+        )
@@ -1,175 +1,67 @@
 from vex import *
+from FileTransfer import FileReceiver
+from SerialProtocol import TEXT_MESSAGE, ReliableChannel, StreamConnection
 import sys
 
 brain = Brain()
 
 
-class BinarySemaphore:
-    """
-    Represents a binary semaphore (thread lock) with two states, locked and unlocked
-    and methods to acquire and release the lock.
-
-    See Also:
-        https://en.m.wikipedia.org/wiki/Semaphore_(programming)
-    """
-
-    def __init__(self):
-        self.locked = False
-        self.attempting_acquisition = False
-
-    def is_locked(self):
-        """
-        Returns True if the semaphore is locked or an acquisition attempt is in progress, False otherwise.
-        """
-        return self.locked or self.attempting_acquisition
-
-    def acquire(self):
-        """
-        Acquires the lock. If the lock is already held by another thread, this method will block until the lock is released.
-        """
-        self.attempting_acquisition = True
-        while self.locked:
-            pass
-        self.locked = True
-        self.attempting_acquisition = False
-
-    def release(self):
-        """
-        Releases the lock.
-        """
-        self.locked = False
-
-
-class SafeList:
+class SerialCommunication:
     """
-    A thread-safe wrapper for a list using BinarySemaphore to prevent simultaneous access.
+    Exchange messages with utils/serial_peer.py over the brain's serial port, see SerialProtocol.py
     """
 
     def __init__(self):
-        """
-        Initializes the SafeList with an empty list and a BinarySemaphore.
-        """
-        self._list = []
-        self._lock = BinarySemaphore()
-
-    def _safe_method_call(self, method, *args, **kwargs):
-        """
-        Acquires the lock, executes the specified method with the given arguments,
-        and then releases the lock.
-        """
-        self._lock.acquire()
-        # brain.screen.print("SMCA")
-        try:
-            return method(*args, **kwargs)
-        finally:
-            # brain.screen.print("SMCR")
-            self._lock.release()
-
-    def append(self, item):
-        """
-        Appends an item to the list in a thread-safe manner.
-        """
-        self._safe_method_call(self._list.append, item)
-
-    def remove(self, item):
-        """
-        Removes the first occurrence of the specified item from the list in a thread-safe manner.
-        """
-        self._safe_method_call(self._list.remove, item)
+        # Frames are binary, use the raw byte streams where the port has them
+        input_stream = getattr(sys.stdin, "buffer", sys.stdin)
+        output_stream = getattr(sys.stdout, "buffer", sys.stdout)
+        self.channel = ReliableChannel(output_stream.write, brain.timer)
+        self.connection = StreamConnection(self.channel, input_stream)
+        self.file_receiver = FileReceiver(self.channel)
+        # Names of files received and saved since the last call to read_file
+        self.received_files = []
 
-    def pop(self, index=-1):
-        """
-        Removes and returns the item at the specified index in a thread-safe manner.
-        If no index is specified, removes and returns the last item in the list.
-        """
-        return self._safe_method_call(self._list.pop, index)
+        Thread(self.connection.run)
 
-    def __getitem__(self, index):
-        """
-        Retrieves the item at the specified index in a thread-safe manner.
-        """
-        return self._safe_method_call(self._list.__getitem__, index)
-
-    def __setitem__(self, index, value):
-        """
-        Sets the item at the specified index to the given value in a thread-safe manner.
-        """
-        self._safe_method_call(self._list.__setitem__, index, value)
-
-    def __len__(self):
-        """
-        Returns the number of items in the list in a thread-safe manner.
-        """
-        return self._safe_method_call(len, self._list)
-
-    def __str__(self):
-        """
-        Returns a string representation of the list in a thread-safe manner.
+    def read_file(self):
         """
-        return self._safe_method_call(str, self._list)
+        Wait for a file sent with serial_peer.py's send_file to be saved, text messages that arrive in the meantime
+        are dropped
 
-    def __bool__(self):
-        """
-        Returns True if the list is not empty, False otherwise.
+        Returns:
+            The name it was saved as
         """
-        return self._safe_method_call(bool, self._list)
-
-
-class SerialCommunication:
-    def __init__(self):
-        self.incoming_messages = SafeList()
-        self.outgoing_messages = SafeList()
-
-        Thread(self.get_loop)
-        Thread(self.send_loop)
-
-    def get_loop(self):
-        while True:
-            self.incoming_messages.append(sys.stdin.readline().strip("\n"))
-            wait(10, MSEC)
-
-    def read_file(self):
-        file_contents = ""
-        self.send("Ready to receive file, please provide filename")
-        while not self.has_incoming_messages():
-            wait(10, MSEC)
-        filename = self.receive()
-        # brain.screen.print("Receiving file: " + filename)
-        # brain.screen.next_row()
-
-        while True:
-            chunk = self.receive(True)
-            brain.screen.print("Read chunk: " + chunk)
-            brain.screen.next_row()
-
-            if "\xd1" not in chunk:
-                file_contents += chunk + "\n"
-            else:
-                break
-        return filename, file_contents
-
-    def send_loop(self):
-        while True:
-            if self.has_outgoing_messages():
-                sys.stdout.write(str(self.outgoing_messages.pop(0)).encode() + b"\n")
-            wait(10, MSEC)
+        while not self.received_files:
+            self.receive(True)
+        return self.received_files.pop(0)
 
     def has_incoming_messages(self):
-        return bool(self.incoming_messages)
+        return self.channel.has_messages()
 
     def has_outgoing_messages(self):
-        return bool(self.outgoing_messages)
+        return bool(self.channel.pending())
 
     def send(self, message):
-        self.outgoing_messages.append(message)
+        self.channel.send(TEXT_MESSAGE, str(message))
 
     def receive(self, blocking=False):
-        if blocking:
-            while not self.has_incoming_messages():
-                wait(10, MSEC)
-        if self.has_incoming_messages():
-            return self.incoming_messages.pop(0)
-        return None
+        """
+        Get the next text message, file transfer messages that arrive first are handled along the way
+
+        Returns:
+            The next text message, or None if there isn't one (or a file was saved while waiting)
+        """
+        while True:
+            message = self.channel.receive(blocking)
+            if message is None:
+                return None
+            message_type, payload = message
+            if message_type == TEXT_MESSAGE:
+                return payload.decode()
+            file_name = self.file_receiver.handle(message_type, payload)
+            if file_name is not None:
+                self.received_files.append(file_name)
+                return None
 
 
 def md5(message):
@@ -317,19 +209,15 @@ def main():
 
     serial = SerialCommunication()
     while True:
-        if serial.has_incoming_messages():
+        # Handle everything that has arrived, a file transfer sends many chunks between each pass of this loop
+        while serial.has_incoming_messages():
             received = serial.receive()
-            brain.screen.print(received)
-            brain.screen.next_row()
-            if "tx" in received:
-                file_path, file_contents = serial.read_file()
-                brain.screen.clear_screen()
-                brain.screen.set_cursor(1, 1)
-                brain.screen.print("file path: " + file_path)
+            if received is not None:
+                brain.screen.print(received)
                 brain.screen.next_row()
-                brain.screen.print("file contents: " + file_contents)
-                with open(file_path, "w") as f:
-                    f.write(file_contents)
+        while serial.received_files:
+            brain.screen.print("Received file: " + serial.read_file())
+            brain.screen.next_row()
         serial.send("time:" + str(brain.timer.time(SECONDS)))
         wait(100, MSEC)
 
@@ -26,6 +26,7 @@ TURNS = "TURNS"
 MM = "MM"
 MSEC = "MSEC"
 VOLT = "VOLT"
+RPM = "RPM"
 PRIMARY = "PRIMARY"
 PARTNER = "PARTNER"
 COAST = "COAST"
@@ -99,13 +100,14 @@ class Color:
 # noinspection PyUnusedLocal
 # noinspection PyPep8Naming
 class Thread:
-    def __init__(self, function, args: tuple | list | set = (None,)):
-        self.thread = threading.Thread(target=function, args=args)
+    def __init__(self, function, args: tuple | list = ()):
+        # Daemon threads, like the brain's threads, don't keep the program running once the main thread ends
+        self.thread = threading.Thread(target=function, args=tuple(args), daemon=True)
         self.thread.start()
 
     def stop(self):
-        print("Killing thread {self.thread}")
-        self.thread.stop()
+        # Python threads can't be killed, the thread keeps running until its function returns
+        print(f"Can't kill thread {self.thread}")
 
 
 # noinspection PyUnusedLocal
@@ -140,11 +142,11 @@ class Inertial:
 
     @staticmethod
     def heading():
-        pass
+        return 0
 
     @staticmethod
     def rotation(unit):
-        pass
+        return 0
 
     @staticmethod
     def is_calibrating() -> bool:
@@ -430,7 +432,7 @@ class Motor:
         pass
 
     @staticmethod
-    def velocity():
+    def velocity(*args):
         return 0
 
     @staticmethod
@@ -0,0 +1,190 @@
+from unittest import TestCase
+import sys
+import os
+import threading
+import time
+
+src_dir = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+
+sys.path.append(src_dir)
+
+from vex import Brain
+
+from Commands import (
+    Command,
+    CommandScheduler,
+    FunctionalCommand,
+    InstantCommand,
+    ParallelCommandGroup,
+    ParallelRaceGroup,
+    SequentialCommandGroup,
+    WaitCommand,
+    WaitUntilCommand,
+)
+from Runtime import Runtime
+
+
+class FakeTimer:
+    def __init__(self):
+        self.seconds = 0
+
+    def time(self, units):
+        return self.seconds * 1000 if units == "MSEC" else self.seconds
+
+
+class CountingCommand(Command):
+    # Finishes after a number of ticks and records every stage it goes through
+    def __init__(self, ticks, log, name, requirements=()):
+        super().__init__(requirements)
+        self.ticks = ticks
+        self.log = log
+        self.name = name
+        self.executions = 0
+
+    def initialize(self):
+        self.executions = 0
+        self.log.append(self.name + " initialize")
+
+    def execute(self):
+        self.executions += 1
+
+    def is_finished(self):
+        return self.executions >= self.ticks
+
+    def end(self, interrupted):
+        self.log.append(self.name + (" interrupted" if interrupted else " end"))
+
+
+def run_ticks(scheduler, ticks):
+    for _ in range(ticks):
+        scheduler.run()
+
+
+class TestCommands(TestCase):
+    def setUp(self):
+        self.timer = FakeTimer()
+        self.scheduler = CommandScheduler(self.timer)
+        self.log = []
+
+    def test_command_lifecycle(self):
+        command = CountingCommand(3, self.log, "a")
+        self.scheduler.schedule(command)
+        run_ticks(self.scheduler, 2)
+        self.assertTrue(self.scheduler.is_scheduled(command))
+        self.scheduler.run()
+        self.assertFalse(self.scheduler.is_scheduled(command))
+        self.assertEqual(self.log, ["a initialize", "a end"])
+
+    def test_sequential_group(self):
+        group = SequentialCommandGroup(
+            CountingCommand(2, self.log, "a"), CountingCommand(2, self.log, "b")
+        )
+        self.scheduler.schedule(group)
+        run_ticks(self.scheduler, 2)
+        self.assertEqual(self.log, ["a initialize", "a end", "b initialize"])
+        run_ticks(self.scheduler, 2)
+        self.assertEqual(self.log[-1], "b end")
+        self.assertFalse(self.scheduler.is_scheduled(group))
+
+    def test_parallel_group_waits_for_all(self):
+        group = ParallelCommandGroup(
+            CountingCommand(1, self.log, "a"), CountingCommand(3, self.log, "b")
+        )
+        self.scheduler.schedule(group)
+        self.scheduler.run()
+        self.assertIn("a end", self.log)
+        self.assertTrue(self.scheduler.is_scheduled(group))
+        run_ticks(self.scheduler, 2)
+        self.assertFalse(self.scheduler.is_scheduled(group))
+
+    def test_race_group_interrupts_the_rest(self):
+        group = ParallelRaceGroup(
+            CountingCommand(1, self.log, "a"), CountingCommand(3, self.log, "b")
+        )
+        self.scheduler.schedule(group)
+        self.scheduler.run()
+        self.assertFalse(self.scheduler.is_scheduled(group))
+        self.assertIn("b interrupted", self.log)
+
+    def test_shared_requirement_interrupts(self):
+        subsystem = object()
+        first = CountingCommand(10, self.log, "a", (subsystem,))
+        second = CountingCommand(10, self.log, "b", (subsystem,))
+        self.scheduler.schedule(first)
+        self.scheduler.run()
+        self.scheduler.schedule(second)
+        self.scheduler.run()
+        self.assertEqual(self.log, ["a initialize", "a interrupted", "b initialize"])
+
+    def test_cancel(self):
+        command = CountingCommand(10, self.log, "a")
+        self.scheduler.schedule(command)
+        self.scheduler.run()
+        self.scheduler.cancel(command)
+        self.scheduler.run()
+        self.assertEqual(self.log[-1], "a interrupted")
+        self.assertFalse(self.scheduler.is_scheduled(command))
+
+    def test_wait_commands(self):
+        flag = []
+        group = SequentialCommandGroup(
+            WaitCommand(self.timer, 1),
+            InstantCommand(lambda: flag.append(1)),
+            WaitUntilCommand(lambda: len(flag) > 1),
+        )
+        self.scheduler.schedule(group)
+        self.scheduler.run()
+        self.assertEqual(flag, [])
+        self.timer.seconds = 1
+        self.scheduler.run()
+        self.assertEqual(flag, [1])
+        flag.append(2)
+        self.scheduler.run()
+        self.assertFalse(self.scheduler.is_scheduled(group))
+
+    def test_run_until_finished_without_thread(self):
+        ticks = []
+        command = FunctionalCommand(
+            execute=lambda: ticks.append(1), is_finished=lambda: len(ticks) >= 3
+        )
+        self.scheduler.period_ms = 0
+        self.scheduler.run_until_finished(command)
+        self.assertEqual(len(ticks), 3)
+
+    def test_run_until_finished_from_runtime(self):
+        # While a Runtime ticks the scheduler, the waiting thread must not tick it as well
+        timer = Brain.timer
+        scheduler = CommandScheduler(timer, 10)
+        runtime = Runtime(timer)
+        scheduler.add_to_runtime(runtime)
+        runtime.start()
+        command = CountingCommand(1000, self.log, "counting")
+        try:
+            scheduler.run_until_finished(
+                ParallelRaceGroup(command, WaitCommand(timer, 0.3))
+            )
+        finally:
+            runtime.stop()
+        # About 30 ticks in 0.3 seconds, ticking from both threads would give about 60
+        self.assertGreater(command.executions, 15)
+        self.assertLess(command.executions, 40)
+
+    def test_restart_runs_one_loop(self):
+        scheduler = CommandScheduler(Brain.timer, 10)
+        threads = []
+        scheduler.start()
+        time.sleep(0.03)
+        # Started again while the first loop is still waiting for the next tick
+        scheduler.stop()
+        scheduler.start()
+        scheduler.schedule(
+            FunctionalCommand(execute=lambda: threads.append(threading.get_ident()))
+        )
+        time.sleep(0.05)
+        threads.clear()
+        time.sleep(0.05)
+        scheduler.stop()
+        self.assertGreater(len(threads), 0)
+        self.assertEqual(1, len(set(threads)))
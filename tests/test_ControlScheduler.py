@@ -0,0 +1,158 @@
+from unittest import TestCase
+import sys
+import os
+
+src_dir = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+
+sys.path.append(src_dir)
+
+import threading
+import time
+
+import ControlScheduler as scheduler_module
+from ControlScheduler import ControlScheduler
+from Logger import WARNING
+from MotorPIDController import MotorPID
+from vex import Brain
+
+
+class FakeTimer:
+    def __init__(self):
+        self.milliseconds = 0
+
+    def time(self, units):
+        return self.milliseconds if units == "MSEC" else self.milliseconds / 1000
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.messages = []
+
+    def emit(self, level, name, message):
+        self.messages.append((level, name, message))
+
+
+class FakeController:
+    # Records the order it was updated in and advances the timer by how long it "takes"
+    def __init__(self, timer, log, name, duration_ms):
+        self.timer = timer
+        self.log = log
+        self.name = name
+        self.duration_ms = duration_ms
+
+    def update(self):
+        self.log.append(self.name)
+        self.timer.milliseconds += self.duration_ms
+
+
+class FakeMotor:
+    def __init__(self):
+        self.current_velocity = 0
+        self.commanded_velocity = None
+
+    def velocity(self, units):
+        return self.current_velocity
+
+    def set_velocity(self, velocity, units):
+        self.commanded_velocity = velocity
+
+
+class TestControlScheduler(TestCase):
+    def setUp(self):
+        self.timer = FakeTimer()
+        self.overruns = []
+        self.scheduler = ControlScheduler(
+            self.timer, 10, lambda tick_ms, statistics: self.overruns.append(tick_ms)
+        )
+        self.log = []
+        # Controllers are timed with the microsecond tick counter, follow the fake timer instead
+        self.ticks_us = scheduler_module.ticks_us
+        scheduler_module.ticks_us = lambda: self.timer.milliseconds * 1000
+
+    def tearDown(self):
+        scheduler_module.ticks_us = self.ticks_us
+
+    def test_priority_order(self):
+        for name, priority in (("low", 0), ("high", 5), ("middle", 1), ("low 2", 0)):
+            self.scheduler.register(
+                FakeController(self.timer, self.log, name, 1), priority, name
+            )
+        self.scheduler.run()
+        self.assertEqual(self.log, ["high", "middle", "low", "low 2"])
+
+    def test_statistics_and_overruns(self):
+        fast = self.scheduler.register(FakeController(self.timer, self.log, "a", 2))
+        slow = self.scheduler.register(FakeController(self.timer, self.log, "b", 4))
+        self.assertEqual(self.scheduler.run(), 6)
+        self.assertEqual(self.overruns, [])
+        slow.duration_ms = 12
+        self.scheduler.run()
+        self.assertEqual(self.overruns, [14])
+        self.assertEqual(self.scheduler.overruns, 1)
+        fast_statistics, slow_statistics = self.scheduler.statistics()
+        self.assertEqual(fast_statistics.average_ms, 2)
+        self.assertEqual(slow_statistics.maximum_ms, 12)
+        self.assertEqual(slow_statistics.average_ms, 8)
+        self.assertEqual(slow_statistics.updates, 2)
+
+    def test_unregister(self):
+        controller = self.scheduler.register(FakeController(self.timer, self.log, "a", 1))
+        self.assertRaises(ValueError, self.scheduler.register, controller)
+        self.scheduler.unregister(controller)
+        self.scheduler.run()
+        self.assertFalse(self.scheduler.is_registered(controller))
+        self.assertEqual(self.log, [])
+
+    def test_motor_pid_registers_and_adds_correction(self):
+        motor = FakeMotor()
+        motor_pid = MotorPID(self.timer, motor, 0.5, 0, 0, 0.01, scheduler=self.scheduler)
+        self.assertTrue(self.scheduler.is_registered(motor_pid))
+        motor_pid.set_velocity(50)
+        motor.current_velocity = 40
+        self.timer.milliseconds += 10
+        self.scheduler.run()
+        # The motor is sent its target plus the PID's correction
+        self.assertEqual(motor.commanded_velocity, 55)
+
+    def test_sub_millisecond_timings(self):
+        self.scheduler.register(FakeController(self.timer, self.log, "a", 0.25))
+        self.assertAlmostEqual(0.25, self.scheduler.run())
+        self.assertAlmostEqual(0.25, self.scheduler.statistics()[0].last_ms)
+
+    def test_overruns_are_logged(self):
+        handler = RecordingHandler()
+        scheduler_module.log.add_handler(handler)
+        try:
+            scheduler = ControlScheduler(self.timer, 10)
+            scheduler.register(FakeController(self.timer, self.log, "slow", 12), name="slow")
+            scheduler.run()
+        finally:
+            scheduler_module.log.remove_handler(handler)
+        self.assertEqual(1, len(handler.messages))
+        level, name, message = handler.messages[0]
+        self.assertEqual((WARNING, "ControlScheduler"), (level, name))
+        self.assertIn("slowest was slow", message)
+
+    def test_restart_runs_one_loop(self):
+        scheduler_module.ticks_us = self.ticks_us
+        scheduler = ControlScheduler(Brain.timer, 10)
+        threads = []
+
+        class Recorder:
+            def update(self):
+                threads.append(threading.get_ident())
+
+        scheduler.register(Recorder())
+        scheduler.start()
+        time.sleep(0.03)
+        # Started again while the first loop is still waiting for the next tick
+        scheduler.stop()
+        scheduler.start()
+        time.sleep(0.05)
+        threads.clear()
+        time.sleep(0.05)
+        scheduler.stop()
+        self.assertGreater(len(threads), 0)
+        self.assertEqual(1, len(set(threads)))
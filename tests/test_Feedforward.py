@@ -0,0 +1,60 @@
+from unittest import TestCase
+import sys
+import os
+
+src_dir = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+
+sys.path.append(src_dir)
+
+from Feedforward import MotorFeedforward, fit_feedforward
+
+KS, KV, KA = 0.6, 0.16, 0.02
+
+
+def voltage(velocity, acceleration):
+    return MotorFeedforward(KS, KV, KA).calculate(velocity, acceleration)
+
+
+class TestFeedforward(TestCase):
+    def test_calculate(self):
+        feedforward = MotorFeedforward(KS, KV, KA)
+        self.assertEqual(feedforward.calculate(0), 0)
+        self.assertAlmostEqual(feedforward.calculate(10, 5), 0.6 + 1.6 + 0.1)
+        self.assertAlmostEqual(feedforward.calculate(-10), -0.6 - 1.6)
+
+    def test_maximum_achievable_velocity(self):
+        feedforward = MotorFeedforward(KS, KV, KA)
+        self.assertAlmostEqual(
+            feedforward.calculate(feedforward.maximum_achievable_velocity(12)), 12
+        )
+
+    def test_rejects_non_positive_kv(self):
+        self.assertRaises(ValueError, MotorFeedforward, KS, 0)
+
+    def test_fit_recovers_constants(self):
+        # Stationary samples below kS should be ignored
+        quasistatic_samples = [(0.1 * i, 0) for i in range(6)]
+        for velocity in range(1, 60):
+            quasistatic_samples.append((voltage(velocity, 0), velocity))
+            quasistatic_samples.append((voltage(-velocity, 0), -velocity))
+        step_samples = []
+        velocity = 1
+        for _ in range(100):
+            # The robot accelerating under a 6 volt step
+            acceleration = (6 - KS - KV * velocity) / KA
+            step_samples.append((6, velocity, acceleration))
+            velocity += acceleration * 0.01
+
+        ks, kv, ka = fit_feedforward(quasistatic_samples, step_samples)
+        self.assertAlmostEqual(ks, KS)
+        self.assertAlmostEqual(kv, KV)
+        self.assertAlmostEqual(ka, KA)
+
+    def test_fit_without_step_samples(self):
+        quasistatic_samples = [(voltage(v, 0), v) for v in range(1, 20)]
+        self.assertAlmostEqual(fit_feedforward(quasistatic_samples, [])[2], 0)
+
+    def test_fit_rejects_stationary_samples(self):
+        self.assertRaises(ValueError, fit_feedforward, [(1, 0), (2, 0)], [])
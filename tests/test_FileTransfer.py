@@ -0,0 +1,182 @@
+from unittest import TestCase
+import binascii
+import os
+import random
+import struct
+import sys
+import tempfile
+import threading
+
+src_dir = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+utils_dir = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "utils"
+)
+
+sys.path.append(src_dir)
+sys.path.append(utils_dir)
+
+from FileTransfer import (
+    CHUNK_CORRUPT,
+    DATA_HEADER_FORMAT,
+    DIGEST_MISMATCH,
+    PART_SUFFIX,
+    RESULT_FORMAT,
+    RESUME_FORMAT,
+    START_FORMAT,
+    TRANSFER_COMPLETE,
+    WRONG_OFFSET,
+    FileReceiver,
+)
+from SerialProtocol import (
+    FILE_DATA_MESSAGE,
+    FILE_END_MESSAGE,
+    FILE_RESULT_MESSAGE,
+    FILE_RESUME_MESSAGE,
+    FILE_START_MESSAGE,
+)
+from serial_peer import SerialPeer
+
+
+class RecordingChannel:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, message_type, payload=b""):
+        self.sent.append((message_type, payload))
+
+
+def start_message(data, name):
+    return struct.pack(START_FORMAT, len(data), binascii.crc32(data)) + name.encode()
+
+
+def data_message(data, offset, length):
+    chunk = data[offset : offset + length]
+    return struct.pack(DATA_HEADER_FORMAT, offset, binascii.crc32(chunk)) + chunk
+
+
+class TestFileReceiver(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "path.txt")
+        self.data = bytes(random.Random(3).randrange(256) for _ in range(5000))
+        self.channel = RecordingChannel()
+        # A small buffer so it fills and is written several times
+        self.receiver = FileReceiver(self.channel, 300)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def send_chunks(self, start, end, length=700):
+        for offset in range(start, end, length):
+            self.receiver.handle(
+                FILE_DATA_MESSAGE, data_message(self.data, offset, min(length, end - offset))
+            )
+
+    def last_result(self):
+        message_type, payload = self.channel.sent[-1]
+        self.assertEqual(FILE_RESULT_MESSAGE, message_type)
+        return struct.unpack(RESULT_FORMAT, payload)
+
+    def test_whole_file(self):
+        self.receiver.handle(FILE_START_MESSAGE, start_message(self.data, self.path))
+        self.assertEqual(
+            (FILE_RESUME_MESSAGE, struct.pack(RESUME_FORMAT, 0, 0)), self.channel.sent[0]
+        )
+        self.send_chunks(0, len(self.data))
+        self.assertEqual(self.path, self.receiver.handle(FILE_END_MESSAGE, b""))
+        self.assertEqual((TRANSFER_COMPLETE, len(self.data)), self.last_result())
+        with open(self.path, "rb") as file:
+            self.assertEqual(self.data, file.read())
+        self.assertFalse(os.path.exists(self.path + PART_SUFFIX))
+
+    def test_rejected_chunks(self):
+        self.receiver.handle(FILE_START_MESSAGE, start_message(self.data, self.path))
+        self.send_chunks(0, 1000)
+        corrupt = bytearray(data_message(self.data, 1000, 100))
+        corrupt[-1] ^= 0xFF
+        self.receiver.handle(FILE_DATA_MESSAGE, bytes(corrupt))
+        self.assertEqual((CHUNK_CORRUPT, 1000), self.last_result())
+        self.receiver.handle(FILE_DATA_MESSAGE, data_message(self.data, 1500, 100))
+        self.assertEqual((WRONG_OFFSET, 1000), self.last_result())
+        self.send_chunks(1000, len(self.data))
+        self.assertEqual(self.path, self.receiver.handle(FILE_END_MESSAGE, b""))
+
+    def test_resume(self):
+        self.receiver.handle(FILE_START_MESSAGE, start_message(self.data, self.path))
+        self.send_chunks(0, 2100)
+        # Starting the same file again reports what has already arrived
+        self.receiver.handle(FILE_START_MESSAGE, start_message(self.data, self.path))
+        self.assertEqual(
+            (
+                FILE_RESUME_MESSAGE,
+                struct.pack(RESUME_FORMAT, 2100, binascii.crc32(self.data[:2100])),
+            ),
+            self.channel.sent[-1],
+        )
+        self.send_chunks(2100, len(self.data))
+        self.assertEqual(self.path, self.receiver.handle(FILE_END_MESSAGE, b""))
+        with open(self.path, "rb") as file:
+            self.assertEqual(self.data, file.read())
+
+    def test_digest_mismatch(self):
+        other = self.data[:-1] + bytes([self.data[-1] ^ 1])
+        self.receiver.handle(FILE_START_MESSAGE, start_message(other, self.path))
+        self.send_chunks(0, len(self.data))
+        self.assertIsNone(self.receiver.handle(FILE_END_MESSAGE, b""))
+        self.assertEqual(DIGEST_MISMATCH, self.last_result()[0])
+        self.assertFalse(os.path.exists(self.path))
+        self.assertFalse(os.path.exists(self.path + PART_SUFFIX))
+
+
+class TestSendFile(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.directory.name, "source.bin")
+        self.destination = os.path.join(self.directory.name, "destination.bin")
+        self.data = bytes(random.Random(4).randrange(256) for _ in range(20000))
+        with open(self.source, "wb") as file:
+            file.write(self.data)
+
+        self.controller, self.device = os.openpty()
+        self.computer = SerialPeer(self.controller)
+        self.brain = SerialPeer(self.device)
+        self.running = True
+        self.thread = threading.Thread(target=self.run_brain, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.running = False
+        self.thread.join(1.0)
+        os.close(self.controller)
+        os.close(self.device)
+        self.directory.cleanup()
+
+    def run_brain(self):
+        receiver = FileReceiver(self.brain.channel)
+        while self.running:
+            message = self.brain.receive(0.05)
+            if message is not None:
+                receiver.handle(*message)
+
+    def check_sent(self, resumed_from):
+        self.assertEqual(
+            TRANSFER_COMPLETE, self.computer.send_file(self.source, self.destination, 5.0)
+        )
+        self.assertEqual(resumed_from, self.computer.resumed_from)
+        with open(self.destination, "rb") as file:
+            self.assertEqual(self.data, file.read())
+
+    def test_send_file(self):
+        self.check_sent(0)
+
+    def test_resume_from_partial_file(self):
+        with open(self.destination + PART_SUFFIX, "wb") as file:
+            file.write(self.data[:7000])
+        self.check_sent(7000)
+
+    def test_partial_file_of_a_different_file_is_replaced(self):
+        with open(self.destination + PART_SUFFIX, "wb") as file:
+            file.write(b"something else")
+        self.check_sent(0)
@@ -0,0 +1,105 @@
+from unittest import TestCase
+import math
+import random
+import sys
+import os
+
+src_dir = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+
+sys.path.append(src_dir)
+
+import Constants
+from Kinematics import DrivetrainKinematics
+from Utilities import calculate_wheel_power
+
+
+def legacy_wheel_speeds(direction, speed, spin):
+    # The per-wheel calculation Drivetrain.move used before the kinematics matrix
+    return [
+        calculate_wheel_power(direction, speed, angle) + (spin if inverted else -spin)
+        for angle, inverted in (
+            (Constants.front_left_wheel_rotation_rad, Constants.front_left_motor_inverted),
+            (Constants.front_right_wheel_rotation_rad, Constants.front_right_motor_inverted),
+            (Constants.rear_left_wheel_rotation_rad, Constants.rear_left_motor_inverted),
+            (Constants.rear_right_wheel_rotation_rad, Constants.rear_right_motor_inverted),
+        )
+    ]
+
+
+def legacy_odometry_delta(rotation_rad, wheel_distances):
+    # The field-relative movement Odometry.update_states calculated before the kinematics matrix
+    front_left, front_right, rear_left, rear_right = wheel_distances
+    if not Constants.front_left_motor_inverted:
+        front_left *= -1
+    if not Constants.front_right_motor_inverted:
+        front_right *= -1
+    if not Constants.rear_left_motor_inverted:
+        rear_left *= -1
+    if not Constants.rear_right_motor_inverted:
+        rear_right *= -1
+    theta = rotation_rad - math.pi / 4
+    dx = (front_left - rear_right) / 2
+    dy = (rear_left - front_right) / 2
+    return (
+        dy * math.cos(theta) + dx * math.sin(theta),
+        dy * math.sin(theta) - dx * math.cos(theta),
+    )
+
+
+class TestKinematics(TestCase):
+    def setUp(self):
+        self.kinematics = DrivetrainKinematics.from_constants(
+            Constants.DrivetrainType.Mecanum
+        )
+        random.seed(3773)
+
+    def test_inverse_matches_legacy(self):
+        for _ in range(100):
+            direction = random.uniform(-math.pi, math.pi)
+            speed = random.uniform(0, 1)
+            spin = random.uniform(-1, 1)
+            expected = legacy_wheel_speeds(direction, speed, spin)
+            actual = self.kinematics.inverse(
+                math.cos(direction) * speed, math.sin(direction) * speed, spin
+            )
+            for a, b in zip(actual, expected):
+                self.assertAlmostEqual(a, b)
+
+    def test_forward_matches_legacy_odometry(self):
+        for _ in range(100):
+            rotation = random.uniform(-math.pi, math.pi)
+            distances = [random.uniform(-5, 5) for _ in range(4)]
+            dx, dy, _ = self.kinematics.forward(distances)
+            delta_x = dx * math.cos(rotation) - dy * math.sin(rotation)
+            delta_y = dx * math.sin(rotation) + dy * math.cos(rotation)
+            expected_x, expected_y = legacy_odometry_delta(rotation, distances)
+            self.assertAlmostEqual(delta_x, expected_x)
+            self.assertAlmostEqual(delta_y, expected_y)
+
+    def test_forward_inverts_inverse(self):
+        for drivetrain_type in (
+            Constants.DrivetrainType.Mecanum,
+            Constants.DrivetrainType.XDrive,
+        ):
+            kinematics = DrivetrainKinematics.from_constants(drivetrain_type)
+            chassis_speeds = kinematics.forward(kinematics.inverse(0.3, -0.2, 0.5))
+            for a, b in zip(chassis_speeds, (0.3, -0.2, 0.5)):
+                self.assertAlmostEqual(a, b)
+
+    def test_tank_cannot_strafe(self):
+        kinematics = DrivetrainKinematics.from_constants(Constants.DrivetrainType.Tank)
+        wheel_speeds = kinematics.inverse(0.5, 0.4, 0.1)
+        dx, dy, omega = kinematics.forward(wheel_speeds)
+        self.assertEqual(dx, 0)
+        self.assertAlmostEqual(dy, 0.4)
+        self.assertAlmostEqual(omega, 0.1)
+
+    def test_desaturate_uses_absolute_maximum(self):
+        self.assertEqual(
+            DrivetrainKinematics.desaturate([0.5, -2, 1, 0]), [0.25, -1, 0.5, 0]
+        )
+        self.assertEqual(
+            DrivetrainKinematics.desaturate([0.5, -0.5, 1, 0]), [0.5, -0.5, 1, 0]
+        )
@@ -0,0 +1,87 @@
+from unittest import TestCase
+import os
+import sys
+
+src_dir = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+
+sys.path.append(src_dir)
+
+import Logger
+from Logger import DEBUG, ERROR, INFO, WARNING, get_logger
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.messages = []
+
+    def emit(self, level, name, message):
+        self.messages.append((level, name, message))
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now_ms = 0
+
+    def time(self, unit):
+        return self.now_ms
+
+
+class Unformattable:
+    def __str__(self):
+        raise AssertionError("Disabled messages should not be formatted")
+
+
+class TestLogger(TestCase):
+    def setUp(self):
+        self.handler = RecordingHandler()
+        self.parent = get_logger("TestParent")
+        self.child = get_logger("TestParent.Child")
+        self.parent.add_handler(self.handler)
+        self.parent.set_level(DEBUG)
+        self.timer = Logger._timer
+        Logger._timer = FakeTimer()
+
+    def tearDown(self):
+        self.parent.remove_handler(self.handler)
+        self.parent.set_level(None)
+        self.child.set_level(None)
+        self.child.set_rate_limit(0)
+        Logger._timer = self.timer
+
+    def test_get_logger_builds_a_hierarchy(self):
+        self.assertIs(self.child, get_logger("TestParent.Child"))
+        self.assertIs(self.parent, self.child.parent)
+        self.assertIs(get_logger(), self.parent.parent)
+
+    def test_messages_reach_ancestor_handlers(self):
+        self.child.info("x=%s y=%s", 1, 2)
+        self.assertEqual([(INFO, "TestParent.Child", "x=1 y=2")], self.handler.messages)
+
+    def test_levels_are_inherited(self):
+        self.parent.set_level(WARNING)
+        self.assertFalse(self.child.info_enabled)
+        self.assertTrue(self.child.warning_enabled)
+        self.child.set_level(DEBUG)
+        self.assertTrue(self.child.debug_enabled)
+        self.child.set_level(None)
+        self.assertEqual(WARNING, self.child.level)
+
+    def test_disabled_messages_are_not_formatted(self):
+        self.parent.set_level(ERROR)
+        self.child.debug("%s", Unformattable())
+        self.child.warning(Unformattable())
+        self.assertEqual([], self.handler.messages)
+
+    def test_rate_limit(self):
+        self.child.set_rate_limit(100)
+        for _ in range(5):
+            self.child.debug("tick")
+            Logger._timer.now_ms += 30
+        # Errors are never rate limited
+        self.child.error("failed")
+        self.assertEqual(
+            ["tick", "tick (3 messages skipped)", "failed"],
+            [message for _, _, message in self.handler.messages],
+        )
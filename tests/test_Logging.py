@@ -0,0 +1,105 @@
+from unittest import TestCase
+import os
+import sys
+import tempfile
+
+src_dir = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+
+sys.path.append(src_dir)
+
+from Utilities import Logging
+
+
+class TestLogging(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.log_directory = self.directory.name + os.sep
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def make_log(self, **kwargs):
+        return Logging("test", flush_interval=None, directory=self.log_directory, **kwargs)
+
+    def read_log(self):
+        with open(os.path.join(self.directory.name, "test.log"), "rb") as log_file:
+            return log_file.read().decode()
+
+    def test_messages_are_written_in_order(self):
+        log = self.make_log()
+        for i in range(5):
+            log.log("line " + str(i) + "\n")
+        self.assertEqual(6, len(log))
+        log.flush_file_contents()
+        self.assertEqual(0, len(log))
+        lines = self.read_log().splitlines()
+        self.assertTrue(lines[0].startswith("Starting log at"))
+        self.assertEqual(["line " + str(i) for i in range(5)], lines[1:])
+        log.exit()
+
+    def test_flush_writes_once(self):
+        log = self.make_log()
+        writes = []
+        write = log.file_object.write
+        log.file_object.write = lambda data: writes.append(bytes(data)) or write(data)
+        for i in range(20):
+            log.log(str(i) + "\n")
+        log.flush_file_contents()
+        self.assertEqual(1, len(writes))
+        log.exit()
+
+    def test_reopening_appends(self):
+        self.make_log().exit()
+        self.make_log().exit()
+        self.assertEqual(2, self.read_log().count("Starting log at"))
+
+    def test_drop_newest(self):
+        log = self.make_log(capacity=4)
+        for i in range(6):
+            log.log(str(i) + "\n")
+        # The start message and 0 to 2 fit, 3 to 5 are dropped
+        self.assertEqual(3, log.dropped_count)
+        log.flush_file_contents()
+        lines = self.read_log().splitlines()
+        self.assertEqual(["0", "1", "2"], lines[1:4])
+        self.assertIn("3 messages were dropped", lines[4])
+        log.exit()
+
+    def test_drop_oldest(self):
+        log = self.make_log(capacity=4, drop_policy=Logging.DROP_OLDEST)
+        for i in range(6):
+            log.log(str(i) + "\n")
+        self.assertEqual(3, log.overwritten_count)
+        log.flush_file_contents()
+        self.assertEqual(["2", "3", "4", "5"], self.read_log().splitlines()[:4])
+        log.exit()
+
+    def test_block_flushes_to_make_room(self):
+        log = self.make_log(capacity=4, drop_policy=Logging.BLOCK)
+        for i in range(10):
+            log.log(str(i) + "\n")
+        log.exit()
+        self.assertEqual(0, log.dropped_count)
+        self.assertEqual([str(i) for i in range(10)], self.read_log().splitlines()[1:11])
+
+    def test_long_messages_are_truncated(self):
+        log = self.make_log(record_size=8)
+        # The start message is long enough to be truncated too
+        truncated_count = log.truncated_count
+        log.log(b"0123456789\n")
+        self.assertEqual(truncated_count + 1, log.truncated_count)
+        log.log("next\n")
+        log.log(b"no newline")
+        log.exit()
+        lines = self.read_log().splitlines()
+        # Each truncated line keeps its newline, so the following message starts a line of its own
+        self.assertEqual(["Startin", "0123456", "next", "no newliEnding "], lines)
+
+    def test_missing_directory(self):
+        log = Logging("test", flush_interval=None, directory=self.log_directory + "missing/")
+        log.log("lost\n")
+        log.flush_file_contents()
+        self.assertEqual(0, len(log))
+        log.exit()
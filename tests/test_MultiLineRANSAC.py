@@ -0,0 +1,86 @@
+from unittest import TestCase
+import math
+import random
+import sys
+import os
+
+src_dir = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+
+sys.path.append(src_dir)
+
+from MultiLineRANSAC import MultiLineExtractor, SpatialGrid
+
+
+def field_walls(seed=1):
+    # The four walls of a 1424 x 1424 field with noise, plus obstacles scattered inside
+    generator = random.Random(seed)
+    points = []
+    for i in range(150):
+        along = i * 1424 / 150
+        points.append((along, generator.gauss(0, 2)))
+        points.append((along, 1424 + generator.gauss(0, 2)))
+        points.append((generator.gauss(0, 2), along))
+        points.append((1424 + generator.gauss(0, 2), along))
+    points += [
+        (generator.uniform(100, 1300), generator.uniform(100, 1300)) for _ in range(200)
+    ]
+    return points
+
+
+class TestSpatialGrid(TestCase):
+    def test_indices_near_line_matches_a_full_scan(self):
+        generator = random.Random(2)
+        points = [(generator.uniform(0, 500), generator.uniform(0, 500)) for _ in range(2000)]
+        grid = SpatialGrid(points, 15)
+        angle = 0.4
+        normal_x, normal_y = -math.sin(angle), math.cos(angle)
+        offset = 100
+        expected = {
+            i
+            for i, (x, y) in enumerate(points)
+            if abs(x * normal_x + y * normal_y - offset) < 10
+        }
+        found = set(grid.indices_near_line(normal_x, normal_y, offset, 10).tolist())
+        self.assertEqual(expected, found)
+
+    def test_removed_points_are_not_found(self):
+        points = [(x, 0.0) for x in range(100)]
+        grid = SpatialGrid(points, 5)
+        grid.remove(range(50))
+        self.assertEqual(50, len(grid))
+        found = grid.indices_near_line(0.0, 1.0, 0.0, 1)
+        self.assertEqual(list(range(50, 100)), sorted(found.tolist()))
+
+
+class TestMultiLineExtractor(TestCase):
+    def test_finds_every_wall(self):
+        lines = MultiLineExtractor(4, 10, 90, random_seed=1).extract(field_walls())
+        self.assertEqual(4, len(lines))
+        vertical = sorted(model.x_intercept for model, _ in lines if abs(model.slope) > 1)
+        horizontal = sorted(model.y_intercept for model, _ in lines if abs(model.slope) <= 1)
+        self.assertEqual(2, len(vertical))
+        self.assertEqual(2, len(horizontal))
+        for found, expected in zip(vertical + horizontal, (0, 1424, 0, 1424)):
+            self.assertAlmostEqual(expected, found, delta=3)
+        for _, inliers in lines:
+            self.assertGreaterEqual(len(inliers), 140)
+
+    def test_lines_do_not_share_points(self):
+        lines = MultiLineExtractor(4, 10, 90, random_seed=3).extract(field_walls(3))
+        seen = set()
+        for _, inliers in lines:
+            self.assertFalse(seen & inliers)
+            seen |= inliers
+
+    def test_rejected_lines_are_skipped(self):
+        only_vertical = MultiLineExtractor(
+            4, 10, 90, accept=lambda model, inliers: abs(model.slope) > 1, random_seed=1
+        )
+        lines = only_vertical.extract(field_walls())
+        self.assertEqual(2, len(lines))
+        self.assertTrue(all(abs(model.slope) > 1 for model, _ in lines))
+
+    def test_too_few_points(self):
+        self.assertEqual([], MultiLineExtractor(4, 10, 90).extract([(0, 0), (1, 1)]))
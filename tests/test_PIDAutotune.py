@@ -0,0 +1,81 @@
+from unittest import TestCase
+import math
+import sys
+import os
+
+src_dir = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+
+sys.path.append(src_dir)
+
+from PIDAutotune import (
+    RelayAutotuner,
+    TUNING_RULES,
+    tunings_from_ultimate,
+    ultimate_gain,
+)
+
+
+class FakeTimer:
+    def __init__(self):
+        self.seconds = 0
+
+    def time(self, units):
+        return self.seconds
+
+
+def run_relay_test(tuner, timer, gain, delay_s, dt=0.001, start=0.0, wrap=False):
+    # An integrating plant (a motor's position) whose input takes delay_s to have an effect
+    position = start
+    pending = [0.0] * round(delay_s / dt)
+    while not tuner.is_finished():
+        pending.append(tuner.update(position))
+        position += gain * pending.pop(0) * dt
+        if wrap and position > math.pi:
+            position -= 2 * math.pi
+        timer.seconds += dt
+
+
+class TestPIDAutotune(TestCase):
+    def test_ultimate_gain(self):
+        self.assertAlmostEqual(ultimate_gain(1, 4 / math.pi), 1)
+        self.assertAlmostEqual(ultimate_gain(1, 5, 3), 4 / (math.pi * 4))
+        self.assertRaises(ValueError, ultimate_gain, 1, 1, 1)
+
+    def test_tuning_rules(self):
+        self.assertEqual(tunings_from_ultimate(10, 2, "classic"), (6, 6, 1.5))
+        self.assertEqual(tunings_from_ultimate(10, 2, "p"), (5, 0, 0))
+        self.assertRaises(ValueError, tunings_from_ultimate, 1, 1, "unknown")
+        for rule in TUNING_RULES:
+            self.assertTrue(all(gain >= 0 for gain in tunings_from_ultimate(1, 1, rule)))
+
+    def test_relay_on_integrator_with_delay(self):
+        # Under a relay an integrator with delay L makes a triangle wave with period 4L and amplitude gain * d * L
+        timer = FakeTimer()
+        tuner = RelayAutotuner(timer, 1.0, 2.0, cycles=3)
+        run_relay_test(tuner, timer, gain=5, delay_s=0.1)
+        self.assertFalse(tuner.timed_out())
+        self.assertAlmostEqual(tuner.ultimate_period(), 0.4, delta=0.01)
+        self.assertAlmostEqual(tuner.oscillation_amplitude(), 1.0, delta=0.02)
+        self.assertAlmostEqual(tuner.ultimate_gain(), 4 * 2 / math.pi, delta=0.06)
+
+    def test_continuous_input_wraps(self):
+        timer = FakeTimer()
+        tuner = RelayAutotuner(timer, math.pi - 0.05, 1.0, cycles=2)
+        tuner.enable_continuous_input(-math.pi, math.pi)
+        run_relay_test(
+            tuner, timer, gain=1, delay_s=0.1, start=math.pi - 0.05, wrap=True
+        )
+        self.assertAlmostEqual(tuner.ultimate_period(), 0.4, delta=0.01)
+        self.assertAlmostEqual(tuner.oscillation_amplitude(), 0.1, delta=0.01)
+
+    def test_timeout(self):
+        timer = FakeTimer()
+        tuner = RelayAutotuner(timer, 1.0, 1.0, timeout_s=1)
+        for _ in range(20):
+            tuner.update(0)
+            timer.seconds += 0.1
+        self.assertTrue(tuner.is_finished())
+        self.assertTrue(tuner.timed_out())
+        self.assertEqual(tuner.update(0), 0)
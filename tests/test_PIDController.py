@@ -0,0 +1,101 @@
+from unittest import TestCase
+import math
+import sys
+import os
+
+src_dir = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+
+sys.path.append(src_dir)
+
+from PIDController import PIDController
+
+
+class FakeTimer:
+    def __init__(self):
+        self.seconds = 0
+
+    def time(self, units):
+        return self.seconds
+
+
+class TestPIDController(TestCase):
+    def test_measured_mode_skips_early_updates(self):
+        timer = FakeTimer()
+        controller = PIDController(timer, 1, 0, 0, 0.05)
+        controller.setpoint = 10
+        timer.seconds = 0.05
+        self.assertEqual(controller.update(0), 10)
+        timer.seconds = 0.06
+        self.assertEqual(controller.update(5), 10)
+        timer.seconds = 0.1
+        self.assertEqual(controller.update(5), 5)
+
+    def test_fixed_period_needs_no_timer(self):
+        controller = PIDController(None, 0, 1, 0, 0.5, fixed_period=True)
+        controller.setpoint = 2
+        self.assertEqual(controller.update(0), 1)
+        self.assertEqual(controller.update(0), 2)
+        self.assertRaises(ValueError, PIDController, None, 1, 0, 0)
+
+    def test_setpoint_change_does_not_kick_derivative(self):
+        controller = PIDController(None, 0, 0, 1, 0.1, fixed_period=True)
+        controller.update(0)
+        controller.setpoint = 100
+        self.assertEqual(controller.update(0), 0)
+        self.assertAlmostEqual(controller.update(1), -10)
+
+    def test_continuous_input(self):
+        controller = PIDController(None, 1, 0, 0, 0.1, fixed_period=True)
+        controller.enable_continuous_input(-math.pi, math.pi)
+        controller.setpoint = math.pi - 0.1
+        self.assertAlmostEqual(controller.update(-math.pi + 0.1), -0.2)
+
+    def test_output_limits_stop_windup(self):
+        controller = PIDController(
+            None, 1, 1, 0, 0.1, output_limits=(-1, 1), fixed_period=True
+        )
+        controller.setpoint = 10
+        for _ in range(100):
+            self.assertEqual(controller.update(0), 1)
+        # With the integral held the output drops as soon as the error does
+        self.assertLess(controller.update(9.5), 1)
+
+    def test_output_limits_set_later(self):
+        controller = PIDController(None, 1, 0, 0, 0.1, fixed_period=True)
+        controller.setpoint = 10
+        self.assertEqual(controller.update(0), 10)
+        controller.set_output_limits((-1, 1))
+        self.assertEqual(controller.update(0), 1)
+
+    def test_feedforward(self):
+        controller = PIDController(None, 1, 0, 0, 0.1, fixed_period=True)
+        controller.setpoint = 1
+        self.assertEqual(controller.update(0, feedforward=2), 3)
+
+    def test_batch_matches_update(self):
+        measurements = [math.sin(i / 10) * 5 for i in range(200)]
+        setpoints = [1 if i < 100 else -2 for i in range(200)]
+        arguments = (None, 0.8, 0.3, 0.05, 0.02, (-1, 1), (-3, 3), 0.5, True)
+        looped = PIDController(*arguments)
+        expected = []
+        for measurement, setpoint in zip(measurements, setpoints):
+            looped.setpoint = setpoint
+            expected.append(looped.update(measurement))
+        batched = PIDController(*arguments)
+        actual = batched.calculate_batch(measurements, setpoints)
+        for a, b in zip(actual, expected):
+            self.assertAlmostEqual(a, b)
+        self.assertAlmostEqual(batched.update(1), looped.update(1))
+
+    def test_at_setpoint(self):
+        controller = PIDController(None, 1, 0, 0, 0.1, fixed_period=True)
+        controller.set_tolerance(0.5, 1)
+        controller.setpoint = 1
+        controller.update(0)
+        self.assertFalse(controller.at_setpoint())
+        controller.update(1.2)
+        self.assertFalse(controller.at_setpoint())
+        controller.update(1.2)
+        self.assertTrue(controller.at_setpoint())
@@ -0,0 +1,136 @@
+from unittest import TestCase
+import math
+import os
+import random
+import sys
+import tempfile
+
+src_dir = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+
+sys.path.append(src_dir)
+
+from DistanceMap import MAXIMUM_DISTANCE, DistanceMap
+from ParticleFilter import ParticleFilter, kld_sample_count
+
+# Walls at 10cm and 210cm on both axes, in a map with room either side so readings that overshoot still land on it
+WALL_MINIMUM_CM = 10
+WALL_MAXIMUM_CM = 210
+MAP_SIZE_CM = 220
+CELL_SIZE_CM = 2
+SENSORS = [(0, 10), (math.pi / 2, 10), (math.pi, 10), (-math.pi / 2, 10)]
+
+
+def box_map():
+    cells = MAP_SIZE_CM // CELL_SIZE_CM
+    walls = (WALL_MINIMUM_CM // CELL_SIZE_CM, WALL_MAXIMUM_CM // CELL_SIZE_CM)
+    distances = bytearray(cells * cells)
+    for y in range(cells):
+        for x in range(cells):
+            distances[y * cells + x] = min(abs(cell - wall) for cell in (x, y) for wall in walls)
+    return DistanceMap(cells, cells, CELL_SIZE_CM, distances)
+
+
+def readings_from(pose):
+    # What each sensor reads from a pose in the box, by casting a ray to the walls
+    readings = []
+    for sensor_rotation, sensor_distance_from_center_cm in SENSORS:
+        direction_x = math.sin(pose[2] + sensor_rotation)
+        direction_y = math.cos(pose[2] + sensor_rotation)
+        ray_lengths = []
+        for position, direction in ((pose[0], direction_x), (pose[1], direction_y)):
+            if direction > 1e-9:
+                ray_lengths.append((WALL_MAXIMUM_CM - position) / direction)
+            elif direction < -1e-9:
+                ray_lengths.append((WALL_MINIMUM_CM - position) / direction)
+        readings.append(min(ray_lengths) - sensor_distance_from_center_cm)
+    return readings
+
+
+class TestDistanceMap(TestCase):
+    def test_write_and_load(self):
+        distance_map = box_map()
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "field.dmap")
+            distance_map.write(file_name)
+            loaded = DistanceMap.load(file_name)
+        self.assertEqual((distance_map.width, distance_map.height), (loaded.width, loaded.height))
+        self.assertEqual(CELL_SIZE_CM, loaded.cell_size_cm)
+        self.assertEqual(bytes(distance_map.distances), bytes(loaded.distances))
+
+    def test_rejects_other_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "field.dmap")
+            with open(file_name, "wb") as bad_file:
+                bad_file.write(b"VTRJ" + bytes(20))
+            with self.assertRaises(ValueError):
+                DistanceMap.load(file_name)
+
+    def test_lookup(self):
+        distance_map = box_map()
+        self.assertEqual(0, distance_map.cell_distance(11, 100))
+        self.assertEqual(20, distance_map.distance_cm(100, 31))
+        self.assertEqual(MAXIMUM_DISTANCE, distance_map.cell_distance(-5, 100))
+        self.assertEqual(MAXIMUM_DISTANCE, distance_map.cell_distance(100, MAP_SIZE_CM))
+
+
+class TestParticleFilter(TestCase):
+    def setUp(self):
+        random.seed(4)
+        self.particle_filter = ParticleFilter(
+            box_map(), SENSORS, min_particles=100, max_particles=400
+        )
+
+    def test_kld_sample_count_grows_with_spread(self):
+        self.assertEqual(1, kld_sample_count(1, 0.05, 2.33))
+        counts = [kld_sample_count(bins, 0.05, 2.33) for bins in (2, 10, 100)]
+        self.assertEqual(sorted(counts), counts)
+        self.assertGreater(counts[-1], 1000)
+
+    def test_predict_moves_the_way_each_particle_faces(self):
+        self.particle_filter.translation_noise = self.particle_filter.rotation_noise = 0
+        self.particle_filter.position_jitter_cm = self.particle_filter.rotation_jitter_rad = 0
+        self.particle_filter.initialize(50, 50, 0, position_sigma_cm=0, rotation_sigma_rad=0, count=2)
+        self.particle_filter.rotation[1] = math.pi / 2
+        # The odometry faces +y and drives 10cm forward
+        self.particle_filter.predict((0, 0, 0), (0, 10, 0))
+        self.assertAlmostEqual(50, self.particle_filter.x[0], places=4)
+        self.assertAlmostEqual(60, self.particle_filter.y[0], places=4)
+        # The second particle faces +x, so the same forward move takes it along x
+        self.assertAlmostEqual(60, self.particle_filter.x[1], places=4)
+        self.assertAlmostEqual(50, self.particle_filter.y[1], places=4)
+
+    def test_update_prefers_particles_that_match_the_readings(self):
+        self.particle_filter.initialize(0, 0, 0, position_sigma_cm=0, rotation_sigma_rad=0, count=2)
+        self.particle_filter.x[0], self.particle_filter.y[0] = 60, 120
+        self.particle_filter.x[1], self.particle_filter.y[1] = 100, 100
+        self.assertTrue(self.particle_filter.update(readings_from((60, 120, 0))))
+        self.assertGreater(self.particle_filter.weights[0], 0.99)
+        self.assertAlmostEqual(1, sum(self.particle_filter.weights), places=5)
+
+    def test_resample_shrinks_a_converged_cloud(self):
+        self.particle_filter.initialize_uniform()
+        self.assertEqual(400, len(self.particle_filter))
+        self.particle_filter.update(readings_from((60, 120, 0.2)))
+        self.particle_filter.resample()
+        self.assertGreaterEqual(len(self.particle_filter), 100)
+        self.assertLess(len(self.particle_filter), 400)
+
+    def test_corrects_odometry_drift(self):
+        true_pose = [60.0, 60.0, 0.1]
+        # The odometry thinks the robot started 8cm from where it really is
+        odometry_pose = [68.0, 54.0, 0.1]
+        self.particle_filter.initialize(*odometry_pose, position_sigma_cm=8, rotation_sigma_rad=0.05)
+        for _ in range(30):
+            previous_odometry_pose = tuple(odometry_pose)
+            # Drive forward 2cm a step, the odometry sees the same move from its wrong position
+            for pose in (true_pose, odometry_pose):
+                pose[0] += 2 * math.sin(pose[2])
+                pose[1] += 2 * math.cos(pose[2])
+            estimate = self.particle_filter.step(
+                previous_odometry_pose, tuple(odometry_pose), readings_from(true_pose)
+            )
+        self.assertLess(math.dist(estimate[:2], true_pose[:2]), 3)
+        self.assertAlmostEqual(true_pose[2], estimate[2], delta=0.08)
+        self.assertLessEqual(len(self.particle_filter), 400)
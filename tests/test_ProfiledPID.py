@@ -0,0 +1,112 @@
+from unittest import TestCase
+import math
+import sys
+import os
+
+src_dir = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+
+sys.path.append(src_dir)
+
+from ProfiledPID import ProfiledPIDController
+from SCurveMovement import SCurveConstraints, SCurveProfile
+from TrapezoidMovement import Constraints, State
+from Utilities import input_modulus
+
+
+class FakeTimer:
+    def __init__(self):
+        self.seconds = 0
+
+    def time(self, units):
+        return self.seconds
+
+
+def simulate(controller, timer, position, steps, dt=0.02):
+    # A mechanism whose velocity is the controller's output
+    positions = [position]
+    for _ in range(steps):
+        timer.seconds += dt
+        position += controller.calculate(position) * dt
+        positions.append(position)
+    return positions
+
+
+class TestProfiledPID(TestCase):
+    def test_states_are_hashable(self):
+        self.assertEqual(1, len({State(1, 2), State(1, 2)}))
+        self.assertNotEqual(State(1, 2), State(1, 0))
+
+    def test_input_modulus(self):
+        self.assertAlmostEqual(
+            input_modulus(3 * math.pi / 2, -math.pi, math.pi), -math.pi / 2
+        )
+        self.assertAlmostEqual(input_modulus(-5, -2, 2), -1)
+        self.assertAlmostEqual(input_modulus(1, -2, 2), 1)
+
+    def test_setpoint_is_velocity_limited(self):
+        timer = FakeTimer()
+        controller = ProfiledPIDController(timer, 5, 0, 0, Constraints(1, 2), 0.015)
+        controller.set_goal(3)
+        previous_setpoint = controller.get_setpoint().position
+        for _ in range(100):
+            timer.seconds += 0.02
+            controller.calculate(0)
+            setpoint = controller.get_setpoint().position
+            self.assertLessEqual(setpoint - previous_setpoint, 1 * 0.02 + 1e-9)
+            previous_setpoint = setpoint
+
+    def test_reaches_goal(self):
+        timer = FakeTimer()
+        controller = ProfiledPIDController(timer, 5, 0, 0, Constraints(1, 2), 0.015)
+        controller.set_goal(2)
+        positions = simulate(controller, timer, 0, 300)
+        self.assertAlmostEqual(positions[-1], 2, places=2)
+        self.assertLess(max(positions), 2.05)
+
+    def test_s_curve_profile(self):
+        timer = FakeTimer()
+        controller = ProfiledPIDController(
+            timer, 5, 0, 0, SCurveConstraints(1, 2, 10), 0.015
+        )
+        self.assertIsInstance(controller.m_profile, SCurveProfile)
+        controller.set_goal(2)
+        setpoints = []
+        for _ in range(150):
+            timer.seconds += 0.02
+            controller.calculate(0)
+            setpoints.append(controller.get_setpoint())
+        # The setpoint follows the S-curve along from rest rather than restarting every tick
+        self.assertAlmostEqual(
+            setpoints[39].position,
+            SCurveProfile(SCurveConstraints(1, 2, 10))
+            .calculate(0.8, State(0, 0), State(2, 0))
+            .position,
+        )
+        self.assertEqual(setpoints[-1].position, 2)
+        positions = simulate(controller, timer, 0, 300)
+        self.assertAlmostEqual(positions[-1], 2, places=2)
+
+    def test_continuous_input_takes_shortest_way(self):
+        timer = FakeTimer()
+        controller = ProfiledPIDController(timer, 5, 0, 0, Constraints(1, 2), 0.015)
+        controller.enable_continuous_input(-math.pi, math.pi)
+        controller.reset(3)
+        controller.set_goal(-3)
+        positions = simulate(controller, timer, 3, 300)
+        # Going up through pi is 0.28 rad, going down through 0 would be 6 rad
+        self.assertGreater(min(positions), 2.9)
+        self.assertAlmostEqual(positions[-1], 2 * math.pi - 3, places=2)
+
+    def test_rejects_non_positive_period(self):
+        self.assertRaises(
+            ValueError,
+            ProfiledPIDController,
+            FakeTimer(),
+            1,
+            0,
+            0,
+            Constraints(1, 1),
+            0,
+        )
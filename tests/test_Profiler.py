@@ -0,0 +1,96 @@
+from unittest import TestCase
+import os
+import sys
+
+src_dir = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+
+sys.path.append(src_dir)
+
+from Profiler import (
+    BUCKET_COUNT,
+    Profiler,
+    ProfileTelemetry,
+    Section,
+    bucket_index,
+    bucket_upper_bound,
+)
+
+
+class RecordingTelemetry:
+    def __init__(self):
+        self.channels = []
+        self.records = []
+
+    def channel(self, name, fields, format):
+        self.channels.append(name)
+        return len(self.channels) - 1
+
+    def record(self, channel, *values):
+        self.records.append((channel, values))
+
+
+class TestProfiler(TestCase):
+    def test_buckets_hold_their_times(self):
+        previous_upper_bound = -1
+        for index in range(BUCKET_COUNT):
+            upper_bound = bucket_upper_bound(index)
+            # Every time belongs to exactly one bucket, and buckets are at most 1/8 as wide as their times
+            self.assertEqual(index, bucket_index(previous_upper_bound + 1))
+            self.assertEqual(index, bucket_index(upper_bound))
+            self.assertLessEqual(upper_bound - previous_upper_bound, max(1, (upper_bound + 1) / 8))
+            previous_upper_bound = upper_bound
+        self.assertEqual(BUCKET_COUNT - 1, bucket_index(10**9))
+
+    def test_statistics(self):
+        section = Section("test")
+        for time_us in range(1, 1001):
+            section.record(time_us)
+        self.assertEqual(1000, section.count)
+        self.assertEqual(1, section.minimum_us)
+        self.assertEqual(1000, section.maximum_us)
+        self.assertEqual(500.5, section.mean_us)
+        self.assertTrue(990 <= section.percentile_us(99) <= 990 * 1.125)
+        self.assertTrue(500 <= section.percentile_us(50) <= 500 * 1.125)
+        self.assertEqual(1000, section.percentile_us(100))
+        section.reset()
+        self.assertEqual(0, section.percentile_us(99))
+
+    def test_context_manager_and_decorator(self):
+        profiler = Profiler()
+
+        @profiler.profile()
+        def work():
+            return 3
+
+        self.assertEqual(3, work())
+        with profiler.section("block"):
+            pass
+        self.assertEqual(["work", "block"], [section.name for section in profiler.sections()])
+        self.assertEqual([1, 1], [section.count for section in profiler.sections()])
+
+    def test_disabled_profiler_costs_nothing(self):
+        profiler = Profiler(enabled=False)
+
+        def work():
+            pass
+
+        self.assertIs(work, profiler.profile("work")(work))
+        with profiler.section("block"):
+            pass
+        self.assertEqual([], profiler.sections())
+
+    def test_profile_telemetry(self):
+        profiler = Profiler()
+        profiler.section("Odometry").record(100)
+        telemetry = RecordingTelemetry()
+        profile_telemetry = ProfileTelemetry(telemetry, profiler)
+        # The sections that already exist are declared before anything is recorded
+        self.assertEqual(["profile.Odometry"], telemetry.channels)
+        profile_telemetry.update()
+        profiler.section("Display").record(2000)
+        profile_telemetry.update()
+        self.assertEqual(["profile.Odometry", "profile.Display"], telemetry.channels)
+        self.assertEqual((0, (1, 100, 100.0, 100, 100)), telemetry.records[0])
+        self.assertEqual(3, len(telemetry.records))
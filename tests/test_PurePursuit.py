@@ -0,0 +1,71 @@
+from unittest import TestCase
+import math
+import sys
+import os
+
+src_dir = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+
+sys.path.append(src_dir)
+
+from PurePursuit import PurePursuit
+
+
+def simulate(follower, start_position, step_cm=2, maximum_steps=10000):
+    # Drive a perfect point robot along the commands of the follower
+    x, y = start_position
+    positions = [(x, y)]
+    for _ in range(maximum_steps):
+        direction, speed, _ = follower.update((x, y))
+        if follower.finished:
+            break
+        x += math.cos(direction) * speed * step_cm
+        y += math.sin(direction) * speed * step_cm
+        positions.append((x, y))
+    return positions
+
+
+class TestPurePursuit(TestCase):
+    def test_curvature(self):
+        self.assertAlmostEqual(PurePursuit.curvature((0, 0), (1, 0), (2, 0)), 0)
+        # Three points on a circle of radius 10
+        self.assertAlmostEqual(
+            PurePursuit.curvature((10, 0), (0, 10), (-10, 0)), 1 / 10
+        )
+
+    def test_path_is_filled(self):
+        follower = PurePursuit([(0, 0), (0, 100)], 1, 20, point_spacing_cm=5)
+        self.assertEqual(len(follower.points), 21)
+        self.assertAlmostEqual(follower.distances[-1], 100)
+
+    def test_rejects_degenerate_path(self):
+        self.assertRaises(ValueError, PurePursuit, [(5, 5), (5, 5)], 1, 20)
+
+    def test_speed_limited_at_corners_and_end(self):
+        follower = PurePursuit(
+            [(0, 0), (100, 0), (100, 100)], 1, 20, curvature_speed_gain=0.05
+        )
+        corner_index = follower.points.index((100.0, 0.0))
+        self.assertLess(follower.speeds[corner_index], 1)
+        self.assertEqual(follower.speeds[-1], 0)
+        self.assertEqual(follower.speeds[0], 1)
+
+    def test_follows_path_to_end(self):
+        follower = PurePursuit([(0, 0), (100, 0), (100, 100)], 1, 20)
+        positions = simulate(follower, (0, 0))
+        self.assertTrue(follower.finished)
+        end_x, end_y = positions[-1]
+        self.assertLess(math.hypot(end_x - 100, end_y - 100), 3)
+        # The robot should cut the corner rather than driving through it
+        self.assertGreater(
+            min(math.hypot(x - 100, y) for x, y in positions), 1
+        )
+
+    def test_target_heading_faces_path(self):
+        follower = PurePursuit([(0, 0), (0, 100)], 1, 20)
+        _, _, heading = follower.update((0, 0))
+        self.assertAlmostEqual(heading, 0)
+        follower = PurePursuit([(0, 0), (100, 0)], 1, 20)
+        _, _, heading = follower.update((0, 0))
+        self.assertAlmostEqual(heading, -math.pi / 2)
@@ -0,0 +1,80 @@
+from unittest import TestCase
+import math
+import os
+import sys
+import tempfile
+
+src_dir = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+
+sys.path.append(src_dir)
+
+import RaycastTable as raycast_table_module
+from RaycastTable import NO_HIT, RaycastTable, write_raycast_table
+
+WIDTH = 3
+HEIGHT = 2
+ANGLE_BINS = 4
+
+
+def stored_range(cell_x, cell_y, angle_bin):
+    # A distinct value for every entry, with one entry that sees nothing
+    if (cell_x, cell_y, angle_bin) == (2, 1, 3):
+        return NO_HIT
+    return cell_y * 100 + cell_x * 10 + angle_bin
+
+
+class TestRaycastTable(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.directory.name, "field.ray")
+        rows = [
+            bytes(
+                stored_range(cell_x, cell_y, angle_bin)
+                for cell_x in range(WIDTH)
+                for angle_bin in range(ANGLE_BINS)
+            )
+            for cell_y in range(HEIGHT)
+        ]
+        write_raycast_table(self.file_name, WIDTH, HEIGHT, ANGLE_BINS, 5.0, 0.5, rows)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def check_queries(self):
+        with RaycastTable(self.file_name) as table:
+            self.assertEqual((WIDTH, HEIGHT, ANGLE_BINS), (table.width, table.height, table.angle_bins))
+            # Cell (1, 1) looking along +x, which is angle bin 1
+            self.assertEqual(111 * 0.5, table.expected_range(7, 6, math.pi / 2))
+            # Angles wrap, and round to the nearest bin
+            self.assertEqual(
+                table.expected_range(7, 6, -math.pi / 2 + 0.1),
+                table.expected_range(7, 6, 3 * math.pi / 2),
+            )
+            self.assertIsNone(table.expected_range(12, 7, 3 * math.pi / 2))
+            self.assertIsNone(table.expected_range(-1, 2, 0))
+            self.assertIsNone(table.expected_range(2, 10, 0))
+            self.assertEqual([20 * 0.5, 21 * 0.5, 22 * 0.5, 23 * 0.5], table.expected_ranges(12, 1))
+
+    def test_memory_mapped_queries(self):
+        self.check_queries()
+
+    def test_file_queries(self):
+        # The brain has no mmap, so queries seek and read instead
+        mmap = raycast_table_module.mmap
+        raycast_table_module.mmap = None
+        try:
+            self.check_queries()
+        finally:
+            raycast_table_module.mmap = mmap
+
+    def test_rejects_other_files(self):
+        with open(self.file_name, "wb") as bad_file:
+            bad_file.write(b"VDMP" + bytes(30))
+        with self.assertRaises(ValueError):
+            RaycastTable(self.file_name)
+
+    def test_rows_must_be_complete(self):
+        with self.assertRaises(ValueError):
+            write_raycast_table(self.file_name, WIDTH, 1, ANGLE_BINS, 5.0, 0.5, [bytes(3)])
@@ -0,0 +1,122 @@
+from unittest import TestCase
+import os
+import sys
+
+src_dir = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+
+sys.path.append(src_dir)
+
+import threading
+import time
+
+from vex import Brain
+from Profiler import Section
+from Runtime import Runtime
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now_ms = 0
+
+    def time(self, unit):
+        return self.now_ms
+
+
+class TestRuntime(TestCase):
+    def setUp(self):
+        self.timer = FakeTimer()
+        self.runtime = Runtime(self.timer)
+        self.ran = []
+
+    def add_task(self, name, period_ms, duration_ms=0, deadline_ms=None):
+        def run():
+            self.ran.append(name)
+            self.timer.now_ms += duration_ms
+
+        return self.runtime.add_task(run, period_ms, name, deadline_ms)
+
+    def test_earliest_deadline_runs_first(self):
+        self.add_task("slow", 100)
+        self.add_task("fast", 10)
+        self.add_task("urgent", 100, deadline_ms=5)
+        while self.runtime.step() == 0:
+            pass
+        self.assertEqual(["urgent", "fast", "slow"], self.ran)
+
+    def test_step_reports_time_until_next_task(self):
+        self.assertIsNone(self.runtime.step())
+        self.add_task("a", 10)
+        self.add_task("b", 25)
+        self.runtime.step()
+        self.runtime.step()
+        self.timer.now_ms = 4
+        self.assertEqual(6, self.runtime.step())
+
+    def test_periods_are_kept(self):
+        task = self.add_task("a", 10, duration_ms=1)
+        for self.timer.now_ms in range(0, 100):
+            self.runtime.step()
+        self.assertEqual(10, task.runs)
+        self.assertEqual(0, task.missed_deadlines)
+        self.assertEqual(0, task.maximum_lateness_ms)
+
+    def test_overruns_are_recorded_and_skipped(self):
+        task = self.add_task("slow", 10, duration_ms=25)
+        self.runtime.step()
+        self.assertEqual(1, task.missed_deadlines)
+        self.assertEqual(1, task.skipped)
+        self.assertEqual(20, task.release_ms)
+        self.assertEqual(25, task.maximum_ms)
+
+    def test_profiled_in_microseconds(self):
+        # The millisecond timer doesn't move, the section still sees how long the task took
+        task = self.runtime.add_task(lambda: time.sleep(0.0005), 10, "sleeps")
+        task.section = Section("sleeps")
+        self.runtime.step()
+        self.assertEqual(1, task.section.count)
+        self.assertGreaterEqual(task.section.maximum_us, 400)
+        self.assertLess(task.section.maximum_us, 100000)
+        self.assertEqual(0, task.last_ms)
+
+    def test_remove_task(self):
+        task = self.add_task("a", 10)
+        self.runtime.remove_task(task)
+        self.assertEqual([], self.runtime.statistics())
+        self.assertIsNone(self.runtime.step())
+
+    def test_event_loop(self):
+        # Run on the real clock, the loop sleeps between tasks rather than spinning
+        runtime = Runtime(Brain.timer)
+        task = runtime.add_task(lambda: None, 10, "tick")
+        runtime.run(duration_ms=100)
+        self.assertTrue(8 <= task.runs <= 11)
+        self.assertLess(runtime.utilization, 0.5)
+
+    def test_restart_runs_one_loop(self):
+        runtime = Runtime(Brain.timer)
+        threads = []
+        runtime.add_task(lambda: threads.append(threading.get_ident()), 10, "tick")
+        runtime.start()
+        time.sleep(0.03)
+        # Started again while the first loop is still waiting for the next tick
+        runtime.stop()
+        runtime.start()
+        time.sleep(0.05)
+        threads.clear()
+        time.sleep(0.05)
+        runtime.stop()
+        self.assertGreater(len(threads), 0)
+        self.assertEqual(1, len(set(threads)))
+
+    def test_failing_tasks_keep_running(self):
+        def fail():
+            raise ValueError("broken")
+
+        task = self.runtime.add_task(fail, 10, "broken")
+        self.add_task("other", 10)
+        self.runtime.step()
+        self.runtime.step()
+        self.assertEqual(1, task.errors)
+        self.assertEqual(["other"], self.ran)
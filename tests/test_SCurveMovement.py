@@ -0,0 +1,96 @@
+from unittest import TestCase
+import sys
+import os
+
+src_dir = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+
+sys.path.append(src_dir)
+
+from SCurveMovement import SCurveConstraints, SCurveProfile, solve_s_curve
+from TrapezoidMovement import State
+
+
+class TestSCurveMovement(TestCase):
+    def setUp(self):
+        self.constraints = SCurveConstraints(1, 0.5, 1)
+        self.profile = SCurveProfile(self.constraints)
+
+    def test_solve(self):
+        # Long enough to reach both limits, short enough to reach only the acceleration limit, and shorter still
+        self.assertEqual(solve_s_curve(self.constraints, 10), (0.5, 1.5, 7.5))
+        jerk_time, constant_time, cruise_time = solve_s_curve(self.constraints, 1)
+        self.assertEqual((jerk_time, cruise_time), (0.5, 0))
+        self.assertGreater(constant_time, 0)
+        self.assertEqual(solve_s_curve(self.constraints, 0.25)[1:], (0, 0))
+        self.assertRaises(ValueError, SCurveConstraints, 1, 0, 1)
+
+    def test_profile_is_smooth_and_reaches_goal(self):
+        start, goal = State(2, 0), State(-8, 0)
+        total_time = None
+        previous_state = self.profile.calculate(0, start, goal)
+        self.assertAlmostEqual(previous_state.position, 2)
+        step = 0.001
+        t = step
+        while total_time is None or t <= total_time + 0.1:
+            state = self.profile.calculate(t, start, goal)
+            total_time = self.profile.total_time()
+            self.assertLessEqual(state.position, previous_state.position + 1e-12)
+            self.assertLessEqual(abs(state.velocity), 1 + 1e-9)
+            # The velocity changes by at most the maximum acceleration times the step
+            self.assertLessEqual(
+                abs(state.velocity - previous_state.velocity), 0.5 * step + 1e-9
+            )
+            previous_state = state
+            t += step
+        self.assertEqual(previous_state, goal)
+        self.assertAlmostEqual(total_time, 12.5)
+        self.assertTrue(self.profile.is_finished(total_time))
+        self.assertFalse(self.profile.is_finished(total_time - 0.01))
+
+    def test_solved_once_per_goal(self):
+        start, goal = State(0, 0), State(3, 0)
+        self.profile.calculate(0, start, goal)
+        segments = self.profile._segment_states
+        self.profile.calculate(1, State(0, 0), State(3, 0))
+        self.assertIs(self.profile._segment_states, segments)
+        self.profile.calculate(1, start, State(4, 0))
+        self.assertIsNot(self.profile._segment_states, segments)
+
+    def test_time_left_until(self):
+        start, goal = State(0, 0), State(-10, 0)
+        self.profile.calculate(0, start, goal)
+        self.assertEqual(self.profile.time_left_until(1), 0)
+        self.assertEqual(self.profile.time_left_until(-20), self.profile.total_time())
+        # The profile is symmetrical, so it is halfway there halfway through
+        self.assertAlmostEqual(self.profile.time_left_until(-5), 6.25)
+        t = self.profile.time_left_until(-1)
+        self.assertAlmostEqual(self.profile.calculate(t, start, goal).position, -1)
+
+    def test_advancing_a_tick_at_a_time(self):
+        # As ProfiledPIDController uses it, passing back the state it returned each tick
+        profile = SCurveProfile(SCurveConstraints(1, 2, 10))
+        state, goal = State(0, 0), State(1, 0)
+        for _ in range(40):
+            state = profile.calculate(0.02, state, goal)
+        direct = SCurveProfile(SCurveConstraints(1, 2, 10)).calculate(0.8, State(0, 0), goal)
+        self.assertAlmostEqual(state.position, direct.position)
+        self.assertAlmostEqual(state.velocity, direct.velocity)
+
+    def test_starts_from_current_velocity(self):
+        goal = State(1, 0)
+        for velocity in (0.5, -0.5, 0.99, 3):
+            profile = SCurveProfile(SCurveConstraints(1, 2, 10))
+            start = State(0, velocity)
+            self.assertAlmostEqual(profile.calculate(0, start, goal).velocity, velocity)
+            # The velocity is continuous from the start, changing by at most the maximum acceleration per step
+            previous = profile.calculate(0.001, start, goal)
+            self.assertLessEqual(abs(previous.velocity - velocity), 2 * 0.001 + 1e-9)
+            end = profile.calculate(profile.total_time(), start, goal)
+            self.assertEqual(end, goal)
+        # Too fast to stop before the goal, so it overshoots and comes back
+        profile = SCurveProfile(SCurveConstraints(1, 2, 10))
+        start = State(0.95, 0.9)
+        self.assertGreater(profile.calculate(0.5, start, goal).position, 1)
+        self.assertEqual(profile.calculate(profile.total_time(), start, goal), goal)
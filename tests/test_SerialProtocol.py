@@ -0,0 +1,204 @@
+from unittest import TestCase
+import binascii
+import os
+import random
+import sys
+import threading
+import tty
+
+src_dir = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+utils_dir = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "utils"
+)
+
+sys.path.append(src_dir)
+sys.path.append(utils_dir)
+
+from SerialProtocol import (
+    ACK_FRAME,
+    DATA_FRAME,
+    TEXT_MESSAGE,
+    ReliableChannel,
+    StreamConnection,
+    cobs_decode,
+    cobs_encode,
+    crc16_xmodem,
+    decode_frame,
+    encode_frame,
+)
+from serial_peer import MonotonicTimer, SerialPeer
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now_ms = 0
+
+    def time(self, unit):
+        return self.now_ms
+
+
+class LossyLink:
+    """
+    Carries frames between two channels, dropping and corrupting some of them
+    """
+
+    def __init__(self, drop_every: int = 0, corrupt_every: int = 0):
+        self.drop_every = drop_every
+        self.corrupt_every = corrupt_every
+        self.count = 0
+        self.in_flight = []
+
+    def write(self, data):
+        self.count += 1
+        if self.drop_every and self.count % self.drop_every == 0:
+            return
+        if self.corrupt_every and self.count % self.corrupt_every == 0:
+            data = bytearray(data)
+            data[len(data) // 2] ^= 0x10
+        self.in_flight.append(bytes(data))
+
+    def deliver(self, channel):
+        frames, self.in_flight = self.in_flight, []
+        for frame in frames:
+            channel.receive_bytes(frame)
+
+
+class TestFraming(TestCase):
+    def test_crc_matches_binascii(self):
+        self.assertEqual(0x31C3, crc16_xmodem(b"123456789"))
+        data = bytes(random.Random(1).randrange(256) for _ in range(1000))
+        self.assertEqual(binascii.crc_hqx(data, 0), crc16_xmodem(data))
+        self.assertEqual(
+            binascii.crc_hqx(data, 0), crc16_xmodem(data[500:], crc16_xmodem(data[:500]))
+        )
+
+    def test_cobs_round_trip(self):
+        generator = random.Random(2)
+        cases = [
+            b"",
+            b"\x00",
+            b"\x00\x00",
+            b"\x11\x22\x00\x33",
+            bytes(range(1, 255)),
+            bytes(range(1, 256)),
+            b"\x01" * 600,
+            bytes(generator.randrange(4) for _ in range(2000)),
+        ]
+        for data in cases:
+            encoded = cobs_encode(data)
+            self.assertNotIn(0, encoded)
+            self.assertLessEqual(len(encoded), len(data) + len(data) // 254 + 1)
+            self.assertEqual(data, cobs_decode(encoded))
+
+    def test_frame_round_trip(self):
+        encoded = encode_frame(DATA_FRAME, TEXT_MESSAGE, 7, b"\x00binary\x00")
+        self.assertEqual(0, encoded[-1])
+        self.assertEqual(1, encoded.count(0))
+        self.assertEqual(
+            (DATA_FRAME, TEXT_MESSAGE, 7, b"\x00binary\x00"), decode_frame(encoded[:-1])
+        )
+
+    def test_corrupt_frames_are_rejected(self):
+        encoded = bytearray(encode_frame(ACK_FRAME, 0, 3)[:-1])
+        encoded[2] ^= 0x01
+        with self.assertRaises(ValueError):
+            decode_frame(encoded)
+        with self.assertRaises(ValueError):
+            decode_frame(b"\x02\x01")
+
+
+class TestReliableChannel(TestCase):
+    def exchange(self, link_to_receiver, link_to_sender, messages, window_size=8):
+        timer = FakeTimer()
+        sender = ReliableChannel(link_to_receiver.write, timer, window_size, 50)
+        receiver = ReliableChannel(link_to_sender.write, timer, window_size, 50)
+        for message in messages:
+            sender.send(TEXT_MESSAGE, message)
+        received = []
+        for _ in range(10000):
+            link_to_receiver.deliver(receiver)
+            link_to_sender.deliver(sender)
+            while receiver.has_messages():
+                received.append(receiver.receive()[1])
+            if not sender.pending() and not link_to_receiver.in_flight:
+                break
+            timer.now_ms += 10
+            sender.poll()
+        return sender, receiver, received
+
+    def test_delivers_in_order(self):
+        messages = [str(i).encode() for i in range(300)]
+        sender, receiver, received = self.exchange(LossyLink(), LossyLink(), messages)
+        self.assertEqual(messages, received)
+        self.assertEqual(0, sender.retransmissions)
+
+    def test_recovers_from_lost_and_corrupt_frames(self):
+        messages = [bytes([i % 256, 0, i // 256]) for i in range(600)]
+        sender, receiver, received = self.exchange(
+            LossyLink(drop_every=5, corrupt_every=7),
+            LossyLink(drop_every=3),
+            messages,
+        )
+        self.assertEqual(messages, received)
+        self.assertGreater(sender.retransmissions, 0)
+        self.assertGreater(receiver.corrupt_frames, 0)
+        self.assertGreater(receiver.duplicates, 0)
+
+    def test_frames_split_across_reads(self):
+        timer = FakeTimer()
+        receiver = ReliableChannel(lambda data: None, timer)
+        data = encode_frame(DATA_FRAME, 5, 0, b"abc") + encode_frame(DATA_FRAME, 6, 1, b"def")
+        # Garbage before the first delimiter, as if listening started part way through a frame
+        data = b"\x07\x07" + b"\x00" + data
+        for index in range(len(data)):
+            receiver.receive_bytes(data[index : index + 1])
+        self.assertEqual((5, b"abc"), receiver.receive())
+        self.assertEqual((6, b"def"), receiver.receive())
+        self.assertIsNone(receiver.receive())
+
+
+class TestPseudoTerminal(TestCase):
+    def setUp(self):
+        self.controller, self.device = os.openpty()
+
+    def tearDown(self):
+        os.close(self.controller)
+        os.close(self.device)
+
+    def test_peers(self):
+        computer = SerialPeer(self.controller)
+        brain = SerialPeer(self.device)
+        payload = bytes(range(256)) * 4
+        computer.send(TEXT_MESSAGE, "hello")
+        computer.send(9, payload)
+        brain_received = [brain.receive(2.0), brain.receive(2.0)]
+        self.assertEqual([(TEXT_MESSAGE, b"hello"), (9, payload)], brain_received)
+        self.assertTrue(computer.wait_until_sent(2.0))
+
+    def test_stream_connection(self):
+        # The brain's end reads from a stream in its own thread, as main_wireless does with stdin
+        tty.setraw(self.device)
+        stream = os.fdopen(os.dup(self.device), "rb", buffering=0)
+        brain = ReliableChannel(
+            lambda data: os.write(self.device, data), MonotonicTimer()
+        )
+        connection = StreamConnection(brain, stream)
+        thread = threading.Thread(target=connection.run, daemon=True)
+        thread.start()
+        computer = SerialPeer(self.controller)
+        try:
+            for i in range(20):
+                computer.send(TEXT_MESSAGE, "message " + str(i))
+            self.assertTrue(computer.wait_until_sent(5.0))
+            self.assertEqual(
+                ["message " + str(i) for i in range(20)],
+                [brain.receive(True, 2000)[1].decode() for _ in range(20)],
+            )
+            brain.send(TEXT_MESSAGE, "reply")
+            self.assertEqual((TEXT_MESSAGE, b"reply"), computer.receive(2.0))
+        finally:
+            connection.stop()
+            thread.join(1.0)
+            stream.close()
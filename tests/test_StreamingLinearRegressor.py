@@ -0,0 +1,122 @@
+from unittest import TestCase
+import math
+import random
+import sys
+import os
+
+src_dir = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+
+sys.path.append(src_dir)
+
+from LinearRegressor import LinearRegressor
+from StreamingLinearRegressor import StreamingLinearRegressor
+
+
+class TestStreamingLinearRegressor(TestCase):
+    def setUp(self):
+        generator = random.Random(4)
+        self.points = [
+            (x, 0.8 * x + 3 + generator.gauss(0, 1.4)) for x in range(1, 31)
+        ]
+
+    def test_matches_linear_regressor(self):
+        expected = LinearRegressor().fit(self.points)
+        regressor = StreamingLinearRegressor().add_points(self.points).fit()
+        self.assertAlmostEqual(regressor.slope, expected.slope)
+        self.assertAlmostEqual(regressor.y_intercept, expected.y_intercept)
+        self.assertAlmostEqual(regressor.x_intercept, expected.x_intercept)
+        self.assertAlmostEqual(regressor.sum_xy, sum(x * y for x, y in self.points))
+        self.assertAlmostEqual(regressor.sum_x_squared, sum(x * x for x, _ in self.points))
+        self.assertEqual(regressor.count, 30)
+
+    def test_remove_point(self):
+        regressor = StreamingLinearRegressor().add_points(self.points)
+        for point in self.points[:10]:
+            regressor.remove_point(*point)
+        expected = StreamingLinearRegressor().add_points(self.points[10:]).fit()
+        regressor.fit()
+        self.assertAlmostEqual(regressor.slope, expected.slope)
+        self.assertAlmostEqual(regressor.y_intercept, expected.y_intercept)
+        for point in self.points[10:]:
+            regressor.remove_point(*point)
+        self.assertEqual(regressor.count, 0)
+        self.assertRaises(ValueError, regressor.remove_point, 0, 0)
+
+    def test_sliding_window(self):
+        regressor = StreamingLinearRegressor(window_size=8)
+        for i, point in enumerate(self.points):
+            regressor.add_point(*point)
+            if i >= 8:
+                expected = LinearRegressor().fit(self.points[i - 7 : i + 1])
+                self.assertAlmostEqual(regressor.fit().slope, expected.slope)
+                self.assertAlmostEqual(regressor.y_intercept, expected.y_intercept)
+        self.assertEqual(regressor.count, 8)
+        self.assertRaises(ValueError, regressor.remove_point, *self.points[-1])
+
+    def test_weighted_fit(self):
+        # A weight of 2 counts the same as adding the point twice
+        weighted = StreamingLinearRegressor().add_points(
+            [(x, y, 2.0 if x % 3 == 0 else 1.0) for x, y in self.points]
+        )
+        duplicated = StreamingLinearRegressor().add_points(
+            self.points + [point for point in self.points if point[0] % 3 == 0]
+        )
+        self.assertAlmostEqual(weighted.fit().slope, duplicated.fit().slope)
+        self.assertAlmostEqual(weighted.y_intercept, duplicated.y_intercept)
+
+    def test_total_least_squares(self):
+        # Points scattered either side of the line y = 2x + 1 at right angles to it
+        regressor = StreamingLinearRegressor()
+        normal = (-2 / math.sqrt(5), 1 / math.sqrt(5))
+        for i in range(-10, 11):
+            for offset in (-0.5, 0.5):
+                regressor.add_point(
+                    i + normal[0] * offset, 2 * i + 1 + normal[1] * offset
+                )
+        regressor.fit_total_least_squares()
+        self.assertAlmostEqual(regressor.slope, 2)
+        self.assertAlmostEqual(regressor.y_intercept, 1)
+        self.assertAlmostEqual(regressor.distance_to_point(0, 1), 0)
+        self.assertAlmostEqual(regressor.distance_to_point(2, 0), math.sqrt(5))
+
+    def test_vertical_and_horizontal_lines(self):
+        regressor = StreamingLinearRegressor().add_points([(3, y) for y in range(5)])
+        self.assertRaises(ValueError, regressor.fit)
+        regressor.fit_total_least_squares()
+        self.assertTrue(math.isinf(regressor.slope))
+        self.assertEqual(regressor.predict_x(10), 3)
+        self.assertEqual(regressor.distance_to_point(5, 100), 2)
+
+        regressor = StreamingLinearRegressor().add_points([(x, -2) for x in range(5)])
+        regressor.fit_total_least_squares()
+        self.assertEqual(regressor.slope, 0)
+        self.assertEqual(regressor.predict_y(100), -2)
+
+    def test_distance_to_the_fitted_line(self):
+        regressor = StreamingLinearRegressor().add_points([(x, 2 * x) for x in range(10)])
+        regressor.fit()
+        self.assertAlmostEqual(regressor.distance_to_point(20, 40), 0)
+        # Points added since the fit don't move the line until it is fitted again
+        regressor.add_point(100, 0)
+        regressor.remove_point(0, 0)
+        self.assertAlmostEqual(regressor.distance_to_point(20, 40), 0)
+        self.assertAlmostEqual(regressor.distance_to_point(0, 5), math.sqrt(5))
+
+    def test_far_from_origin(self):
+        # The raw sums lose every significant digit here, the centered moments don't
+        offset = 1e9
+        regressor = StreamingLinearRegressor().add_points(
+            [(offset + x, offset + 0.5 * x) for x in range(10)]
+        )
+        self.assertAlmostEqual(regressor.fit().slope, 0.5)
+        self.assertAlmostEqual(regressor.fit_total_least_squares().slope, 0.5)
+
+    def test_bad_values(self):
+        self.assertRaises(ValueError, StreamingLinearRegressor().fit)
+        self.assertRaises(
+            ValueError, StreamingLinearRegressor().add_points([(1, 1), (1, 1)]).fit
+        )
+        self.assertRaises(ValueError, StreamingLinearRegressor().add_point, 1, 1, 0)
+        self.assertRaises(ValueError, StreamingLinearRegressor, 1)
@@ -0,0 +1,151 @@
+from unittest import TestCase
+import os
+import sys
+import threading
+
+src_dir = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+
+sys.path.append(src_dir)
+
+import Synchronization
+from Synchronization import (
+    Condition,
+    Empty,
+    Event,
+    Full,
+    Lock,
+    Queue,
+    SafeDeque,
+)
+
+
+class TestLock(TestCase):
+    def check_lock(self):
+        lock = Lock()
+        self.assertTrue(lock.acquire())
+        self.assertTrue(lock.locked())
+        self.assertFalse(lock.acquire(False))
+        self.assertFalse(lock.acquire(True, 5))
+        lock.release()
+        self.assertFalse(lock.locked())
+        with lock:
+            self.assertTrue(lock.locked())
+        self.assertFalse(lock.locked())
+
+    def test_thread_lock(self):
+        self.check_lock()
+
+    def test_brain_lock(self):
+        # The brain has no _thread, locks are flags and waiting threads call wait
+        _thread = Synchronization._thread
+        Synchronization._thread = None
+        try:
+            self.check_lock()
+            with self.assertRaises(RuntimeError):
+                Lock().release()
+        finally:
+            Synchronization._thread = _thread
+
+    def test_lock_excludes_other_threads(self):
+        lock = Lock()
+        counter = [0]
+
+        def increment():
+            for _ in range(2000):
+                with lock:
+                    value = counter[0]
+                    counter[0] = value + 1
+
+        threads = [threading.Thread(target=increment) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(8000, counter[0])
+
+
+class TestCondition(TestCase):
+    def test_wait_times_out(self):
+        condition = Condition()
+        with condition:
+            self.assertFalse(condition.wait(5))
+            self.assertEqual(0, len(condition._waiters))
+
+    def test_notify_wakes_a_waiter(self):
+        condition = Condition()
+        ready = []
+
+        def produce():
+            with condition:
+                ready.append(True)
+                condition.notify()
+
+        with condition:
+            threading.Thread(target=produce).start()
+            self.assertTrue(condition.wait_for(lambda: ready, 2000))
+
+    def test_event(self):
+        event = Event()
+        self.assertFalse(event.wait(5))
+        threading.Timer(0.01, event.set).start()
+        self.assertTrue(event.wait(2000))
+        event.clear()
+        self.assertFalse(event.is_set())
+
+
+class TestQueue(TestCase):
+    def test_first_in_first_out(self):
+        queue = Queue()
+        for i in range(20):
+            queue.put(i)
+        self.assertEqual(list(range(20)), [queue.get() for _ in range(20)])
+        with self.assertRaises(Empty):
+            queue.get_nowait()
+        with self.assertRaises(Empty):
+            queue.get(True, 5)
+
+    def test_bounded(self):
+        queue = Queue(2)
+        queue.put(1)
+        queue.put(2)
+        with self.assertRaises(Full):
+            queue.put_nowait(3)
+        with self.assertRaises(Full):
+            queue.put(3, True, 5)
+
+    def test_producer_and_consumer(self):
+        queue = Queue(4)
+
+        def produce():
+            for i in range(100):
+                queue.put(i)
+
+        threading.Thread(target=produce).start()
+        self.assertEqual(list(range(100)), [queue.get(True, 2000) for _ in range(100)])
+
+
+class TestSafeDeque(TestCase):
+    def test_both_ends(self):
+        deque = SafeDeque()
+        for i in range(20):
+            deque.append(i)
+        deque.appendleft(-1)
+        self.assertEqual(21, len(deque))
+        self.assertEqual(-1, deque.popleft())
+        self.assertEqual(19, deque.pop())
+        self.assertEqual(0, deque.popleft())
+        deque.clear()
+        self.assertFalse(deque)
+        with self.assertRaises(IndexError):
+            deque.pop()
+
+    def test_maximum_length_drops_from_the_other_end(self):
+        deque = SafeDeque(3)
+        for i in range(5):
+            deque.append(i)
+        self.assertEqual(2, deque.popleft())
+        deque.appendleft(10)
+        deque.appendleft(11)
+        self.assertEqual([11, 10, 3], [deque.popleft() for _ in range(3)])
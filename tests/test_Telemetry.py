@@ -0,0 +1,125 @@
+from unittest import TestCase
+import os
+import sys
+import tempfile
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+sys.path.append(os.path.join(root_dir, "src"))
+sys.path.append(os.path.join(root_dir, "utils"))
+
+from Telemetry import Telemetry
+from telemetry_reader import convert, read_telemetry
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now_ms = 1000
+
+    def time(self, unit):
+        return self.now_ms
+
+
+class TestTelemetry(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.directory.name, "Match.tlm")
+        self.timer = FakeTimer()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def make_telemetry(self, **kwargs):
+        return Telemetry(self.file_name, self.timer, flush_interval=None, **kwargs)
+
+    def test_round_trip(self):
+        telemetry = self.make_telemetry(block_records=4)
+        pose = telemetry.channel("pose", ("x", "y", "rotation"), "fff")
+        counter = telemetry.channel("counter", ("count", "flag"), "iB")
+        for i in range(10):
+            telemetry.record(pose, i, 2 * i, 0.5)
+            if i % 3 == 0:
+                telemetry.record(counter, -i, 1)
+            self.timer.now_ms += 5
+            telemetry.flush()
+        telemetry.close()
+
+        channels = read_telemetry(self.file_name)
+        self.assertEqual(list(range(10)), channels["pose"]["x"].tolist())
+        self.assertEqual([2 * i for i in range(10)], channels["pose"]["y"].tolist())
+        self.assertEqual([0.5] * 10, channels["pose"]["rotation"].tolist())
+        self.assertEqual(
+            [1 + 0.005 * i for i in range(10)],
+            [round(time_, 3) for time_ in channels["pose"]["time_s"].tolist()],
+        )
+        self.assertEqual([0, -3, -6, -9], channels["counter"]["count"].tolist())
+        self.assertEqual([1.0, 1.015, 1.03, 1.045], channels["counter"]["time_s"].tolist())
+
+    def test_long_gaps_start_a_new_block(self):
+        telemetry = self.make_telemetry()
+        channel = telemetry.channel("value", ("value",), "h")
+        telemetry.record(channel, 1)
+        self.timer.now_ms += 100000
+        telemetry.record(channel, 2)
+        telemetry.close()
+        self.assertEqual([1, 101], read_telemetry(self.file_name)["value"]["time_s"].tolist())
+
+    def test_records_are_dropped_when_the_writer_falls_behind(self):
+        telemetry = self.make_telemetry(block_records=2)
+        channel = telemetry.channel("value", ("value",), "h")
+        for i in range(6):
+            telemetry.record(channel, i)
+        # Two blocks fill without being written, the rest have nowhere to go
+        self.assertEqual(2, telemetry.dropped_count)
+        telemetry.flush()
+        telemetry.record(channel, 6)
+        telemetry.close()
+        self.assertEqual([0, 1, 2, 3, 6], read_telemetry(self.file_name)["value"]["value"].tolist())
+
+    def test_each_boot_writes_its_own_file(self):
+        first = self.make_telemetry()
+        first.record(first.channel("value", ("value",), "h"), 1)
+        first.close()
+        second = self.make_telemetry()
+        second.record(second.channel("value", ("value",), "h"), 2)
+        second.close()
+        self.assertEqual(os.path.join(self.directory.name, "Match_1.tlm"), second.file_name)
+        self.assertEqual([1], read_telemetry(self.file_name)["value"]["value"].tolist())
+        self.assertEqual([2], read_telemetry(second.file_name)["value"]["value"].tolist())
+
+    def test_schema_is_written_by_the_writer(self):
+        telemetry = self.make_telemetry()
+        first = telemetry.channel("first", ("value",), "h")
+        telemetry.record(first, 1)
+        telemetry.flush()
+        size = os.path.getsize(self.file_name)
+        # Declared after recording started, nothing is written until the next flush
+        late = telemetry.channel("late", ("value",), "h")
+        self.assertEqual(size, os.path.getsize(self.file_name))
+        telemetry.record(late, 2)
+        telemetry.close()
+        channels = read_telemetry(self.file_name)
+        self.assertEqual([1], channels["first"]["value"].tolist())
+        self.assertEqual([2], channels["late"]["value"].tolist())
+
+    def test_fields_must_match_format(self):
+        telemetry = self.make_telemetry()
+        with self.assertRaises(ValueError):
+            telemetry.channel("pose", ("x", "y"), "fff")
+        telemetry.close()
+
+    def test_rejects_other_files(self):
+        with open(self.file_name, "wb") as bad_file:
+            bad_file.write(b"VRAY" + bytes(16))
+        with self.assertRaises(ValueError):
+            read_telemetry(self.file_name)
+
+    def test_convert_to_csv(self):
+        telemetry = self.make_telemetry()
+        channel = telemetry.channel("pose", ("x", "y"), "ff")
+        telemetry.record(channel, 1, 2)
+        telemetry.close()
+        (output,) = convert(self.file_name)
+        self.assertEqual(os.path.join(self.directory.name, "Match_pose.csv"), output)
+        with open(output) as csv_file:
+            self.assertEqual(["time_s,x,y", "1.0,1.0,2.0"], csv_file.read().splitlines())
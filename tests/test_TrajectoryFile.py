@@ -0,0 +1,66 @@
+from unittest import TestCase
+import os
+import sys
+import tempfile
+
+src_dir = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+
+sys.path.append(src_dir)
+
+from TrajectoryFile import (
+    HEADER_SIZE,
+    RECORD_SIZE,
+    TrajectoryPlayer,
+    read_trajectory,
+    write_trajectory,
+)
+from TrajectoryGenerator import TrajectoryConstraints, generate_trajectory
+
+
+class TestTrajectoryFile(TestCase):
+    def setUp(self):
+        self.trajectory = generate_trajectory(
+            [(0, 0), (100, 0), (100, 100)],
+            TrajectoryConstraints(60, 120, 80),
+            spline=True,
+        )
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.directory.name, "path.trj")
+        write_trajectory(self.file_name, self.trajectory)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_file_size(self):
+        self.assertEqual(
+            os.path.getsize(self.file_name),
+            HEADER_SIZE + RECORD_SIZE * len(self.trajectory),
+        )
+
+    def test_round_trip(self):
+        trajectory = read_trajectory(self.file_name)
+        self.assertEqual(len(trajectory), len(self.trajectory))
+        self.assertAlmostEqual(trajectory.time_step, self.trajectory.time_step)
+        for i in range(len(trajectory)):
+            self.assertEqual(trajectory.record(i), self.trajectory.record(i))
+
+    def test_player_matches_trajectory(self):
+        with TrajectoryPlayer(self.file_name, buffer_records=4) as player:
+            self.assertEqual(player.record_count, len(self.trajectory))
+            self.assertAlmostEqual(player.total_time, self.trajectory.total_time)
+            # Read out of order to exercise refilling the read-ahead buffer
+            for i in (0, 1, 5, 3, len(self.trajectory) - 1, 2):
+                self.assertEqual(player.record(i), self.trajectory.record(i))
+            t = 0.0
+            while t < player.total_time + 0.1:
+                for a, b in zip(player.sample(t), self.trajectory.sample(t)):
+                    self.assertAlmostEqual(a, b, delta=1e-4 * max(1, abs(b)))
+                t += 0.013
+
+    def test_rejects_other_files(self):
+        with open(self.file_name, "wb") as file:
+            file.write(b"[(0, 0), (1, 1)]")
+        self.assertRaises(ValueError, TrajectoryPlayer, self.file_name)
+        self.assertRaises(ValueError, read_trajectory, self.file_name)
@@ -0,0 +1,88 @@
+from unittest import TestCase
+import math
+import sys
+import os
+
+src_dir = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+
+sys.path.append(src_dir)
+
+from TrajectoryGenerator import (
+    TrajectoryConstraints,
+    catmull_rom_spline,
+    generate_trajectory,
+    resample_path,
+)
+
+
+class TestTrajectoryGenerator(TestCase):
+    def setUp(self):
+        self.constraints = TrajectoryConstraints(60, 120, 80)
+
+    def test_resample_path(self):
+        points = resample_path([(0, 0), (10, 0), (10, 10)], 1)
+        self.assertEqual(len(points), 21)
+        for i in range(1, len(points)):
+            self.assertAlmostEqual(
+                math.dist(points[i - 1], points[i]), 1, places=6
+            )
+
+    def test_spline_passes_through_waypoints(self):
+        waypoints = [(0, 0), (50, 20), (100, 0), (150, 40)]
+        spline = catmull_rom_spline(waypoints, 10)
+        for waypoint in waypoints:
+            self.assertTrue(
+                any(math.dist(waypoint, point) < 1e-6 for point in spline)
+            )
+
+    def test_straight_line_is_trapezoidal(self):
+        trajectory = generate_trajectory([(0, 0), (0, 200)], self.constraints)
+        start = trajectory.record(0)
+        end = trajectory.record(len(trajectory) - 1)
+        self.assertAlmostEqual(start[1:3], (0, 0))
+        self.assertAlmostEqual(end[1], 0, places=4)
+        self.assertAlmostEqual(end[2], 200, places=3)
+        self.assertAlmostEqual(end[5], 0, places=4)
+        # Accelerating to 60 cm/s at 120 cm/s² takes 25 cm, so the trajectory has a cruise phase
+        self.assertAlmostEqual(
+            max(trajectory.vy), self.constraints.maximum_velocity, places=3
+        )
+        self.assertAlmostEqual(trajectory.total_time, 200 / 60 + 60 / 120, places=2)
+
+    def test_limits_are_respected(self):
+        trajectory = generate_trajectory(
+            [(0, 0), (100, 0), (100, 100), (0, 100)], self.constraints, spline=True
+        )
+        speeds = [math.hypot(vx, vy) for vx, vy in zip(trajectory.vx, trajectory.vy)]
+        self.assertLessEqual(max(speeds), self.constraints.maximum_velocity + 1e-3)
+        for i in range(1, len(speeds)):
+            acceleration = (speeds[i] - speeds[i - 1]) / (
+                trajectory.t[i] - trajectory.t[i - 1]
+            )
+            self.assertLessEqual(
+                abs(acceleration), self.constraints.maximum_acceleration * 1.05
+            )
+
+    def test_heading_interpolation(self):
+        trajectory = generate_trajectory(
+            [(0, 0), (100, 0)],
+            self.constraints,
+            start_heading_rad=0,
+            end_heading_rad=math.pi / 2,
+        )
+        self.assertAlmostEqual(trajectory.theta[0], 0)
+        self.assertAlmostEqual(trajectory.theta[-1], math.pi / 2, places=5)
+
+    def test_sample_interpolates(self):
+        trajectory = generate_trajectory([(0, 0), (0, 100)], self.constraints)
+        t = trajectory.t[10] + trajectory.time_step / 2
+        sample = trajectory.sample(t)
+        self.assertAlmostEqual(sample[0], t)
+        self.assertGreater(sample[2], trajectory.y[10])
+        self.assertLess(sample[2], trajectory.y[11])
+        self.assertEqual(
+            trajectory.sample(trajectory.total_time + 1),
+            trajectory.record(len(trajectory) - 1),
+        )
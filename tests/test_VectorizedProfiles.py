@@ -0,0 +1,74 @@
+from unittest import TestCase
+import sys
+import os
+
+import numpy as np
+
+src_dir = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+
+sys.path.append(src_dir)
+
+from TrapezoidMovement import Constraints, State, TrapezoidProfile
+from VectorizedProfiles import (
+    SCurveConstraints,
+    VectorizedSCurveProfile,
+    VectorizedTrapezoidProfile,
+)
+
+
+class TestVectorizedProfiles(TestCase):
+    def test_trapezoid_matches_scalar_profile(self):
+        constraints = Constraints(1, 0.2)
+        for current, goal in (
+            (State(0, 0), State(10, 0)),
+            (State(0, 0), State(2, 0)),
+            (State(3, 0.5), State(-4, 0)),
+            (State(0, 0.3), State(10, 0.2)),
+        ):
+            profile = VectorizedTrapezoidProfile(constraints, current, goal)
+            scalar_profile = TrapezoidProfile(constraints)
+            ts = np.linspace(0, profile.total_time() + 1, 500)
+            positions, velocities, _ = profile.sample(ts)
+            for t, position, velocity in zip(ts, positions, velocities):
+                state = scalar_profile.calculate(t, current, goal)
+                self.assertAlmostEqual(position, state.position)
+                self.assertAlmostEqual(velocity, state.velocity)
+            self.assertAlmostEqual(profile.total_time(), scalar_profile.total_time())
+
+    def test_trapezoid_accelerations(self):
+        profile = VectorizedTrapezoidProfile(Constraints(1, 0.5), State(), State(-10))
+        _, _, accelerations = profile.sample([0.5, 5, profile.total_time() - 0.5, 100])
+        self.assertEqual(list(accelerations), [-0.5, 0, 0.5, 0])
+
+    def test_s_curve_respects_constraints(self):
+        constraints = SCurveConstraints(1, 0.5, 1)
+        for distance in (0.1, 1, 3, 10, -10):
+            profile = VectorizedSCurveProfile(constraints, 2, 2 + distance)
+            ts = np.linspace(0, profile.total_time(), 2001)
+            positions, velocities, accelerations = profile.sample(ts)
+            self.assertAlmostEqual(positions[0], 2)
+            self.assertAlmostEqual(positions[-1], 2 + distance)
+            self.assertAlmostEqual(velocities[-1], 0)
+            self.assertLessEqual(np.abs(velocities).max(), 1 + 1e-9)
+            self.assertLessEqual(np.abs(accelerations).max(), 0.5 + 1e-9)
+            # The acceleration changes smoothly, never faster than the jerk limit
+            jerks = np.diff(accelerations[:-1]) / (ts[1] - ts[0])
+            self.assertLessEqual(np.abs(jerks).max(), 1 + 1e-6)
+            # The position never runs backwards
+            steps = np.diff(positions) * np.sign(distance)
+            self.assertGreaterEqual(steps.min(), -1e-12)
+
+    def test_s_curve_reaches_limits_on_long_moves(self):
+        profile = VectorizedSCurveProfile(SCurveConstraints(1, 0.5, 1), 0, 10)
+        # 2.5s of ramping at each end (0.5s jerk, 1.5s constant, 0.5s jerk) and 7.5s cruising
+        self.assertAlmostEqual(profile.total_time(), 12.5)
+        _, velocities, _ = profile.sample([6])
+        self.assertAlmostEqual(velocities[0], 1)
+
+    def test_zero_length_profile(self):
+        profile = VectorizedSCurveProfile(SCurveConstraints(1, 1, 1), 5, 5)
+        positions, velocities, accelerations = profile.sample([0, 1])
+        self.assertEqual(list(positions), [5, 5])
+        self.assertEqual(profile.total_time(), 0)
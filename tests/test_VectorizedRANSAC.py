@@ -0,0 +1,98 @@
+from unittest import TestCase
+import math
+import random
+import sys
+import os
+
+import numpy as np
+
+src_dir = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+
+sys.path.append(src_dir)
+
+from VectorizedRANSAC import VectorizedRANSAC
+
+
+def wall_with_outliers(seed=1):
+    # A noisy vertical wall at x = 756 with a third of the points scattered randomly
+    generator = random.Random(seed)
+    wall = [(756 + generator.gauss(0, 2), y * 3.0) for y in range(200)]
+    outliers = [
+        (generator.uniform(0, 700), generator.uniform(0, 1400)) for _ in range(100)
+    ]
+    return wall, outliers
+
+
+class TestVectorizedRANSAC(TestCase):
+    def test_required_iterations(self):
+        detector = VectorizedRANSAC(500, 2, confidence=0.99)
+        self.assertEqual(detector.required_iterations(0.5), 17)
+        self.assertEqual(detector.required_iterations(0.01), 500)
+        self.assertEqual(detector.required_iterations(0), 500)
+        self.assertEqual(detector.required_iterations(1), 0)
+
+    def test_samples_are_distinct(self):
+        detector = VectorizedRANSAC(default_sample_size=3, random_seed=2)
+        indices = detector._sample_indices(1000, 4)
+        self.assertTrue(((indices >= 0) & (indices < 4)).all())
+        self.assertTrue(all(len(set(row)) == 3 for row in indices.tolist()))
+
+    def test_finds_wall_and_stops_early(self):
+        wall, outliers = wall_with_outliers()
+        for scoring in ("ransac", "msac"):
+            detector = VectorizedRANSAC(500, 2, 12, 20, scoring=scoring, random_seed=3)
+            model, inliers = detector.fit(wall + outliers)
+            self.assertTrue(math.isinf(model.slope) or abs(model.slope) > 50)
+            self.assertTrue(set(wall) <= inliers)
+            self.assertLess(len(inliers), len(wall) + 10)
+            self.assertLess(detector.iterations, 500)
+
+    def test_msac_prefers_the_closer_fit(self):
+        # Two parallel walls, a tight one and a longer one whose points spread almost to the inlier distance
+        generator = random.Random(6)
+        tight = [(100 + generator.gauss(0, 0.2), y * 10.0) for y in range(60)]
+        loose = [(600 + generator.uniform(-11, 11), y * 10.0) for y in range(70)]
+        fits = {}
+        for scoring in ("ransac", "msac"):
+            detector = VectorizedRANSAC(
+                200, 2, 12, 20, scoring=scoring, batch_size=1, random_seed=19
+            )
+            fits[scoring] = detector.fit(loose + tight)
+        # Counting inliers keeps a line through the loose wall, the MSAC cost picks the tight one despite fewer inliers
+        ransac_model, ransac_inliers = fits["ransac"]
+        msac_model, msac_inliers = fits["msac"]
+        self.assertTrue(ransac_inliers <= set(loose))
+        self.assertEqual(set(tight), msac_inliers)
+        self.assertGreater(len(ransac_inliers), len(msac_inliers))
+
+    def test_prosac_sampling(self):
+        wall, outliers = wall_with_outliers()
+        detector = VectorizedRANSAC(500, 2, 12, 20, batch_size=8, random_seed=4)
+        model, inliers = detector.fit(outliers + wall, quality=[0.0] * 100 + [1.0] * 200)
+        self.assertTrue(set(wall) <= inliers)
+        # The first hypotheses come from the best points, which are all on the wall, so the first line found is the
+        # wall and the adaptive bound for a 2/3 inlier ratio (9 iterations) ends the search after the second batch
+        self.assertEqual(detector.iterations, 16)
+
+    def test_custom_functions(self):
+        # Reject every line that isn't close to horizontal, the floor should be found instead of the wall
+        wall, outliers = wall_with_outliers()
+        floor = [(x * 3.0, 10 + random.Random(x).gauss(0, 2)) for x in range(60)]
+
+        def score_model(self, model, inliers):
+            return len(inliers) if abs(model.slope) < 0.05 else 0
+
+        detector = VectorizedRANSAC(
+            500, 2, 12, 20, score_model=score_model, random_seed=5
+        )
+        model, inliers = detector.fit(wall + floor + outliers)
+        self.assertLess(abs(model.slope), 0.05)
+        self.assertTrue(set(floor) <= inliers)
+
+    def test_too_few_points(self):
+        model, inliers = VectorizedRANSAC().fit([(1, 1)])
+        self.assertIsNone(model)
+        self.assertEqual(inliers, set())
+        self.assertRaises(ValueError, VectorizedRANSAC, scoring="unknown")
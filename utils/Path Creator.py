@@ -98,6 +98,12 @@ def write_spline_points_to_file(x, y):
     with open(file_path, "w") as file:
         file.write(str(point_list))
 
+    # Imported here rather than at the top of the file because it pulls in the robot code from the src directory
+    from trajectory_builder import build_trajectory
+
+    if len(point_list) >= 2:
+        build_trajectory(point_list, os.path.join(DEPLOY_DIR, "path.trj"))
+
 
 def clear_waypoints():
     global x_points, y_points
@@ -72,6 +72,12 @@ VEX_BUILTIN_MODULES = [
     "ujson",
     "vexdev",
 ]
+# Standard library modules that are only imported when their MicroPython equivalent (ex: uarray) is missing,
+# which only happens when running the code on a computer, so they never need to be deployed
+HOST_FALLBACK_MODULES = [
+    "array",
+    "struct",
+]
 
 
 def mount_drive(drive_path):
@@ -154,7 +160,11 @@ def detect_dependencies(file_path, available_libraries, visited=None):
         elif isinstance(node, ast.ImportFrom):
             module_names = [node.module]
         for module in module_names:
-            if module not in visited and module not in VEX_BUILTIN_MODULES:
+            if (
+                module not in visited
+                and module not in VEX_BUILTIN_MODULES
+                and module not in HOST_FALLBACK_MODULES
+            ):
                 # Add the module to the visited set
                 visited.add(module)
                 # Add the module to the imported set
@@ -0,0 +1,188 @@
+"""
+Build the field distance map used by the particle filter (see src/ParticleFilter.py) from an obstacle image, every
+non-transparent pixel is an obstacle and the image is stretched over the whole field
+
+Run this file to rebuild deploy/field.dmap from the simulation's obstacle map, or pass an image and options on the
+command line
+"""
+
+import argparse
+import math
+import os
+import sys
+
+from PIL import Image
+
+SRC_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+DEPLOY_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deploy"
+)
+SIMULATION_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "simulations"
+)
+
+sys.path.append(SRC_DIRECTORY)
+
+import Constants
+from DistanceMap import MAXIMUM_DISTANCE, DistanceMap
+
+
+def squared_distance_transform_1d(values):
+    """
+    The exact 1D squared distance transform by Felzenszwalb and Huttenlocher's lower envelope of parabolas
+
+    Args:
+        values: The cost at each index, 0 at obstacles and infinity elsewhere for the first pass
+
+    Returns:
+        A list where each entry is the smallest (i - j)^2 + values[j] over every j
+    """
+    count = len(values)
+    sites = [i for i, value in enumerate(values) if not math.isinf(value)]
+    if not sites:
+        return [math.inf] * count
+
+    # The parabolas making up the lower envelope, and the boundaries between them (one more than the parabolas)
+    vertices = [sites[0]]
+    boundaries = [-math.inf, math.inf]
+    for q in sites[1:]:
+        while True:
+            vertex = vertices[-1]
+            intersection = (
+                (values[q] + q * q) - (values[vertex] + vertex * vertex)
+            ) / (2 * q - 2 * vertex)
+            if intersection > boundaries[-2]:
+                break
+            # The new parabola hides the last one completely, the first is never hidden as its boundary is -infinity
+            vertices.pop()
+            boundaries.pop()
+            boundaries[-1] = math.inf
+        boundaries[-1] = intersection
+        vertices.append(q)
+        boundaries.append(math.inf)
+
+    result = [0.0] * count
+    envelope_index = 0
+    for q in range(count):
+        while boundaries[envelope_index + 1] < q:
+            envelope_index += 1
+        vertex = vertices[envelope_index]
+        result[q] = (q - vertex) * (q - vertex) + values[vertex]
+    return result
+
+
+def distance_transform(obstacle_grid):
+    """
+    Get the Euclidean distance from every cell to the nearest obstacle cell
+
+    Args:
+        obstacle_grid: A list of rows, each a list of booleans that are True for obstacles
+
+    Returns:
+        A list of rows of distances in cells
+    """
+    height = len(obstacle_grid)
+    width = len(obstacle_grid[0])
+    # The 2D transform is a 1D transform of each column followed by one of each row
+    columns = [
+        squared_distance_transform_1d(
+            [0 if obstacle_grid[y][x] else math.inf for y in range(height)]
+        )
+        for x in range(width)
+    ]
+    return [
+        [
+            math.sqrt(squared)
+            for squared in squared_distance_transform_1d(
+                [columns[x][y] for x in range(width)]
+            )
+        ]
+        for y in range(height)
+    ]
+
+
+def load_obstacle_grid(image_path, field_size, cell_size):
+    """
+    Read an obstacle image into a grid of cells
+
+    Args:
+        image_path: The image to read, non-transparent pixels are obstacles
+        field_size: The (width, height) of the field the image covers
+        cell_size: The width of each cell, in the same units as field_size
+
+    Returns:
+        A list of rows from y = 0 up, each a list of booleans that are True for obstacles
+    """
+    image = Image.open(image_path).convert("RGBA")
+    image_width, image_height = image.size
+    width = int(math.ceil(field_size[0] / cell_size))
+    height = int(math.ceil(field_size[1] / cell_size))
+    pixels = image.load()
+
+    # A cell is an obstacle if any pixel inside it is, image rows run down the screen while map rows run up the field
+    obstacle_grid = [[False] * width for _ in range(height)]
+    for pixel_y in range(image_height):
+        cell_y = height - 1 - min(height - 1, pixel_y * height // image_height)
+        for pixel_x in range(image_width):
+            if pixels[pixel_x, pixel_y][3] > 0:
+                obstacle_grid[cell_y][min(width - 1, pixel_x * width // image_width)] = True
+    return obstacle_grid
+
+
+def build_distance_map(image_path, field_size_cm, cell_size_cm):
+    """
+    Build a DistanceMap from an obstacle image
+
+    Args:
+        image_path: The image to read, non-transparent pixels are obstacles
+        field_size_cm: The (width, height) of the field the image covers
+        cell_size_cm: The width of each map cell
+
+    Returns:
+        The DistanceMap
+    """
+    obstacle_grid = load_obstacle_grid(image_path, field_size_cm, cell_size_cm)
+    width, height = len(obstacle_grid[0]), len(obstacle_grid)
+    distances = bytearray(width * height)
+    for y, row in enumerate(distance_transform(obstacle_grid)):
+        for x, distance in enumerate(row):
+            distances[y * width + x] = int(round(min(MAXIMUM_DISTANCE, distance)))
+    return DistanceMap(width, height, cell_size_cm, distances)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "image",
+        nargs="?",
+        default=os.path.join(SIMULATION_DIRECTORY, "Test_Obstacles.png"),
+        help="The obstacle image",
+    )
+    parser.add_argument(
+        "--output",
+        default=os.path.join(DEPLOY_DIRECTORY, Constants.distance_map_file),
+        help="The distance map file to write",
+    )
+    parser.add_argument(
+        "--cell-size",
+        type=float,
+        default=Constants.distance_map_cell_size_cm,
+        help="The width of each map cell in centimeters",
+    )
+    arguments = parser.parse_args()
+
+    distance_map = build_distance_map(
+        arguments.image,
+        (Constants.field_x_size, Constants.field_y_size),
+        arguments.cell_size,
+    )
+    distance_map.write(arguments.output)
+    print(
+        f"Built {arguments.output}: {distance_map.width} x {distance_map.height} cells of {arguments.cell_size}cm"
+    )
+
+
+if __name__ == "__main__":
+    main()
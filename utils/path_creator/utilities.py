@@ -1,5 +1,6 @@
 import numpy as np
 import os
+import sys
 from constants import *
 
 
@@ -16,6 +17,13 @@ def write_spline_points_to_file(x, y):
     with open(file_path, "w") as file:
         file.write(str(point_list))
 
+    # Imported here rather than at the top of the file because it pulls in the robot code from the src directory
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from trajectory_builder import build_trajectory
+
+    if len(point_list) >= 2:
+        build_trajectory(point_list, os.path.join(DEPLOY_DIR, "path.trj"))
+
 
 def clear_waypoints(path_creator):
     path_creator.x_points.clear()
@@ -1,30 +1,60 @@
+import argparse
+import ast
 import math
+import os
 import time
 
 import pygame
 
+from telemetry_reader import WORKING_DIRECTORY, read_telemetry
+
 SCREEN_WIDTH, SCREEN_HEIGHT = 1000, 1000
 
-pygame.init()
 
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Path plotter")
-clock = pygame.time.Clock()
+def load_points(file_name):
+    """
+    Load the robot's recorded poses
 
-log_contents = open("Drivetrain_Position.log", "r").readlines()
+    Args:
+        file_name: A telemetry log with a pose channel (see src/Telemetry.py), or an older text log with one
+            (time, (x, y), rotation) tuple per line
 
-print([eval(x) for x in log_contents])
+    Returns:
+        A list of (time, (x, y), rotation) tuples, with times in seconds from the first pose
+    """
+    if file_name.endswith(".tlm"):
+        pose = read_telemetry(file_name)["pose"]
+        times = pose["time_s"] - pose["time_s"][0] if len(pose["time_s"]) else []
+        return [
+            (time_, (x, y), rot)
+            for time_, x, y, rot in zip(
+                times, pose["x"].tolist(), pose["y"].tolist(), pose["rotation"].tolist()
+            )
+        ]
+    with open(file_name, "r") as log_file:
+        return [ast.literal_eval(line) for line in log_file if line.strip()]
 
-points = [eval(x) for x in log_contents]
 
-start_time = time.monotonic()
+def main():
+    parser = argparse.ArgumentParser(description="Replay the path the robot drove")
+    parser.add_argument(
+        "log",
+        nargs="?",
+        default="Drivetrain.tlm",
+        help="The telemetry log (.tlm) or text position log to replay",
+    )
+    arguments = parser.parse_args()
+    points = load_points(os.path.join(WORKING_DIRECTORY, arguments.log))
 
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Path plotter")
 
-def main():
+    start_time = time.monotonic()
     screen.fill("black")
     for time_, point, rot in points:
         elapsed_time = time.monotonic() - start_time
-        time.sleep(time_ - elapsed_time)
+        time.sleep(max(0, time_ - elapsed_time))
         x, y = point
         pygame.draw.circle(screen, "red", (x * 2, y * 2), 10)
         pygame.draw.line(
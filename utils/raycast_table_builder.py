@@ -0,0 +1,226 @@
+"""
+Build a raycast table (see src/RaycastTable.py) from an obstacle image, every non-transparent pixel is an obstacle and
+the image is stretched over the whole field
+
+Each ray is marched through a distance map of the obstacles, stepping by the distance to the nearest obstacle each time
+(sphere tracing), so open space is crossed in a few steps rather than one cell at a time, then cell by cell once it is
+close to an obstacle. Rows of the table are cast in parallel on every core. Ranges are stored as one byte each, a 4cm
+table of the field with 64 directions per cell is about 540KB.
+
+Run this file to rebuild deploy/field.ray, or build the simulation's table (in image pixels) with:
+    python raycast_table_builder.py ../simulations/Test_Obstacles.png --field-size 400 400 --cell-size 2
+        --range-resolution 1 --output ../simulations/Test_Obstacles.ray
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+SRC_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+DEPLOY_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deploy"
+)
+SIMULATION_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "simulations"
+)
+
+sys.path.append(SRC_DIRECTORY)
+
+import Constants
+from RaycastTable import NO_HIT, write_raycast_table
+from distance_map_builder import distance_transform, load_obstacle_grid
+
+# Shared with the worker processes by _initialize_worker, so the grid is sent to each worker once rather than per row
+_distances = None
+_settings = None
+
+
+def _initialize_worker(distances, settings):
+    global _distances, _settings
+    _distances = distances
+    _settings = settings
+
+
+def cast_ray(distances, start_x, start_y, angle_rad, max_range):
+    """
+    Find how far a ray travels before reaching an obstacle, by sphere tracing through a distance map
+
+    Args:
+        distances: A list of rows of the distance from each cell to the nearest obstacle, in cells
+        start_x: Where the ray starts, in cells
+        start_y: Where the ray starts, in cells
+        angle_rad: The ray's direction, measured as in get_collision_point
+        max_range: The furthest to look, in cells
+
+    Returns:
+        The distance to the obstacle in cells, or None if there is none within max_range or the ray leaves the map
+    """
+    height = len(distances)
+    width = len(distances[0])
+    direction_x = math.sin(angle_rad)
+    direction_y = math.cos(angle_rad)
+    travelled = 0.0
+    while travelled <= max_range:
+        x = start_x + direction_x * travelled
+        y = start_y + direction_y * travelled
+        cell_x = int(x)
+        cell_y = int(y)
+        if not (0 <= cell_x < width and 0 <= cell_y < height):
+            return None
+        clearance = distances[cell_y][cell_x]
+        if clearance == 0:
+            return travelled
+        if clearance >= 3:
+            # No obstacle cell is closer than the clearance between cell centers, less the half diagonals of both cells
+            travelled += clearance - 1.5
+            continue
+        # Close to an obstacle, step to the next cell boundary so a ray that only clips a corner still hits it
+        to_boundary_x = to_boundary_y = math.inf
+        if direction_x > 0:
+            to_boundary_x = (cell_x + 1 - x) / direction_x
+        elif direction_x < 0:
+            to_boundary_x = (cell_x - x) / direction_x
+        if direction_y > 0:
+            to_boundary_y = (cell_y + 1 - y) / direction_y
+        elif direction_y < 0:
+            to_boundary_y = (cell_y - y) / direction_y
+        travelled += min(to_boundary_x, to_boundary_y) + 1e-9
+    return None
+
+
+def _build_row(y):
+    """
+    Cast every ray from one row of the table
+
+    Returns:
+        The row's ranges as bytes
+    """
+    width, angle_bins, table_step, range_step, max_range = _settings
+    row = bytearray(width * angle_bins)
+    start_y = (y + 0.5) * table_step
+    for x in range(width):
+        start_x = (x + 0.5) * table_step
+        for angle_bin in range(angle_bins):
+            distance = cast_ray(
+                _distances,
+                start_x,
+                start_y,
+                2 * math.pi * angle_bin / angle_bins,
+                max_range,
+            )
+            row[x * angle_bins + angle_bin] = (
+                NO_HIT
+                if distance is None
+                else min(NO_HIT - 1, int(round(distance / range_step)))
+            )
+    return bytes(row)
+
+
+def build_raycast_table(
+    image_path,
+    output_path,
+    field_size,
+    cell_size,
+    angle_bins=64,
+    grid_size=None,
+    range_resolution=None,
+    processes=None,
+):
+    """
+    Build a raycast table from an obstacle image and write it to a file
+
+    Args:
+        image_path: The image to read, non-transparent pixels are obstacles
+        output_path: The raycast table file to write
+        field_size: The (width, height) of the field the image covers
+        cell_size: The width of each table cell, one table entry is stored per cell per angle bin
+        angle_bins: The number of directions stored for each cell
+        grid_size: The width of the cells rays are marched through, defaults to a quarter of the table's cells
+        range_resolution: The distance each step of a stored range stands for, defaults to the grid size, so the
+            longest range stored is 254 of these
+        processes: How many worker processes to use, defaults to one per core
+    """
+    grid_size = grid_size or cell_size / 4
+    range_resolution = range_resolution or grid_size
+    obstacle_grid = load_obstacle_grid(image_path, field_size, grid_size)
+    distances = distance_transform(obstacle_grid)
+
+    width = int(math.ceil(field_size[0] / cell_size))
+    height = int(math.ceil(field_size[1] / cell_size))
+    settings = (
+        width,
+        angle_bins,
+        cell_size / grid_size,
+        range_resolution / grid_size,
+        (NO_HIT - 1) * range_resolution / grid_size,
+    )
+    with Pool(processes, _initialize_worker, (distances, settings)) as pool:
+        rows = pool.map(_build_row, range(height))
+    write_raycast_table(
+        output_path, width, height, angle_bins, cell_size, range_resolution, rows
+    )
+    return width, height
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "image",
+        nargs="?",
+        default=os.path.join(SIMULATION_DIRECTORY, "Test_Obstacles.png"),
+        help="The obstacle image",
+    )
+    parser.add_argument(
+        "--output",
+        default=os.path.join(DEPLOY_DIRECTORY, Constants.raycast_table_file),
+        help="The raycast table file to write",
+    )
+    parser.add_argument(
+        "--field-size",
+        type=float,
+        nargs=2,
+        default=(Constants.field_x_size, Constants.field_y_size),
+        help="The width and height the image covers",
+    )
+    parser.add_argument(
+        "--cell-size",
+        type=float,
+        default=Constants.raycast_table_cell_size_cm,
+        help="The width of each table cell",
+    )
+    parser.add_argument(
+        "--angle-bins",
+        type=int,
+        default=Constants.raycast_table_angle_bins,
+        help="The number of directions stored per cell",
+    )
+    parser.add_argument(
+        "--range-resolution",
+        type=float,
+        default=None,
+        help="The distance each step of a stored range stands for, the longest range stored is 254 of these",
+    )
+    arguments = parser.parse_args()
+
+    start_time = time.perf_counter()
+    width, height = build_raycast_table(
+        arguments.image,
+        arguments.output,
+        arguments.field_size,
+        arguments.cell_size,
+        arguments.angle_bins,
+        range_resolution=arguments.range_resolution,
+    )
+    print(
+        f"Built {arguments.output}: {width} x {height} cells x {arguments.angle_bins} angles "
+        f"in {time.perf_counter() - start_time:.1f} seconds"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""
+Talk to a program on the brain that uses src/SerialProtocol.py (such as main_wireless.py) over its serial port
+
+Only for use on a computer
+
+Send a message and print everything the brain sends back for 10 seconds with:
+    python serial_peer.py /dev/ttyACM1 --send "hello" --listen 10
+or send a file to the brain's Micro-SD card (see src/FileTransfer.py) with:
+    python serial_peer.py /dev/ttyACM1 --send-file paths/skills.txt --as skills.txt
+if the transfer is interrupted, running the same command again carries on from where it stopped.
+"""
+
+import argparse
+import os
+import select
+import struct
+import sys
+import termios
+import time
+import tty
+
+SRC_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+
+sys.path.append(SRC_DIRECTORY)
+
+# Importing vex changes into the simulations directory, paths given on the command line are relative to this one
+WORKING_DIRECTORY = os.getcwd()
+
+from binascii import crc32
+
+from FileTransfer import (
+    CHUNK_CORRUPT,
+    DATA_HEADER_FORMAT,
+    MAXIMUM_CHUNK_SIZE,
+    RESULT_FORMAT,
+    RESUME_FORMAT,
+    START_FORMAT,
+    TRANSFER_COMPLETE,
+    WRONG_OFFSET,
+)
+from SerialProtocol import (
+    FILE_DATA_MESSAGE,
+    FILE_END_MESSAGE,
+    FILE_RESULT_MESSAGE,
+    FILE_RESUME_MESSAGE,
+    FILE_START_MESSAGE,
+    TEXT_MESSAGE,
+    ReliableChannel,
+)
+
+BAUD_RATES = {
+    9600: termios.B9600,
+    57600: termios.B57600,
+    115200: termios.B115200,
+    230400: termios.B230400,
+}
+
+
+class MonotonicTimer:
+    """
+    Stands in for brain.timer, time is in milliseconds whatever unit is asked for
+    """
+
+    @staticmethod
+    def time(unit=None):
+        return time.monotonic() * 1000
+
+
+class SerialPeer:
+    """
+    The computer's end of a ReliableChannel
+
+    Nothing happens in the background, bytes are only read (and frames only resent) while one of the methods that
+    takes a timeout is waiting, so call pump regularly while there is nothing else to do.
+
+    Args:
+        port: The serial device to open (ex: /dev/ttyACM1), or a file descriptor that is already open
+        baud_rate: The baud rate to set when opening a device
+        window_size: See ReliableChannel
+        retransmit_timeout_ms: See ReliableChannel
+    """
+
+    def __init__(
+        self,
+        port,
+        baud_rate: int = 115200,
+        window_size: int = 8,
+        retransmit_timeout_ms=200,
+    ):
+        if isinstance(port, int):
+            self.file_descriptor = port
+            self._owns_file_descriptor = False
+        else:
+            self.file_descriptor = os.open(port, os.O_RDWR | os.O_NOCTTY)
+            self._owns_file_descriptor = True
+        if os.isatty(self.file_descriptor):
+            # Pass every byte through untouched, and set the baud rate of real devices
+            tty.setraw(self.file_descriptor)
+            if self._owns_file_descriptor:
+                attributes = termios.tcgetattr(self.file_descriptor)
+                attributes[4] = attributes[5] = BAUD_RATES[baud_rate]
+                termios.tcsetattr(self.file_descriptor, termios.TCSANOW, attributes)
+        self.channel = ReliableChannel(
+            self._write, MonotonicTimer(), window_size, retransmit_timeout_ms
+        )
+        # Messages that arrived while send_file was waiting for replies, receive returns them first
+        self._set_aside = []
+        # Where the last file sent started from, more than 0 if it carried on from an earlier attempt
+        self.resumed_from = 0
+
+    def _write(self, data):
+        view = memoryview(data)
+        while view:
+            written = os.write(self.file_descriptor, view)
+            view = view[written:]
+
+    def pump(self, timeout_s: float = 0.0) -> None:
+        """
+        Wait up to timeout_s for bytes to arrive and handle them, and resend overdue frames
+        """
+        next_due_ms = self.channel.poll()
+        if next_due_ms is not None:
+            timeout_s = min(timeout_s, next_due_ms / 1000)
+        readable, _, _ = select.select([self.file_descriptor], [], [], timeout_s)
+        if readable:
+            self.channel.receive_bytes(os.read(self.file_descriptor, 4096))
+        self.channel.poll()
+
+    def send(self, message_type: int, payload=b"") -> None:
+        """
+        Queue a message to send, it is sent straight away if the window has room, see wait_until_sent
+        """
+        self.channel.send(message_type, payload)
+
+    def wait_until_sent(self, timeout_s: float = 5.0) -> bool:
+        """
+        Keep pumping until every message sent has been acknowledged
+
+        Returns:
+            Whether they were all acknowledged within timeout_s
+        """
+        end_time = time.monotonic() + timeout_s
+        while self.channel.pending():
+            remaining_s = end_time - time.monotonic()
+            if remaining_s <= 0:
+                return False
+            self.pump(min(remaining_s, 0.05))
+        return True
+
+    def receive(self, timeout_s: float = 0.0):
+        """
+        Keep pumping until a message arrives
+
+        Returns:
+            (message type, payload bytes), or None if nothing arrived within timeout_s
+        """
+        if self._set_aside:
+            return self._set_aside.pop(0)
+        end_time = time.monotonic() + timeout_s
+        while True:
+            message = self.channel.receive()
+            if message is not None:
+                return message
+            remaining_s = end_time - time.monotonic()
+            if remaining_s <= 0:
+                return None
+            self.pump(min(remaining_s, 0.05))
+
+    def _receive_file_reply(self, message_type: int, timeout_s: float):
+        """
+        Keep pumping until a file transfer reply of a type arrives, setting aside other messages for receive
+
+        Returns:
+            Its payload, or None if it didn't arrive within timeout_s
+        """
+        end_time = time.monotonic() + timeout_s
+        while True:
+            message = self.channel.receive()
+            if message is not None:
+                if message[0] == message_type:
+                    return message[1]
+                self._set_aside.append(message)
+                continue
+            remaining_s = end_time - time.monotonic()
+            if remaining_s <= 0:
+                return None
+            self.pump(min(remaining_s, 0.05))
+
+    def send_file(self, path: str, remote_name: str, timeout_s: float = 10.0):
+        """
+        Send a file for a FileReceiver on the brain to save, carrying on from where an earlier attempt to send it
+        stopped
+
+        Args:
+            path: The file to send
+            remote_name: The name to save it as on the brain
+            timeout_s: The longest to wait for any one reply from the brain
+
+        Returns:
+            The brain's final status (TRANSFER_COMPLETE if the file was saved), or None if the brain stopped replying
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+        self.send(
+            FILE_START_MESSAGE,
+            struct.pack(START_FORMAT, len(data), crc32(data)) + remote_name.encode(),
+        )
+        reply = self._receive_file_reply(FILE_RESUME_MESSAGE, timeout_s)
+        if reply is None:
+            return None
+        offset, stored_crc = struct.unpack(RESUME_FORMAT, reply)
+        if offset > len(data) or crc32(data[:offset]) != stored_crc:
+            # The partly received file on the brain is from a different version of this one
+            offset = 0
+        self.resumed_from = offset
+
+        while True:
+            while offset < len(data):
+                chunk = data[offset : offset + MAXIMUM_CHUNK_SIZE]
+                self.send(
+                    FILE_DATA_MESSAGE,
+                    struct.pack(DATA_HEADER_FORMAT, offset, crc32(chunk)) + chunk,
+                )
+                offset += len(chunk)
+                # Keep at most a window's worth queued, so a rejected chunk is noticed before much more is sent
+                end_time = time.monotonic() + timeout_s
+                while self.channel.pending() >= self.channel.window_size:
+                    if time.monotonic() > end_time:
+                        return None
+                    self.pump(0.05)
+                rejection = self._receive_file_reply(FILE_RESULT_MESSAGE, 0)
+                if rejection is not None:
+                    _, offset = struct.unpack(RESULT_FORMAT, rejection)
+            self.send(FILE_END_MESSAGE)
+            reply = self._receive_file_reply(FILE_RESULT_MESSAGE, timeout_s)
+            if reply is None:
+                return None
+            status, offset = struct.unpack(RESULT_FORMAT, reply)
+            if status not in (CHUNK_CORRUPT, WRONG_OFFSET):
+                return status
+
+    def close(self) -> None:
+        if self._owns_file_descriptor:
+            os.close(self.file_descriptor)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("port", help="The brain's serial device, ex: /dev/ttyACM1")
+    parser.add_argument(
+        "--baud-rate", type=int, default=115200, choices=sorted(BAUD_RATES)
+    )
+    parser.add_argument(
+        "--send",
+        action="append",
+        default=[],
+        help="A text message to send, may be repeated",
+    )
+    parser.add_argument("--send-file", default=None, help="A file to send to the brain")
+    parser.add_argument(
+        "--as",
+        dest="remote_name",
+        default=None,
+        help="The name to save the file as on the brain, defaults to its name here",
+    )
+    parser.add_argument(
+        "--listen",
+        type=float,
+        default=0.0,
+        help="How many seconds to print the messages the brain sends for",
+    )
+    arguments = parser.parse_args()
+
+    peer = SerialPeer(arguments.port, arguments.baud_rate)
+    try:
+        for text in arguments.send:
+            peer.send(TEXT_MESSAGE, text)
+        if not peer.wait_until_sent():
+            print("The brain didn't acknowledge every message")
+        if arguments.send_file is not None:
+            path = os.path.join(WORKING_DIRECTORY, arguments.send_file)
+            remote_name = arguments.remote_name or os.path.basename(path)
+            status = peer.send_file(path, remote_name)
+            if status == TRANSFER_COMPLETE:
+                print(
+                    f"Sent {path} as {remote_name}, starting from byte {peer.resumed_from}"
+                )
+            elif status is None:
+                print(f"The brain stopped replying while sending {path}")
+            else:
+                print(f"The brain couldn't save {path}, status {status}")
+
+        end_time = time.monotonic() + arguments.listen
+        while time.monotonic() < end_time:
+            message = peer.receive(end_time - time.monotonic())
+            if message is None:
+                continue
+            message_type, payload = message
+            if message_type == TEXT_MESSAGE:
+                print(payload.decode(errors="replace"))
+            else:
+                print(f"Message type {message_type}: {payload!r}")
+        print(
+            f"{peer.channel.frames_sent} frames sent, {peer.channel.retransmissions} resent, "
+            f"{peer.channel.corrupt_frames} corrupt frames received"
+        )
+    finally:
+        peer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+Read a binary telemetry log (see src/Telemetry.py) into NumPy arrays, and convert it to CSV or Parquet files
+
+Only for use on a computer, NumPy is not available on the brain
+
+Convert a log copied from the Micro-SD card with:
+    python telemetry_reader.py Drivetrain.tlm --format csv
+which writes Drivetrain_pose.csv, Drivetrain_wheel_velocity.csv and so on, one file per channel. Parquet needs pyarrow.
+"""
+
+import argparse
+import csv
+import os
+import re
+import struct
+import sys
+
+import numpy as np
+
+SRC_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+
+sys.path.append(SRC_DIRECTORY)
+
+# Importing vex changes into the simulations directory, paths given on the command line are relative to this one
+WORKING_DIRECTORY = os.getcwd()
+
+from Telemetry import (
+    BLOCK_HEADER_FORMAT,
+    BLOCK_HEADER_SIZE,
+    DATA_BLOCK,
+    HEADER_FORMAT,
+    HEADER_SIZE,
+    SCHEMA_BLOCK,
+    TELEMETRY_MAGIC,
+    TELEMETRY_VERSION,
+)
+
+# The NumPy type of each struct format character, all little-endian
+STRUCT_TYPES = {
+    "b": "i1",
+    "B": "u1",
+    "?": "?",
+    "h": "<i2",
+    "H": "<u2",
+    "i": "<i4",
+    "I": "<u4",
+    "l": "<i4",
+    "L": "<u4",
+    "q": "<i8",
+    "Q": "<u8",
+    "e": "<f2",
+    "f": "<f4",
+    "d": "<f8",
+}
+
+
+def record_dtype(format, fields):
+    """
+    Get the NumPy structured type of one record of a channel
+
+    Args:
+        format: The channel's struct format, without a byte order
+        fields: The channel's field names
+
+    Returns:
+        A dtype with the record's time offset ("offset_ms") followed by each field
+    """
+    types = []
+    for count, character in re.findall(r"(\d*)([a-zA-Z?])", format):
+        if character not in STRUCT_TYPES:
+            raise ValueError("Unsupported struct format character " + repr(character))
+        types.extend([STRUCT_TYPES[character]] * int(count or 1))
+    if len(types) != len(fields):
+        raise ValueError("The format must have one value for each field")
+    return np.dtype([("offset_ms", "<u2")] + list(zip(fields, types)))
+
+
+def read_telemetry(file_name):
+    """
+    Read every channel of a telemetry log
+
+    Args:
+        file_name: The path of the log
+
+    Returns:
+        A dictionary of channel name to a dictionary of field name to a NumPy array of the field's values, each
+        channel also has a "time_s" array of the time each record was taken, in seconds since the brain started
+
+    Raises:
+        ValueError: If the file is not a telemetry log, was written by an incompatible version, or is corrupt
+    """
+    with open(file_name, "rb") as telemetry_file:
+        data = telemetry_file.read()
+    if len(data) < HEADER_SIZE:
+        raise ValueError("Telemetry file is too short to contain a header")
+    magic, version = struct.unpack_from(HEADER_FORMAT, data)
+    if magic != TELEMETRY_MAGIC:
+        raise ValueError("Not a telemetry file")
+    if version != TELEMETRY_VERSION:
+        raise ValueError("Unsupported telemetry version " + str(version))
+
+    # Channel id to (name, fields, dtype), and the data blocks of each channel
+    schemas = {}
+    blocks = {}
+    position = HEADER_SIZE
+    while position < len(data):
+        block_type = data[position]
+        if block_type == SCHEMA_BLOCK:
+            channel_id = data[position + 1]
+            position += 2
+            texts = []
+            for _ in range(3):
+                if position >= len(data):
+                    raise ValueError("Telemetry file ends part way through a schema")
+                length = data[position]
+                texts.append(data[position + 1 : position + 1 + length].decode())
+                position += 1 + length
+            name, format, fields = texts
+            fields = fields.split(",") if fields else []
+            schemas[channel_id] = (name, fields, record_dtype(format, fields))
+            blocks[channel_id] = []
+        elif block_type == DATA_BLOCK:
+            if position + BLOCK_HEADER_SIZE > len(data):
+                raise ValueError("Telemetry file ends part way through a block header")
+            _, channel_id, count, start_ms = struct.unpack_from(
+                BLOCK_HEADER_FORMAT, data, position
+            )
+            if channel_id not in schemas:
+                raise ValueError("Data block for undeclared channel " + str(channel_id))
+            dtype = schemas[channel_id][2]
+            position += BLOCK_HEADER_SIZE
+            end = position + count * dtype.itemsize
+            if end > len(data):
+                raise ValueError("Telemetry file ends part way through a block")
+            blocks[channel_id].append(
+                (start_ms, np.frombuffer(data, dtype, count, position))
+            )
+            position = end
+        else:
+            raise ValueError("Unknown telemetry block type " + str(block_type))
+
+    channels = {}
+    for channel_id, (name, fields, dtype) in schemas.items():
+        if blocks[channel_id]:
+            records = np.concatenate([records for _, records in blocks[channel_id]])
+            start_ms = np.repeat(
+                [start_ms for start_ms, _ in blocks[channel_id]],
+                [len(records) for _, records in blocks[channel_id]],
+            )
+        else:
+            records = np.zeros(0, dtype)
+            start_ms = np.zeros(0)
+        channel = {"time_s": (start_ms + records["offset_ms"]) / 1000}
+        for field in fields:
+            channel[field] = records[field].copy()
+        channels[name] = channel
+    return channels
+
+
+def write_csv(channel, file_name):
+    """
+    Write one channel, as returned by read_telemetry, to a CSV file with a header row
+    """
+    columns = list(channel)
+    with open(file_name, "w", newline="") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(columns)
+        writer.writerows(zip(*(channel[column].tolist() for column in columns)))
+
+
+def write_parquet(channel, file_name):
+    """
+    Write one channel, as returned by read_telemetry, to a Parquet file
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Writing Parquet files needs pyarrow, install it with pip install pyarrow")
+    pyarrow.parquet.write_table(pyarrow.table(channel), file_name)
+
+
+def convert(file_name, output_format="csv", output_directory=None):
+    """
+    Convert every channel of a telemetry log to its own file, named after the log and the channel
+
+    Args:
+        file_name: The path of the log
+        output_format: "csv" or "parquet"
+        output_directory: Where to write the files, defaults to the log's directory
+
+    Returns:
+        The paths of the files written
+    """
+    writer = {"csv": write_csv, "parquet": write_parquet}[output_format]
+    stem = os.path.splitext(os.path.basename(file_name))[0]
+    output_directory = output_directory or os.path.dirname(os.path.abspath(file_name))
+    written = []
+    for name, channel in read_telemetry(file_name).items():
+        output = os.path.join(output_directory, stem + "_" + name + "." + output_format)
+        writer(channel, output)
+        written.append(output)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("log", help="The telemetry log to read")
+    parser.add_argument(
+        "--format",
+        choices=("csv", "parquet"),
+        default=None,
+        help="Convert every channel to this format, otherwise print a summary of each channel",
+    )
+    parser.add_argument(
+        "--output-directory",
+        default=None,
+        help="Where to write converted files, defaults to the log's directory",
+    )
+    arguments = parser.parse_args()
+    log = os.path.join(WORKING_DIRECTORY, arguments.log)
+    output_directory = arguments.output_directory and os.path.join(
+        WORKING_DIRECTORY, arguments.output_directory
+    )
+
+    if arguments.format is None:
+        for name, channel in read_telemetry(log).items():
+            times = channel["time_s"]
+            duration = times[-1] - times[0] if len(times) else 0
+            print(
+                f"{name}: {len(times)} records over {duration:.2f} seconds, "
+                f"fields {', '.join(field for field in channel if field != 'time_s')}"
+            )
+        return
+    for output in convert(log, arguments.format, output_directory):
+        print(f"Wrote {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Convert paths made with the path creator (.pth files) into binary trajectory files (.trj) that the robot can stream
+from the SD card, run this file to rebuild the trajectory for every path in the deploy directory
+"""
+
+import ast
+import os
+import sys
+from glob import glob
+
+SRC_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+DEPLOY_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deploy"
+)
+
+sys.path.append(SRC_DIRECTORY)
+
+import Constants
+from TrajectoryFile import write_trajectory
+from TrajectoryGenerator import TrajectoryConstraints, generate_trajectory
+
+
+def build_trajectory(point_list, file_path, spline=True):
+    """
+    Generate a trajectory through a list of points and write it to a trajectory file
+
+    Args:
+        point_list: The points to drive through (x, y) in centimeters
+        file_path: The path of the trajectory file to write
+        spline: Whether to drive a smooth spline through the points rather than straight lines between them
+
+    Returns:
+        The generated trajectory
+    """
+    constraints = TrajectoryConstraints(
+        Constants.trajectory_maximum_velocity_cm_per_s,
+        Constants.trajectory_maximum_acceleration_cm_per_s2,
+        Constants.trajectory_maximum_centripetal_acceleration_cm_per_s2,
+    )
+    trajectory = generate_trajectory(
+        point_list, constraints, Constants.trajectory_time_step_s, spline=spline
+    )
+    write_trajectory(file_path, trajectory)
+    return trajectory
+
+
+def main():
+    for path_file_name in glob(os.path.join(DEPLOY_DIRECTORY, "*.pth")):
+        with open(path_file_name, "r") as path_file:
+            # Older path files may contain action strings between the points, those are not part of the trajectory
+            point_list = [
+                point
+                for point in ast.literal_eval(path_file.read())
+                if isinstance(point, tuple)
+            ]
+        trajectory_file_name = os.path.splitext(path_file_name)[0] + ".trj"
+        trajectory = build_trajectory(point_list, trajectory_file_name)
+        print(
+            f"Built {trajectory_file_name}: {len(trajectory)} records, {trajectory.total_time:.2f} seconds"
+        )
+
+
+if __name__ == "__main__":
+    main()